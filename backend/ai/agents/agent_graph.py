@@ -1,14 +1,32 @@
 """Supervisor-backed orchestration entrypoints."""
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from utils import logger
+from utils import logger, LLMOverloadedError
+from services import GuardrailVerdict
 
 from orchestrator import HybridSupervisor
 
 supervisor = HybridSupervisor()
 
 
+def _busy_response(language: str, exc: LLMOverloadedError) -> Dict[str, Any]:
+    """Fast answer for a turn whose LLM call was shed under load"""
+    logger.warning("message_shed_under_load", error=str(exc), language=language)
+    response = (
+        "इस समय बहुत सारे अनुरोध आ रहे हैं। कृपया कुछ सेकंड बाद पुनः प्रयास करें।"
+        if language == "hi-IN"
+        else "We're handling a lot of requests right now. Please try again in a few seconds."
+    )
+    return {
+        "success": False,
+        "response": response,
+        "language": language,
+        "error": "overloaded",
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 async def process_message(
     message: str,
     user_id: str,
@@ -17,6 +35,8 @@ async def process_message(
     user_context: Optional[Dict[str, Any]] = None,
     message_history: Optional[List[Dict[str, str]]] = None,
     upi_mode: Optional[bool] = None,
+    voice_mode: bool = False,
+    guardrail_verdict: Optional[GuardrailVerdict] = None,
 ) -> Dict[str, Any]:
     try:
         return await supervisor.process(
@@ -27,7 +47,11 @@ async def process_message(
             user_context=user_context,
             message_history=message_history,
             upi_mode=upi_mode,
+            voice_mode=voice_mode,
+            guardrail_verdict=guardrail_verdict,
         )
+    except LLMOverloadedError as exc:
+        return _busy_response(language, exc)
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.error("message_processing_error", error=str(exc), session_id=session_id)
         error_response = (
@@ -44,4 +68,49 @@ async def process_message(
         }
 
 
-__all__ = ["process_message"]
+async def process_message_stream(
+    message: str,
+    user_id: str,
+    session_id: str,
+    language: str = "en-IN",
+    user_context: Optional[Dict[str, Any]] = None,
+    message_history: Optional[List[Dict[str, str]]] = None,
+    upi_mode: Optional[bool] = None,
+    voice_mode: bool = False,
+    guardrail_verdict: Optional[GuardrailVerdict] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Streaming counterpart of process_message: token events, then one final event"""
+    try:
+        async for event in supervisor.process_stream(
+            message=message,
+            user_id=user_id,
+            session_id=session_id,
+            language=language,
+            user_context=user_context,
+            message_history=message_history,
+            upi_mode=upi_mode,
+            voice_mode=voice_mode,
+            guardrail_verdict=guardrail_verdict,
+        ):
+            yield event
+    except LLMOverloadedError as exc:
+        yield {"type": "final", "replace": True, **_busy_response(language, exc)}
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("message_stream_processing_error", error=str(exc), session_id=session_id)
+        error_response = (
+            "मुझे खेद है, मुझे आपकी मदद करने में समस्या हो रही है। कृपया पुनः प्रयास करें।"
+            if language == "hi-IN"
+            else "I'm sorry, I'm having trouble helping you right now. Please try again."
+        )
+        yield {
+            "type": "final",
+            "replace": True,
+            "success": False,
+            "response": error_response,
+            "language": language,
+            "error": str(exc),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+__all__ = ["process_message", "process_message_stream"]
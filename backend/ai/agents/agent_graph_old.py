@@ -121,7 +121,7 @@ For transfers, ALWAYS confirm amount and recipient before executing."""
                 return state
             
             from tools import get_user_accounts
-            accounts_result = get_user_accounts.invoke({"user_id": user_id})
+            accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
             
             if accounts_result["success"] and accounts_result["accounts"]:
                 if account_type_requested:
@@ -165,7 +165,7 @@ For transfers, ALWAYS confirm amount and recipient before executing."""
             # Call transaction history tool
             if user_context.get("account_number"):
                 from tools import get_transaction_history
-                result = get_transaction_history.invoke({
+                result = await get_transaction_history.ainvoke({
                     "account_number": user_context["account_number"],
                     "days": 30,
                     "limit": 5
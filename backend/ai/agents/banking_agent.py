@@ -16,7 +16,7 @@ async def banking_agent(state):
     Returns:
         Updated state with AI response
     """
-    from services import get_llm_service
+    from services import get_llm_service, answer_priority
     
     # Get unified LLM service
     llm = get_llm_service()
@@ -120,7 +120,12 @@ If you are having difficulty understanding the user's question or are generating
             if hasattr(msg, 'content'):
                 role = "user" if isinstance(msg, HumanMessage) else "assistant"
                 messages_dict.append({"role": role, "content": msg.content})
-        response_content = await llm.chat(messages_dict, use_fast_model=False)
+        response_content = await llm.chat(
+            messages_dict,
+            use_fast_model=False,
+            on_token=state.get("token_sink"),
+            priority=answer_priority(state.get("voice_mode")),
+        )
         
         # Detect generic answers and ask for clarification
         generic_indicators = [
@@ -162,7 +167,7 @@ async def handle_balance_query(state, last_user_message, language):
         return "कृपया लॉगिन करें।" if language == "hi-IN" else "Please login first."
     
     from tools import get_user_accounts
-    accounts_result = get_user_accounts.invoke({"user_id": user_id})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
     
     if not accounts_result["success"] or not accounts_result["accounts"]:
         return "कोई खाता नहीं मिला।" if language == "hi-IN" else "No accounts found."
@@ -203,7 +208,7 @@ async def handle_balance_query(state, last_user_message, language):
     }
     
     # Use LLM to generate natural response
-    from services import get_llm_service
+    from services import get_llm_service, answer_priority
     llm = get_llm_service()
     
     # Build prompt for LLM
@@ -227,7 +232,12 @@ IMPORTANT: Always use Indian Rupees (₹ or INR) for all amounts. Never use doll
         {"role": "user", "content": user_prompt}
     ]
     
-    response = await llm.chat(messages, use_fast_model=False)
+    response = await llm.chat(
+        messages,
+        use_fast_model=False,
+        on_token=state.get("token_sink"),
+        priority=answer_priority(state.get("voice_mode")),
+    )
     return response
 
 
@@ -240,7 +250,7 @@ async def handle_transaction_query(state, user_context, language):
     from tools import get_user_accounts, get_transaction_history
     
     # Get all user accounts
-    accounts_result = get_user_accounts.invoke({"user_id": user_id})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
     
     if not accounts_result["success"] or not accounts_result["accounts"]:
         return "कोई खाता नहीं मिला।" if language == "hi-IN" else "No accounts found."
@@ -252,7 +262,7 @@ async def handle_transaction_query(state, user_context, language):
     
     for account in accounts_result["accounts"]:
         account_number = account["account_number"]
-        result = get_transaction_history.invoke({
+        result = await get_transaction_history.ainvoke({
             "account_number": account_number,
             "days": 30,
             "limit": 5  # Top 5 per account
@@ -327,7 +337,7 @@ async def handle_statement_request(state, last_user_message, language):
         return "कृपया लॉगिन करें।" if language == "hi-IN" else "Please login first."
     
     # Get user's accounts
-    accounts_result = get_user_accounts.invoke({"user_id": user_id})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
     
     if not accounts_result["success"] or not accounts_result["accounts"]:
         return "कोई खाता नहीं मिला।" if language == "hi-IN" else "No accounts found."
@@ -527,7 +537,7 @@ async def handle_reminder_query(state, user_context, language):
     from datetime import datetime, timedelta
     import re
 
-    accounts_result = get_user_accounts.invoke({"user_id": user_id})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
     accounts = accounts_result["accounts"] if accounts_result.get("success") else []
 
     last_message = state["messages"][-1].content
@@ -698,7 +708,7 @@ async def handle_transfer_request(state, user_context, language, last_user_messa
     import re
     
     # Get user's accounts to match source account
-    accounts_result = get_user_accounts.invoke({"user_id": user_id})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": user_id})
     accounts = accounts_result["accounts"] if accounts_result.get("success") else []
     
     # Extract transfer details from message using LLM
@@ -11,8 +11,11 @@ SIMPLE LOGIC:
   * Transfer → Banking agent (normal transfer, unless explicitly mentions UPI)
 """
 from langchain_core.messages import AIMessage
+from config import settings
 from utils import logger, log_agent_decision
-import re
+from services.intent_model import get_intent_metrics, get_intent_model
+from services.message_features import message_features_for
+import time
 
 
 async def classify_intent(state):
@@ -26,7 +29,7 @@ async def classify_intent(state):
     2. If UPI mode is inactive:
        - Balance query → Banking agent
        - Transfer → Banking agent (unless explicitly mentions UPI)
-    3. Otherwise → Use LLM classification
+    3. Otherwise → Local intent model, escalating to the LLM when it is unsure
     
     Args:
         state: AgentState with messages, language, etc.
@@ -34,6 +37,30 @@ async def classify_intent(state):
     Returns:
         Updated state with current_intent set
     """
+    start = time.perf_counter()
+    route = await _route_intent(state)
+    get_intent_metrics().record(route, (time.perf_counter() - start) * 1000)
+    return state
+
+
+async def _predict_intent(message: str):
+    """Local model prediction, or None when it is disabled or its encoder cannot load"""
+    if not settings.intent_model_enabled:
+        return None
+    try:
+        return await get_intent_model().apredict(message)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("intent_model_unavailable", error=str(exc))
+        return None
+
+
+async def _route_intent(state) -> str:
+    """
+    Set state["current_intent"] and report which route decided it
+    
+    Returns:
+        "rule" (keyword rules), "model" (local intent model) or "llm"
+    """
     from services import get_llm_service
     
     # Get unified LLM service
@@ -42,7 +69,8 @@ async def classify_intent(state):
     # Get messages and last user message
     messages = state.get("messages", [])
     last_message = messages[-1].content if messages else ""
-    msg_lower = last_message.lower()
+    # One keyword scan of the message serves every rule below
+    features = message_features_for(state, last_message)
     language = state.get("language", "en-IN")
     
     # Check if UPI mode is active (from frontend or previous state)
@@ -77,15 +105,10 @@ async def classify_intent(state):
         logger.info("pending_upi_operation_detected", 
                    message=last_message, 
                    structured_data_type=existing_structured_data.get("type"))
-        return state
+        return "rule"
     
     # Check for wake-up phrases to activate UPI mode
-    wake_up_phrases = [
-        "hello vaani", "hello upi", "hey vaani", "hey upi",
-        "हेलो वाणी", "हेलो upi", "हेलो यूपीआई"
-    ]
-    is_wake_up = any(phrase in msg_lower for phrase in wake_up_phrases)
-    if is_wake_up:
+    if features.has("wake_up"):
         state["upi_mode"] = True
         state["structured_data"] = {
             "type": "upi_mode_activation",
@@ -96,33 +119,23 @@ async def classify_intent(state):
         # Route to UPI agent to handle activation
         intent = "upi_payment"
         state["current_intent"] = intent
-        return state
+        return "rule"
     
     # SIMPLE ROUTING LOGIC: Check for balance and transfer keywords
-    balance_keywords = [
-        "balance", "बैलेंस", "kitne paise", "कितने पैसे", "bakaaya", "बकाया", "शेष",
-        "balance check", "kitne paise hain", "bakaaya rashi", "शेष राशि",
-        "account balance", "mera account balance", "kitna hai", "कितना है",
-        "मेरा अकाउंट बैलेंस", "बैलेंस कितना है", "खाता बैलेंस", "बकाया राशि"
-    ]
-    has_balance_keyword = any(keyword in msg_lower for keyword in balance_keywords)
+    has_balance_keyword = features.has("balance")
     
     # DEBUG: Log keyword detection
     if has_balance_keyword:
-        matched_keywords = [kw for kw in balance_keywords if kw in msg_lower]
+        matched_keywords = list(features.matched("balance"))
         logger.info("balance_keyword_detected",
                    message=last_message[:100],
                    matched_keywords=matched_keywords,
                    has_balance_keyword=True)
     
-    transfer_keywords = [
-        "transfer", "send", "pay", "भेजें", "भुगतान", "ट्रांसफर",
-        "send money", "transfer money", "pay money"
-    ]
-    has_transfer_keyword = any(keyword in msg_lower for keyword in transfer_keywords)
+    has_transfer_keyword = features.has("transfer")
     
     # Check if message contains amount (numbers, rupees, etc.)
-    has_amount = bool(re.search(r'\d+|rupees?|rs\.?|₹|hundred|thousand|lakh|crore', msg_lower))
+    has_amount = features.has_amount
     
     # CRITICAL: Check for language change keywords FIRST, before other routing
     # BUT: Be strict - only match full phrases, not partial matches
@@ -130,22 +143,12 @@ async def classify_intent(state):
     
     # FIRST: Check if message contains loan/product keywords - if yes, NEVER treat as language change
     # AND route to rag_agent for product information
-    loan_product_keywords = [
-        "loan", "लोन", "ऋण", "mudra", "मुद्रा", "business", "बिजनेस",
-        "home", "होम", "personal", "पर्सनल", "gold", "गोल्ड", "interest", "ब्याज",
-        "ke baare", "के बारे", "bataiye", "बताइए", "batao", "बताओ",
-        "processing fee", "processing charges", "प्रोसेसिंग फीस", "प्रोसेसिंग शुल्क",
-        "fee", "fees", "charges", "शुल्क", "फीस", "rate", "दर", "eligibility", "योग्यता",
-        "investment", "निवेश", "scheme", "स्कीम", "yojana", "योजना", "ppf", "nps", "ssy",
-        "पीपीएफ", "एनपीएस", "सुकन्या"
-    ]
-    has_loan_product_keyword = any(term in msg_lower for term in loan_product_keywords)
+    has_loan_product_keyword = features.has("loan_product")
     
     # CRITICAL: Route loan/investment queries to rag_agent (general_faq) BEFORE other routing
     if has_loan_product_keyword:
         # Check if it's specifically about loan/investment information, not operations
-        operation_keywords = ["apply", "apply for", "want to take", "लेना चाहते", "apply करना", "apply करें"]
-        is_operation_query = any(op_kw in msg_lower for op_kw in operation_keywords)
+        is_operation_query = features.has("product_operation")
         
         # If it's asking about information (fees, rates, eligibility, etc.), route to rag_agent
         if not is_operation_query:
@@ -153,25 +156,14 @@ async def classify_intent(state):
             state["current_intent"] = intent
             logger.info("loan_investment_query_routed_to_rag", 
                        message=last_message[:100],
-                       detected_keywords=[term for term in loan_product_keywords if term in msg_lower],
+                       detected_keywords=list(features.matched("loan_product")),
                        intent=intent)
-            return state
+            return "rule"
     
     # Only check for language change if NO loan/product keywords are present
     if not has_loan_product_keyword:
-        language_change_keywords_en = [
-            "change language", "switch language", "set language", "language to english", 
-            "language to hindi", "english please", "hindi please", "speak english", "speak hindi",
-            "change to english", "change to hindi", "switch to english", "switch to hindi",
-            "i want to change the language", "i want to switch language"
-        ]
-        language_change_keywords_hi = [
-            "भाषा बदलें", "भाषा बदलो", "अंग्रेजी में बोलें", "हिंदी में बोलें",
-            "भाषा अंग्रेजी करें", "भाषा हिंदी करें", "अंग्रेजी में बात करें", "हिंदी में बात करें"
-        ]
-        
-        # Check for explicit language change phrases
-        has_language_change = any(keyword in msg_lower for keyword in language_change_keywords_en + language_change_keywords_hi)
+        # Check for explicit language change phrases (English and Hindi)
+        has_language_change = features.has("language_change")
         
         if has_language_change:
             intent = "language_change"
@@ -180,17 +172,16 @@ async def classify_intent(state):
                        message=last_message[:100], 
                        current_language=language,
                        intent=intent)
-            return state
+            return "rule"
     else:
         # Has loan/product keywords - explicitly NOT a language change
         logger.info("language_change_prevented_by_loan_keywords", 
                    message=last_message[:100],
-                   detected_keywords=[term for term in loan_product_keywords if term in msg_lower])
+                   detected_keywords=list(features.matched("loan_product")))
     
     # CRITICAL: Check for reminder keywords FIRST, regardless of UPI mode
     # Reminder operations should always go to banking_operation, not UPI agent
-    reminder_keywords = ["reminder", "remind", "set reminder", "create reminder", "view reminder", "show reminder", "अनुस्मारक"]
-    has_reminder_keyword = any(keyword in msg_lower for keyword in reminder_keywords)
+    has_reminder_keyword = features.has("reminder")
     
     if has_reminder_keyword:
         intent = "banking_operation"
@@ -199,7 +190,7 @@ async def classify_intent(state):
                    message=last_message[:100], 
                    upi_mode_active=upi_mode_active,
                    intent=intent)
-        return state
+        return "rule"
     
     # CRITICAL ROUTING: When UPI mode is active
     if upi_mode_active:
@@ -220,7 +211,7 @@ async def classify_intent(state):
                        upi_mode_active=True,
                        intent=intent,
                        state_after_setting=state.get("current_intent"))
-            return state
+            return "rule"
         
         # Transfer/Payment → UPI agent
         if has_transfer_keyword or has_amount:
@@ -228,11 +219,10 @@ async def classify_intent(state):
             state["upi_mode"] = True
             state["current_intent"] = intent
             logger.info("upi_payment_routed", message=last_message, upi_mode_active=True)
-            return state
+            return "rule"
     
     # Check for UPI keywords (both English and Hindi) BEFORE routing to banking agent
-    upi_keywords = ["upi", "यूपीआई", "यूपी", "yupi", "you pee", "you p i"]
-    has_upi_keyword = any(keyword in msg_lower for keyword in upi_keywords)
+    has_upi_keyword = features.has("upi")
     
     # When UPI mode is inactive: Route to banking agent for balance/transfer
     if not upi_mode_active:
@@ -243,38 +233,46 @@ async def classify_intent(state):
             state["current_intent"] = intent
             logger.info("upi_keyword_detected_activating_upi_mode", 
                        message=last_message, 
-                       upi_keywords_found=[kw for kw in upi_keywords if kw in msg_lower])
-            return state
+                       upi_keywords_found=list(features.matched("upi")))
+            return "rule"
         
         # Balance query → Banking agent (normal balance check)
         if has_balance_keyword:
             intent = "banking_operation"
             state["current_intent"] = intent
             logger.info("normal_balance_check_routed", message=last_message, upi_mode_active=False)
-            return state
+            return "rule"
         
         # Transfer (without explicit UPI mention) → Banking agent
         if has_transfer_keyword and not has_upi_keyword:
             intent = "banking_operation"
             state["current_intent"] = intent
             logger.info("normal_transfer_routed", message=last_message, upi_mode_active=False)
-            return state
-    
-    # Check for UPI keywords again before LLM classification (in case it wasn't caught above)
-    upi_keywords = ["upi", "यूपीआई", "यूपी", "yupi", "you pee", "you p i"]
-    has_upi_keyword = any(keyword in msg_lower for keyword in upi_keywords)
-    
-    # If UPI keyword detected and not already in UPI mode, activate it
-    if has_upi_keyword and not upi_mode_active:
-        state["upi_mode"] = True
-        intent = "upi_payment"
-        state["current_intent"] = intent
-        logger.info("upi_keyword_detected_in_llm_fallback", 
-                   message=last_message,
-                   upi_keywords_found=[kw for kw in upi_keywords if kw in msg_lower])
-        return state
-    
-    # For other queries, use LLM classification
+            return "rule"
+    
+    # Statement keywords always win over model/LLM classification (reminder keywords already checked above)
+    if features.has("statement"):
+        state["current_intent"] = "banking_operation"
+        logger.info("banking_keyword_detected", message=last_message, forced_intent="banking_operation")
+        return "rule"
+    
+    # For other queries, try the local intent model before paying for an LLM call
+    prediction = await _predict_intent(last_message)
+    if prediction is not None and prediction.confidence >= settings.intent_model_confidence_threshold:
+        state["current_intent"] = prediction.intent
+        log_agent_decision(
+            agent="intent_classifier",
+            intent=prediction.intent,
+            confidence=prediction.confidence,
+        )
+        logger.info("intent_classified_locally",
+                   intent=prediction.intent,
+                   confidence=prediction.confidence,
+                   similarity=prediction.similarity,
+                   user_message=last_message)
+        return "model"
+    
+    # Below the confidence threshold, use LLM classification
     intent_prompt = f"""You are a banking assistant. Classify the user's intent into ONE of these categories:
     - language_change: User wants to change language (e.g., "change language to Hindi", "switch to English", "भाषा बदलें", "अंग्रेजी में बोलें", "हिंदी में बोलें")
     - upi_payment: UPI payments, sending money via UPI, "pay via UPI", "UPI payment", "send money via UPI", "pay ₹X to Y via UPI", "यूपीआई से पैसे ट्रांसफर", "यूपीआई से भुगतान", or explicitly mentions UPI/यूपीआई
@@ -296,7 +294,13 @@ User message: "{last_message}"
 Reply with ONLY the intent category name, nothing else."""
     
     # Use fast model for quick classification
-    intent = await llm.chat([{"role": "user", "content": intent_prompt}], use_fast_model=True)
+    # Under load, skip the LLM and fall through to the default "other" route
+    intent = await llm.chat(
+        [{"role": "user", "content": intent_prompt}],
+        use_fast_model=True,
+        temperature=0,
+        fallback="other",
+    )
     intent = intent.strip().lower()
     
     # Validate intent
@@ -304,16 +308,6 @@ Reply with ONLY the intent category name, nothing else."""
     if intent not in valid_intents:
         intent = "other"
     
-    # Final keyword-based fallback (reminder keywords already checked above)
-    statement_keywords = [
-        "statement", "स्टेटमेंट", "bank statement", "account statement", 
-        "download", "डाउनलोड", "nikalna", "nikal", "export"
-    ]
-    
-    if any(keyword in msg_lower for keyword in statement_keywords):
-        intent = "banking_operation"
-        logger.info("banking_keyword_detected", message=last_message, forced_intent=intent)
-    
     state["current_intent"] = intent
     
     log_agent_decision(
@@ -322,6 +316,11 @@ Reply with ONLY the intent category name, nothing else."""
         confidence=0.8,
     )
     
-    logger.info("intent_classified", intent=intent, user_message=last_message, upi_mode_active=upi_mode_active)
+    logger.info("intent_classified",
+               intent=intent,
+               user_message=last_message,
+               upi_mode_active=upi_mode_active,
+               model_intent=prediction.intent if prediction else None,
+               model_confidence=prediction.confidence if prediction else None)
     
-    return state
+    return "llm"
@@ -1,10 +1,11 @@
 """Hybrid RAG supervisor agent that orchestrates specialist sub-agents."""
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 
 from agents.rag_agents.customer_support_agent import handle_customer_support_query
 from agents.rag_agents.investment_agent import (
@@ -15,6 +16,17 @@ from agents.rag_agents.loan_agent import (
     handle_general_loan_query,
     handle_loan_query,
 )
+from config import settings
+from services.answer_cache import SemanticAnswerCache, get_answer_cache
+from services.message_features import (
+    INVESTMENT_TYPE_KEYWORDS,
+    LOAN_FOLLOWUP_TYPES,
+    LOAN_TYPE_KEYWORDS,
+    MessageFeatures,
+    extract_message_features,
+    message_features_for,
+    scan_keywords,
+)
 from utils import logger
 
 
@@ -53,27 +65,16 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # CRITICAL: Check for EXPLICIT customer support queries FIRST (before conversation context)
     # This prevents customer support queries from being misrouted due to conversation context
-    query_lower = user_query.lower()
-    
-    # Explicit customer support keywords (must be in current query, not context)
-    explicit_customer_support_keywords = [
-        "customer support", "customer care", "contact", "phone number", "phone", "helpline",
-        "email", "email address", "address", "headquarters", "head office", "branch address",
-        "website", "contact us", "reach us", "get in touch", "support", "customer service",
-        "call", "number", "location", "office address", "help with customer", "need help with",
-        "i need help with customer", "i need customer", "need customer support", "need customer care",
-        "ग्राहक सहायता", "कस्टमर केयर", "संपर्क", "फोन नंबर", "हेल्पलाइन", "ईमेल", "वेबसाइट",
-        "मुझे ग्राहक सहायता", "ग्राहक सहायता की आवश्यकता", "ग्राहक सहायता चाहिए"
-    ]
+    features = message_features_for(state, user_query)
     
     # Check if current query explicitly mentions customer support (ignore conversation context)
-    is_explicit_customer_support = any(keyword in query_lower for keyword in explicit_customer_support_keywords)
+    is_explicit_customer_support = features.has("customer_support")
     
     if is_explicit_customer_support:
         logger.info(
             "explicit_customer_support_query_detected",
             query=user_query,
-            matched_keywords=[kw for kw in explicit_customer_support_keywords if kw in query_lower]
+            matched_keywords=list(features.matched("customer_support"))
         )
         await handle_customer_support_query(state, user_query=user_query, llm=llm)
         return state
@@ -81,7 +82,7 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     # Extract conversation context to help detect loan/investment queries
     conversation_context = _extract_conversation_context(state, max_pairs=3)
     
-    signals = _detect_query_signals(user_query, conversation_context=conversation_context)
+    signals = _detect_query_signals(user_query, conversation_context=conversation_context, features=features)
     
     # If investment or loan query detected, route to appropriate agent
     if signals.is_investment_query or signals.is_loan_query:
@@ -96,34 +97,12 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         # Continue to investment/loan handling below
     else:
         # Check for bank info queries (only if NOT investment/loan)
-        bank_info_keywords = [
-            "what is", "who is", "tell me about", "explain", "describe",
-            "national bank", "sun national bank", "sun national", "the bank", "this bank",
-            "your bank", "bank information", "about bank", "about the bank",
-            "क्या है", "कौन है", "बताएं", "समझाएं", "राष्ट्रीय बैंक", "सन नेशनल बैंक",
-            "बैंक के बारे में", "बैंक की जानकारी"
-        ]
-        
         # Check if query is asking about the bank itself (not products/services)
         is_bank_info_query = False
-        if any(keyword in query_lower for keyword in bank_info_keywords):
-            # Additional check: should NOT be about products (loan, investment, etc.)
-            # Include investment scheme abbreviations and loan types
-            product_keywords = [
-                "loan", "investment", "scheme", "plan", "product", "service",
-                # Investment schemes
-                "ppf", "nps", "ssy", "elss", "fd", "rd", "nsc",
-                "fixed deposit", "recurring deposit", "public provident fund",
-                "national pension", "sukanya", "equity linked", "tax saving",
-                # Loan types
-                "home loan", "personal loan", "auto loan", "car loan", "business loan",
-                "education loan", "gold loan", "loan against property", "lap",
-                # Hindi
-                "लोन", "निवेश", "योजना", "उत्पाद", "सेवा",
-                "पीपीएफ", "एनपीएस", "सुकन्या", "ईएलएसएस", "एफडी", "आरडी", "एनएससी",
-                "होम लोन", "पर्सनल लोन", "ऑटो लोन"
-            ]
-            has_product_keyword = any(keyword in query_lower for keyword in product_keywords)
+        if features.has("bank_info"):
+            # Additional check: should NOT be about products (loan, investment, scheme
+            # abbreviations, loan types)
+            has_product_keyword = features.has("bank_product")
             
             # If query asks "what is" + "bank" but no product keywords, it's about the bank
             if not has_product_keyword:
@@ -134,8 +113,15 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
                 "bank_info_query_detected",
                 query=user_query
             )
-            await handle_customer_support_query(state, user_query=user_query, llm=llm)
-            return state
+            return await _answer_with_cache(
+                state,
+                user_query=user_query,
+                language=language,
+                domain="support",
+                product_type=None,
+                conversation_context=conversation_context,
+                handler=lambda: handle_customer_support_query(state, user_query=user_query, llm=llm),
+            )
     logger.info(
         "rag_supervisor_signals",
         is_loan=signals.is_loan_query,
@@ -155,12 +141,7 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     # Also check if investment query is asking for options/choices but no specific type detected
     # This handles queries like "I want to do investment, what options do I have?"
     if signals.is_investment_query and not signals.detected_investment_type:
-        query_lower = user_query.lower()
-        option_keywords = [
-            "options", "option", "choices", "choice", "what do i have", "what are",
-            "show me", "list", "available", "विकल्प", "क्या", "दिखाएं", "सूची"
-        ]
-        has_option_keywords = any(keyword in query_lower for keyword in option_keywords)
+        has_option_keywords = features.has("options")
         
         # If query contains investment keywords and option keywords but no specific type,
         # treat it as a general investment query
@@ -178,12 +159,7 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     # Also check if loan query is asking for options/choices but no specific type detected
     # This handles queries like "I want to borrow money, what options do I have?"
     if signals.is_loan_query and not signals.detected_loan_type:
-        query_lower = user_query.lower()
-        option_keywords = [
-            "options", "option", "choices", "choice", "what do i have", "what are",
-            "show me", "list", "available", "विकल्प", "क्या", "दिखाएं", "सूची"
-        ]
-        has_option_keywords = any(keyword in query_lower for keyword in option_keywords)
+        has_option_keywords = features.has("options")
         
         # If query contains loan keywords and option keywords but no specific type,
         # treat it as a general loan query
@@ -196,29 +172,124 @@ async def rag_agent(state: Dict[str, Any]) -> Dict[str, Any]:
             return handle_general_loan_query(state, language)
 
     if signals.is_investment_query:
-        await handle_investment_query(
+        return await _answer_with_cache(
             state,
             user_query=user_query,
             language=language,
-            llm=llm,
-            detected_investment_type=signals.detected_investment_type,
+            domain="investment",
+            product_type=signals.detected_investment_type,
+            conversation_context=conversation_context,
+            handler=lambda: handle_investment_query(
+                state,
+                user_query=user_query,
+                language=language,
+                llm=llm,
+                detected_investment_type=signals.detected_investment_type,
+            ),
         )
-        return state
 
     if signals.is_loan_query:
-        await handle_loan_query(
+        return await _answer_with_cache(
             state,
             user_query=user_query,
             language=language,
-            llm=llm,
-            detected_loan_type=signals.detected_loan_type,
+            domain="loan",
+            product_type=signals.detected_loan_type,
+            conversation_context=conversation_context,
+            handler=lambda: handle_loan_query(
+                state,
+                user_query=user_query,
+                language=language,
+                llm=llm,
+                detected_loan_type=signals.detected_loan_type,
+            ),
         )
+
+    return await _answer_with_cache(
+        state,
+        user_query=user_query,
+        language=language,
+        domain="support",
+        product_type=None,
+        conversation_context=conversation_context,
+        handler=lambda: handle_customer_support_query(state, user_query=user_query, llm=llm),
+    )
+
+
+async def _answer_with_cache(
+    state: Dict[str, Any],
+    *,
+    user_query: str,
+    language: str,
+    domain: str,
+    product_type: Optional[str],
+    conversation_context: str,
+    handler: Callable[[], Awaitable[Any]],
+) -> Dict[str, Any]:
+    """Serve a semantically equivalent cached answer, or run the specialist and cache its answer.
+
+    Only non-personalized FAQ turns are eligible: the intent must be general_faq and
+    there must be no prior conversation the answer could depend on.
+    """
+    eligible = (
+        settings.answer_cache_enabled
+        and state.get("current_intent") == "general_faq"
+        and not conversation_context
+    )
+    if not eligible:
+        await handler()
         return state
 
-    await handle_customer_support_query(state, user_query=user_query, llm=llm)
+    cache = get_answer_cache()
+    scope = SemanticAnswerCache.scope_key(language, domain, product_type)
+    user_name = (state.get("user_context") or {}).get("name")
+    try:
+        collection_version = await _collection_version(domain, language)
+        cached = await cache.alookup(user_query, scope, collection_version, user_name=user_name)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("answer_cache_lookup_failed", scope=scope, error=str(exc))
+        await handler()
+        return state
+
+    if cached:
+        state["messages"].append(AIMessage(content=cached.response))
+        if cached.structured_data:
+            state["structured_data"] = cached.structured_data
+        state["next_action"] = "end"
+        return state
+
+    message_count = len(state["messages"])
+    structured_before = copy.deepcopy(state.get("structured_data"))
+    await handler()
+
+    new_messages = state["messages"][message_count:]
+    if len(new_messages) == 1 and isinstance(new_messages[0], AIMessage):
+        structured_after = state.get("structured_data")
+        try:
+            await cache.astore(
+                user_query,
+                scope,
+                collection_version,
+                new_messages[0].content,
+                structured_data=structured_after if structured_after != structured_before else None,
+                user_name=user_name,
+                language=language,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("answer_cache_store_failed", scope=scope, error=str(exc))
     return state
 
 
+async def _collection_version(domain: str, language: str) -> str:
+    """Version of the RAG collection backing a domain; support answers have none"""
+    if domain not in ("loan", "investment"):
+        return "static"
+    from services.rag_service import aget_rag_service
+
+    rag_service = await aget_rag_service(documents_type=domain, language=language)
+    return rag_service.collection_version
+
+
 def _extract_latest_user_query(state: Dict[str, Any]) -> Optional[str]:
     user_messages = [msg for msg in state["messages"] if isinstance(msg, HumanMessage)]
     return user_messages[-1].content if user_messages else None
@@ -272,493 +343,182 @@ def _extract_conversation_context(state: Dict[str, Any], max_pairs: int = 3) ->
     return conversation_context.lower()
 
 
-def _detect_query_signals(user_query: str, conversation_context: str = "") -> QuerySignals:
-    query_lower = user_query.lower()
+def _detect_query_signals(
+    user_query: str,
+    conversation_context: str = "",
+    features: Optional[MessageFeatures] = None,
+) -> QuerySignals:
+    """
+    Detect loan/investment intent and product types for the current query
+
+    The current query's keywords come from its single feature scan; the
+    conversation context is only scanned when a rule needs it.
+    """
+    if features is None or features.message != user_query:
+        features = extract_message_features(user_query)
+    query_lower = features.text
     
     # Combine current query with conversation context for better detection
     combined_text = f"{conversation_context} {query_lower}".lower() if conversation_context else query_lower
+    scans = {}
 
-    loan_keywords = [
-        "loan",
-        "interest rate",
-        "emi",
-        "eligibility",
-        "documents required",
-        "home loan",
-        "personal loan",
-        "auto loan",
-        "car loan",
-        "education loan",
-        "business loan",
-        "gold loan",
-        "property loan",
-        "mortgage",
-        "down payment",
-        "processing fee",
-        "prepayment",
-        "tenure",
-        "collateral",
-        # Context-aware keywords (check in combined text)
-        "against property",  # When combined with loan context
-        "loan against property",
-        # Hindi keywords
-        "udhar",
-        "udhaar",
-        "कर्ज",
-        "ऋण",
-        "लोन",
-        "उधार",
-        "उधारी",
-        "ब्याज दर",
-        "होम लोन",
-        "पर्सनल लोन",
-        "ऑटो लोन",
-        "एजुकेशन लोन",
-        "बिजनेस लोन",
-        "गोल्ड लोन",
-    ]
-
-    general_loan_queries = [
-        "what loans",
-        "which loans",
-        "available loans",
-        "types of loans",
-        "loan types",
-        "loan products",
-        "tell me about loans",
-        "loans available",
-        "what kind of loans",
-        "loan options",
-        "loan schemes",
-        "loan information",
-        "loan info",
-        "show me loans",
-        "list loans",
-        "all loans",
-        "i want to borrow",
-        "i want to borrow money",
-        "want to borrow",
-        "want to borrow money",
-        "i need a loan",
-        "i need loan",
-        "need a loan",
-        "need loan",
-        "what options do i have",
-        "what options",
-        "what choices",
-        "what are my options",
-        "what are the options",
-        "show me options",
-        "show options",
-        "list loans",
-        "loan list",
-        # Hindi general loan queries (only when NO specific loan type is mentioned)
-        "कौन से लोन",
-        "कौन सी लोन",
-        "कौन सा लोन",
-        "कौन से ऋण",
-        "कौन सी ऋण",
-        "कौन सा ऋण",
-        # Note: "लोन के बारे में" and "ऋण के बारे में" are removed from general queries
-        # because they match specific queries like "home loan ke baare mein" or "होम लोन के बारे में"
-        # Only match if it's just "लोन" or "ऋण" without a specific type before "के बारे में"
-        "उधार के बारे में",
-        "कर्ज के बारे में",
-        "मुझे लोन चाहिए",
-        "मुझे ऋण चाहिए",
-        "मुझे उधार चाहिए",
-        "मुझे कर्ज चाहिए",
-        "बैंक से उधार",
-        "बैंक से कर्ज",
-        "बैंक से लोन",
-        "बैंक से ऋण",
-        "पैसे उधार",
-        "पैसे कर्ज",
-        "लोन की जानकारी",
-        "लोन जानकारी",
-        "ऋण की जानकारी",
-        "ऋण जानकारी",
-        "मुझे पैसे चाहिए",
-        "मुझे पैसा चाहिए",
-        "क्या विकल्प हैं",
-        "क्या विकल्प",
-        "कौन से विकल्प",
-    ]
-
-    investment_keywords = [
-        "investment",
-        "invest",
-        "scheme",
-        "ppf",
-        "nps",
-        "ssy",
-        "sukanya",
-        "elss",
-        "fixed deposit",
-        "fd",
-        "recurring deposit",
-        "rd",
-        "nsc",
-        "tax saving",
-        "retirement",
-        "pension",
-        "savings",
-        "mutual fund",
-        "public provident fund",
-        "national pension",
-        "sukanya samriddhi",
-        "equity linked",
-        "national savings certificate",
-        # Hindi keywords
-        "nivesh",
-        "निवेश",
-        "निवेश करना",
-        "योजना",
-        "स्कीम",
-        "पीपीएफ",
-        "एनपीएस",
-        "सुकन्या",
-        "फिक्स्ड डिपॉजिट",
-        "एफडी",
-        "रिकरिंग डिपॉजिट",
-        "आरडी",
-        "टैक्स सेविंग",
-        "बचत",
-        "पेंशन",
-        "रिटायरमेंट",
-    ]
-
-    general_investment_queries = [
-        "what investments",
-        "which investments",
-        "available investments",
-        "investment schemes",
-        "investment types",
-        "investment options",
-        "tell me about investments",
-        "investments available",
-        "what investment schemes",
-        "investment plans",
-        "savings schemes",
-        "tax saving schemes",
-        "show me investment",
-        "investment options available",
-        "i want to invest",
-        "i want to do investment",
-        "want to invest",
-        "want to do investment",
-        "what options do i have",
-        "what options",
-        "what choices",
-        "what are my options",
-        "what are the options",
-        "show me options",
-        "show options",
-        "list investments",
-        "list investment",
-        "investment list",
-        # Hindi general investment queries
-        "कौन सी योजना",
-        "कौन सी स्कीम",
-        "कौन से निवेश",
-        "कौन सी निवेश योजना",
-        "निवेश योजना",
-        "निवेश स्कीम",
-        "निवेश के बारे में",
-        "योजना के बारे में",
-        "स्कीम के बारे में",
-        "मुझे निवेश करना है",
-        "पैसे निवेश करना",
-        "पैसे निवेश",
-        "निवेश करने के लिए",
-        "कुछ योजना",
-        "कुछ स्कीम",
-        "कुछ निवेश",
-        "निवेश की जानकारी",
-        "योजना की जानकारी",
-        "स्कीम की जानकारी",
-        "मुझे निवेश करना चाहिए",
-        "मैं निवेश करना चाहता",
-        "मैं निवेश करना चाहती",
-        "क्या विकल्प हैं",
-        "क्या विकल्प",
-        "कौन से विकल्प",
-    ]
-
-    specific_loan_types = {
-        # English loan types
-        "home loan": "home_loan",
-        "home_loan": "home_loan",
-        "personal loan": "personal_loan",
-        "personal_loan": "personal_loan",
-        "auto loan": "auto_loan",
-        "auto_loan": "auto_loan",
-        "car loan": "auto_loan",
-        "education loan": "education_loan",
-        "education_loan": "education_loan",
-        "business loan": "business_loan",
-        "business_loan": "business_loan",
-        "gold loan": "gold_loan",
-        "gold_loan": "gold_loan",
-        "loan against property": "loan_against_property",
-        "loan_against_property": "loan_against_property",
-        "property loan": "loan_against_property",
-        "lap": "loan_against_property",
-        # Hindi loan types
-        "होम लोन": "home_loan",
-        "होमलोन": "home_loan",
-        "पर्सनल लोन": "personal_loan",
-        "पर्सनललोन": "personal_loan",
-        "ऑटो लोन": "auto_loan",
-        "ऑटोलोन": "auto_loan",
-        "एजुकेशन लोन": "education_loan",
-        "एजुकेशनलोन": "education_loan",
-        "बिजनेस लोन": "business_loan",
-        "बिजनेसलोन": "business_loan",
-        "गोल्ड लोन": "gold_loan",
-        "गोल्डलोन": "gold_loan",
-        "प्रॉपर्टी लोन": "loan_against_property",
-        "प्रॉपर्टी के खिलाफ लोन": "loan_against_property",
-    }
+    def combined():
+        if "combined" not in scans:
+            scans["combined"] = scan_keywords(combined_text) if conversation_context else features.keywords
+        return scans["combined"]
 
-    specific_investment_types = {
-        "ppf": "ppf",
-        "public provident fund": "ppf",
-        "nps": "nps",
-        "national pension": "nps",
-        "national pension system": "nps",
-        "ssy": "ssy",
-        "sukanya": "ssy",
-        "sukanya samriddhi": "ssy",
-        "sukanya samriddhi yojana": "ssy",
-        "sukanya samridhi": "ssy",
-        "sukanya samridhi yojana": "ssy",
-        "elss": "elss",
-        "tax saving mutual fund": "elss",
-        "equity linked savings scheme": "elss",
-        "fixed deposit": "fd",
-        "fd": "fd",
-        "recurring deposit": "rd",
-        "rd": "rd",
-        "nsc": "nsc",
-        "national savings certificate": "nsc",
-        # Hindi investment types
-        "पीपीएफ": "ppf",
-        "पब्लिक प्रोविडेंट फंड": "ppf",
-        "एनपीएस": "nps",
-        "नेशनल पेंशन": "nps",
-        "नेशनल पेंशन सिस्टम": "nps",
-        "सुकन्या": "ssy",
-        "सुकन्या समृद्धि": "ssy",
-        "सुकन्या समृद्धि योजना": "ssy",
-        "ईएलएसएस": "elss",
-        "टैक्स सेविंग म्यूचुअल फंड": "elss",
-        "फिक्स्ड डिपॉजिट": "fd",
-        "एफडी": "fd",
-        "रिकरिंग डिपॉजिट": "rd",
-        "आरडी": "rd",
-        "नेशनल सेविंग्स सर्टिफिकेट": "nsc",
-        "एनएससी": "nsc",
-    }
+    def context():
+        if "context" not in scans:
+            scans["context"] = scan_keywords(conversation_context)
+        return scans["context"]
+
+    def context_mentions_loan() -> bool:
+        return bool(conversation_context) and context().has("loan_context")
 
     # CRITICAL: Check if this is a general loan query FIRST
     # If it's a general query, don't use conversation context to detect loan types
     # This prevents showing previous loan details when user asks for loan list again
-    is_general_loan_query = any(phrase in query_lower for phrase in general_loan_queries)
+    is_general_loan_query = features.has("general_loan")
     
     # IMPORTANT: Check for specific loan types FIRST (before general queries)
     # PRIORITIZE CURRENT QUERY over conversation context to avoid false matches
-    # Sort by length (longest first) to match longer phrases first (e.g., "home loan" before "loan")
+    # Longer names take priority (e.g., "home loan" before "loan")
     detected_loan_type = None
-    sorted_loan_types = sorted(specific_loan_types.items(), key=lambda item: len(item[0]), reverse=True)
     
     # FIRST: Check in current query ONLY (prioritize what user is asking NOW)
-    for loan_name, loan_type in sorted_loan_types:
-        if loan_name in query_lower:
-            detected_loan_type = loan_type
-            logger.info(
-                "loan_type_detected_from_current_query",
-                loan_name=loan_name,
-                loan_type=loan_type,
-                query=user_query
-            )
-            break
+    loan_name = features.first("loan_type")
+    if loan_name:
+        detected_loan_type = LOAN_TYPE_KEYWORDS[loan_name]
+        logger.info(
+            "loan_type_detected_from_current_query",
+            loan_name=loan_name,
+            loan_type=detected_loan_type,
+            query=user_query
+        )
     
     # SECOND: If not found in current query AND it's NOT a general loan query,
     # check combined text (with context) for context-aware matches
     # This handles follow-up queries like "tell me more" after "business loan"
     # BUT: Skip context check if user is asking for general loan information (fresh start)
     if not detected_loan_type and not is_general_loan_query:
-        for loan_name, loan_type in sorted_loan_types:
-            if loan_name in combined_text:
-                # Special handling for "against property" - only match if there's loan context
-                if loan_name == "loan against property" or loan_name == "property loan":
-                    # Check if previous context mentions loans
-                    if "loan" in conversation_context or "लोन" in conversation_context or "ऋण" in conversation_context:
-                        detected_loan_type = loan_type
-                        logger.info(
-                            "loan_type_detected_from_context",
-                            loan_name=loan_name,
-                            loan_type=loan_type,
-                            context=conversation_context[:100]
-                        )
-                        break
-                else:
-                    # Only use context if current query doesn't mention a different loan type
-                    # This prevents "business loan" in context from matching when user asks "gold loan"
-                    current_query_has_other_loan = any(
-                        other_loan in query_lower 
-                        for other_loan in specific_loan_types.keys() 
-                        if other_loan != loan_name
+        query_loan_names = set(features.matched("loan_type"))
+        for loan_name in combined().keywords("loan_type"):
+            loan_type = LOAN_TYPE_KEYWORDS[loan_name]
+            # Special handling for "against property" - only match if there's loan context
+            if loan_name == "loan against property" or loan_name == "property loan":
+                # Check if previous context mentions loans
+                if context_mentions_loan():
+                    detected_loan_type = loan_type
+                    logger.info(
+                        "loan_type_detected_from_context",
+                        loan_name=loan_name,
+                        loan_type=loan_type,
+                        context=conversation_context[:100]
                     )
-                    if not current_query_has_other_loan:
-                        detected_loan_type = loan_type
-                        logger.info(
-                            "loan_type_detected_from_combined_text",
-                            loan_name=loan_name,
-                            loan_type=loan_type,
-                            query=user_query,
-                            context=conversation_context[:100]
-                        )
-                        break
+                    break
+            # Only use context if current query doesn't mention a different loan type
+            # This prevents "business loan" in context from matching when user asks "gold loan"
+            elif not query_loan_names - {loan_name}:
+                detected_loan_type = loan_type
+                logger.info(
+                    "loan_type_detected_from_combined_text",
+                    loan_name=loan_name,
+                    loan_type=loan_type,
+                    query=user_query,
+                    context=conversation_context[:100]
+                )
+                break
 
     # CRITICAL: Check if this is a general investment query FIRST
     # If it's a general query, don't use conversation context to detect investment types
     # This prevents showing previous investment/loan details when user asks for investment list again
-    is_general_investment_query = any(phrase in query_lower for phrase in general_investment_queries)
+    is_general_investment_query = features.has("general_investment")
     
     # IMPORTANT: Check for specific investment types FIRST (before general queries)
     # PRIORITIZE CURRENT QUERY over conversation context to avoid false matches
-    # Sort by length (longest first) to match longer phrases first (e.g., "sukanya samriddhi yojana" before "sukanya")
+    # Longer names take priority (e.g., "sukanya samriddhi yojana" before "sukanya")
     detected_investment_type = None
-    sorted_investment_types = sorted(specific_investment_types.items(), key=lambda item: len(item[0]), reverse=True)
     
     # FIRST: Check in current query ONLY (prioritize what user is asking NOW)
-    for investment_name, investment_type in sorted_investment_types:
-        if investment_name in query_lower:
-            detected_investment_type = investment_type
-            logger.info(
-                "investment_type_detected_from_current_query",
-                investment_name=investment_name,
-                investment_type=investment_type,
-                query=user_query
-            )
-            break
+    investment_name = features.first("investment_type")
+    if investment_name:
+        detected_investment_type = INVESTMENT_TYPE_KEYWORDS[investment_name]
+        logger.info(
+            "investment_type_detected_from_current_query",
+            investment_name=investment_name,
+            investment_type=detected_investment_type,
+            query=user_query
+        )
     
     # SECOND: If not found in current query AND it's NOT a general investment query,
     # check combined text (with context) for context-aware matches
     # This handles follow-up queries like "tell me more" after "ppf"
     # BUT: Skip context check if user is asking for general investment information (fresh start)
     if not detected_investment_type and not is_general_investment_query:
-        for investment_name, investment_type in sorted_investment_types:
-            if investment_name in combined_text:
-                detected_investment_type = investment_type
-                logger.info(
-                    "investment_type_detected_from_combined_text",
-                    investment_name=investment_name,
-                    investment_type=investment_type,
-                    query=user_query,
-                    context=conversation_context[:100]
-                )
-                break
+        investment_name = combined().first("investment_type")
+        if investment_name:
+            detected_investment_type = INVESTMENT_TYPE_KEYWORDS[investment_name]
+            logger.info(
+                "investment_type_detected_from_combined_text",
+                investment_name=investment_name,
+                investment_type=detected_investment_type,
+                query=user_query,
+                context=conversation_context[:100]
+            )
 
     # Check if it's a general loan query (only if no specific loan type was detected)
-    # Use the pre-computed is_general_loan_query value
-    is_general_loan = False
-    if not detected_loan_type:
-        # Only check general queries if no specific loan type was found
-        is_general_loan = is_general_loan_query
-    else:
-        # If specific loan type detected, don't treat as general query
-        is_general_loan = False
+    is_general_loan = is_general_loan_query and not detected_loan_type
 
     # Check loan keywords in combined text (with context) for better detection
-    # Special handling for context-aware keywords
+    # "against property" alone only counts when the conversation already mentions loans
     # IMPORTANT: Prioritize current query intent - if current query is clearly about investments,
     # don't mark as loan query based on conversation context alone
-    is_loan_query = False
-    current_query_has_investment_keywords = any(keyword in query_lower for keyword in investment_keywords)
+    def has_loan_keyword(matches) -> bool:
+        keywords = matches.keywords("loan")
+        return any(keyword != "against property" for keyword in keywords) or (
+            "against property" in keywords and context_mentions_loan()
+        )
+
+    current_query_has_investment_keywords = features.has("investment")
     
     # First check current query for loan keywords (prioritize what user is asking NOW)
-    for keyword in loan_keywords:
-        if keyword in query_lower:
-            # For "against property", only match if there's loan context
-            if keyword == "against property":
-                if "loan" in conversation_context or "लोन" in conversation_context or "ऋण" in conversation_context:
-                    is_loan_query = True
-                    break
-            else:
-                is_loan_query = True
-                break
+    is_loan_query = has_loan_keyword(features.keywords)
     
     # Only check combined_text (with context) if:
     # 1. Current query doesn't have loan keywords AND
     # 2. Current query doesn't have investment keywords (to avoid conflicts)
     if not is_loan_query and not current_query_has_investment_keywords:
-        for keyword in loan_keywords:
-            if keyword in combined_text:
-                # For "against property", only match if there's loan context
-                if keyword == "against property":
-                    if "loan" in conversation_context or "लोन" in conversation_context or "ऋण" in conversation_context:
-                        is_loan_query = True
-                        break
-                else:
-                    is_loan_query = True
-                    break
+        is_loan_query = has_loan_keyword(combined())
     
     # Also check if conversation context mentions loans and current query is brief follow-up
     # BUT: Skip this if:
     # 1. It's a general loan query (user wants fresh start, not follow-up) OR
     # 2. Current query has investment keywords (prioritize investment intent) OR
     # 3. Current query explicitly mentions customer support (don't use context for customer support queries)
-    customer_support_keywords_in_query = [
-        "customer support", "customer care", "contact", "support", "help", "helpline",
-        "ग्राहक सहायता", "कस्टमर केयर", "संपर्क", "सहायता", "मदद"
-    ]
-    has_explicit_customer_support = any(keyword in query_lower for keyword in customer_support_keywords_in_query)
+    has_explicit_customer_support = features.has("support_request")
     
     if not is_loan_query and conversation_context and not is_general_loan_query and not current_query_has_investment_keywords and not has_explicit_customer_support:
         # If previous context has loans and current query is brief (likely a follow-up)
-        has_loan_context = any(word in conversation_context for word in ["loan", "लोन", "ऋण", "loans", "products", "options"])
+        has_loan_context = context().has("loan_followup_context")
         is_brief_followup = len(user_query.split()) <= 3  # 3 words or less
         
-        # Common follow-up patterns
-        followup_patterns = ["against property", "property", "gold", "home", "personal", "business", "education", "auto"]
-        is_followup = any(pattern in query_lower for pattern in followup_patterns)
+        # Common follow-up patterns ("car" only names the type once it is a follow-up)
+        followup_words = features.matched("loan_followup")
+        is_followup = any(word != "car" for word in followup_words)
         
         if has_loan_context and (is_brief_followup or is_followup):
             is_loan_query = True
             # Try to detect loan type from follow-up
-            if not detected_loan_type:
-                if "property" in query_lower or "against property" in query_lower:
-                    detected_loan_type = "loan_against_property"
-                elif "gold" in query_lower:
-                    detected_loan_type = "gold_loan"
-                elif "home" in query_lower:
-                    detected_loan_type = "home_loan"
-                elif "personal" in query_lower:
-                    detected_loan_type = "personal_loan"
-                elif "business" in query_lower:
-                    detected_loan_type = "business_loan"
-                elif "education" in query_lower:
-                    detected_loan_type = "education_loan"
-                elif "auto" in query_lower or "car" in query_lower:
-                    detected_loan_type = "auto_loan"
+            if not detected_loan_type and followup_words:
+                detected_loan_type = LOAN_FOLLOWUP_TYPES[features.first("loan_followup")]
 
     # Check if it's a general investment query (only if no specific investment type was detected)
-    # Use the pre-computed is_general_investment_query value
-    is_general_investment = False
-    if not detected_investment_type:
-        # Only check general queries if no specific investment type was found
-        is_general_investment = is_general_investment_query
-    else:
-        # If specific investment type detected, don't treat as general query
-        is_general_investment = False
+    is_general_investment = is_general_investment_query and not detected_investment_type
 
     return QuerySignals(
         is_loan_query=is_loan_query,
         is_general_loan_query=is_general_loan,
-        is_investment_query=any(keyword in query_lower for keyword in investment_keywords),
+        is_investment_query=current_query_has_investment_keywords,
         is_general_investment_query=is_general_investment,
         detected_loan_type=detected_loan_type,
         detected_investment_type=detected_investment_type,
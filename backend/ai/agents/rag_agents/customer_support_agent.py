@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 
 from langchain_core.messages import AIMessage
 from utils import logger
+from services.llm_service import answer_priority
 
 
 def get_customer_support_info(language: str = "en-IN") -> Dict[str, Any]:
@@ -103,7 +104,12 @@ async def handle_customer_support_query(state: Dict[str, Any], *, user_query: st
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_query},
     ]
-    response = await llm.chat(llm_messages, use_fast_model=False)
+    response = await llm.chat(
+        llm_messages,
+        use_fast_model=False,
+        on_token=state.get("token_sink"),
+        priority=answer_priority(state.get("voice_mode")),
+    )
 
     state["messages"].append(AIMessage(content=response))
     state["next_action"] = "end"
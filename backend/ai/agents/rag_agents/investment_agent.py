@@ -6,6 +6,9 @@ from typing import Any, Dict, Optional
 
 from langchain_core.messages import AIMessage
 from utils import logger
+from services.llm_service import LLMPriority, answer_priority
+from services.extraction_cache import cached_extraction
+from services.product_card_index import get_product_card_index
 
 
 def _clean_english_text(text: str) -> str:
@@ -226,15 +229,25 @@ async def handle_investment_query(
     detected_investment_type: Optional[str],
 ) -> Dict[str, Any]:
     """Provide detailed investment information using RAG and fallback cards."""
-    from services.rag_service import get_rag_service
+    from services.rag_service import aget_rag_service
+
+    # Scheme cards precomputed at ingestion answer without retrieval or an LLM call
+    card_index = get_product_card_index("investment", language)
+    indexed_card = card_index.get(detected_investment_type) if card_index is not None and detected_investment_type else None
+    if indexed_card:
+        state["structured_data"] = {"type": "investment", "investmentInfo": indexed_card}
+        state["messages"].append(AIMessage(content=_build_investment_response_text(indexed_card, language)))
+        state["next_action"] = "end"
+        logger.info("rag_investment_agent_response", has_structured=True, from_card_index=True, scheme_type=detected_investment_type)
+        return state
 
     rag_context = ""
     try:
-        rag_service = get_rag_service(documents_type="investment", language=language)
+        rag_service = await aget_rag_service(documents_type="investment", language=language)
         rag_filter = None
         if detected_investment_type:
             rag_filter = {"scheme_type": detected_investment_type}
-        rag_context = rag_service.get_context_for_query(
+        rag_context = await rag_service.aget_context_for_query(
             user_query,
             k=2 if rag_filter else 3,
             filter=rag_filter,
@@ -280,27 +293,11 @@ async def handle_investment_query(
         logger.info("rag_investment_agent_response", has_structured=True)
         return state
 
-    llm_messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_query},
-    ]
-    response = await llm.chat(llm_messages, use_fast_model=False)
-    
-    # Clean response text if language is English to remove any Hindi characters
-    if language == "en-IN":
-        response = _clean_english_text(response)
-    
-    # Detect generic answers and ask for clarification
-    generic_indicators = [
-        "i'm not sure", "i don't know", "i'm not certain", "i cannot", "i'm unable",
-        "मुझे नहीं पता", "मुझे यकीन नहीं", "मैं नहीं जानती", "मैं निश्चित नहीं", "मैं असमर्थ हूं"
-    ]
-    is_generic = any(indicator in response.lower() for indicator in generic_indicators)
-    
     # Check if RAG context was empty or very short (indicating no relevant document retrieval)
     rag_context_empty = not rag_context or len(rag_context.strip()) < 100
     
     # HALLUCINATION CHECK: If RAG retrieval returns 0 documents, force refusal instead of making up answer
+    # (checked before calling the LLM, whose answer would be discarded anyway)
     if rag_context_empty:
         logger.warning("rag_context_empty_forced_refusal",
                      detected_investment_type=detected_investment_type,
@@ -314,6 +311,28 @@ async def handle_investment_query(
         state["next_action"] = "end"
         return state
     
+    llm_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_query},
+    ]
+    response = await llm.chat(
+        llm_messages,
+        use_fast_model=False,
+        on_token=state.get("token_sink"),
+        priority=answer_priority(state.get("voice_mode")),
+    )
+    
+    # Clean response text if language is English to remove any Hindi characters
+    if language == "en-IN":
+        response = _clean_english_text(response)
+    
+    # Detect generic answers and ask for clarification
+    generic_indicators = [
+        "i'm not sure", "i don't know", "i'm not certain", "i cannot", "i'm unable",
+        "मुझे नहीं पता", "मुझे यकीन नहीं", "मैं नहीं जानती", "मैं निश्चित नहीं", "मैं असमर्थ हूं"
+    ]
+    is_generic = any(indicator in response.lower() for indicator in generic_indicators)
+    
     # If response is generic and RAG context was empty, ask for clarification
     if (is_generic or rag_context_empty) and detected_investment_type:
         if language == "hi-IN":
@@ -381,7 +400,15 @@ IMPORTANT RULES:
 """
 
     try:
-        extracted_json = await llm.chat([{ "role": "user", "content": extraction_prompt }], use_fast_model=True)
+        extracted_json = await cached_extraction(
+            llm,
+            extraction_prompt,
+            "investment",
+            language,
+            use_fast_model=True,
+            temperature=0,  # Deterministic: same context -> same card, so results are shareable
+            priority=LLMPriority.BACKGROUND,
+        )
         extracted_json = extracted_json.strip()
         if extracted_json.startswith("```json"):
             extracted_json = extracted_json[7:]
@@ -2,10 +2,15 @@
 from __future__ import annotations
 import re
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from langchain_core.messages import AIMessage
 from utils import logger
+from services.llm_service import LLMPriority, answer_priority
+from services.extraction_cache import cached_extraction
+from services.product_card_index import get_product_card_index
+from services.message_features import SUB_LOAN_KEYWORDS, message_features_for
+from utils.keyword_automaton import KeywordMatcher
 
 
 def _clean_english_text(text: str) -> str:
@@ -560,7 +565,7 @@ def _extract_conversation_context(state: Dict[str, Any], max_pairs: int = 3) ->
     return conversation_context
 
 
-def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> List[str]:
+async def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> List[str]:
     """Detect all available sub-loan types for a main loan type from the RAG database.
     
     This queries the vector database intelligently to find all chunks that have sub-loan type loan_type values.
@@ -581,6 +586,12 @@ def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> L
     if main_loan_normalized not in expected_sub_types:
         return []
     
+    # The card index built at ingestion already lists the product's sub-types
+    card_index = get_product_card_index("loan", language)
+    if card_index is not None and card_index.sub_types(main_loan_normalized):
+        logger.info("sub_loan_types_from_card_index", main_type=main_loan_normalized)
+        return expected_sub_types[main_loan_normalized]
+    
     # Query the database with multiple search terms to find all related chunks
     # Use language-specific queries
     if language == "hi-IN":
@@ -601,7 +612,7 @@ def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> L
     # Query with each search term to maximize coverage
     for query_term in queries[:3]:  # Use first 3 queries to avoid too many calls
         try:
-            results = rag_service.retrieve(query_term, k=30)
+            results = await rag_service.aretrieve(query_term, k=30)
             for doc in results:
                 loan_type = doc.metadata.get("loan_type", "")
                 if loan_type:
@@ -634,7 +645,7 @@ def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> L
     if main_type_found or main_loan_normalized in ["business_loan", "home_loan"]:
         # Double-check: query specifically for the main type to confirm it exists
         try:
-            main_type_results = rag_service.retrieve(
+            main_type_results = await rag_service.aretrieve(
                 main_loan_normalized.replace("_", " "), 
                 k=5,
                 filter={"loan_type": main_type_upper}
@@ -687,6 +698,25 @@ def _detect_sub_loan_types(rag_service, main_loan_type: str, language: str) -> L
     return []
 
 
+def _build_sub_loan_index() -> Dict[str, Tuple[str, str]]:
+    """Sub-loan keywords and sub-type names ("business loan mudra") -> (sub_type, parent type)
+
+    Order is the lookup priority: parent types as listed, longest keyword first,
+    each keyword followed by the name of the sub-type it maps to.
+    """
+    index: Dict[str, Tuple[str, str]] = {}
+    for loan_type, keywords in SUB_LOAN_KEYWORDS.items():
+        for keyword in sorted(keywords, key=len, reverse=True):
+            sub_type = keywords[keyword]
+            for alias in (keyword, sub_type.lower().replace("_", " ")):
+                index.setdefault(alias, (sub_type, loan_type))
+    return index
+
+
+_SUB_LOAN_BY_KEYWORD = _build_sub_loan_index()
+_SUB_LOAN_MATCHER = KeywordMatcher({"sub_loan": tuple(_SUB_LOAN_BY_KEYWORD)})
+
+
 async def handle_loan_query(
     state: Dict[str, Any],
     *,
@@ -696,7 +726,7 @@ async def handle_loan_query(
     detected_loan_type: Optional[str],
 ) -> Dict[str, Any]:
     """Answer loan questions using RAG context and structured cards."""
-    from services.rag_service import get_rag_service
+    from services.rag_service import aget_rag_service
 
     # Extract conversation context from previous messages
     conversation_context = _extract_conversation_context(state, max_pairs=3)
@@ -709,7 +739,7 @@ async def handle_loan_query(
             # If previous context mentions loans, include it in the query
             enhanced_query = f"{conversation_context}\n\nCurrent question: {user_query}"
 
-    rag_service = get_rag_service(documents_type="loan", language=language)
+    rag_service = await aget_rag_service(documents_type="loan", language=language)
     
     # Normalize detected_loan_type for checking sub-types
     normalized_loan_type = None
@@ -719,51 +749,20 @@ async def handle_loan_query(
     
     # Check if user query mentions a SPECIFIC sub-loan type
     # If yes, retrieve that specific sub-loan type instead of showing selection
-    user_query_lower = user_query.lower()
     specific_sub_loan_mentioned = None
     
-    # Map sub-loan type keywords to their normalized types
-    sub_loan_keywords = {
-        "business_loan": {
-            "mudra": "BUSINESS_LOAN_MUDRA",
-            "term loan": "BUSINESS_LOAN_TERM",
-            "term": "BUSINESS_LOAN_TERM",  # Check "term" after checking "term loan"
-            "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
-            "working": "BUSINESS_LOAN_WORKING_CAPITAL",  # Check "working" after checking "working capital"
-            "invoice": "BUSINESS_LOAN_INVOICE",
-            "equipment": "BUSINESS_LOAN_EQUIPMENT",
-            "overdraft": "BUSINESS_LOAN_OVERDRAFT",
-            # Hindi keywords
-            "मुद्रा": "BUSINESS_LOAN_MUDRA",
-            "टर्म": "BUSINESS_LOAN_TERM",
-            "कार्यशील": "BUSINESS_LOAN_WORKING_CAPITAL",
-        },
-        "home_loan": {
-            "purchase": "HOME_LOAN_PURCHASE",
-            "construction": "HOME_LOAN_CONSTRUCTION",
-            "plot": "HOME_LOAN_PLOT_CONSTRUCTION",
-            "extension": "HOME_LOAN_EXTENSION",
-            "renovation": "HOME_LOAN_RENOVATION",
-            "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
-        }
-    }
-    
     # Check if user query mentions a specific sub-loan type
-    # First, check if normalized_loan_type is in sub_loan_keywords
-    if normalized_loan_type in sub_loan_keywords:
-        keywords = sub_loan_keywords[normalized_loan_type]
-        # Sort by length (longest first) to match "term loan" before "term"
-        sorted_keywords = sorted(keywords.items(), key=lambda x: len(x[0]), reverse=True)
-        for keyword, sub_type in sorted_keywords:
-            if keyword in user_query_lower:
-                specific_sub_loan_mentioned = sub_type
-                logger.info(
-                    "specific_sub_loan_type_detected_in_query",
-                    keyword=keyword,
-                    sub_type=sub_type,
-                    query=user_query
-                )
-                break
+    # First, check the sub-types of the detected loan type ("term loan" wins over "term")
+    if normalized_loan_type in SUB_LOAN_KEYWORDS:
+        keyword = message_features_for(state, user_query).first(f"sub_loan:{normalized_loan_type}")
+        if keyword:
+            specific_sub_loan_mentioned = SUB_LOAN_KEYWORDS[normalized_loan_type][keyword]
+            logger.info(
+                "specific_sub_loan_type_detected_in_query",
+                keyword=keyword,
+                sub_type=specific_sub_loan_mentioned,
+                query=user_query
+            )
     
     # Also check ALL sub-loan keywords if normalized_loan_type is None or not found
     # This handles cases like "Tell me about mudra loan" where business_loan wasn't detected
@@ -771,37 +770,30 @@ async def handle_loan_query(
     if not specific_sub_loan_mentioned:
         # First, check if the query contains a direct sub-loan type (e.g., "business_loan_mudra")
         # Normalize underscores to spaces for matching
-        query_normalized = user_query_lower.replace("_", " ").replace("-", " ")
+        query_normalized = user_query.lower().replace("_", " ").replace("-", " ")
         
-        # Check all sub-loan keywords across all loan types
-        for loan_type, keywords in sub_loan_keywords.items():
-            sorted_keywords = sorted(keywords.items(), key=lambda x: len(x[0]), reverse=True)
-            for keyword, sub_type in sorted_keywords:
-                # Check both the keyword and the sub_type (normalized) in the query
-                sub_type_normalized = sub_type.lower().replace("_", " ")
-                if keyword in query_normalized or sub_type_normalized in query_normalized:
-                    specific_sub_loan_mentioned = sub_type
-                    # Also set normalized_loan_type to the parent loan type
-                    if not normalized_loan_type:
-                        normalized_loan_type = loan_type
-                        detected_loan_type = loan_type
-                    logger.info(
-                        "specific_sub_loan_type_detected_directly",
-                        keyword=keyword,
-                        sub_type=sub_type,
-                        parent_type=loan_type,
-                        query=user_query,
-                        query_normalized=query_normalized
-                    )
-                    break
-            if specific_sub_loan_mentioned:
-                break
+        # Check all sub-loan keywords and sub-type names across all loan types
+        keyword = _SUB_LOAN_MATCHER.scan(query_normalized).first("sub_loan")
+        if keyword:
+            specific_sub_loan_mentioned, loan_type = _SUB_LOAN_BY_KEYWORD[keyword]
+            # Also set normalized_loan_type to the parent loan type
+            if not normalized_loan_type:
+                normalized_loan_type = loan_type
+                detected_loan_type = loan_type
+            logger.info(
+                "specific_sub_loan_type_detected_directly",
+                keyword=keyword,
+                sub_type=specific_sub_loan_mentioned,
+                parent_type=loan_type,
+                query=user_query,
+                query_normalized=query_normalized
+            )
     
     # Check if this loan type has multiple sub-types
     # For business_loan and home_loan, show sub-type selection ONLY if no specific sub-type mentioned
     sub_loan_types = []
     if normalized_loan_type in ["business_loan", "home_loan"]:
-        sub_loan_types = _detect_sub_loan_types(rag_service, normalized_loan_type, language)
+        sub_loan_types = await _detect_sub_loan_types(rag_service, normalized_loan_type, language)
         
         # If user mentioned a specific sub-loan type, use that instead of showing selection
         if specific_sub_loan_mentioned:
@@ -825,6 +817,17 @@ async def handle_loan_query(
             )
             return _create_sub_loan_selection(state, normalized_loan_type, sub_loan_types, language)
     
+    # Product cards precomputed at ingestion answer without retrieval or an LLM call
+    # (sub-loan types are not indexed and go through extraction below)
+    card_index = get_product_card_index("loan", language)
+    indexed_card = card_index.get(detected_loan_type) if card_index is not None and detected_loan_type else None
+    if indexed_card:
+        state["structured_data"] = {"type": "loan", "loanInfo": indexed_card}
+        state["messages"].append(AIMessage(content=_build_loan_response_text(indexed_card, language)))
+        state["next_action"] = "end"
+        logger.info("rag_loan_agent_response", has_structured=True, from_card_index=True, loan_type=detected_loan_type)
+        return state
+    
     rag_context = ""
     try:
         rag_filter = None
@@ -872,7 +875,7 @@ async def handle_loan_query(
                 filter_value=rag_filter["loan_type"]
             )
         
-        rag_context = rag_service.get_context_for_query(
+        rag_context = await rag_service.aget_context_for_query(
             enhanced_query,
             k=5 if rag_filter else 3,  # Increase k to get more relevant chunks when filtering
             filter=rag_filter,
@@ -886,7 +889,7 @@ async def handle_loan_query(
                            original_filter=rag_filter["loan_type"],
                            new_filter=parent_lower)
                 rag_filter_lower = {"loan_type": parent_lower}
-                rag_context = rag_service.get_context_for_query(
+                rag_context = await rag_service.aget_context_for_query(
                     enhanced_query,
                     k=5,
                     filter=rag_filter_lower,
@@ -955,6 +958,24 @@ async def handle_loan_query(
                 language=language
             )
 
+    # Check if RAG context was empty or very short (indicating no relevant document retrieval)
+    rag_context_empty = not rag_context or len(rag_context.strip()) < 100
+    
+    # HALLUCINATION CHECK: If RAG retrieval returns 0 documents, force refusal instead of making up answer
+    # (checked before calling the LLM, whose answer would be discarded anyway)
+    if rag_context_empty:
+        logger.warning("rag_context_empty_forced_refusal",
+                     detected_loan_type=detected_loan_type,
+                     query=user_query)
+        if language == "hi-IN":
+            refusal_response = "मुझे खेद है, मुझे उस विशिष्ट उत्पाद के बारे में जानकारी नहीं है। कृपया किसी अन्य बैंकिंग उत्पाद के बारे में पूछें।"
+        else:
+            refusal_response = "I'm sorry, I don't have information on that specific product. Please ask about other banking products."
+        
+        state["messages"].append(AIMessage(content=refusal_response))
+        state["next_action"] = "end"
+        return state
+    
     # Build user query with conversation context for LLM
     user_query_with_context = user_query
     if conversation_context:
@@ -964,7 +985,12 @@ async def handle_loan_query(
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_query_with_context},
     ]
-    response = await llm.chat(llm_messages, use_fast_model=False)
+    response = await llm.chat(
+        llm_messages,
+        use_fast_model=False,
+        on_token=state.get("token_sink"),
+        priority=answer_priority(state.get("voice_mode")),
+    )
     
     # Clean response text if language is English to remove any Hindi characters
     if language == "en-IN":
@@ -977,23 +1003,6 @@ async def handle_loan_query(
     ]
     is_generic = any(indicator in response.lower() for indicator in generic_indicators)
     
-    # Check if RAG context was empty or very short (indicating no relevant document retrieval)
-    rag_context_empty = not rag_context or len(rag_context.strip()) < 100
-    
-    # HALLUCINATION CHECK: If RAG retrieval returns 0 documents, force refusal instead of making up answer
-    if rag_context_empty:
-        logger.warning("rag_context_empty_forced_refusal",
-                     detected_loan_type=detected_loan_type,
-                     query=user_query)
-        if language == "hi-IN":
-            refusal_response = "मुझे खेद है, मुझे उस विशिष्ट उत्पाद के बारे में जानकारी नहीं है। कृपया किसी अन्य बैंकिंग उत्पाद के बारे में पूछें।"
-        else:
-            refusal_response = "I'm sorry, I don't have information on that specific product. Please ask about other banking products."
-        
-        state["messages"].append(AIMessage(content=refusal_response))
-        state["next_action"] = "end"
-        return state
-    
     # If response is generic and RAG context was empty, ask for clarification
     if (is_generic or rag_context_empty) and detected_loan_type:
         if language == "hi-IN":
@@ -1021,16 +1030,16 @@ async def _handle_multiple_sub_loan_types(
     llm,
 ) -> Dict[str, Any]:
     """Handle queries for loan types with multiple sub-types - return multiple cards or selection."""
-    from services.rag_service import get_rag_service
+    from services.rag_service import aget_rag_service
     
-    rag_service = get_rag_service(documents_type="loan", language=language)
+    rag_service = await aget_rag_service(documents_type="loan", language=language)
     
     # Try to extract cards for all sub-types
     all_loan_cards = []
     
     for sub_type in sub_loan_types:
         # Retrieve context for this sub-type
-        rag_context = rag_service.get_context_for_query(
+        rag_context = await rag_service.aget_context_for_query(
             user_query,
             k=2,
             filter={"loan_type": sub_type}
@@ -1270,7 +1279,15 @@ IMPORTANT RULES:
 """
 
     try:
-        extracted_json = await llm.chat([{ "role": "user", "content": extraction_prompt }], use_fast_model=True)
+        extracted_json = await cached_extraction(
+            llm,
+            extraction_prompt,
+            "loan",
+            language,
+            use_fast_model=True,
+            temperature=0,  # Deterministic: same context -> same card, so results are shareable
+            priority=LLMPriority.BACKGROUND,
+        )
         extracted_json = extracted_json.strip()
         if extracted_json.startswith("```json"):
             extracted_json = extracted_json[7:]
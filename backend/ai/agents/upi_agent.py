@@ -265,7 +265,7 @@ async def handle_upi_balance_check(state, user_context, language, last_user_mess
     from tools import get_user_accounts
     
     # Get user's accounts
-    accounts_result = get_user_accounts.invoke({"user_id": state.get("user_id")})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": state.get("user_id")})
     accounts = accounts_result["accounts"] if accounts_result.get("success") else []
     
     if not accounts:
@@ -435,7 +435,7 @@ async def handle_upi_payment(state, user_context, language, last_user_message):
     import re
     
     # Get user's accounts
-    accounts_result = get_user_accounts.invoke({"user_id": state.get("user_id")})
+    accounts_result = await get_user_accounts.ainvoke({"user_id": state.get("user_id")})
     accounts = accounts_result["accounts"] if accounts_result.get("success") else []
     
     if not accounts:
@@ -692,10 +692,10 @@ Return ONLY valid JSON, nothing else."""
     if recipient_identifier in ["first", "last"]:
         try:
             from db.repositories import beneficiaries as beneficiary_repo
-            from utils.db_helper import get_db
+            from utils.db_helper import get_async_db
             
-            with get_db() as db:
-                beneficiaries = beneficiary_repo.list_beneficiaries(db, user_id=state.get("user_id"), include_blocked=False)
+            async with get_async_db() as db:
+                beneficiaries = await beneficiary_repo.list_beneficiaries_async(db, user_id=state.get("user_id"), include_blocked=False)
                 beneficiaries_list = list(beneficiaries)
                 
                 if beneficiaries_list:
@@ -710,10 +710,10 @@ Return ONLY valid JSON, nothing else."""
                     from sqlalchemy import select
                     
                     stmt = select(Account).where(Account.account_number == beneficiary.account_number)
-                    account = db.execute(stmt).scalars().first()
+                    account = (await db.execute(stmt)).scalars().first()
                     if account:
                         stmt = select(User).where(User.id == account.user_id)
-                        user = db.execute(stmt).scalars().first()
+                        user = (await db.execute(stmt)).scalars().first()
                         if user and user.upi_id:
                             recipient_identifier = user.upi_id
                         elif user and user.phone_number:
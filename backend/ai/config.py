@@ -36,6 +36,13 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-3.5-turbo"
     openai_enabled: bool = False
     
+    # HTTP Connection Pooling (one shared pool per upstream: ollama, openai)
+    http_max_connections: int = 20  # Per upstream; calls beyond this wait for a free connection
+    http_host_max_connections: dict = {}  # Per-upstream overrides, e.g. {"ollama": 4}
+    http_max_keepalive_connections: int = 10  # Idle connections kept open for reuse
+    http_keepalive_expiry_seconds: float = 30.0  # Close idle connections after this long
+    http2_enabled: bool = False  # Negotiate HTTP/2 over TLS (OpenAI); needs the h2 package
+    
     # LLM Provider Selection
     # Options: "ollama" (local) or "openai" (cloud)
     llm_provider: str = "ollama"
@@ -45,6 +52,11 @@ class Settings(BaseSettings):
     azure_tts_region: str = "centralindia"
     azure_tts_enabled: bool = False
     
+    # Streaming TTS (/api/tts/stream): sentences are synthesized while text is still arriving
+    tts_stream_synthesizer: str = "azure"  # azure | local (silent WAV stand-in for tests/dev)
+    tts_stream_max_concurrency: int = 2  # Sentences synthesized ahead of playback
+    tts_sentence_max_chars: int = 300  # Force a break in run-on text without punctuation
+    
     # Database Configuration
     database_url: str = "sqlite:///./vaani_banking.db"
     
@@ -52,6 +64,39 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     redis_enabled: bool = False
     
+    # Embedding Pipeline (RAG retrieval and ingestion)
+    embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # torch | int8 (dynamic quantization) | onnx
+    embedding_onnx_file: Optional[str] = None  # e.g. "onnx/model_qint8_avx512_vnni.onnx"
+    embedding_batch_size: int = 32
+    embedding_batch_wait_ms: float = 5.0  # Window for coalescing concurrent queries
+    embedding_cache_size: int = 4096  # Query + chunk vectors kept in the LRU
+    
+    # Async RAG retrieval
+    rag_executor_workers: int = 4  # Threads running encoder + Chroma queries off the event loop
+    rag_collection_max_concurrency: int = 2  # Concurrent searches allowed per collection
+    rag_preload_on_startup: bool = True  # Warm all four collections before reporting ready
+    ingest_workers: int = 0  # Processes parsing/chunking PDFs during ingestion (0 = one per core)
+    ingest_write_batch_size: int = 256  # Chunks per embed + Chroma upsert during ingestion
+
+    # Semantic answer cache (non-personalized FAQ answers from the RAG agents)
+    answer_cache_enabled: bool = True
+    answer_cache_similarity_threshold: float = 0.92  # Cosine similarity needed for a hit
+    answer_cache_ttl_seconds: int = 3600
+    answer_cache_max_entries: int = 256  # Per (language, domain, product type) scope
+    
+    # Extraction cache: persisted outputs of deterministic card-extraction prompts
+    extraction_cache_enabled: bool = True
+    extraction_cache_path: str = "./chroma_db/extraction_cache.sqlite3"
+    extraction_cache_max_entries: int = 2000
+    
+    # Product card index: cards parsed from the PDFs at ingestion, served without retrieval or LLM
+    product_card_index_enabled: bool = True
+    
+    # Local intent model: embedding nearest-centroid classifier tried before the LLM fallback
+    intent_model_enabled: bool = True
+    intent_model_confidence_threshold: float = 0.7  # Calibrated probability needed to skip the LLM
+    
     # Vector Database (Qdrant)
     qdrant_url: str = "http://localhost:6333"
     qdrant_collection_name: str = "banking_documents"
@@ -71,6 +116,8 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 20
     rate_limit_per_hour: int = 100
+    rate_limiter_backend: str = "memory"  # memory (per process) | redis (shared by all workers, needs REDIS_ENABLED)
+    rate_limiter_max_keys: int = 100000  # Users tracked per process before the least recent are dropped
     
     # Guardrail Settings
     enable_input_guardrails: bool = True
@@ -97,6 +144,17 @@ class Settings(BaseSettings):
     llm_top_p: float = 0.9
     llm_max_tokens: int = 512
     
+    # LLM Scheduler: per-model concurrency slots and bounded priority queues
+    llm_max_concurrent_requests: int = 2  # Default slots per model (match OLLAMA_NUM_PARALLEL)
+    llm_model_slots: dict = {}  # Per-model overrides, e.g. {"llama3.2:3b": 4}
+    llm_max_queue_depth: int = 16  # Interactive calls shed once this many are queued ahead
+    llm_background_max_queue_depth: int = 4  # Card extraction is shed much earlier
+    
+    # Request coalescing: identical in-flight prompts share one upstream call
+    llm_coalesce_requests: bool = True
+    llm_result_cache_ttl_seconds: int = 60  # Reuse temperature-0 results for this long (0 disables)
+    llm_result_cache_max_entries: int = 512
+    
     # Voice Settings
     voice_config: dict = {
         "en-IN": "en-IN-NeerjaNeural",
@@ -9,7 +9,7 @@ This script processes:
 - English Investment Schemes (PPF, NPS, SSY)
 
 Usage:
-    python ingest_documents_english.py
+    python ingest_documents_english.py [--full-rebuild]
 """
 import sys
 from pathlib import Path
@@ -17,10 +17,41 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from services.rag_service import RAGService
+from config import settings
+from services.product_card_index import build_product_card_index
+from services.rag_service import IngestionReport, RAGService
 from utils import logger
 
 
+def _print_sync_report(report: IngestionReport) -> None:
+    """Print what an incremental sync changed"""
+    if report.full_rebuild:
+        print(f"   Rebuilt collection '{report.collection}' from scratch")
+    for label, names in (
+        ("Added", report.added),
+        ("Changed", report.changed),
+        ("Removed", report.removed),
+        ("Failed", report.failed),
+    ):
+        for name in names:
+            print(f"   • {label}: {name}")
+    print(f"✅ {len(report.unchanged)} unchanged PDFs skipped, "
+          f"{report.chunks_written} chunks written, {report.chunks_deleted} deleted "
+          f"in {report.duration_seconds}s")
+
+
+def _build_card_index(documents_path: Path, persist_dir: str, language: str, documents_type: str) -> None:
+    """Rebuild the precomputed product cards served by the loan/investment agents"""
+    try:
+        index = build_product_card_index(str(documents_path), persist_dir, language, documents_type)
+        print(f"🗂️  Product card index: {len(index['products'])} cards "
+              f"({', '.join(sorted(index['products']))})")
+    except Exception as e:
+        # Agents fall back to retrieval + LLM extraction without an index
+        print(f"⚠️  Product card index not built: {e}")
+        logger.warning("english_product_card_index_failed", documents_type=documents_type, error=str(e))
+
+
 def main():
     """Main ingestion function for English documents (loans + investments)"""
     print("=" * 60)
@@ -28,6 +59,9 @@ def main():
     print("Processing both Loan Products and Investment Schemes")
     print("=" * 60)
     
+    # Pass --full-rebuild to drop the collections and re-embed every PDF
+    full_rebuild = "--full-rebuild" in sys.argv
+    
     ai_dir = Path(__file__).parent
     base_docs_dir = ai_dir.parent / "backend" / "documents"
     
@@ -58,26 +92,18 @@ def main():
         collection_name=loan_collection
     )
     
-    print(f"\n🔄 Loading PDF documents for loans...")
-    loan_documents = loan_rag_service.load_pdf_documents()
-    print(f"✅ Loaded {len(loan_documents)} pages from loan PDFs")
+    print(f"\n🔄 Syncing loan vector database with PDFs...")
+    print(f"   Using embedding model: {settings.embedding_model_name}")
+    print(f"   Only added, changed or removed PDFs are re-embedded")
     
-    if loan_documents:
-        print(f"\n🔄 Splitting loan documents into chunks...")
-        loan_chunks = loan_rag_service.chunk_documents(loan_documents)
-        print(f"✅ Created {len(loan_chunks)} chunks")
-        
-        print(f"\n🔄 Creating vector database for loans...")
-        print(f"   Using embedding model: sentence-transformers/all-MiniLM-L6-v2")
-        print(f"   This may take a few minutes...")
-        
-        try:
-            loan_rag_service.vectorstore = loan_rag_service.create_vector_store(loan_chunks)
-            print(f"✅ Loan vector database created successfully!")
-        except Exception as e:
-            print(f"\n❌ ERROR during loan vector store creation: {e}")
-            logger.error("english_loan_ingestion_failed", error=str(e))
-            return 1
+    try:
+        loan_report = loan_rag_service.sync_documents(full_rebuild=full_rebuild)
+        _print_sync_report(loan_report)
+    except Exception as e:
+        print(f"\n❌ ERROR during loan vector store sync: {e}")
+        logger.error("english_loan_ingestion_failed", error=str(e))
+        return 1
+    _build_card_index(loan_docs_path, loan_persist_dir, "en-IN", "loan")
     
     # Process investment schemes
     print("\n📚 Processing English Investment Schemes...")
@@ -106,26 +132,18 @@ def main():
         collection_name=investment_collection
     )
     
-    print(f"\n🔄 Loading PDF documents for investments...")
-    investment_documents = investment_rag_service.load_pdf_documents()
-    print(f"✅ Loaded {len(investment_documents)} pages from investment PDFs")
+    print(f"\n🔄 Syncing investment vector database with PDFs...")
+    print(f"   Using embedding model: {settings.embedding_model_name}")
+    print(f"   Only added, changed or removed PDFs are re-embedded")
     
-    if investment_documents:
-        print(f"\n🔄 Splitting investment documents into chunks...")
-        investment_chunks = investment_rag_service.chunk_documents(investment_documents)
-        print(f"✅ Created {len(investment_chunks)} chunks")
-        
-        print(f"\n🔄 Creating vector database for investments...")
-        print(f"   Using embedding model: sentence-transformers/all-MiniLM-L6-v2")
-        print(f"   This may take a few minutes...")
-        
-        try:
-            investment_rag_service.vectorstore = investment_rag_service.create_vector_store(investment_chunks)
-            print(f"✅ Investment vector database created successfully!")
-        except Exception as e:
-            print(f"\n❌ ERROR during investment vector store creation: {e}")
-            logger.error("english_investment_ingestion_failed", error=str(e))
-            return 1
+    try:
+        investment_report = investment_rag_service.sync_documents(full_rebuild=full_rebuild)
+        _print_sync_report(investment_report)
+    except Exception as e:
+        print(f"\n❌ ERROR during investment vector store sync: {e}")
+        logger.error("english_investment_ingestion_failed", error=str(e))
+        return 1
+    _build_card_index(investment_docs_path, investment_persist_dir, "en-IN", "investment")
     
     # Comprehensive retrieval tests
     print(f"\n🔄 Running comprehensive retrieval tests...")
@@ -2,9 +2,13 @@
 FastAPI application for AI backend
 Handles chat requests and TTS generation
 """
+import asyncio
+import codecs
+import json
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable
 from datetime import datetime
 import base64
 
@@ -21,8 +25,13 @@ from pydantic import BaseModel, Field, ConfigDict
 import uvicorn
 
 from config import settings
-from services import get_llm_service, get_azure_tts_service, get_guardrail_service, GuardrailViolationType
-from agents.agent_graph import process_message
+from services import get_llm_service, get_azure_tts_service, get_guardrail_service, GuardrailVerdict, GuardrailViolationType
+from services.http_transport import get_http_clients
+from services.rag_warmup import get_rag_warmup
+from services.rag_service import close_rag_services
+from services.intent_model import get_intent_metrics
+from services.tts_streaming import get_stream_synthesizer, stream_speech
+from agents.agent_graph import process_message, process_message_stream
 from utils import logger
 from utils.demo_logging import demo_logger
 
@@ -96,6 +105,34 @@ class HealthResponse(BaseModel):
     version: str
     ollama_status: bool
     azure_tts_available: bool
+    rag_ready: bool = True
+    rag_warmup: Optional[Dict[str, Any]] = None
+    llm_scheduler: Optional[Dict[str, Any]] = None
+    intent_routing: Optional[Dict[str, Any]] = None
+    http_pools: Optional[Dict[str, Any]] = None
+
+
+# Background warm-up task (kept referenced so it isn't garbage collected)
+_rag_warmup_task: Optional[asyncio.Task] = None
+
+
+async def preload_rag_collections():
+    """Start warming the RAG collections; /health reports 503 until it finishes"""
+    global _rag_warmup_task
+    warmup = get_rag_warmup()
+    if warmup.ready:
+        logger.info("rag_warmup_skipped", state=warmup.state)
+        return
+    _rag_warmup_task = asyncio.create_task(warmup.run())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the RAG collections on startup; close the pooled upstream HTTP clients and release the RAG models on shutdown"""
+    await preload_rag_collections()
+    yield
+    await get_http_clients().close()
+    close_rag_services()
 
 
 # Create FastAPI app
@@ -103,6 +140,7 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI-powered banking assistant backend",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -161,25 +199,75 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# How often a long-running turn checks whether the client is still connected
+DISCONNECT_POLL_INTERVAL_SECONDS = 0.5
+
+
+async def run_until_disconnect(http_request: Request, work: Awaitable[Any]) -> Optional[Any]:
+    """
+    Await ``work`` but cancel it if the client disconnects first.
+    
+    Cancellation propagates into pending RAG retrievals and LLM calls so an
+    abandoned turn stops holding executor slots and collection semaphores.
+    
+    Returns:
+        The result of ``work``, or None if the client went away
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                logger.info("client_disconnected_cancelling_turn", path=http_request.url.path)
+                return None
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 # Endpoints
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+    
+    Returns 503 while the RAG collections are still warming up so the load
+    balancer only routes traffic to workers that can answer product questions.
+    """
     llm = get_llm_service()
     azure_tts = get_azure_tts_service()
+    warmup = get_rag_warmup()
     
     llm_healthy = await llm.health_check()
     
-    return HealthResponse(
-        status="healthy" if llm_healthy else "degraded",
+    if not warmup.ready:
+        status = "warming_up"
+    elif llm_healthy and warmup.state != "degraded":
+        status = "healthy"
+    else:
+        status = "degraded"
+    
+    health = HealthResponse(
+        status=status,
         version=settings.app_version,
         ollama_status=llm_healthy,  # Keep field name for backward compatibility
-        azure_tts_available=azure_tts.is_available()
+        azure_tts_available=azure_tts.is_available(),
+        rag_ready=warmup.ready,
+        rag_warmup=warmup.snapshot(),
+        llm_scheduler=llm.stats(),
+        intent_routing=get_intent_metrics().stats(),
+        http_pools=get_http_clients().stats(),
     )
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=health.model_dump())
+    return health
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Process a chat message through the agent system
     
@@ -217,11 +305,14 @@ async def chat(request: ChatRequest):
         )
         
         # Input Guardrails: Check user input before processing
+        # (the verdict is shared with the supervisor so each check runs once per text)
         guardrail_service = get_guardrail_service()
+        guardrail_verdict = GuardrailVerdict()
         input_check = await guardrail_service.check_input(
             message=request.message,
             language=request.language,
-            user_id=request.user_id
+            user_id=request.user_id,
+            verdict=guardrail_verdict,
         )
         
         if not input_check.passed:
@@ -233,6 +324,7 @@ async def chat(request: ChatRequest):
                 language=request.language,
                 message_preview=request.message[:100]
             )
+            logger.info("guardrail_verdict", user_id=request.user_id, **guardrail_verdict.summary())
             
             # Return appropriate error message based on language
             error_message = input_check.message
@@ -258,16 +350,24 @@ async def chat(request: ChatRequest):
                 for msg in request.message_history
             ]
         
-        # Process through agent graph
-        result = await process_message(
-            message=request.message,
-            user_id=request.user_id,
-            session_id=request.session_id,
-            language=request.language,
-            user_context=request.user_context,
-            message_history=history,
-            upi_mode=request.upi_mode  # Pass UPI mode from frontend
+        # Process through agent graph (cancelled if the client disconnects mid-turn)
+        result = await run_until_disconnect(
+            http_request,
+            process_message(
+                message=request.message,
+                user_id=request.user_id,
+                session_id=request.session_id,
+                language=request.language,
+                user_context=request.user_context,
+                message_history=history,
+                upi_mode=request.upi_mode,  # Pass UPI mode from frontend
+                voice_mode=request.voice_mode,
+                guardrail_verdict=guardrail_verdict,
+            ),
         )
+        if result is None:
+            # 499: client closed request (nobody is listening for the body)
+            return Response(status_code=499)
         
         # Output Guardrails: Check AI response before sending
         # Pass intent to allow guardrail to skip language check for language_change
@@ -275,8 +375,10 @@ async def chat(request: ChatRequest):
             response=result.get("response", ""),
             language=result.get("language", request.language),  # Use updated language from result
             original_query=request.message,
-            intent=result.get("intent")  # Pass intent to skip language check for language_change
+            intent=result.get("intent"),  # Pass intent to skip language check for language_change
+            verdict=guardrail_verdict,
         )
+        logger.info("guardrail_verdict", user_id=request.user_id, **guardrail_verdict.summary())
         
         if not output_check.passed:
             # Log guardrail violation
@@ -464,59 +566,147 @@ Return ONLY valid JSON, nothing else."""
         )
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     """
-    Stream chat response for real-time updates
+    Stream a chat turn through the agent system as Server-Sent Events
+    
+    Runs the same pipeline as /api/chat (input guardrails, intent routing,
+    RAG context, banking tools, output guardrails) but sends the answer as it
+    is generated:
     
-    Returns Server-Sent Events (SSE) stream
+    - ``event: token``: ``{"text": ...}``, PII-redacted response text in order
+    - ``event: final``: the /api/chat payload (including structured_data) plus
+      ``replace``; when true, clients discard the streamed text and show
+      ``response`` instead
+    - ``data: [DONE]``
     """
-    try:
-        logger.info(
-            "chat_stream_request",
-            user_id=request.user_id,
-            session_id=request.session_id
-        )
+    logger.info(
+        "chat_stream_request",
+        user_id=request.user_id,
+        session_id=request.session_id,
+        language=request.language,
+        voice_mode=request.voice_mode,
+        upi_mode=request.upi_mode,
+    )
+    demo_logger.chat_request(
+        user_id=request.user_id,
+        session_id=request.session_id,
+        message=request.message,
+        language=request.language,
+        voice_mode=request.voice_mode,
+        upi_mode=request.upi_mode,
+    )
+    
+    # Input Guardrails run before the stream opens, exactly as in /api/chat
+    guardrail_service = get_guardrail_service()
+    guardrail_verdict = GuardrailVerdict()
+    input_check = await guardrail_service.check_input(
+        message=request.message,
+        language=request.language,
+        user_id=request.user_id,
+        verdict=guardrail_verdict,
+    )
+    
+    history = []
+    if request.message_history:
+        history = [
+            {"role": msg.role, "content": msg.content}
+            for msg in request.message_history
+        ]
+    
+    async def generate():
+        """Relay supervisor events; closing the stream cancels the running turn"""
+        if not input_check.passed:
+            logger.warning(
+                "guardrail_violation_input",
+                user_id=request.user_id,
+                violation_type=input_check.violation_type,
+                language=request.language,
+                message_preview=request.message[:100]
+            )
+            logger.info("guardrail_verdict", user_id=request.user_id, **guardrail_verdict.summary())
+            if request.language == "hi-IN":
+                error_message = input_check.message or "मुझे खेद है, आपका संदेश संसाधित नहीं किया जा सका। कृपया अपना प्रश्न दोबारा बताएं।"
+            else:
+                error_message = input_check.message or "I'm sorry, your message could not be processed. Please rephrase your question."
+            blocked = ChatResponse(
+                success=False,
+                response=error_message,
+                language=request.language,
+                timestamp=datetime.now().isoformat()
+            )
+            yield _sse_event("final", {**blocked.model_dump(), "replace": False})
+            yield "data: [DONE]\n\n"
+            return
         
-        async def generate():
-            """Generate streaming response"""
-            llm = get_llm_service()
-            
-            # Build messages
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"You are Vaani, a banking assistant. Respond in {request.language}."
-                }
-            ]
-            
-            if request.message_history:
-                for msg in request.message_history:
-                    messages.append({"role": msg.role, "content": msg.content})
-            
-            messages.append({"role": "user", "content": request.message})
-            
-            # Stream response
-            async for chunk in llm.chat_stream(
-                messages,
-                use_fast_model=request.voice_mode
+        final: Dict[str, Any] = {}
+        try:
+            async for event in process_message_stream(
+                message=request.message,
+                user_id=request.user_id,
+                session_id=request.session_id,
+                language=request.language,
+                user_context=request.user_context,
+                message_history=history,
+                upi_mode=request.upi_mode,
+                voice_mode=request.voice_mode,
+                guardrail_verdict=guardrail_verdict,
             ):
-                yield f"data: {chunk}\n\n"
-            
-            yield "data: [DONE]\n\n"
+                if event["type"] == "token":
+                    yield _sse_event("token", {"text": event["text"]})
+                else:
+                    final = event
+        except asyncio.CancelledError:
+            logger.info("client_disconnected_cancelling_turn", path="/api/chat/stream")
+            raise
         
-        return StreamingResponse(
-            generate(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            }
+        # Output Guardrails on the complete answer; a failure replaces what was streamed
+        output_check = await guardrail_service.check_output(
+            response=final.get("response", ""),
+            language=final.get("language", request.language),
+            original_query=request.message,
+            intent=final.get("intent"),
+            verdict=guardrail_verdict,
         )
+        logger.info("guardrail_verdict", user_id=request.user_id, **guardrail_verdict.summary())
+        if not output_check.passed:
+            logger.warning(
+                "guardrail_violation_output",
+                user_id=request.user_id,
+                violation_type=output_check.violation_type,
+                language=request.language,
+                response_preview=final.get("response", "")[:100]
+            )
+            if request.language == "hi-IN":
+                final["response"] = "मुझे खेद है, मुझे आपकी मदद करने में समस्या हो रही है। कृपया पुनः प्रयास करें।"
+            else:
+                final["response"] = "I'm sorry, I'm having trouble helping you right now. Please try again."
+            final["replace"] = True
         
-    except Exception as e:
-        logger.error("chat_stream_error", error=str(e))
-        raise HTTPException(status_code=500, detail=str(e))
+        demo_logger.ai_response(
+            response=final.get("response", ""),
+            agent=final.get("intent", "unknown"),
+            language=request.language,
+        )
+        payload = ChatResponse(**final).model_dump()
+        yield _sse_event("final", {**payload, "replace": bool(final.get("replace"))})
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer tokens
+        }
+    )
 
 
 @app.post("/api/tts")
@@ -563,6 +753,80 @@ async def text_to_speech(request: TTSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while
+    the response streams: Starlette's disconnect listener would otherwise
+    swallow the body chunks, so it only starts once the body is consumed.
+    """
+    
+    def __init__(self, content: Any, body_consumed: asyncio.Event, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.body_consumed = body_consumed
+    
+    async def listen_for_disconnect(self, receive) -> None:
+        await self.body_consumed.wait()
+        await super().listen_for_disconnect(receive)
+
+
+@app.post("/api/tts/stream")
+async def text_to_speech_stream(http_request: Request, language: str = "en-IN"):
+    """
+    Sentence-level streaming TTS
+    
+    The request body is response text sent with chunked transfer encoding as
+    the LLM produces it (e.g. piped from /api/chat/stream tokens). Each
+    sentence is synthesized as soon as it is complete, while later text is
+    still arriving, and returned as one NDJSON line per sentence in order:
+    {"index", "text", "audio": base64 WAV} or {"index", "text", "error"},
+    followed by {"done": true, "sentences": n}.
+    """
+    synthesizer = get_stream_synthesizer()
+    if synthesizer is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Azure TTS not available. Use Web Speech API on frontend."
+        )
+    
+    body_consumed = asyncio.Event()
+    
+    async def text_chunks():
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            async for chunk in http_request.stream():
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+        finally:
+            body_consumed.set()
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+    
+    async def generate():
+        sentences = 0
+        async for segment in stream_speech(text_chunks(), synthesizer, language=language):
+            line = {"index": segment.index, "text": segment.text}
+            if segment.audio is not None:
+                line["audio"] = base64.b64encode(segment.audio).decode("ascii")
+            else:
+                line["error"] = segment.error
+            sentences += 1
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+        logger.info("tts_stream_complete", language=language, sentences=sentences)
+        yield json.dumps({"done": True, "sentences": sentences}) + "\n"
+    
+    return BodyStreamingResponse(
+        generate(),
+        body_consumed,
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx hold back audio
+        }
+    )
+
+
 @app.post("/api/voice-verification")
 async def voice_verification(request: VoiceVerificationRequest):
     """
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from langchain_core.messages import BaseMessage
 
+from services.guardrail_service import GuardrailVerdict
+from services.message_features import MessageFeatures
+
 
 @dataclass
 class ConversationState:
@@ -18,10 +21,18 @@ class ConversationState:
     user_context: Dict[str, Any]
     upi_mode: bool
     authenticated: bool
+    # Voice turns get the highest LLM scheduling priority for their answer
+    voice_mode: bool = False
     statement_data: Dict[str, Any] = field(default_factory=dict)
     structured_data: Dict[str, Any] = field(default_factory=dict)
     current_intent: str = "unknown"
     next_action: str = ""
+    # Set for streamed turns: agents pass it as on_token to their final LLM call
+    token_sink: Optional[Callable[[str], Awaitable[None]]] = None
+    # Keyword categories, amounts and account digits of the current message (one scan per turn)
+    message_features: Optional[MessageFeatures] = None
+    # Guardrail results for this turn, shared with main.py so each check runs once per text
+    guardrail_verdict: GuardrailVerdict = field(default_factory=GuardrailVerdict)
 
     def to_agent_payload(self) -> Dict[str, Any]:
         """Return a mutable dict the specialist agents already understand."""
@@ -33,10 +44,13 @@ class ConversationState:
             "user_context": self.user_context,
             "upi_mode": self.upi_mode,
             "authenticated": self.authenticated,
+            "voice_mode": self.voice_mode,
             "statement_data": self.statement_data,
             "structured_data": self.structured_data,
             "current_intent": self.current_intent,
             "next_action": self.next_action,
+            "token_sink": self.token_sink,
+            "message_features": self.message_features,
         }
 
     def apply_agent_state(self, agent_state: Dict[str, Any]) -> None:
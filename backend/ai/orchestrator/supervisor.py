@@ -1,8 +1,9 @@
 """Hybrid supervisor orchestrator for the banking assistant."""
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
@@ -13,7 +14,8 @@ from agents.greeting_agent import greeting_agent
 from agents.upi_agent import upi_agent
 from utils import logger
 from utils.demo_logging import demo_logger
-from services import get_guardrail_service
+from services import get_guardrail_service, GuardrailVerdict
+from services.message_features import extract_message_features
 
 from .router import IntentRouter
 from .state import ConversationState
@@ -45,6 +47,8 @@ class HybridSupervisor:
         user_context: Optional[Dict[str, Any]] = None,
         message_history: Optional[List[Dict[str, Any]]] = None,
         upi_mode: Optional[bool] = None,
+        voice_mode: bool = False,
+        guardrail_verdict: Optional[GuardrailVerdict] = None,
     ) -> Dict[str, Any]:
         context = self._build_context(
             message=message,
@@ -54,35 +58,128 @@ class HybridSupervisor:
             user_context=user_context or {},
             message_history=message_history or [],
             upi_mode=upi_mode,
+            voice_mode=voice_mode,
+            guardrail_verdict=guardrail_verdict,
         )
 
-        # Guardrail: Validate input before routing (intercept malicious queries early)
-        is_valid, guardrail_message = self.guardrail.validate_input(message, language)
-        if not is_valid:
-            logger.warning("security_event",
-                         event_type="input_blocked_by_guardrail",
-                         user_id=user_id,
-                         language=language,
-                         message_preview=message[:100])
-            
-            # Use guardrail's specific message, or fallback to default
-            if guardrail_message:
-                refusal_message = guardrail_message
+        refusal = self._check_input(message, user_id, language, context.guardrail_verdict)
+        if refusal is not None:
+            return refusal
+
+        agent_key = await self._route(context)
+        await self._invoke_specialist(agent_key, context)
+
+        return self._build_response(context)
+
+    async def process_stream(
+        self,
+        *,
+        message: str,
+        user_id: str,
+        session_id: str,
+        language: str = "en-IN",
+        user_context: Optional[Dict[str, Any]] = None,
+        message_history: Optional[List[Dict[str, Any]]] = None,
+        upi_mode: Optional[bool] = None,
+        voice_mode: bool = False,
+        guardrail_verdict: Optional[GuardrailVerdict] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process(): same routing, agents and guardrails.
+
+        Yields ``{"type": "token", "text": ...}`` events while the specialist's
+        LLM call streams (PII-redacted incrementally), then one
+        ``{"type": "final", ...}`` event carrying the process() payload. If the
+        agent rewrote its answer after streaming it (refusal normalization,
+        appended clarifications that do not extend the streamed text), the final
+        event has ``replace=True`` and clients must show its ``response`` instead.
+        """
+        context = self._build_context(
+            message=message,
+            user_id=user_id,
+            session_id=session_id,
+            language=language,
+            user_context=user_context or {},
+            message_history=message_history or [],
+            upi_mode=upi_mode,
+            voice_mode=voice_mode,
+            guardrail_verdict=guardrail_verdict,
+        )
+
+        refusal = self._check_input(message, user_id, language, context.guardrail_verdict)
+        if refusal is not None:
+            yield {"type": "final", "replace": False, **refusal}
+            return
+
+        agent_key = await self._route(context)
+
+        tokens: asyncio.Queue = asyncio.Queue()
+        redactor = self.guardrail.stream_redactor()
+        context.token_sink = tokens.put
+
+        async def run_specialist() -> None:
+            try:
+                await self._invoke_specialist(agent_key, context)
+            finally:
+                tokens.put_nowait(None)
+
+        task = asyncio.create_task(run_specialist())
+        try:
+            while True:
+                chunk = await tokens.get()
+                if chunk is None:
+                    break
+                safe_text = redactor.feed(chunk)
+                if safe_text:
+                    yield {"type": "token", "text": safe_text}
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+        payload = self._build_response(context)
+        response_text = payload["response"]
+        replace = not response_text.startswith(redactor.emitted)
+        if not replace and len(response_text) > len(redactor.emitted):
+            # Held-back tail plus anything the agent appended (or a non-streamed answer)
+            yield {"type": "token", "text": response_text[len(redactor.emitted):]}
+        if replace:
+            logger.info("stream_response_replaced", agent=agent_key, streamed_chars=len(redactor.emitted))
+        yield {"type": "final", "replace": replace, **payload}
+
+    def _check_input(
+        self, message: str, user_id: str, language: str, verdict: GuardrailVerdict
+    ) -> Optional[Dict[str, Any]]:
+        """Guardrail: validate input before routing; returns the refusal payload if blocked"""
+        is_valid, guardrail_message = self.guardrail.validate_input(message, language, verdict=verdict)
+        if is_valid:
+            return None
+
+        logger.warning("security_event",
+                     event_type="input_blocked_by_guardrail",
+                     user_id=user_id,
+                     language=language,
+                     message_preview=message[:100])
+        
+        # Use guardrail's specific message, or fallback to default
+        if guardrail_message:
+            refusal_message = guardrail_message
+        else:
+            # Fallback message
+            if language == "hi-IN":
+                refusal_message = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
             else:
-                # Fallback message
-                if language == "hi-IN":
-                    refusal_message = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
-                else:
-                    refusal_message = "I am a banking agent. Please ask questions related to banking at Sun National Bank."
-            
-            return {
-                "success": False,
-                "response": refusal_message,
-                "intent": "blocked",
-                "language": language,
-                "timestamp": datetime.now().isoformat(),
-            }
+                refusal_message = "I am a banking agent. Please ask questions related to banking at Sun National Bank."
+        
+        return {
+            "success": False,
+            "response": refusal_message,
+            "intent": "blocked",
+            "language": language,
+            "timestamp": datetime.now().isoformat(),
+        }
 
+    async def _route(self, context: ConversationState) -> str:
         intent = await self.router.assign_intent(context)
         agent_key = self.router.resolve_route(intent)
         
@@ -94,10 +191,7 @@ class HybridSupervisor:
             language=context.language,
             upi_mode=context.upi_mode,
         )
-        
-        await self._invoke_specialist(agent_key, context)
-
-        return self._build_response(context)
+        return agent_key
 
     def _build_context(
         self,
@@ -109,6 +203,8 @@ class HybridSupervisor:
     user_context: Dict[str, Any],
     message_history: List[Dict[str, Any]],
         upi_mode: Optional[bool],
+        voice_mode: bool = False,
+        guardrail_verdict: Optional[GuardrailVerdict] = None,
     ) -> ConversationState:
         messages: List[BaseMessage] = []
         for entry in message_history:
@@ -130,11 +226,15 @@ class HybridSupervisor:
             user_context=user_context,
             upi_mode=inferred_upi_mode,
             authenticated=bool(user_id),
+            voice_mode=voice_mode,
+            message_features=extract_message_features(message),
+            guardrail_verdict=guardrail_verdict if guardrail_verdict is not None else GuardrailVerdict(),
         )
         logger.info(
             "conversation_context_created",
             upi_mode=context.upi_mode,
             language=context.language,
+            keyword_categories=sorted(context.message_features.keywords.categories),
         )
         return context
 
@@ -182,7 +282,9 @@ class HybridSupervisor:
         
         # Guardrail: Sanitize output - redact PII and normalize refusals
         # Skip language consistency check for language_change intents (handled in main.py check_output)
-        sanitized_response = self.guardrail.sanitize_output(response_text, context.language)
+        sanitized_response = self.guardrail.sanitize_output(
+            response_text, context.language, verdict=context.guardrail_verdict
+        )
         
         payload: Dict[str, Any] = {
             "success": True,
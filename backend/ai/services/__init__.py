@@ -2,8 +2,14 @@
 from .ollama_service import get_ollama_service, OllamaService
 from .openai_service import get_openai_service, OpenAIService
 from .azure_tts_service import get_azure_tts_service, AzureTTSService
-from .llm_service import get_llm_service, LLMService, LLMProvider
-from .guardrail_service import get_guardrail_service, GuardrailService, GuardrailViolationType, GuardrailResult
+from .llm_service import get_llm_service, LLMService, LLMProvider, LLMPriority, answer_priority
+from .guardrail_service import (
+    get_guardrail_service,
+    GuardrailService,
+    GuardrailViolationType,
+    GuardrailResult,
+    GuardrailVerdict,
+)
 
 __all__ = [
     "get_ollama_service",
@@ -15,8 +21,11 @@ __all__ = [
     "get_llm_service",
     "LLMService",
     "LLMProvider",
+    "LLMPriority",
+    "answer_priority",
     "get_guardrail_service",
     "GuardrailService",
     "GuardrailViolationType",
     "GuardrailResult",
+    "GuardrailVerdict",
 ]
@@ -0,0 +1,296 @@
+"""
+Semantic Answer Cache
+Reuses prior FAQ answers for semantically equivalent questions, scoped by language and product type
+"""
+import asyncio
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config import settings
+from utils import logger
+
+
+# Stored in place of the user's name so one answer can be served to every customer
+USER_NAME_PLACEHOLDER = "{{user_name}}"
+FIRST_NAME_PLACEHOLDER = "{{first_name}}"
+
+
+def _name_tokens(user_name: str) -> List[str]:
+    """Words of a customer name; single letters (initials) are too common to match"""
+    return [token for token in re.findall(r"\w+", user_name) if len(token) > 1]
+
+
+def _name_pattern(token: str) -> "re.Pattern[str]":
+    return re.compile(rf"\b{re.escape(token)}\b", re.IGNORECASE)
+
+
+@dataclass
+class CachedAnswer:
+    """A cached agent answer plus the card payload that accompanied it"""
+
+    query: str
+    response: str
+    structured_data: Optional[Dict[str, Any]]
+    collection_version: str
+    personalized: bool
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+class _Scope:
+    """Answers for one (language, domain, product type) scope, searched as one matrix"""
+
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self.vectors: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+
+    def matrix(self):
+        if self._matrix is None and self.entries:
+            self._keys = list(self.entries.keys())
+            self._matrix = np.vstack([self.vectors[key] for key in self._keys])
+        return self._keys, self._matrix
+
+    def put(self, key: str, vector: np.ndarray, answer: CachedAnswer, max_entries: int) -> None:
+        self.entries[key] = answer
+        self.entries.move_to_end(key)
+        self.vectors[key] = vector
+        while len(self.entries) > max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            self.vectors.pop(evicted, None)
+        self._matrix = None
+
+    def remove(self, key: str) -> None:
+        self.entries.pop(key, None)
+        self.vectors.pop(key, None)
+        self._matrix = None
+
+
+class SemanticAnswerCache:
+    """
+    Embedding-similarity cache of final agent answers.
+
+    Entries are scoped by language, domain (loan/investment/support) and the
+    detected loan or scheme type, and stamped with the version of the RAG
+    collection they were answered from; a re-ingested collection makes every
+    answer in its scopes stale.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self._embeddings = embeddings
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None else settings.answer_cache_similarity_threshold
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.answer_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.answer_cache_max_entries
+        self._scopes: Dict[str, _Scope] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def scope_key(language: str, domain: str, product_type: Optional[str] = None) -> str:
+        """Build the scope key; product types are normalized so "Home Loan" == "HOME_LOAN" """
+        product = (product_type or "any").strip().lower().replace(" ", "_")
+        return f"{language}:{domain}:{product}"
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            from services.embedding_service import get_embedding_registry
+
+            # Held for the lifetime of the process, like the RAG collections
+            self._embeddings = get_embedding_registry().acquire()
+        return self._embeddings
+
+    def _embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def lookup(
+        self,
+        query: str,
+        scope: str,
+        collection_version: str,
+        user_name: Optional[str] = None,
+    ) -> Optional[CachedAnswer]:
+        """
+        Find a cached answer for a semantically equivalent query
+
+        Args:
+            query: Current user query
+            scope: Key from scope_key()
+            collection_version: Current version of the backing RAG collection
+            user_name: Name substituted into personalized answers
+
+        Returns:
+            CachedAnswer with the response ready to send, or None on a miss
+        """
+        vector = self._embed(query)
+        now = time.time()
+
+        with self._lock:
+            bucket = self._scopes.get(scope)
+            if bucket is None or not bucket.entries:
+                self.misses += 1
+                return None
+
+            # Whole scope was answered from an older collection: drop it
+            if any(entry.collection_version != collection_version for entry in bucket.entries.values()):
+                stale = [k for k, e in bucket.entries.items() if e.collection_version != collection_version]
+                for key in stale:
+                    bucket.remove(key)
+                self.invalidations += len(stale)
+                logger.info("answer_cache_invalidated", scope=scope, entries=len(stale), version=collection_version)
+
+            keys, matrix = bucket.matrix()
+            if matrix is None:
+                self.misses += 1
+                return None
+
+            similarities = matrix @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            entry = bucket.entries[keys[best]]
+
+            if now - entry.created_at > self.ttl_seconds:
+                bucket.remove(keys[best])
+                self.misses += 1
+                return None
+            if similarity < self.similarity_threshold or (entry.personalized and not user_name):
+                self.misses += 1
+                return None
+
+            entry.hits += 1
+            self.hits += 1
+
+        response = entry.response
+        if entry.personalized:
+            first_name = (_name_tokens(user_name) or [user_name])[0]
+            response = response.replace(USER_NAME_PLACEHOLDER, user_name).replace(FIRST_NAME_PLACEHOLDER, first_name)
+        logger.info(
+            "answer_cache_hit",
+            scope=scope,
+            similarity=round(similarity, 4),
+            cached_query=entry.query[:100],
+        )
+        return CachedAnswer(
+            query=entry.query,
+            response=response,
+            structured_data=copy.deepcopy(entry.structured_data),
+            collection_version=entry.collection_version,
+            personalized=entry.personalized,
+            created_at=entry.created_at,
+            hits=entry.hits,
+        )
+
+    def store(
+        self,
+        query: str,
+        scope: str,
+        collection_version: str,
+        response: str,
+        structured_data: Optional[Dict[str, Any]] = None,
+        user_name: Optional[str] = None,
+        language: str = "en-IN",
+    ) -> bool:
+        """
+        Cache an answer for later semantically equivalent queries
+
+        Returns:
+            True if the answer was cached, False if it was not safe to share
+        """
+        personalized = False
+        if user_name:
+            tokens = _name_tokens(user_name)
+            templated = response.replace(user_name, USER_NAME_PLACEHOLDER)
+            if tokens:
+                templated = _name_pattern(tokens[0]).sub(FIRST_NAME_PLACEHOLDER, templated)
+            if any(_name_pattern(token).search(templated) for token in tokens[1:]):
+                # Addressed by surname or middle name alone: no template fits other customers
+                return False
+            personalized = templated != response
+            if not personalized and language != "en-IN":
+                # The name may have been transliterated (e.g. into Devanagari) and
+                # cannot be templated reliably, so never share this answer
+                return False
+            response = templated
+
+        vector = self._embed(query)
+        answer = CachedAnswer(
+            query=query,
+            response=response,
+            structured_data=copy.deepcopy(structured_data) if structured_data else None,
+            collection_version=collection_version,
+            personalized=personalized,
+        )
+        key = " ".join(query.lower().split())
+        with self._lock:
+            bucket = self._scopes.setdefault(scope, _Scope())
+            bucket.put(key, vector, answer, self.max_entries)
+        logger.debug("answer_cache_stored", scope=scope, personalized=personalized)
+        return True
+
+    async def alookup(self, *args, **kwargs) -> Optional[CachedAnswer]:
+        """lookup() on the retrieval executor so the encoder never blocks the event loop"""
+        from services.rag_service import get_retrieval_executor
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_retrieval_executor(), lambda: self.lookup(*args, **kwargs))
+
+    async def astore(self, *args, **kwargs) -> bool:
+        """store() on the retrieval executor"""
+        from services.rag_service import get_retrieval_executor
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_retrieval_executor(), lambda: self.store(*args, **kwargs))
+
+    def invalidate(self, scope_prefix: str = "") -> int:
+        """Drop every scope starting with scope_prefix (all scopes by default)"""
+        with self._lock:
+            scopes = [scope for scope in self._scopes if scope.startswith(scope_prefix)]
+            removed = sum(len(self._scopes.pop(scope).entries) for scope in scopes)
+            self.invalidations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for metrics endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "scopes": len(self._scopes),
+                "entries": sum(len(bucket.entries) for bucket in self._scopes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+# Singleton instance
+_answer_cache: Optional[SemanticAnswerCache] = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """Get or create the semantic answer cache"""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = SemanticAnswerCache()
+    return _answer_cache
@@ -0,0 +1,368 @@
+"""
+Embedding Service
+Batched, content-hash cached embeddings for RAG retrieval and ingestion,
+plus a process-wide registry so every RAG collection shares one model instance
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from config import settings
+from utils import logger
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embedding vectors keyed by content hash"""
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_key(kind: str, text: str) -> str:
+        """Build a cache key from the embedding kind and the text content"""
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{kind}:{digest}"
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class QueryMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into micro-batches.
+
+    The first caller to arrive becomes the batch leader: it waits up to
+    ``max_wait_ms`` (or until ``max_batch_size`` texts are queued), encodes the
+    whole batch with one call, and hands each waiting caller its vector. The
+    leader steps down as soon as its own text is encoded; a caller still
+    waiting then takes over, so no caller serves the queue indefinitely.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._embed_batch = embed_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self._pending: List[Tuple[str, Future]] = []
+        self._cond = threading.Condition()
+        self._leader_active = False
+        self.batches = 0
+        self.batched_texts = 0
+
+    def embed(self, text: str) -> List[float]:
+        """Embed one text, sharing the encoder call with concurrent callers"""
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._cond.notify_all()
+            while not future.done() and self._leader_active:
+                self._cond.wait()
+            if future.done():
+                return future.result()
+            self._leader_active = True
+
+        try:
+            self._lead(future)
+        finally:
+            with self._cond:
+                # Hand over to a caller whose text is still queued
+                self._leader_active = False
+                self._cond.notify_all()
+        return future.result()
+
+    def _lead(self, own: Future) -> None:
+        wait_seconds = self.max_wait_seconds
+        while not own.done():
+            with self._cond:
+                deadline = time.monotonic() + wait_seconds
+                while len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+            self._run_batch(batch)
+            with self._cond:
+                self._cond.notify_all()
+            # Texts queued ahead of ours have already waited long enough
+            wait_seconds = 0.0
+
+    def _run_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = self._embed_batch(unique_texts)
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+        self.batches += 1
+        self.batched_texts += len(batch)
+        logger.debug(
+            "embedding_micro_batch",
+            batch_size=len(batch),
+            unique_texts=len(unique_texts),
+        )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that adds a content-hash LRU and query micro-batching.
+
+    Query and document vectors are cached separately because some encoders
+    embed them differently. ``embed_documents`` only sends cache misses to the
+    underlying encoder, in batches of ``batch_size``.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        cache_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_ms: Optional[float] = None,
+    ):
+        self.base = base
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.cache = EmbeddingCache(
+            max_size=cache_size if cache_size is not None else settings.embedding_cache_size
+        )
+        self._query_batcher = QueryMicroBatcher(
+            self.base.embed_documents,
+            max_batch_size=self.batch_size,
+            max_wait_ms=batch_wait_ms if batch_wait_ms is not None else settings.embedding_batch_wait_ms,
+        )
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, encoding only texts that are not cached yet"""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+
+        for idx, text in enumerate(texts):
+            key = EmbeddingCache.content_key("doc", text)
+            vector = self.cache.get(key)
+            if vector is None:
+                missing.setdefault(text, []).append(idx)
+            else:
+                results[idx] = vector
+
+        if missing:
+            pending = list(missing.keys())
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start : start + self.batch_size]
+                vectors = self.base.embed_documents(batch)
+                for text, vector in zip(batch, vectors):
+                    self.cache.put(EmbeddingCache.content_key("doc", text), vector)
+                    for idx in missing[text]:
+                        results[idx] = vector
+
+            logger.info(
+                "embeddings_documents_encoded",
+                requested=len(texts),
+                encoded=len(pending),
+                cached=len(texts) - sum(len(v) for v in missing.values()),
+            )
+
+        return results  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing cached vectors and batching concurrent callers"""
+        normalized = self._normalize(text)
+        key = EmbeddingCache.content_key("query", normalized)
+        vector = self.cache.get(key)
+        if vector is not None:
+            return vector
+
+        vector = self._query_batcher.embed(normalized)
+        self.cache.put(key, vector)
+        return vector
+
+    def stats(self) -> Dict[str, float]:
+        """Return cache and batching counters for health/metrics endpoints"""
+        lookups = self.cache.hits + self.cache.misses
+        batches = self._query_batcher.batches
+        return {
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_hit_rate": round(self.cache.hits / lookups, 4) if lookups else 0.0,
+            "query_batches": batches,
+            "avg_query_batch_size": round(self._query_batcher.batched_texts / batches, 2) if batches else 0.0,
+        }
+
+
+# Supported CPU inference variants for the sentence-transformers encoder
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx")
+ONNX_MIN_SENTENCE_TRANSFORMERS = (3, 2)  # First release with SentenceTransformer(backend="onnx")
+
+
+def _sentence_transformers_version() -> Tuple[int, ...]:
+    from importlib.metadata import version
+
+    release = version("sentence-transformers").split("+")[0]
+    return tuple(int(part) for part in release.split(".")[:2] if part.isdigit())
+
+
+def load_sentence_transformer_embeddings(model_name: str, backend: str = "torch") -> Embeddings:
+    """
+    Load a sentence-transformers encoder for the requested CPU backend
+
+    Args:
+        model_name: HuggingFace model id (e.g. sentence-transformers/all-MiniLM-L6-v2)
+        backend: "torch" (fp32), "int8" (dynamic int8 quantization of Linear layers)
+                 or "onnx" (ONNX Runtime export, optionally a quantized file)
+
+    Returns:
+        LangChain Embeddings instance
+    """
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    model_kwargs: Dict[str, object] = {"device": "cpu"}
+    if backend == "onnx":
+        # Also needs the onnx extra (optimum + onnxruntime) installed
+        installed = _sentence_transformers_version()
+        if installed < ONNX_MIN_SENTENCE_TRANSFORMERS:
+            raise ValueError(
+                "The onnx embedding backend needs sentence-transformers>=3.2 "
+                f"(installed: {'.'.join(map(str, installed))}); use EMBEDDING_BACKEND=torch or int8"
+            )
+        model_kwargs["backend"] = "onnx"
+        if settings.embedding_onnx_file:
+            model_kwargs["model_kwargs"] = {"file_name": settings.embedding_onnx_file}
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={"normalize_embeddings": True},
+    )
+
+    if backend == "int8":
+        import torch
+
+        client = getattr(embeddings, "client", None) or getattr(embeddings, "_client")
+        torch.quantization.quantize_dynamic(client, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    return embeddings
+
+
+class EmbeddingModelRegistry:
+    """
+    Process-wide registry of embedding models shared by RAGService instances.
+
+    Callers ``acquire()`` a CachedEmbeddings for a (model, backend) pair and
+    ``release()`` it when done. The model is loaded once, on first acquire,
+    and dropped when the last holder releases it.
+    """
+
+    def __init__(self, loader: Callable[[str, str], Embeddings] = load_sentence_transformer_embeddings):
+        self._loader = loader
+        self._models: Dict[Tuple[str, str], CachedEmbeddings] = {}
+        self._refcounts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, model_name: Optional[str] = None, backend: Optional[str] = None) -> CachedEmbeddings:
+        """Borrow the shared model, loading it on first use"""
+        key = (model_name or settings.embedding_model_name, backend or settings.embedding_backend)
+        # Loading happens under the lock so concurrent warm-up threads never load twice
+        with self._lock:
+            embeddings = self._models.get(key)
+            if embeddings is None:
+                start = time.perf_counter()
+                try:
+                    embeddings = CachedEmbeddings(self._loader(*key))
+                except Exception as e:
+                    logger.error("embeddings_init_failed", model=key[0], backend=key[1], error=str(e))
+                    raise
+                self._models[key] = embeddings
+                self._refcounts[key] = 0
+                logger.info(
+                    "embedding_model_loaded",
+                    model=key[0],
+                    backend=key[1],
+                    load_seconds=round(time.perf_counter() - start, 3),
+                )
+            self._refcounts[key] += 1
+            return embeddings
+
+    def release(self, embeddings: Embeddings) -> None:
+        """Return a borrowed model; the last release unloads it"""
+        with self._lock:
+            for key, model in self._models.items():
+                if model is embeddings:
+                    self._refcounts[key] -= 1
+                    if self._refcounts[key] <= 0:
+                        del self._models[key]
+                        del self._refcounts[key]
+                        logger.info("embedding_model_unloaded", model=key[0], backend=key[1])
+                    return
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Reference counts and cache stats per loaded model"""
+        with self._lock:
+            return {
+                f"{model_name}[{backend}]": {
+                    "refcount": self._refcounts[(model_name, backend)],
+                    **embeddings.stats(),
+                }
+                for (model_name, backend), embeddings in self._models.items()
+            }
+
+
+# Singleton instance
+_embedding_registry: Optional[EmbeddingModelRegistry] = None
+
+
+def get_embedding_registry() -> EmbeddingModelRegistry:
+    """Get or create the process-wide embedding model registry"""
+    global _embedding_registry
+    if _embedding_registry is None:
+        _embedding_registry = EmbeddingModelRegistry()
+    return _embedding_registry
@@ -0,0 +1,251 @@
+"""
+Extraction Cache
+Persists LLM outputs of deterministic extraction prompts (product cards) across requests and restarts
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import settings
+from utils import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    collection_version TEXT NOT NULL,
+    output TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS extraction_cache_collection ON extraction_cache (collection, collection_version);
+CREATE INDEX IF NOT EXISTS extraction_cache_last_used ON extraction_cache (last_used_at);
+"""
+
+
+def _contains_json_object(output: str) -> bool:
+    """Only well-formed extractions are persisted; a garbled one would be served until the next ingest"""
+    start = output.find("{")
+    if start == -1:
+        return False
+    try:
+        json.JSONDecoder().raw_decode(output[start:])
+    except ValueError:
+        return False
+    return True
+
+
+class ExtractionCache:
+    """
+    SQLite-backed cache of extraction outputs keyed by prompt hash and model.
+
+    Every entry records the RAG collection and collection version its prompt
+    was built from; the first lookup after a re-ingest drops all entries of
+    that collection with an older version. The table is bounded to
+    ``max_entries`` rows, evicting the least recently used.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or settings.extraction_cache_path
+        self.max_entries = max_entries if max_entries is not None else settings.extraction_cache_max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._current_versions: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _sync_version(self, conn: sqlite3.Connection, collection: str, collection_version: str) -> None:
+        """Drop a collection's entries from older versions the first time a new version is seen"""
+        if self._current_versions.get(collection) == collection_version:
+            return
+        removed = conn.execute(
+            "DELETE FROM extraction_cache WHERE collection = ? AND collection_version != ?",
+            (collection, collection_version),
+        ).rowcount
+        self._current_versions[collection] = collection_version
+        if removed:
+            self.invalidations += removed
+            logger.info(
+                "extraction_cache_invalidated",
+                collection=collection,
+                version=collection_version,
+                entries=removed,
+            )
+
+    def get(self, model: str, prompt: str, collection: str, collection_version: str) -> Optional[str]:
+        """
+        Look up the stored output for a prompt
+
+        Args:
+            model: Model the prompt would run on
+            prompt: Full extraction prompt
+            collection: RAG collection the prompt's context came from
+            collection_version: Current version of that collection
+
+        Returns:
+            Cached LLM output, or None on a miss
+        """
+        key = self.key(model, prompt)
+        with self._lock:
+            conn = self._connection()
+            self._sync_version(conn, collection, collection_version)
+            row = conn.execute(
+                "SELECT output FROM extraction_cache WHERE key = ? AND collection_version = ?",
+                (key, collection_version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE extraction_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+            self.hits += 1
+        logger.debug("extraction_cache_hit", collection=collection, key=key[:12])
+        return row[0]
+
+    def put(self, model: str, prompt: str, collection: str, collection_version: str, output: str) -> None:
+        """Store an extraction output, evicting least recently used rows past max_entries"""
+        key = self.key(model, prompt)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            self._sync_version(conn, collection, collection_version)
+            conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache "
+                "(key, model, collection, collection_version, output, created_at, last_used_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, model, collection, collection_version, output, now, now),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM extraction_cache WHERE key IN "
+                    "(SELECT key FROM extraction_cache ORDER BY last_used_at LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+
+    async def achat(
+        self,
+        llm: Any,
+        prompt: str,
+        collection: str,
+        collection_version: str,
+        **chat_kwargs: Any,
+    ) -> str:
+        """
+        Run a single-message extraction prompt through the cache
+
+        Args:
+            llm: LLMService used on a miss
+            prompt: Extraction prompt (sent as one user message)
+            collection: RAG collection the prompt's context came from
+            collection_version: Current version of that collection
+            **chat_kwargs: Passed to llm.chat (use_fast_model, temperature, priority, ...)
+
+        Returns:
+            The cached or freshly generated LLM output
+        """
+        model = llm.model_name(chat_kwargs.get("use_fast_model", False))
+        loop = asyncio.get_running_loop()
+        try:
+            cached = await loop.run_in_executor(None, self.get, model, prompt, collection, collection_version)
+        except sqlite3.Error as exc:
+            logger.warning("extraction_cache_lookup_failed", collection=collection, error=str(exc))
+            cached = None
+        if cached is not None:
+            return cached
+
+        output = await llm.chat([{"role": "user", "content": prompt}], **chat_kwargs)
+        if _contains_json_object(output):
+            try:
+                await loop.run_in_executor(None, self.put, model, prompt, collection, collection_version, output)
+            except sqlite3.Error as exc:
+                logger.warning("extraction_cache_store_failed", collection=collection, error=str(exc))
+        return output
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for metrics endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._connection().execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Singleton instance
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create the extraction cache"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+
+async def cached_extraction(llm: Any, prompt: str, documents_type: str, language: str, **chat_kwargs: Any) -> str:
+    """
+    Run a product-card extraction prompt, reusing the stored output when the
+    prompt and the backing RAG collection are unchanged
+
+    Args:
+        llm: LLMService used on a miss
+        prompt: Extraction prompt built from that collection's context
+        documents_type: "loan" or "investment"
+        language: Language of the collection the context came from
+        **chat_kwargs: Passed to llm.chat
+
+    Returns:
+        LLM output (raw JSON text)
+    """
+    if not settings.extraction_cache_enabled:
+        return await llm.chat([{"role": "user", "content": prompt}], **chat_kwargs)
+
+    from services.rag_service import aget_rag_service
+
+    rag_service = await aget_rag_service(documents_type=documents_type, language=language)
+    return await get_extraction_cache().achat(
+        llm,
+        prompt,
+        rag_service.collection_name,
+        rag_service.collection_version,
+        **chat_kwargs,
+    )
@@ -4,16 +4,24 @@ Handles input validation, content moderation, and safety checks using only open-
 """
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, List, Set, Tuple
+from typing import Dict, Any, Callable, Optional, List, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 import re
-from collections import defaultdict
 import time
 
 from utils import logger
+from utils.keyword_automaton import KeywordMatches
 from config import settings
+from services.rate_limiter import RateLimit, create_rate_limiter
+from services.message_features import (
+    TOXIC_KEYWORDS_EN,
+    TOXIC_KEYWORDS_HI,
+    TOXIC_KEYWORDS_ROMANIZED_HI,
+    extract_message_features,
+    scan_keywords,
+)
 
 
 class GuardrailViolationType(str, Enum):
@@ -38,6 +46,246 @@ class GuardrailResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class GuardrailVerdict:
+    """
+    Guardrail results for one turn, shared by main.py and the supervisor.
+    
+    Both layers guard the same message and response, so every check runs once
+    per distinct (check, text, language) and later callers reuse the result.
+    Time spent in each check is accumulated for the turn's log line.
+    """
+    results: Dict[Tuple[str, str, str], Any] = field(default_factory=dict)
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+    cache_hits: int = 0
+    
+    def run(self, stage: str, text: str, language: str, check: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of a check, running it the first time
+        
+        Args:
+            stage: Check name (e.g. "toxicity", "pii", "sanitize")
+            text: Text the check inspects
+            language: Language code the check was run for
+            check: Zero-argument callable performing the check
+        """
+        key = (stage, text, language)
+        if key in self.results:
+            self.cache_hits += 1
+            return self.results[key]
+        start = time.perf_counter()
+        result = check()
+        self.stage_ms[stage] = self.stage_ms.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+        self.results[key] = result
+        return result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Loggable per-stage timing breakdown"""
+        return {
+            "checks_run": len(self.results),
+            "cache_hits": self.cache_hits,
+            "total_ms": round(sum(self.stage_ms.values()), 3),
+            "stage_ms": {stage: round(ms, 3) for stage, ms in self.stage_ms.items()},
+        }
+
+
+class PatternSet:
+    """
+    Named regex patterns scanned as one alternation.
+    
+    The scan alternation has no named groups, so ``re`` can fold the branches
+    into a single prefix check and most positions are skipped in C; only on a
+    hit is the named alternation matched at that position to report which
+    pattern fired. Patterns without IGNORECASE are fastest, so case-insensitive
+    sets are written in lower case and searched in lower-cased text.
+    """
+    
+    def __init__(self, patterns: Dict[str, str], flags: int = 0):
+        self.patterns = dict(patterns)
+        self._scan = re.compile("|".join(f"(?:{pattern})" for pattern in self.patterns.values()), flags)
+        self._named = re.compile(
+            "|".join(f"(?P<{name}>{pattern})" for name, pattern in self.patterns.items()), flags
+        )
+    
+    def search(self, text: str) -> Optional[str]:
+        """Name of the pattern producing the leftmost match in text, or None"""
+        match = self._scan.search(text)
+        if match is None:
+            return None
+        # Same branches in the same order, so the named match at this position agrees
+        return self._named.match(text, match.start()).lastgroup
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+# PII detection patterns for Indian context (case-insensitive ones are scoped inline)
+PII_PATTERNS: Dict[str, str] = {
+    # Aadhaar: 12 digits, optionally space-separated
+    "aadhaar": r'\b\d{4}\s?\d{4}\s?\d{4}\b',
+    # PAN: 5 letters + 4 digits + 1 letter (e.g., ABCDE1234F)
+    "pan": r'\b[A-Z]{5}\d{4}[A-Z]\b',
+    # Account numbers: 9-18 digits (common Indian bank account lengths)
+    "account_number": r'\b\d{9,18}\b',
+    # CVV: 3-4 digits
+    "cvv": r'(?i:\b(?:cvv|cvc)\s*:?\s*\d{3,4}\b)',
+    # PIN: 4-6 digits (banking PINs)
+    "pin": r'(?i:\b(?:pin|password)\s*:?\s*\d{4,6}\b)',
+    # Indian phone numbers: 10 digits starting with 6-9
+    "phone": r'\b[6-9]\d{9}\b',
+    # Credit/Debit card: 16 digits (optionally space-separated)
+    "card_number": r'\b\d{4}\s?\d{4}\s?\d{4}\s?\d{4}\b',
+    # IFSC code: 11 characters (4 letters + 0 + 6 alphanumeric)
+    "ifsc": r'\b[A-Z]{4}0[A-Z0-9]{6}\b',
+}
+
+# Prompt injection patterns - enhanced with DAN and other jailbreaks (lower case, matched against lower-cased text)
+INJECTION_PATTERNS: Dict[str, str] = {
+    # English patterns
+    "ignore_instructions": r'ignore\s+(previous|above|all|all\s+previous)\s+(instructions|rules|prompts|directives)',
+    "forget_everything": r'forget\s+(everything|all|previous|all\s+previous)',
+    "role_reassignment": r'you\s+are\s+(now|nowadays|currently)\s+(a|an|the)',
+    "system_prefix": r'system\s*:\s*',
+    "chat_template_tag": r'<\|(system|assistant|user)\|>',
+    "bracket_role_tag": r'\[system\]|\[assistant\]|\[user\]',
+    "override_instructions": r'override\s+(system|instructions|rules)',
+    "disregard_instructions": r'disregard\s+(previous|above|all)',
+    "pretend": r'pretend\s+you\s+are',
+    "act_as_if": r'act\s+as\s+if\s+you\s+are',
+    # DAN (Do Anything Now) jailbreak patterns
+    "dan": r'you\s+are\s+dan',
+    "do_anything_now": r'do\s+anything\s+now',
+    "unrestricted": r'you\s+are\s+now\s+unrestricted',
+    "break_character": r'break\s+character',
+    "roleplay": r'roleplay\s+as',
+    "jailbreak": r'jailbreak',
+    "developer_mode": r'developer\s+mode',
+    "admin_mode": r'admin\s+mode',
+    # Hindi patterns (Devanagari)
+    "ignore_instructions_hi": r'पिछले\s+(निर्देश|नियम|प्रॉम्प्ट)\s+को\s+नजरअंदाज',
+    "forget_everything_hi": r'सब\s+भूल\s+जाओ',
+    "role_reassignment_hi": r'अब\s+तुम\s+(हो|हैं)',
+    "system_prefix_hi": r'सिस्टम\s*:\s*',
+    # Hindi patterns (Romanized)
+    "ignore_instructions_romanized_hi": r'pichle\s+(nirdesh|niyam)\s+ko\s+nazarandaz',
+    "forget_everything_romanized_hi": r'sab\s+bhool\s+jao',
+    "role_reassignment_romanized_hi": r'ab\s+tum\s+(ho|hain)',
+}
+
+# Non-banking investment/shopping phrasing (searched in lower-cased text)
+_INVESTMENT_SHOPPING = PatternSet({
+    "investment_in": r"investment\s+in\s+\w+",  # "investment in bitcoin", "investment in air purifier"
+    "invest_in": r"invest\s+in\s+\w+",  # "invest in crypto", "invest in stocks"
+    "shopping_at": r"shopping\s+at\s+\w+",  # "shopping at Amazon", "shopping at Flipkart"
+    "buy_from": r"buy\s+(from|on|at)\s+\w+",  # "buy from Amazon", "buy on Amazon"
+    "purchase_from": r"purchase\s+(from|on|at)\s+\w+",  # "purchase from Amazon"
+})
+
+# General knowledge question phrasing (searched in lower-cased text)
+_GENERAL_KNOWLEDGE = PatternSet({
+    "what_is": r"what\s+(does|is|are|was|were)\s+(a|an|the)?\s*\w+",
+    "how_does": r"how\s+(does|do|is|are|was|were)\s+(a|an|the)?\s*\w+",
+    "why_is": r"why\s+(is|are|was|were|does|do)\s+(a|an|the)?\s*\w+",
+    "who_is": r"who\s+(is|are|was|were)\s+\w+",  # "Who is Ronaldo?", "Who are you?"
+    "tell_me_about": r"tell\s+me\s+about\s+(a|an|the)?\s*\w+",
+    "explain": r"explain\s+(a|an|the)?\s*\w+",
+    "describe": r"describe\s+(a|an|the)?\s*\w+",
+    "what_about": r"what\s+about\s+\w+",
+})
+
+# LLM refusal phrasing replaced by a polite, localized refusal (searched in lower-cased text)
+_REFUSAL = PatternSet({
+    "cannot_help": r"i\s+cannot\s+help",
+    "cant_help": r"i\s+can't\s+help",
+    "unable": r"i\s+am\s+unable\s+to",
+    "dont_have": r"i\s+don't\s+have",
+    "do_not_have": r"i\s+do\s+not\s+have",
+    "sorry_cannot": r"sorry,\s*i\s+cannot",
+    "cannot_hi": r"मैं\s+नहीं\s+कर\s+सकती",
+    "unable_hi": r"मैं\s+असमर्थ\s+हूं",
+    "dont_know_hi": r"मुझे\s+नहीं\s+पता",
+})
+
+# Output redaction, applied in this order
+_CARD_REDACTION = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
+_PAN_REDACTION = re.compile(r'\b[A-Z]{5}\d{4}[A-Z]\b')
+_AADHAAR_REDACTION = re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\b')
+_ACCOUNT_NUMBER_REDACTION = re.compile(r'\b\d{9,18}\b')
+# Currency indicators that suggest a number is an amount, not an account number
+_CURRENCY_INDICATORS = (
+    '₹', 'rs', 'inr', 'rupee', 'rupees', 'lakh', 'crore', 'thousand',
+    'balance', 'amount', 'total', 'sum', 'price', 'cost', 'fee'
+)
+# Every redacted entity contains a digit
+_DIGIT = re.compile(r'\d')
+
+# Gibberish and language-consistency character classes
+_ALPHANUMERIC = re.compile(r'[a-zA-Z0-9\u0900-\u097F]')
+_REPEATED_CHARACTER = re.compile(r'(.)\1{3,}')
+_VOWEL = re.compile(r'[aeiouAEIOU\u0904-\u0914\u0960-\u0961]')
+_CONSONANT = re.compile(r'[bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ\u0915-\u0939\u0958-\u095F]')
+_DEVANAGARI_RUN = re.compile(r'[\u0900-\u097F]+')
+_LATIN_WORD = re.compile(r'\b[a-zA-Z]+\b')
+
+
+class StreamingRedactor:
+    """
+    Incremental PII redaction for streamed responses.
+    
+    Text is held back until it can no longer change the redaction of what
+    came before it: output is only released up to a whitespace boundary with
+    no digits in the preceding HOLDBACK characters, so every PII match (all of
+    which contain digits) and the context used to classify account numbers lie
+    entirely inside the released prefix. The released text is therefore always
+    a prefix of redacting the full response in one go.
+    
+    Until the first digit there is nothing to hold back for, so digit-free
+    text is released at every whitespace boundary as it arrives.
+    """
+    
+    # Longer than the 30-character context window used for account numbers
+    HOLDBACK = 40
+    _DIGIT = _DIGIT
+    
+    def __init__(self, redact):
+        self._redact = redact
+        self._raw = ""
+        self._released_upto = 0
+        self._last_digit = -1
+        self.emitted = ""
+    
+    def feed(self, chunk: str) -> str:
+        """Add streamed text; return newly releasable redacted text (possibly empty)"""
+        if not chunk:
+            return ""
+        offset = len(self._raw)
+        self._raw += chunk
+        digits = list(self._DIGIT.finditer(chunk))
+        if digits:
+            self._last_digit = offset + digits[-1].start()
+        
+        # Latest cut that follows a whitespace character and, once a digit was seen,
+        # the digit-free holdback
+        lower_bound = self._released_upto + 1
+        if self._last_digit >= 0:
+            lower_bound = max(lower_bound, self._last_digit + 1 + self.HOLDBACK)
+        cut = len(self._raw)
+        while cut >= lower_bound and not self._raw[cut - 1].isspace():
+            cut -= 1
+        if cut < lower_bound:
+            return ""
+        
+        redacted = self._redact(self._raw[:cut])
+        if not redacted.startswith(self.emitted):
+            # Never expected; stop releasing and let the final response win
+            self._released_upto = len(self._raw) + 1
+            return ""
+        delta = redacted[len(self.emitted):]
+        self.emitted = redacted
+        self._released_upto = cut
+        return delta
+
+
 class GuardrailService:
     """Service for enforcing guardrails on user inputs and AI outputs"""
     
@@ -54,13 +302,23 @@ class GuardrailService:
         # Load prompt injection patterns
         self.injection_patterns = self._load_injection_patterns()
         
-        # Rate limiting storage (in-memory, per user)
-        self.rate_limit_store: Dict[str, List[float]] = defaultdict(list)
-        self.rate_limit_lock = {}  # Simple lock mechanism
+        # Each category is also compiled into one alternation, so a single scan
+        # answers the common case (no violation) and names the first match
+        self._pii_scan = PatternSet(PII_PATTERNS)
+        self._injection_scan = PatternSet(INJECTION_PATTERNS)
         
         # Configuration from settings
         self.max_requests_per_minute = getattr(settings, 'guardrail_rate_limit_per_minute', 30)
         self.max_requests_per_hour = getattr(settings, 'guardrail_rate_limit_per_hour', 500)
+        
+        # Per-user rate limiting (in-process, or shared by all workers through Redis)
+        self.rate_limiter = create_rate_limiter(
+            [
+                RateLimit("minute", self.max_requests_per_minute, 60),
+                RateLimit("hour", self.max_requests_per_hour, 3600),
+            ],
+            prefix="guardrail:ratelimit",
+        )
         self.max_language_mixing_ratio = getattr(settings, 'guardrail_max_language_mixing_ratio', 0.3)
         self.enable_input_guardrails = getattr(settings, 'enable_input_guardrails', True)
         self.enable_output_guardrails = getattr(settings, 'enable_output_guardrails', True)
@@ -71,7 +329,12 @@ class GuardrailService:
                    pii_patterns=len(self.pii_patterns),
                    injection_patterns=len(self.injection_patterns))
     
-    def validate_input(self, message: str, language: str = "en-IN") -> tuple[bool, Optional[str]]:
+    def validate_input(
+        self,
+        message: str,
+        language: str = "en-IN",
+        verdict: Optional[GuardrailVerdict] = None,
+    ) -> tuple[bool, Optional[str]]:
         """
         Validate input message - returns (is_valid, message) tuple.
         This is the main entry point for input validation as per security architect requirements.
@@ -79,6 +342,7 @@ class GuardrailService:
         Args:
             message: User's message to validate
             language: Language code (en-IN or hi-IN)
+            verdict: The turn's verdict; checks already run for this message are reused
             
         Returns:
             Tuple of (is_valid: bool, message: Optional[str])
@@ -87,9 +351,11 @@ class GuardrailService:
         """
         if not self.enable_input_guardrails:
             return (True, None)
+        if verdict is None:
+            verdict = GuardrailVerdict()
         
         # 1. Jailbreak Detection
-        injection_check = self._check_prompt_injection(message, language)
+        injection_check = self._run_injection_check(verdict, message, language)
         if not injection_check.passed:
             logger.warning("security_event",
                          event_type="jailbreak_detected",
@@ -97,7 +363,7 @@ class GuardrailService:
             return (False, injection_check.message)
         
         # 2. Topic Filtering
-        topic_check = self._check_off_topic(message, language)
+        topic_check = verdict.run("off_topic", message, language, lambda: self._check_off_topic(message, language))
         if not topic_check.passed:
             logger.warning("security_event",
                          event_type="off_topic_detected",
@@ -105,7 +371,7 @@ class GuardrailService:
             return (False, topic_check.message)
         
         # 3. Gibberish Detection
-        if self._check_gibberish(message):
+        if verdict.run("gibberish", message, language, lambda: self._check_gibberish(message)):
             logger.warning("security_event",
                          event_type="gibberish_detected",
                          message_preview=message[:100])
@@ -116,7 +382,7 @@ class GuardrailService:
             return (False, gibberish_message)
         
         # 4. Content Moderation (Toxicity)
-        toxicity_check = self._check_toxicity(message, language)
+        toxicity_check = self._run_toxicity_check(verdict, message, language)
         if not toxicity_check.passed:
             logger.warning("security_event",
                          event_type="toxic_content_detected",
@@ -124,7 +390,7 @@ class GuardrailService:
             return (False, toxicity_check.message)
         
         # 5. PII Detection
-        pii_check = self._check_pii(message, language)
+        pii_check = self._run_pii_check(verdict, message, language)
         if not pii_check.passed:
             logger.warning("security_event",
                          event_type="pii_detected",
@@ -133,19 +399,27 @@ class GuardrailService:
         
         return (True, None)
     
-    def sanitize_output(self, response: str, language: str = "en-IN") -> str:
+    def sanitize_output(
+        self,
+        response: str,
+        language: str = "en-IN",
+        verdict: Optional[GuardrailVerdict] = None,
+    ) -> str:
         """
         Sanitize AI-generated output - redacts PII and normalizes refusals.
         
         Args:
             response: AI-generated response text
             language: Language code (en-IN or hi-IN)
+            verdict: The turn's verdict, which records the sanitized text and timing
             
         Returns:
             Sanitized response string
         """
         if not self.enable_output_guardrails:
             return response
+        if verdict is not None:
+            return verdict.run("sanitize", response, language, lambda: self.sanitize_output(response, language))
         
         # 1. PII Redaction in text response
         sanitized = self._redact_pii_from_text(response)
@@ -155,11 +429,18 @@ class GuardrailService:
         
         return sanitized
     
+    def stream_redactor(self) -> StreamingRedactor:
+        """Create an incremental PII redactor for one streamed response"""
+        if not self.enable_output_guardrails:
+            return StreamingRedactor(lambda text: text)
+        return StreamingRedactor(self._redact_pii_from_text)
+    
     async def check_input(
         self, 
         message: str, 
         language: str = "en-IN",
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        verdict: Optional[GuardrailVerdict] = None,
     ) -> GuardrailResult:
         """
         Check user input against all guardrails
@@ -168,6 +449,7 @@ class GuardrailService:
             message: User's message
             language: Language code (en-IN or hi-IN)
             user_id: Optional user ID for rate limiting
+            verdict: The turn's verdict; pass the same one to the supervisor so it reuses these checks
             
         Returns:
             GuardrailResult indicating if input passes all checks
@@ -176,10 +458,12 @@ class GuardrailService:
         if not self.enable_input_guardrails:
             return GuardrailResult(passed=True, metadata={"disabled": True})
         
+        if verdict is None:
+            verdict = GuardrailVerdict()
         start_time = time.time()
         
         # 1. Content Moderation
-        toxicity_check = self._check_toxicity(message, language)
+        toxicity_check = self._run_toxicity_check(verdict, message, language)
         if not toxicity_check.passed:
             logger.warning("guardrail_violation",
                          violation_type=toxicity_check.violation_type,
@@ -188,7 +472,7 @@ class GuardrailService:
             return toxicity_check
         
         # 2. PII Detection
-        pii_check = self._check_pii(message, language)
+        pii_check = self._run_pii_check(verdict, message, language)
         if not pii_check.passed:
             logger.warning("guardrail_violation",
                          violation_type=pii_check.violation_type,
@@ -198,7 +482,7 @@ class GuardrailService:
             return pii_check
         
         # 3. Prompt Injection Detection
-        injection_check = self._check_prompt_injection(message, language)
+        injection_check = self._run_injection_check(verdict, message, language)
         if not injection_check.passed:
             logger.warning("guardrail_violation",
                          violation_type=injection_check.violation_type,
@@ -208,7 +492,8 @@ class GuardrailService:
         
         # 4. Rate Limiting (if user_id provided)
         if user_id:
-            rate_check = self._check_rate_limit(user_id)
+            # Counted once per turn however many layers ask
+            rate_check = verdict.run("rate_limit", user_id, "", lambda: self._check_rate_limit(user_id))
             if not rate_check.passed:
                 logger.warning("guardrail_violation",
                              violation_type=rate_check.violation_type,
@@ -229,7 +514,8 @@ class GuardrailService:
         response: str,
         language: str = "en-IN",
         original_query: Optional[str] = None,
-        intent: Optional[str] = None
+        intent: Optional[str] = None,
+        verdict: Optional[GuardrailVerdict] = None,
     ) -> GuardrailResult:
         """
         Check AI-generated response against guardrails
@@ -239,6 +525,7 @@ class GuardrailService:
             language: Expected language code
             original_query: Original user query for context
             intent: Current intent (e.g., "language_change") - used to skip certain checks
+            verdict: The turn's verdict, shared with the supervisor's output sanitization
             
         Returns:
             GuardrailResult indicating if output passes all checks
@@ -246,14 +533,18 @@ class GuardrailService:
         # Skip if guardrails disabled
         if not self.enable_output_guardrails:
             return GuardrailResult(passed=True, metadata={"disabled": True})
-        
+        if verdict is None:
+            verdict = GuardrailVerdict()
         start_time = time.time()
         
         # 1. Language Consistency
         # Skip language consistency check for language_change intents
         # (response language will intentionally differ from request language)
         if intent != "language_change":
-            lang_check = self._check_language_consistency(response, language)
+            lang_check = verdict.run(
+                "language_consistency", response, language,
+                lambda: self._check_language_consistency(response, language),
+            )
             if not lang_check.passed:
                 logger.warning("guardrail_violation",
                              violation_type=lang_check.violation_type,
@@ -263,7 +554,10 @@ class GuardrailService:
                 return lang_check
         
         # 2. Response Safety (check for toxic content in output)
-        safety_check = self._check_toxicity(response, language)
+        safety_check = verdict.run(
+            "toxicity", response, language,
+            lambda: self._check_toxicity(response, language, keywords=scan_keywords(response)),
+        )
         if not safety_check.passed:
             logger.warning("guardrail_violation",
                          violation_type=safety_check.violation_type,
@@ -272,7 +566,7 @@ class GuardrailService:
             return safety_check
         
         # 3. Check for PII leakage in response
-        pii_check = self._check_pii(response, language)
+        pii_check = self._run_pii_check(verdict, response, language)
         if not pii_check.passed:
             logger.warning("guardrail_violation",
                          violation_type=pii_check.violation_type,
@@ -288,208 +582,48 @@ class GuardrailService:
         
         return GuardrailResult(passed=True, metadata={"duration_ms": duration_ms})
     
+    def _run_toxicity_check(self, verdict: GuardrailVerdict, message: str, language: str) -> GuardrailResult:
+        return verdict.run("toxicity", message, language, lambda: self._check_toxicity(message, language))
+    
+    def _run_pii_check(self, verdict: GuardrailVerdict, text: str, language: str) -> GuardrailResult:
+        return verdict.run("pii", text, language, lambda: self._check_pii(text, language))
+    
+    def _run_injection_check(self, verdict: GuardrailVerdict, message: str, language: str) -> GuardrailResult:
+        return verdict.run("prompt_injection", message, language, lambda: self._check_prompt_injection(message, language))
+    
     def _load_toxic_keywords_en(self) -> Set[str]:
         """Load English toxic keywords - comprehensive list for banking context"""
-        return {
-            # Profanity (common words)
-            "fuck", "fucking", "fucked", "fucker", "shit", "shitting", "shitted",
-            "damn", "damned", "dammit", "hell", "crap", "crap", "ass", "asshole",
-            "bitch", "bastard", "piss", "pissed", "piss off",
-            # Threats
-            "kill you", "hurt you", "attack you", "destroy you", "sue you",
-            "sue", "lawsuit", "legal action", "file complaint",
-            # Hate speech indicators
-            "hate you", "stupid", "idiot", "moron", "fool", "dumb", "dumbass",
-            "retard", "retarded", "imbecile",
-            # Harassment
-            "shut up", "shut your mouth", "be quiet", "shut the fuck up",
-            "fuck off", "piss off", "go to hell",
-            # Aggressive language
-            "useless", "worthless", "pathetic", "terrible", "worst",
-        }
+        return set(TOXIC_KEYWORDS_EN)
     
     def _load_toxic_keywords_hi(self) -> Set[str]:
         """Load Hindi toxic keywords (Devanagari script)"""
-        return {
-            # Profanity
-            "बकवास", "गंदा", "मूर्ख",
-            # Threats
-            "मार दूंगा", "हत्या", "नुकसान",
-            # Hate speech
-            "नफरत", "बेवकूफ", "मूर्ख", "गधा",
-            # Harassment
-            "चुप रहो", "बंद करो", "खामोश",
-        }
+        return set(TOXIC_KEYWORDS_HI)
     
     def _load_toxic_keywords_romanized_hi(self) -> Set[str]:
         """Load Romanized Hindi toxic keywords"""
-        return {
-            # Common Romanized Hindi profanity
-            "bakwas", "ganda", "murkha", "chutiya", "bhosdike", "madarchod",
-            "behenchod", "lund", "gaand", "chut", "bhenchod",
-            "maar dunga", "hate", "stupid", "fuck", "shit",
-            "chup raho", "band karo", "teri maa", "teri behen",
-        }
+        return set(TOXIC_KEYWORDS_ROMANIZED_HI)
     
     def _load_pii_patterns(self) -> Dict[str, re.Pattern]:
         """Load PII detection patterns for Indian context"""
-        return {
-            # Aadhaar: 12 digits, optionally space-separated
-            "aadhaar": re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\b'),
-            
-            # PAN: 5 letters + 4 digits + 1 letter (e.g., ABCDE1234F)
-            "pan": re.compile(r'\b[A-Z]{5}\d{4}[A-Z]\b'),
-            
-            # Account numbers: 9-18 digits (common Indian bank account lengths)
-            "account_number": re.compile(r'\b\d{9,18}\b'),
-            
-            # CVV: 3-4 digits
-            "cvv": re.compile(r'\b(?:cvv|cvc)\s*:?\s*\d{3,4}\b', re.IGNORECASE),
-            
-            # PIN: 4-6 digits (banking PINs)
-            "pin": re.compile(r'\b(?:pin|password)\s*:?\s*\d{4,6}\b', re.IGNORECASE),
-            
-            # Indian phone numbers: 10 digits starting with 6-9
-            "phone": re.compile(r'\b[6-9]\d{9}\b'),
-            
-            # Credit/Debit card: 16 digits (optionally space-separated)
-            "card_number": re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\s?\d{4}\b'),
-            
-            # IFSC code: 11 characters (4 letters + 0 + 6 alphanumeric)
-            "ifsc": re.compile(r'\b[A-Z]{4}0[A-Z0-9]{6}\b'),
-        }
+        return {entity_type: re.compile(pattern) for entity_type, pattern in PII_PATTERNS.items()}
     
-    def _load_injection_patterns(self) -> List[re.Pattern]:
+    def _load_injection_patterns(self) -> Dict[str, re.Pattern]:
         """Load prompt injection detection patterns - enhanced with DAN and other jailbreaks"""
-        return [
-            # English patterns
-            re.compile(r'ignore\s+(previous|above|all|all\s+previous)\s+(instructions|rules|prompts|directives)', re.IGNORECASE),
-            re.compile(r'forget\s+(everything|all|previous|all\s+previous)', re.IGNORECASE),
-            re.compile(r'you\s+are\s+(now|nowadays|currently)\s+(a|an|the)', re.IGNORECASE),
-            re.compile(r'system\s*:\s*', re.IGNORECASE),
-            re.compile(r'<\|(system|assistant|user)\|>', re.IGNORECASE),
-            re.compile(r'\[SYSTEM\]|\[ASSISTANT\]|\[USER\]', re.IGNORECASE),
-            re.compile(r'override\s+(system|instructions|rules)', re.IGNORECASE),
-            re.compile(r'disregard\s+(previous|above|all)', re.IGNORECASE),
-            re.compile(r'pretend\s+you\s+are', re.IGNORECASE),
-            re.compile(r'act\s+as\s+if\s+you\s+are', re.IGNORECASE),
-            # DAN (Do Anything Now) jailbreak patterns
-            re.compile(r'you\s+are\s+DAN', re.IGNORECASE),
-            re.compile(r'do\s+anything\s+now', re.IGNORECASE),
-            re.compile(r'you\s+are\s+now\s+unrestricted', re.IGNORECASE),
-            re.compile(r'break\s+character', re.IGNORECASE),
-            re.compile(r'roleplay\s+as', re.IGNORECASE),
-            re.compile(r'jailbreak', re.IGNORECASE),
-            re.compile(r'developer\s+mode', re.IGNORECASE),
-            re.compile(r'admin\s+mode', re.IGNORECASE),
-            
-            # Hindi patterns (Devanagari)
-            re.compile(r'पिछले\s+(निर्देश|नियम|प्रॉम्प्ट)\s+को\s+नजरअंदाज', re.IGNORECASE),
-            re.compile(r'सब\s+भूल\s+जाओ', re.IGNORECASE),
-            re.compile(r'अब\s+तुम\s+(हो|हैं)', re.IGNORECASE),
-            re.compile(r'सिस्टम\s*:\s*', re.IGNORECASE),
-            
-            # Hindi patterns (Romanized)
-            re.compile(r'pichle\s+(nirdesh|niyam)\s+ko\s+nazarandaz', re.IGNORECASE),
-            re.compile(r'sab\s+bhool\s+jao', re.IGNORECASE),
-            re.compile(r'ab\s+tum\s+(ho|hain)', re.IGNORECASE),
-        ]
+        return {name: re.compile(pattern, re.IGNORECASE) for name, pattern in INJECTION_PATTERNS.items()}
     
     def _check_off_topic(self, message: str, language: str) -> GuardrailResult:
         """Check if message is about off-topic subjects (non-banking topics)"""
         message_lower = message.lower()
-        
-        # Banking-related keywords (if query contains these, it's likely banking-related)
-        # Note: "investment" is included but we need to check context (banking investment vs non-banking)
-        banking_keywords = [
-            "account", "balance", "transaction", "loan", "credit", "debit", "deposit",
-            "withdraw", "transfer", "upi", "payment", "bill", "statement", "interest",
-            "rate", "fd", "rd", "savings", "checking", "bank", "banking",
-            "atm", "card", "pin", "password", "branch", "ifsc", "aadhaar", "pan",
-            "emi", "scheme", "plan", "insurance", "mutual fund", "ppf", "nps",
-            "banking investment", "bank investment", "bank scheme", "bank plan",
-            # Investment schemes (abbreviations and full names)
-            "elss", "equity linked", "equity linked savings", "sukanya", "ssy", "nsc",
-            "fixed deposit", "recurring deposit", "public provident fund",
-            "national pension", "tax saving", "tax-saving",
-            # Loan types
-            "home loan", "personal loan", "auto loan", "car loan", "business loan",
-            "education loan", "gold loan", "loan against property", "lap",
-            "खाता", "बैलेंस", "लेनदेन", "लोन", "क्रेडिट", "डेबिट", "जमा",
-            "निकासी", "ट्रांसफर", "यूपीआई", "भुगतान", "बिल", "स्टेटमेंट", "ब्याज",
-            "दर", "निवेश", "एफडी", "आरडी", "बचत", "बैंक", "बैंकिंग",
-            "एटीएम", "कार्ड", "पिन", "पासवर्ड", "शाखा", "आईएफएससी", "आधार", "पैन",
-            "ईएमआई", "योजना", "बीमा", "म्यूचुअल फंड", "पीपीएफ", "एनपीएस",
-            "बैंक निवेश", "बैंक योजना", "बैंक प्लान",
-            "ईएलएसएस", "सुकन्या", "एनएससी", "होम लोन", "पर्सनल लोन", "ऑटो लोन",
-        ]
-        
-        # Non-banking investment keywords (cryptocurrency, stocks, etc.)
-        non_banking_investment_keywords = [
-            "bitcoin", "btc", "crypto", "cryptocurrency", "ethereum", "eth",
-            "trading", "stock market", "stocks", "shares", "share market",
-            "nft", "blockchain", "defi", "altcoin", "dogecoin", "shiba",
-            "forex", "forex trading", "commodity", "commodities",
-            "air purifier", "amazon", "shopping", "online shopping", "e-commerce",
-            "buy", "purchase", "shop", "shopping at", "buy from",
-            "investment in bitcoin", "investment in crypto", "investment in air purifier",
-            "invest in bitcoin", "invest in crypto", "invest in air purifier",
-        ]
+        # Banking, non-banking investment and off-topic keyword lists all come from one scan
+        features = extract_message_features(message)
         
         # Check if query contains banking keywords - if yes, it's likely banking-related
-        has_banking_keyword = any(keyword in message_lower for keyword in banking_keywords)
-        
-        # Off-topic keywords (general knowledge, non-banking topics)
-        off_topic_keywords = [
-            # Politics
-            "politics", "political", "election", "vote", "president", "prime minister",
-            "government", "parliament", "congress", "bjp", "modi", "rahul",
-            # Religion
-            "religion", "religious", "hindu", "muslim", "christian", "sikh", "buddhist",
-            "temple", "mosque", "church", "god", "allah", "jesus", "krishna",
-            # Coding/Programming
-            "code", "coding", "programming", "python", "javascript", "java", "c++",
-            "function", "variable", "algorithm", "debug", "compile", "syntax",
-            # Illegal acts
-            "hack", "hacking", "steal", "stealing", "rob", "robbery", "fraud",
-            "scam", "illegal", "crime", "criminal", "drug", "weapon",
-            # General knowledge topics
-            "airplane", "aircraft", "plane", "airport", "flight", "fly", "flying",
-            "weather", "temperature", "rain", "sunny", "cloud", "storm",
-            "sports", "cricket", "football", "soccer", "basketball", "tennis",
-            "movie", "film", "actor", "actress", "cinema", "hollywood",
-            "recipe", "cooking", "food", "restaurant", "cuisine",
-            "science", "physics", "chemistry", "biology", "math", "mathematics",
-            "history", "geography", "country", "capital", "city",
-            "animal", "dog", "cat", "bird", "fish", "wildlife",
-            "car", "vehicle", "bike", "motorcycle", "transport",
-            "what is", "what does", "how does", "tell me about", "explain",
-            # Question patterns that are likely general knowledge
-            "what does a", "what does an", "what is a", "what is an",
-            "how do", "how does", "why is", "why are",
-            "who is", "who are", "who was", "who were",  # Person queries
-            # Famous people/sports personalities (common off-topic queries)
-            "ronaldo", "messi", "ronaldo", "messi", "modi", "gandhi", "einstein",
-            "celebrity", "famous", "person", "people",
-        ]
-        
-        # Hindi off-topic keywords
-        off_topic_keywords_hi = [
-            "राजनीति", "चुनाव", "सरकार", "धर्म", "मंदिर", "मस्जिद",
-            "कोडिंग", "प्रोग्रामिंग", "अवैध", "अपराध",
-            "विमान", "हवाई जहाज", "मौसम", "खेल", "फिल्म", "खाना",
-            "विज्ञान", "इतिहास", "भूगोल", "जानवर", "गाड़ी",
-        ]
+        # (e.g., "buy mutual fund" or "investment plan" stay on topic)
+        has_banking_keyword = features.has("banking")
         
         # Check for non-banking investments/shopping keywords
         # But exclude if banking keywords are present (e.g., "buy mutual fund" should be allowed)
-        has_non_banking_investment = False
-        for keyword in non_banking_investment_keywords:
-            if keyword in message_lower:
-                # Skip if it's a banking-related query (e.g., "buy mutual fund", "investment plan")
-                if not has_banking_keyword:
-                    has_non_banking_investment = True
-                    break
+        has_non_banking_investment = features.has("non_banking_investment") and not has_banking_keyword
         
         # If query has banking keywords, it's likely banking-related - allow it
         if has_banking_keyword:
@@ -509,9 +643,8 @@ class GuardrailService:
                 confidence=0.9
             )
         
-        # Check English keywords
-        for keyword in off_topic_keywords:
-            if keyword in message_lower:
+        # Check English and Hindi off-topic keywords
+        if features.has("off_topic_en"):
                 if language == "hi-IN":
                     message_text = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
                 else:
@@ -524,9 +657,7 @@ class GuardrailService:
                     confidence=0.8
                 )
         
-        # Check Hindi keywords
-        for keyword in off_topic_keywords_hi:
-            if keyword in message:
+        if features.has("off_topic_hi"):
                 if language == "hi-IN":
                     message_text = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
                 else:
@@ -540,46 +671,10 @@ class GuardrailService:
                 )
         
         # Additional check: Investment/shopping patterns (non-banking)
-        investment_shopping_patterns = [
-            r"investment\s+in\s+\w+",  # "investment in bitcoin", "investment in air purifier"
-            r"invest\s+in\s+\w+",  # "invest in crypto", "invest in stocks"
-            r"shopping\s+at\s+\w+",  # "shopping at Amazon", "shopping at Flipkart"
-            r"buy\s+(from|on|at)\s+\w+",  # "buy from Amazon", "buy on Amazon"
-            r"purchase\s+(from|on|at)\s+\w+",  # "purchase from Amazon"
-        ]
-        
-        for pattern_str in investment_shopping_patterns:
-            pattern = re.compile(pattern_str, re.IGNORECASE)
-            if pattern.search(message_lower):
-                # Check if it's NOT a banking-related investment
-                if not any(bank_kw in message_lower for bank_kw in ["bank", "banking", "fd", "rd", "ppf", "nps", "mutual fund", "scheme", "plan"]):
-                    if language == "hi-IN":
-                        message_text = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
-                    else:
-                        message_text = "I am a banking agent. Please ask questions related to banking at Sun National Bank."
-                    
-                    return GuardrailResult(
-                        passed=False,
-                        violation_type=GuardrailViolationType.OFF_TOPIC,
-                        message=message_text,
-                        confidence=0.85
-                    )
-        
-        # Additional check: If query starts with general knowledge question patterns and has no banking keywords
-        general_knowledge_patterns = [
-            r"what\s+(does|is|are|was|were)\s+(a|an|the)?\s*\w+",
-            r"how\s+(does|do|is|are|was|were)\s+(a|an|the)?\s*\w+",
-            r"why\s+(is|are|was|were|does|do)\s+(a|an|the)?\s*\w+",
-            r"who\s+(is|are|was|were)\s+\w+",  # "Who is Ronaldo?", "Who are you?"
-            r"tell\s+me\s+about\s+(a|an|the)?\s*\w+",
-            r"explain\s+(a|an|the)?\s*\w+",
-            r"describe\s+(a|an|the)?\s*\w+",
-            r"what\s+about\s+\w+",
-        ]
-        
-        for pattern_str in general_knowledge_patterns:
-            pattern = re.compile(pattern_str, re.IGNORECASE)
-            if pattern.search(message_lower) and not has_banking_keyword:
+        # ("investment in bitcoin", "shopping at Amazon", "buy from Flipkart")
+        if _INVESTMENT_SHOPPING.search(message_lower):
+            # Check if it's NOT a banking-related investment
+            if not features.has("bank_investment"):
                 if language == "hi-IN":
                     message_text = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
                 else:
@@ -589,9 +684,24 @@ class GuardrailService:
                     passed=False,
                     violation_type=GuardrailViolationType.OFF_TOPIC,
                     message=message_text,
-                    confidence=0.7
+                    confidence=0.85
                 )
         
+        # Additional check: If query starts with general knowledge question patterns and has no banking keywords
+        # ("what is ...", "who is Ronaldo?", "tell me about ...")
+        if _GENERAL_KNOWLEDGE.search(message_lower) and not has_banking_keyword:
+            if language == "hi-IN":
+                message_text = "मैं एक बैंकिंग एजेंट हूं। कृपया Sun National Bank से संबंधित बैंकिंग प्रश्न पूछें।"
+            else:
+                message_text = "I am a banking agent. Please ask questions related to banking at Sun National Bank."
+            
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.OFF_TOPIC,
+                message=message_text,
+                confidence=0.7
+            )
+        
         return GuardrailResult(passed=True)
     
     def _check_gibberish(self, message: str) -> bool:
@@ -603,7 +713,7 @@ class GuardrailService:
             return False  # Too short to be meaningful
         
         # Check for excessive random characters (more than 50% non-alphanumeric)
-        alphanumeric_count = len(re.findall(r'[a-zA-Z0-9\u0900-\u097F]', message))
+        alphanumeric_count = len(_ALPHANUMERIC.findall(message))
         total_chars = len(message.replace(' ', ''))
         
         if total_chars > 0 and alphanumeric_count / total_chars < 0.5:
@@ -612,15 +722,14 @@ class GuardrailService:
         # Check for repeated characters (e.g., "aaaaaa", "123123123")
         if len(message) > 5:
             # Check for 4+ repeated characters
-            repeated_pattern = re.compile(r'(.)\1{3,}')
-            if repeated_pattern.search(message):
+            if _REPEATED_CHARACTER.search(message):
                 return True
         
         # Check for random character sequences (no vowels/consonants pattern)
         if len(message) > 10:
             # Count vowels (English + Hindi)
-            vowels = len(re.findall(r'[aeiouAEIOU\u0904-\u0914\u0960-\u0961]', message))
-            consonants = len(re.findall(r'[bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ\u0915-\u0939\u0958-\u095F]', message))
+            vowels = len(_VOWEL.findall(message))
+            consonants = len(_CONSONANT.findall(message))
             total_letters = vowels + consonants
             
             if total_letters > 10 and vowels == 0:
@@ -630,26 +739,24 @@ class GuardrailService:
     
     def _redact_pii_from_text(self, text: str) -> str:
         """Redact PII from text response (16-digit card numbers, PAN, etc.)"""
-        sanitized = text
+        # Most responses carry no digits at all, and every redacted entity needs one
+        if not _DIGIT.search(text):
+            return text
         
         # Redact 16-digit card numbers (with or without spaces)
-        card_pattern = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
-        sanitized = card_pattern.sub('[CARD REDACTED]', sanitized)
+        sanitized = _CARD_REDACTION.sub('[CARD REDACTED]', text)
         
         # Redact PAN numbers
-        pan_pattern = re.compile(r'\b[A-Z]{5}\d{4}[A-Z]\b')
-        sanitized = pan_pattern.sub('[PAN REDACTED]', sanitized)
+        sanitized = _PAN_REDACTION.sub('[PAN REDACTED]', sanitized)
         
         # Redact Aadhaar numbers
-        aadhaar_pattern = re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\b')
-        sanitized = aadhaar_pattern.sub('[AADHAAR REDACTED]', sanitized)
+        sanitized = _AADHAAR_REDACTION.sub('[AADHAAR REDACTED]', sanitized)
         
         # Redact account numbers (9-18 digits) - but be careful not to redact amounts
         # Only redact if it looks like an account number (not an amount)
         # Use fixed-width lookbehind (Python requires fixed-width for lookbehind)
         # Find all potential account numbers and check context manually
-        account_number_pattern = re.compile(r'\b\d{9,18}\b')
-        matches = list(account_number_pattern.finditer(sanitized))
+        matches = list(_ACCOUNT_NUMBER_REDACTION.finditer(sanitized))
         
         # Process matches in reverse order to maintain indices
         for match in reversed(matches):
@@ -660,16 +767,10 @@ class GuardrailService:
             before_context = sanitized[max(0, start-30):start].lower()
             after_context = sanitized[end:min(len(sanitized), end+30)].lower()
             
-            # Currency indicators that suggest this is an amount, not an account number
-            currency_indicators = [
-                '₹', 'rs', 'inr', 'rupee', 'rupees', 'lakh', 'crore', 'thousand',
-                'balance', 'amount', 'total', 'sum', 'price', 'cost', 'fee'
-            ]
-            
             # Check if this number is part of an amount
             is_amount = (
-                any(indicator in before_context for indicator in currency_indicators) or
-                any(indicator in after_context for indicator in currency_indicators)
+                any(indicator in before_context for indicator in _CURRENCY_INDICATORS) or
+                any(indicator in after_context for indicator in _CURRENCY_INDICATORS)
             )
             
             # Also check if it's part of structured data patterns (like "Account: 123456789")
@@ -692,28 +793,8 @@ class GuardrailService:
         """Normalize LLM refusal responses to be polite and localized"""
         response_lower = response.lower()
         
-        # Check for refusal patterns
-        refusal_patterns_en = [
-            r"i\s+cannot\s+help",
-            r"i\s+can't\s+help",
-            r"i\s+am\s+unable\s+to",
-            r"i\s+don't\s+have",
-            r"i\s+do\s+not\s+have",
-            r"sorry,\s*i\s+cannot",
-        ]
-        
-        refusal_patterns_hi = [
-            r"मैं\s+नहीं\s+कर\s+सकती",
-            r"मैं\s+असमर्थ\s+हूं",
-            r"मुझे\s+नहीं\s+पता",
-        ]
-        
         # Check if response contains refusal
-        is_refusal = False
-        for pattern in refusal_patterns_en + refusal_patterns_hi:
-            if re.search(pattern, response_lower, re.IGNORECASE):
-                is_refusal = True
-                break
+        is_refusal = bool(_REFUSAL.search(response_lower))
         
         if is_refusal:
             # Replace with polite, localized refusal
@@ -724,97 +805,61 @@ class GuardrailService:
         
         return response
     
-    def _check_toxicity(self, message: str, language: str) -> GuardrailResult:
-        """Check for toxic/harmful content using word boundary matching to avoid false positives"""
-        message_lower = message.lower()
+    def _check_toxicity(
+        self,
+        message: str,
+        language: str,
+        keywords: Optional[KeywordMatches] = None,
+    ) -> GuardrailResult:
+        """
+        Check for toxic/harmful content
+        
+        Single-word keywords must match whole words to avoid false positives
+        ("hell" in "hello"); phrases match anywhere.
+        
+        Args:
+            message: Text to check
+            language: Language code (en-IN or hi-IN)
+            keywords: Existing scan of the text; user messages default to the turn's shared scan
+        """
+        if keywords is None:
+            keywords = extract_message_features(message).keywords
         
         # Check against language-specific keywords
         if language == "hi-IN":
-            # Check Devanagari keywords (use word boundary for multi-word phrases)
-            for keyword in self.toxic_keywords_hi:
-                # For single words, use word boundary; for phrases, use simple containment
-                if len(keyword.split()) == 1:
-                    # Single word: use word boundary to avoid false positives (e.g., "hell" in "hello")
-                    pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                    if pattern.search(message):
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message=(
-                                "आपके संदेश में अनुचित सामग्री है। कृपया अपना प्रश्न दोबारा बताएं।"
-                                if language == "hi-IN"
-                                else "Your message contains inappropriate content. Please rephrase."
-                            ),
-                            confidence=0.8
-                        )
-                else:
-                    # Multi-word phrase: use simple containment
-                    if keyword in message:
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message=(
-                                "आपके संदेश में अनुचित सामग्री है। कृपया अपना प्रश्न दोबारा बताएं।"
-                                if language == "hi-IN"
-                                else "Your message contains inappropriate content. Please rephrase."
-                            ),
-                            confidence=0.8
-                        )
-            
-            # Check Romanized Hindi keywords
-            for keyword in self.toxic_keywords_romanized_hi:
-                if len(keyword.split()) == 1:
-                    pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                    if pattern.search(message_lower):
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message=(
-                                "आपके संदेश में अनुचित सामग्री है। कृपया अपना प्रश्न दोबारा बताएं।"
-                                if language == "hi-IN"
-                                else "Your message contains inappropriate content. Please rephrase."
-                            ),
-                            confidence=0.7
-                        )
-                else:
-                    if keyword in message_lower:
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message=(
-                                "आपके संदेश में अनुचित सामग्री है। कृपया अपना प्रश्न दोबारा बताएं।"
-                                if language == "hi-IN"
-                                else "Your message contains inappropriate content. Please rephrase."
-                            ),
-                            confidence=0.7
-                        )
-        else:  # English
-            for keyword in self.toxic_keywords_en:
-                if len(keyword.split()) == 1:
-                    # Single word: use word boundary to avoid false positives
-                    # Example: "hell" should match "go to hell" but NOT "hello"
-                    pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                    if pattern.search(message_lower):
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message="Your message contains inappropriate content. Please rephrase.",
-                            confidence=0.8
-                        )
-                else:
-                    # Multi-word phrase: use simple containment
-                    if keyword in message_lower:
-                        return GuardrailResult(
-                            passed=False,
-                            violation_type=GuardrailViolationType.TOXIC_CONTENT,
-                            message="Your message contains inappropriate content. Please rephrase.",
-                            confidence=0.8
-                        )
+            hindi_message = "आपके संदेश में अनुचित सामग्री है। कृपया अपना प्रश्न दोबारा बताएं।"
+            # Devanagari keywords
+            if keywords.has("toxic_hi"):
+                return GuardrailResult(
+                    passed=False,
+                    violation_type=GuardrailViolationType.TOXIC_CONTENT,
+                    message=hindi_message,
+                    confidence=0.8
+                )
+            # Romanized Hindi keywords
+            if keywords.has("toxic_romanized_hi"):
+                return GuardrailResult(
+                    passed=False,
+                    violation_type=GuardrailViolationType.TOXIC_CONTENT,
+                    message=hindi_message,
+                    confidence=0.7
+                )
+        elif keywords.has("toxic_en"):
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.TOXIC_CONTENT,
+                message="Your message contains inappropriate content. Please rephrase.",
+                confidence=0.8
+            )
         
         return GuardrailResult(passed=True)
     
     def _check_pii(self, message: str, language: str) -> GuardrailResult:
         """Detect PII in message"""
+        # One combined scan clears PII-free messages; only hits are attributed per entity type
+        if self._pii_scan.search(message) is None:
+            return GuardrailResult(passed=True)
+        
         detected_entities = []
         entity_types = []
         
@@ -854,21 +899,20 @@ class GuardrailService:
     
     def _check_prompt_injection(self, message: str, language: str) -> GuardrailResult:
         """Detect prompt injection attempts"""
-        message_lower = message.lower()
-        
-        for pattern in self.injection_patterns:
-            if pattern.search(message):
-                if language == "hi-IN":
-                    message_text = "आपका अनुरोध संसाधित नहीं किया जा सका। कृपया अपना प्रश्न दोबारा बताएं।"
-                else:
-                    message_text = "Your request could not be processed. Please rephrase your question."
-                
-                return GuardrailResult(
-                    passed=False,
-                    violation_type=GuardrailViolationType.PROMPT_INJECTION,
-                    message=message_text,
-                    confidence=0.85
-                )
+        pattern = self._injection_scan.search(message.lower())
+        if pattern:
+            if language == "hi-IN":
+                message_text = "आपका अनुरोध संसाधित नहीं किया जा सका। कृपया अपना प्रश्न दोबारा बताएं।"
+            else:
+                message_text = "Your request could not be processed. Please rephrase your question."
+            
+            return GuardrailResult(
+                passed=False,
+                violation_type=GuardrailViolationType.PROMPT_INJECTION,
+                message=message_text,
+                confidence=0.85,
+                metadata={"pattern": pattern}
+            )
         
         return GuardrailResult(passed=True)
     
@@ -879,8 +923,7 @@ class GuardrailService:
         
         if expected_language == "hi-IN":
             # Check if response contains Devanagari script
-            devanagari_pattern = re.compile(r'[\u0900-\u097F]+')
-            has_devanagari = bool(devanagari_pattern.search(response))
+            has_devanagari = bool(_DEVANAGARI_RUN.search(response))
             
             # Count words
             words = response.split()
@@ -888,7 +931,7 @@ class GuardrailService:
                 return GuardrailResult(passed=True)
             
             # Count English words (Latin script)
-            english_words = len(re.findall(r'\b[a-zA-Z]+\b', response))
+            english_words = len(_LATIN_WORD.findall(response))
             total_words = len(words)
             
             # Calculate ratio
@@ -906,12 +949,11 @@ class GuardrailService:
                     )
         else:  # English expected
             # Check for excessive Hindi/Devanagari
-            devanagari_pattern = re.compile(r'[\u0900-\u097F]+')
-            has_devanagari = bool(devanagari_pattern.search(response))
+            has_devanagari = bool(_DEVANAGARI_RUN.search(response))
             
             if has_devanagari:
                 # Count Devanagari characters
-                devanagari_chars = len(devanagari_pattern.findall(response))
+                devanagari_chars = len(_DEVANAGARI_RUN.findall(response))
                 total_chars = len(response)
                 
                 if total_chars > 0 and devanagari_chars / total_chars > 0.1:  # More than 10% Hindi
@@ -927,49 +969,29 @@ class GuardrailService:
     
     def _check_rate_limit(self, user_id: str) -> GuardrailResult:
         """Check rate limiting for user"""
-        now = time.time()
-        
-        # Get user's request history
-        user_requests = self.rate_limit_store[user_id]
-        
-        # Remove requests older than 1 hour
-        one_hour_ago = now - 3600
-        user_requests = [req_time for req_time in user_requests if req_time > one_hour_ago]
-        self.rate_limit_store[user_id] = user_requests
-        
-        # Check per-minute limit
-        one_minute_ago = now - 60
-        recent_requests = [req_time for req_time in user_requests if req_time > one_minute_ago]
-        
-        if len(recent_requests) >= self.max_requests_per_minute:
-            return GuardrailResult(
-                passed=False,
-                violation_type=GuardrailViolationType.RATE_LIMIT,
-                message="Too many requests. Please wait a moment and try again.",
-                confidence=1.0,
-                metadata={"requests_per_minute": len(recent_requests)}
-            )
-        
-        # Check per-hour limit
-        if len(user_requests) >= self.max_requests_per_hour:
-            return GuardrailResult(
-                passed=False,
-                violation_type=GuardrailViolationType.RATE_LIMIT,
-                message="Too many requests. Please try again later.",
-                confidence=1.0,
-                metadata={"requests_per_hour": len(user_requests)}
-            )
-        
-        # Add current request
-        user_requests.append(now)
-        self.rate_limit_store[user_id] = user_requests
+        decision = self.rate_limiter.hit(user_id)
+        if decision.allowed:
+            return GuardrailResult(passed=True)
         
-        return GuardrailResult(passed=True)
+        if decision.limit.name == "minute":
+            message_text = "Too many requests. Please wait a moment and try again."
+        else:
+            message_text = "Too many requests. Please try again later."
+        
+        return GuardrailResult(
+            passed=False,
+            violation_type=GuardrailViolationType.RATE_LIMIT,
+            message=message_text,
+            confidence=1.0,
+            metadata={
+                f"requests_per_{decision.limit.name}": decision.count,
+                "retry_after_seconds": round(decision.retry_after, 1),
+            }
+        )
     
     def clear_rate_limit(self, user_id: str) -> None:
         """Clear rate limit for a user (useful for testing or admin actions)"""
-        if user_id in self.rate_limit_store:
-            del self.rate_limit_store[user_id]
+        self.rate_limiter.reset(user_id)
 
 
 # Singleton instance
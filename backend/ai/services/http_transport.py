@@ -0,0 +1,202 @@
+"""
+HTTP Transport
+Shared, pooled httpx clients for the upstream LLM APIs, with connection-reuse metrics
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config import settings
+from utils import logger
+
+
+def http2_available() -> bool:
+    """True when the optional h2 package httpx needs for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def http_limits(name: str) -> httpx.Limits:
+    """
+    Connection pool limits for one upstream
+
+    Args:
+        name: Client name, e.g. "ollama"; looked up in settings.http_host_max_connections
+
+    Returns:
+        httpx.Limits for the client's pool
+    """
+    max_connections = settings.http_host_max_connections.get(name, settings.http_max_connections)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(settings.http_max_keepalive_connections, max_connections),
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+class ConnectionMetrics:
+    """Requests sent versus connections opened by one pooled client"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.errors = 0
+        self.http_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_response(self, http_version: str) -> None:
+        with self._lock:
+            self.http_versions[http_version] = self.http_versions.get(http_version, 0) + 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "errors": self.errors,
+            "http_versions": dict(self.http_versions),
+        }
+
+
+class MeteredAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that counts how many requests needed a new connection.
+
+    httpcore reports every TCP connect through the request's "trace"
+    extension, so a request that went out on a kept-alive connection is one
+    that produced no "connection.connect_tcp" event.
+    """
+
+    def __init__(self, metrics: ConnectionMetrics, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                metrics.record_connection()
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        metrics.record_request()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            metrics.record_error()
+            raise
+        metrics.record_response(response.extensions.get("http_version", b"HTTP/1.1").decode("ascii"))
+        return response
+
+    def open_connections(self) -> int:
+        """Connections currently held by the pool (idle or in use)"""
+        return len(self._pool.connections)
+
+
+class HTTPClientRegistry:
+    """
+    One pooled AsyncClient per upstream, shared by every service that calls it.
+
+    Clients are created on first use with the configured pool limits and
+    closed together on application shutdown; a client that was closed is
+    rebuilt on its next use.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, MeteredAsyncTransport] = {}
+        self._metrics: Dict[str, ConnectionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, name: str, **client_kwargs: Any) -> httpx.AsyncClient:
+        """
+        Get or create the shared client for an upstream
+
+        Args:
+            name: Client name, e.g. "ollama" or "openai"
+            **client_kwargs: httpx.AsyncClient options (timeout, headers, ...) used on creation
+
+        Returns:
+            Pooled httpx.AsyncClient
+        """
+        with self._lock:
+            client = self._clients.get(name)
+            if client is not None and not client.is_closed:
+                return client
+
+            http2 = settings.http2_enabled and http2_available()
+            if settings.http2_enabled and not http2:
+                logger.warning("http2_unavailable", client=name, message="Install h2 to enable HTTP/2")
+            metrics = self._metrics.setdefault(name, ConnectionMetrics())
+            limits = http_limits(name)
+            transport = MeteredAsyncTransport(metrics, limits=limits, http2=http2)
+            client = httpx.AsyncClient(transport=transport, **client_kwargs)
+            self._clients[name] = client
+            self._transports[name] = transport
+            logger.info(
+                "http_client_initialized",
+                client=name,
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+                http2=http2,
+            )
+            return client
+
+    async def close_client(self, name: str) -> None:
+        """Close one client, dropping its kept-alive connections"""
+        with self._lock:
+            client = self._clients.pop(name, None)
+            self._transports.pop(name, None)
+        if client is not None:
+            await client.aclose()
+            logger.info("http_client_closed", client=name, **self._metrics[name].stats())
+
+    async def close(self) -> None:
+        """Close every client (application shutdown)"""
+        for name in list(self._clients):
+            await self.close_client(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection-reuse metrics per client for the health endpoint"""
+        stats = {}
+        for name, metrics in self._metrics.items():
+            transport = self._transports.get(name)
+            stats[name] = {
+                **metrics.stats(),
+                "open_connections": transport.open_connections() if transport else 0,
+            }
+        return stats
+
+
+# Singleton instance
+_http_clients: Optional[HTTPClientRegistry] = None
+
+
+def get_http_clients() -> HTTPClientRegistry:
+    """Get or create the shared HTTP client registry"""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HTTPClientRegistry()
+    return _http_clients
@@ -0,0 +1,262 @@
+"""
+Intent Model
+Local nearest-centroid intent classifier over the shared sentence-transformer embeddings,
+used before the LLM for utterances the keyword rules do not cover
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from utils import logger
+
+
+# Labelled utterances per intent, derived from the classifier's keyword rules,
+# the examples in its LLM prompt and the routing test fixtures
+INTENT_EXAMPLES: Dict[str, Tuple[str, ...]] = {
+    "greeting": (
+        "hi", "hello", "hey there", "good morning", "good evening", "namaste",
+        "how are you", "hello, how are you doing today", "namaste ji", "kaise ho",
+        "नमस्ते", "नमस्कार", "आप कैसे हैं", "सुप्रभात",
+    ),
+    "feedback": (
+        "I want to file a complaint", "your service is very slow", "the app keeps crashing",
+        "I have a suggestion for the bank", "I am not happy with the customer service",
+        "thank you, that was helpful", "great service, thanks", "I want to give feedback",
+        "mujhe shikayat darj karni hai", "service bahut kharab hai",
+        "मुझे शिकायत दर्ज करनी है", "आपकी सेवा बहुत धीमी है", "मेरा एक सुझाव है", "धन्यवाद, बहुत मदद मिली",
+    ),
+    "general_faq": (
+        "What is the interest rate for savings account?", "what are your branch timings",
+        "where is the nearest branch", "what is the IFSC code of my branch",
+        "which documents are needed to open an account", "how do I open a fixed deposit",
+        "what is the minimum balance for a savings account", "tell me about your credit cards",
+        "what services does the bank offer", "is the bank open on saturday",
+        "FD rates kya hain", "branch kab khulta hai",
+        "बचत खाते पर ब्याज दर क्या है", "नजदीकी शाखा कहाँ है", "खाता खोलने के लिए कौन से दस्तावेज चाहिए",
+    ),
+    "banking_operation": (
+        "What is my account balance?", "Check balance", "show my recent transactions",
+        "show my last five transactions", "download my bank statement", "I need my account statement",
+        "set a reminder to pay rent", "show my reminders", "transfer money to my savings account",
+        "block my debit card", "update my mobile number", "mini statement please",
+        "Mera account balance kitna hai", "pichle mahine ka statement nikalna hai",
+        "मेरा खाते का बैलेंस क्या है?", "मेरे पिछले लेनदेन दिखाओ", "स्टेटमेंट डाउनलोड करें",
+    ),
+    "language_change": (
+        "change language to Hindi", "switch to English", "can you talk in hindi",
+        "please reply in english", "I prefer hindi", "hindi mein baat karo", "english mein bolo",
+        "भाषा बदलें", "अंग्रेजी में बोलें", "हिंदी में बोलें", "कृपया हिंदी में जवाब दें",
+    ),
+    "upi_payment": (
+        "pay via UPI", "UPI payment", "send money via UPI", "pay 500 rupees to Rahul via UPI",
+        "scan and pay", "pay using my VPA", "Transfer 100 rupees",
+        "यूपीआई से पैसे ट्रांसफर करें", "यूपीआई से भुगतान", "यूपीआई से पैसे भेजें",
+    ),
+    "other": (
+        "what is the weather today", "tell me a joke", "who won the cricket match",
+        "ok", "hmm", "I don't know", "what can you do", "are you a robot",
+        "mausam kaisa hai", "koi gaana sunao", "आज मौसम कैसा है", "एक चुटकुला सुनाओ",
+    ),
+}
+
+# Softmax temperatures tried when calibrating confidence on held-out examples
+_TEMPERATURE_GRID = tuple(np.round(np.geomspace(0.005, 0.5, 40), 4))
+
+
+@dataclass
+class IntentPrediction:
+    """Most likely intent with its calibrated probability"""
+
+    intent: str
+    confidence: float
+    similarity: float  # Cosine similarity to the winning centroid
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _softmax(scores: np.ndarray, temperature: float) -> np.ndarray:
+    logits = scores / temperature
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    weights = np.exp(logits)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+class IntentModel:
+    """
+    Nearest-centroid classifier over normalized sentence embeddings.
+
+    Each intent is the mean of its example embeddings. Cosine similarities
+    to the centroids are turned into probabilities with a softmax whose
+    temperature is fitted by leave-one-out on the examples, so the reported
+    confidence tracks how often a prediction at that level is correct.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        examples: Optional[Dict[str, Sequence[str]]] = None,
+        temperature: Optional[float] = None,
+    ):
+        self._embeddings = embeddings
+        self.examples = examples if examples is not None else INTENT_EXAMPLES
+        self.temperature = temperature
+        self.labels: List[str] = list(self.examples.keys())
+        self._centroids: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            from services.embedding_service import get_embedding_registry
+
+            # Shares the encoder already loaded for the RAG collections
+            self._embeddings = get_embedding_registry().acquire()
+        return self._embeddings
+
+    def fit(self) -> "IntentModel":
+        """Embed the examples, build the centroids and calibrate the temperature"""
+        with self._lock:
+            if self._centroids is not None:
+                return self
+            start = time.perf_counter()
+            texts = [text for label in self.labels for text in self.examples[label]]
+            targets = np.array([i for i, label in enumerate(self.labels) for _ in self.examples[label]])
+            vectors = _normalize_rows(np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32))
+
+            sums = np.vstack([vectors[targets == i].sum(axis=0) for i in range(len(self.labels))])
+            counts = np.bincount(targets, minlength=len(self.labels)).astype(np.float32)
+            self._centroids = _normalize_rows(sums / counts[:, None])
+            if self.temperature is None:
+                self.temperature = self._calibrate(vectors, targets, sums, counts)
+
+            logger.info(
+                "intent_model_fitted",
+                intents=len(self.labels),
+                examples=len(texts),
+                temperature=self.temperature,
+                fit_seconds=round(time.perf_counter() - start, 3),
+            )
+        return self
+
+    def _calibrate(self, vectors: np.ndarray, targets: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> float:
+        """Pick the softmax temperature minimizing leave-one-out negative log-likelihood"""
+        scores = vectors @ _normalize_rows(sums / counts[:, None]).T
+        rows = np.arange(len(targets))
+        # Score each example against its own centroid with the example left out
+        held_out = counts[targets] > 1
+        own = (sums[targets] - vectors) / np.maximum(counts[targets] - 1, 1)[:, None]
+        scores[rows[held_out], targets[held_out]] = np.sum(
+            vectors[held_out] * _normalize_rows(own[held_out]), axis=1
+        )
+
+        best_temperature, best_nll = float(_TEMPERATURE_GRID[0]), float("inf")
+        for temperature in _TEMPERATURE_GRID:
+            probabilities = _softmax(scores, float(temperature))[rows, targets]
+            nll = float(-np.mean(np.log(np.maximum(probabilities, 1e-12))))
+            if nll < best_nll:
+                best_temperature, best_nll = float(temperature), nll
+        return best_temperature
+
+    def predict(self, text: str) -> IntentPrediction:
+        """
+        Classify one utterance
+
+        Args:
+            text: User message
+
+        Returns:
+            IntentPrediction for the closest intent centroid
+        """
+        if self._centroids is None:
+            self.fit()
+        vector = _normalize_rows(np.asarray(self.embeddings.embed_query(text), dtype=np.float32))
+        similarities = self._centroids @ vector
+        probabilities = _softmax(similarities, self.temperature)
+        best = int(np.argmax(probabilities))
+        return IntentPrediction(
+            intent=self.labels[best],
+            confidence=round(float(probabilities[best]), 4),
+            similarity=round(float(similarities[best]), 4),
+        )
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        """predict() on the retrieval executor so the encoder never blocks the event loop"""
+        from services.rag_service import get_retrieval_executor
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_retrieval_executor(), self.predict, text)
+
+
+class IntentRoutingMetrics:
+    """Counts and latency percentiles of classify_intent, per decision route"""
+
+    # Routes: keyword rules, the local model, and the LLM fallback
+    ROUTES = ("rule", "model", "llm")
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {route: 0 for route in self.ROUTES}
+        self._latencies: Dict[str, Deque[float]] = {
+            route: deque(maxlen=self.LATENCY_SAMPLES) for route in self.ROUTES
+        }
+
+    def record(self, route: str, latency_ms: float) -> None:
+        with self._lock:
+            self._counts[route] += 1
+            self._latencies[route].append(latency_ms)
+
+    @staticmethod
+    def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+        ordered = sorted(samples)
+        return {
+            "p50_ms": round(ordered[len(ordered) // 2], 1) if ordered else 0.0,
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else 0.0,
+        }
+
+    def stats(self) -> Dict[str, object]:
+        """Escalation rate and latency percentiles for health/metrics endpoints"""
+        with self._lock:
+            total = sum(self._counts.values())
+            # Turns the keyword rules did not settle are the ones the model can save
+            unmatched = self._counts["model"] + self._counts["llm"]
+            return {
+                "classified": total,
+                "llm_escalation_rate": round(self._counts["llm"] / total, 4) if total else 0.0,
+                "unmatched_llm_escalation_rate": round(self._counts["llm"] / unmatched, 4) if unmatched else 0.0,
+                "routes": {
+                    route: {"count": self._counts[route], **self._percentiles(self._latencies[route])}
+                    for route in self.ROUTES
+                },
+                "overall": self._percentiles([ms for route in self.ROUTES for ms in self._latencies[route]]),
+            }
+
+
+# Singleton instances
+_intent_model: Optional[IntentModel] = None
+_intent_metrics: Optional[IntentRoutingMetrics] = None
+
+
+def get_intent_model() -> IntentModel:
+    """Get or create the intent model (fitted on first prediction)"""
+    global _intent_model
+    if _intent_model is None:
+        _intent_model = IntentModel()
+    return _intent_model
+
+
+def get_intent_metrics() -> IntentRoutingMetrics:
+    """Get or create the intent routing metrics"""
+    global _intent_metrics
+    if _intent_metrics is None:
+        _intent_metrics = IntentRoutingMetrics()
+    return _intent_metrics
@@ -8,6 +8,7 @@ are configured.
 Usage: called from LLMService.chat() when tracing is enabled.
 """
 
+from functools import lru_cache
 from typing import List, Dict
 
 from anyio.to_thread import run_sync
@@ -15,10 +16,16 @@ from langchain_ollama import ChatOllama
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from config import settings
+from .http_transport import http_limits
 
 
+@lru_cache(maxsize=None)
 def _build_model(use_fast_model: bool) -> ChatOllama:
-    """Create a ChatOllama instance using settings and fast/slow model flag."""
+    """Create a ChatOllama instance using settings and fast/slow model flag.
+
+    Instances are cached so every traced call reuses the same underlying
+    httpx client (and its kept-alive connections to the Ollama server).
+    """
 
     model_name = settings.ollama_fast_model if use_fast_model else settings.ollama_model
 
@@ -26,6 +33,7 @@ def _build_model(use_fast_model: bool) -> ChatOllama:
         base_url=settings.ollama_base_url,
         model=model_name,
         temperature=settings.llm_temperature,
+        client_kwargs={"limits": http_limits("ollama")},
     )
 
 
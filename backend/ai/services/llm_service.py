@@ -2,11 +2,19 @@
 Unified LLM Service
 Provides a single interface to switch between Ollama (local) and OpenAI (cloud)
 """
-from typing import List, Dict, Optional, AsyncGenerator
-from enum import Enum
+from typing import Any, List, Dict, Optional, AsyncGenerator, AsyncIterator, Awaitable, Callable
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import Enum, IntEnum
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import json
 import time
 from config import settings
-from utils import logger
+from utils import logger, LLMOverloadedError
 from utils.demo_logging import demo_logger
 from .ollama_service import OllamaService
 from .openai_service import OpenAIService
@@ -19,6 +27,322 @@ class LLMProvider(str, Enum):
     OPENAI = "openai"  # OpenAI GPT models
 
 
+class LLMPriority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first"""
+    VOICE_ANSWER = 0  # Final answer of a voice-mode turn (the user is waiting on speech)
+    ANSWER = 1  # Final answer of a text turn
+    CLASSIFICATION = 2  # Intent classification and short fast-model extractions
+    BACKGROUND = 3  # Card JSON extraction that only enriches an answer
+
+
+def answer_priority(voice_mode: Optional[bool]) -> LLMPriority:
+    """Priority for a turn's final answer"""
+    return LLMPriority.VOICE_ANSWER if voice_mode else LLMPriority.ANSWER
+
+
+class _ModelLane:
+    """Concurrency slots and waiting calls for one model"""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = max(1, slots)
+        self.active = 0
+        # (priority, arrival sequence, future): FIFO within a priority class
+        self.waiters: List[Any] = []
+
+    def queued(self, up_to: Optional[LLMPriority] = None) -> int:
+        # A promoted call has an entry per priority it was queued at; count it once
+        return len({
+            id(future) for priority, _, future in self.waiters
+            if not future.done() and (up_to is None or priority <= up_to)
+        })
+
+
+class SlotTicket:
+    """A call's scheduling class, which a coalesced higher-priority caller may raise while it waits"""
+
+    def __init__(self, priority: LLMPriority) -> None:
+        self.priority = priority
+        self.lane: Optional[_ModelLane] = None
+        self.future: Optional["asyncio.Future[None]"] = None
+
+
+class LLMScheduler:
+    """
+    Priority-aware admission control in front of the LLM provider.
+
+    Each model gets a fixed number of concurrent slots; when they are all
+    busy, calls wait in a per-model priority queue. A call is shed with
+    LLMOverloadedError instead of queued once too many calls of the same or
+    higher priority are already waiting ahead of it, so a burst of background
+    extraction never delays voice answers and an overloaded server fails fast
+    instead of slowing every turn down together.
+    """
+
+    WAIT_SAMPLES = 512
+
+    def __init__(
+        self,
+        default_slots: Optional[int] = None,
+        model_slots: Optional[Dict[str, int]] = None,
+        queue_limits: Optional[Dict[LLMPriority, int]] = None,
+    ):
+        self.default_slots = default_slots if default_slots is not None else settings.llm_max_concurrent_requests
+        self.model_slots = dict(model_slots if model_slots is not None else settings.llm_model_slots)
+        if queue_limits is None:
+            queue_limits = {priority: settings.llm_max_queue_depth for priority in LLMPriority}
+            queue_limits[LLMPriority.BACKGROUND] = settings.llm_background_max_queue_depth
+        self.queue_limits = queue_limits
+        self._lanes: Dict[str, _ModelLane] = {}
+        self._sequence = itertools.count()
+        self._waits: Dict[LLMPriority, deque] = {p: deque(maxlen=self.WAIT_SAMPLES) for p in LLMPriority}
+        self._admitted: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+        self._shed: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+
+    def _lane(self, model: str) -> _ModelLane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            lane = self._lanes[model] = _ModelLane(self.model_slots.get(model, self.default_slots))
+        return lane
+
+    @asynccontextmanager
+    async def slot(
+        self, model: str, priority: LLMPriority, ticket: Optional[SlotTicket] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold one of ``model``'s slots for the duration of the block
+
+        Args:
+            model: Model whose slot is taken
+            priority: Scheduling class of the call
+            ticket: Lets promote() raise the priority while the call is queued;
+                    its priority is used if it was promoted before the call queued
+
+        Raises:
+            LLMOverloadedError: If the call was shed instead of queued
+        """
+        if ticket is not None:
+            priority = min(priority, ticket.priority)
+        await self._acquire(model, priority, ticket)
+        try:
+            yield
+        finally:
+            self._release(model)
+
+    async def _acquire(self, model: str, priority: LLMPriority, ticket: Optional[SlotTicket] = None) -> None:
+        lane = self._lane(model)
+        if lane.active < lane.slots and not lane.queued():
+            lane.active += 1
+            self._record_wait(priority, 0.0)
+            return
+
+        ahead = lane.queued(up_to=priority)
+        if ahead >= self.queue_limits[priority]:
+            self._shed[priority] += 1
+            logger.warning("llm_request_shed", model=model, priority=priority.name, queued_ahead=ahead)
+            raise LLMOverloadedError(f"LLM queue for {model} is full ({ahead} {priority.name} or higher waiting)")
+
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.waiters, (priority, next(self._sequence), future))
+        if ticket is not None:
+            ticket.priority, ticket.lane, ticket.future = priority, lane, future
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation landed
+            if future.done() and not future.cancelled():
+                self._release(model)
+            raise
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._record_wait(priority, wait_ms)
+        logger.info(
+            "llm_queue_wait",
+            model=model,
+            priority=priority.name,
+            wait_ms=round(wait_ms, 1),
+            still_queued=lane.queued(),
+        )
+
+    def promote(self, ticket: SlotTicket, priority: LLMPriority) -> None:
+        """Serve a call at ``priority`` if that is higher than the one it was queued at"""
+        if priority >= ticket.priority:
+            return
+        ticket.priority = priority
+        if ticket.future is not None and not ticket.future.done():
+            # The old entry stays in the heap and is skipped once the future is resolved
+            heapq.heappush(ticket.lane.waiters, (priority, next(self._sequence), ticket.future))
+
+    def _release(self, model: str) -> None:
+        lane = self._lane(model)
+        lane.active -= 1
+        while lane.waiters:
+            _, _, future = heapq.heappop(lane.waiters)
+            if not future.done():
+                lane.active += 1
+                future.set_result(None)
+                break
+
+    def _record_wait(self, priority: LLMPriority, wait_ms: float) -> None:
+        self._admitted[priority] += 1
+        self._waits[priority].append(wait_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, shed counts and queue-wait percentiles for health/metrics endpoints"""
+        priorities = {}
+        for priority in LLMPriority:
+            waits = sorted(self._waits[priority])
+            priorities[priority.name.lower()] = {
+                "admitted": self._admitted[priority],
+                "shed": self._shed[priority],
+                "p50_wait_ms": round(waits[len(waits) // 2], 1) if waits else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 1) if waits else 0.0,
+                "max_wait_ms": round(waits[-1], 1) if waits else 0.0,
+            }
+        return {
+            "models": {
+                model: {"slots": lane.slots, "active": lane.active, "queued": lane.queued()}
+                for model, lane in self._lanes.items()
+            },
+            "priorities": priorities,
+        }
+
+
+class _Flight:
+    """One upstream call shared by every caller that asked for the same prompt"""
+
+    def __init__(
+        self,
+        task: "asyncio.Task[str]",
+        priority: Optional[LLMPriority] = None,
+        promote: Optional[Callable[[LLMPriority], None]] = None,
+    ) -> None:
+        self.task = task
+        self.waiters = 0
+        self.priority = priority
+        self.promote = promote
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight LLM calls and caches deterministic results.
+
+    Concurrent calls with the same key share one upstream request: the first
+    caller starts it and later callers await the same task. A caller with a
+    higher priority than the in-flight call promotes it, so it never waits at
+    the priority of whoever asked first. The upstream call is only cancelled
+    once every caller waiting on it has gone away. Results of temperature-0
+    calls are additionally kept for a short TTL.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.llm_result_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.llm_result_cache_max_entries
+        self._flights: Dict[str, _Flight] = {}
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self.calls = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def key(model: str, messages: List[Any], temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """Stable hash of everything that determines the upstream response"""
+        normalized = [
+            [message.get("role"), message.get("content")] if isinstance(message, dict)
+            else [type(message).__name__, getattr(message, "content", str(message))]
+            for message in messages
+        ]
+        payload = json.dumps([model, normalized, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Optional[str]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return result
+
+    def _store(self, key: str, result: str) -> None:
+        self._results[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[str]],
+        cacheable: bool = False,
+        priority: Optional[LLMPriority] = None,
+        promote: Optional[Callable[[LLMPriority], None]] = None,
+    ) -> str:
+        """
+        Run ``call`` unless an identical call is in flight or cached
+
+        Args:
+            key: Key from key()
+            call: Starts the upstream request
+            cacheable: Keep the result for ttl_seconds (deterministic prompts only)
+            priority: Scheduling class of this caller
+            promote: Raises the priority of ``call`` if a higher-priority caller joins it
+
+        Returns:
+            The upstream response, shared with other callers of the same key
+        """
+        self.calls += 1
+        if cacheable and self.ttl_seconds > 0:
+            cached = self._cached(key)
+            if cached is not None:
+                self.cache_hits += 1
+                logger.debug("llm_result_cache_hit", key=key[:12])
+                return cached
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(call()), priority, promote)
+
+            def finished(task: "asyncio.Task[str]", key: str = key) -> None:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                succeeded = not task.cancelled() and task.exception() is None
+                if succeeded and cacheable and self.ttl_seconds > 0:
+                    self._store(key, task.result())
+
+            flight.task.add_done_callback(finished)
+        else:
+            self.coalesced += 1
+            logger.info("llm_request_coalesced", key=key[:12], waiters=flight.waiters + 1)
+            if priority is not None and flight.priority is not None and priority < flight.priority:
+                flight.priority = priority
+                if flight.promote is not None:
+                    flight.promote(priority)
+                logger.info("llm_request_promoted", key=key[:12], priority=priority.name)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for health/metrics endpoints"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "in_flight": len(self._flights),
+            "cached_results": len(self._results),
+        }
+
+
 class LLMService:
     """
     Unified service for LLM interactions.
@@ -49,6 +373,15 @@ class LLMService:
             logger.info("llm_service_initialized", provider="openai (cloud)")
         else:
             raise ValueError(f"Unknown LLM provider: {self.provider}")
+        
+        self.scheduler = LLMScheduler()
+        self.single_flight = SingleFlight()
+    
+    def model_name(self, use_fast_model: bool) -> str:
+        """Name of the model a call runs on (and whose scheduler slots it occupies)"""
+        if use_fast_model and getattr(self.service, "fast_model", None):
+            return self.service.fast_model
+        return getattr(self.service, "model", self.provider.value)
     
     async def chat(
         self,
@@ -56,6 +389,9 @@ class LLMService:
         use_fast_model: bool = False,
         temperature: float = None,
         max_tokens: int = None,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        priority: Optional[LLMPriority] = None,
+        fallback: Optional[str] = None,
     ) -> str:
         """
         Send chat request to configured LLM provider
@@ -65,10 +401,54 @@ class LLMService:
             use_fast_model: Use faster/cheaper model (only for Ollama)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            on_token: If given, the response is streamed and each chunk is passed
+                      to this callback as it arrives (used by SSE chat streaming)
+            priority: Scheduling class; defaults to CLASSIFICATION for the fast
+                      model and ANSWER otherwise
+            fallback: Returned immediately if the scheduler sheds the call; if
+                      None, LLMOverloadedError is raised instead
+            
+        Identical concurrent non-streamed calls share one upstream request,
+        and temperature-0 results are reused for llm_result_cache_ttl_seconds.
             
         Returns:
             Generated text response
         """
+        if priority is None:
+            priority = LLMPriority.CLASSIFICATION if use_fast_model else LLMPriority.ANSWER
+        model = self.model_name(use_fast_model)
+        
+        ticket = SlotTicket(priority)
+        
+        async def scheduled_call() -> str:
+            async with self.scheduler.slot(model, priority, ticket):
+                return await self._chat(messages, use_fast_model, temperature, max_tokens, on_token)
+        
+        try:
+            if on_token is not None or not settings.llm_coalesce_requests:
+                # Streamed answers have a per-turn token sink and cannot be shared
+                return await scheduled_call()
+            return await self.single_flight.run(
+                SingleFlight.key(model, messages, temperature, max_tokens),
+                scheduled_call,
+                cacheable=temperature == 0,
+                priority=priority,
+                promote=functools.partial(self.scheduler.promote, ticket),
+            )
+        except LLMOverloadedError:
+            if fallback is None:
+                raise
+            return fallback
+    
+    async def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        use_fast_model: bool,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        on_token: Optional[Callable[[str], Awaitable[None]]],
+    ) -> str:
+        """Provider call behind chat(), run while holding a scheduler slot"""
         start_time = time.time()
         
         # Log which provider is being used
@@ -92,7 +472,24 @@ class LLMService:
             and bool(getattr(settings, "langchain_api_key", None))
         )
 
-        if use_langsmith_tracing:
+        if on_token is not None:
+            # Streamed turn: forward chunks as they arrive, still return the full text
+            chunks: List[str] = []
+            async for chunk in self.service.chat_stream(
+                messages=messages,
+                use_fast_model=use_fast_model,
+                temperature=temperature,
+            ):
+                if not chunks:
+                    logger.info(
+                        "llm_first_token",
+                        model=model_name,
+                        ttft_ms=round((time.time() - start_time) * 1000, 1),
+                    )
+                chunks.append(chunk)
+                await on_token(chunk)
+            response = "".join(chunks)
+        elif use_langsmith_tracing:
             # Route via LangChain's ChatOllama so LangSmith captures traces
             response = await chat_with_tracing(
                 messages=messages,
@@ -126,6 +523,7 @@ class LLMService:
         messages: List[Dict[str, str]],
         use_fast_model: bool = False,
         temperature: float = None,
+        priority: LLMPriority = LLMPriority.ANSWER,
     ) -> AsyncGenerator[str, None]:
         """
         Stream chat response from configured LLM provider
@@ -134,6 +532,7 @@ class LLMService:
             messages: List of message dicts
             use_fast_model: Use faster/cheaper model (only for Ollama)
             temperature: Sampling temperature
+            priority: Scheduling class; the slot is held until the stream ends
             
         Yields:
             Text chunks as they're generated
@@ -147,12 +546,13 @@ class LLMService:
             message_count=len(messages)
         )
         
-        async for chunk in self.service.chat_stream(
-            messages=messages,
-            use_fast_model=use_fast_model,
-            temperature=temperature,
-        ):
-            yield chunk
+        async with self.scheduler.slot(self.model_name(use_fast_model), priority):
+            async for chunk in self.service.chat_stream(
+                messages=messages,
+                use_fast_model=use_fast_model,
+                temperature=temperature,
+            ):
+                yield chunk
     
     async def generate_embeddings(self, text: str) -> List[float]:
         """
@@ -179,6 +579,10 @@ class LLMService:
         """Close the service client"""
         await self.service.close()
     
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler and request-coalescing metrics for the health endpoint"""
+        return {**self.scheduler.stats(), "single_flight": self.single_flight.stats()}
+    
     def get_provider_name(self) -> str:
         """Get the name of the current provider"""
         return self.provider.value
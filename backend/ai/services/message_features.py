@@ -0,0 +1,603 @@
+"""
+Message Features
+Shared bilingual keyword lexicon and the per-turn feature set (keyword categories, spans,
+amounts, account digits) computed from the user's message in a single automaton pass
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from utils.keyword_automaton import KeywordMatcher, KeywordMatches
+
+
+# --- Intent routing (agents/intent_classifier.py) ---
+
+WAKE_UP_PHRASES = (
+    "hello vaani", "hello upi", "hey vaani", "hey upi",
+    "हेलो वाणी", "हेलो upi", "हेलो यूपीआई",
+)
+
+BALANCE_KEYWORDS = (
+    "balance", "बैलेंस", "kitne paise", "कितने पैसे", "bakaaya", "बकाया", "शेष",
+    "balance check", "kitne paise hain", "bakaaya rashi", "शेष राशि",
+    "account balance", "mera account balance", "kitna hai", "कितना है",
+    "मेरा अकाउंट बैलेंस", "बैलेंस कितना है", "खाता बैलेंस", "बकाया राशि",
+)
+
+TRANSFER_KEYWORDS = (
+    "transfer", "send", "pay", "भेजें", "भुगतान", "ट्रांसफर",
+    "send money", "transfer money", "pay money",
+)
+
+# Product words that mean "answer from the product documents", never a language change
+LOAN_PRODUCT_KEYWORDS = (
+    "loan", "लोन", "ऋण", "mudra", "मुद्रा", "business", "बिजनेस",
+    "home", "होम", "personal", "पर्सनल", "gold", "गोल्ड", "interest", "ब्याज",
+    "ke baare", "के बारे", "bataiye", "बताइए", "batao", "बताओ",
+    "processing fee", "processing charges", "प्रोसेसिंग फीस", "प्रोसेसिंग शुल्क",
+    "fee", "fees", "charges", "शुल्क", "फीस", "rate", "दर", "eligibility", "योग्यता",
+    "investment", "निवेश", "scheme", "स्कीम", "yojana", "योजना", "ppf", "nps", "ssy",
+    "पीपीएफ", "एनपीएस", "सुकन्या",
+)
+
+PRODUCT_OPERATION_KEYWORDS = ("apply", "apply for", "want to take", "लेना चाहते", "apply करना", "apply करें")
+
+LANGUAGE_CHANGE_KEYWORDS = (
+    "change language", "switch language", "set language", "language to english",
+    "language to hindi", "english please", "hindi please", "speak english", "speak hindi",
+    "change to english", "change to hindi", "switch to english", "switch to hindi",
+    "i want to change the language", "i want to switch language",
+    "भाषा बदलें", "भाषा बदलो", "अंग्रेजी में बोलें", "हिंदी में बोलें",
+    "भाषा अंग्रेजी करें", "भाषा हिंदी करें", "अंग्रेजी में बात करें", "हिंदी में बात करें",
+)
+
+REMINDER_KEYWORDS = ("reminder", "remind", "set reminder", "create reminder", "view reminder", "show reminder", "अनुस्मारक")
+
+UPI_KEYWORDS = ("upi", "यूपीआई", "यूपी", "yupi", "you pee", "you p i")
+
+STATEMENT_KEYWORDS = (
+    "statement", "स्टेटमेंट", "bank statement", "account statement",
+    "download", "डाउनलोड", "nikalna", "nikal", "export",
+)
+
+# --- RAG supervisor (agents/rag_agent.py) ---
+
+CUSTOMER_SUPPORT_KEYWORDS = (
+    "customer support", "customer care", "contact", "phone number", "phone", "helpline",
+    "email", "email address", "address", "headquarters", "head office", "branch address",
+    "website", "contact us", "reach us", "get in touch", "support", "customer service",
+    "call", "number", "location", "office address", "help with customer", "need help with",
+    "i need help with customer", "i need customer", "need customer support", "need customer care",
+    "ग्राहक सहायता", "कस्टमर केयर", "संपर्क", "फोन नंबर", "हेल्पलाइन", "ईमेल", "वेबसाइट",
+    "मुझे ग्राहक सहायता", "ग्राहक सहायता की आवश्यकता", "ग्राहक सहायता चाहिए",
+)
+
+# Narrower list: blocks loan follow-ups inferred from conversation context
+SUPPORT_REQUEST_KEYWORDS = (
+    "customer support", "customer care", "contact", "support", "help", "helpline",
+    "ग्राहक सहायता", "कस्टमर केयर", "संपर्क", "सहायता", "मदद",
+)
+
+BANK_INFO_KEYWORDS = (
+    "what is", "who is", "tell me about", "explain", "describe",
+    "national bank", "sun national bank", "sun national", "the bank", "this bank",
+    "your bank", "bank information", "about bank", "about the bank",
+    "क्या है", "कौन है", "बताएं", "समझाएं", "राष्ट्रीय बैंक", "सन नेशनल बैंक",
+    "बैंक के बारे में", "बैंक की जानकारी",
+)
+
+BANK_PRODUCT_KEYWORDS = (
+    "loan", "investment", "scheme", "plan", "product", "service",
+    "ppf", "nps", "ssy", "elss", "fd", "rd", "nsc",
+    "fixed deposit", "recurring deposit", "public provident fund",
+    "national pension", "sukanya", "equity linked", "tax saving",
+    "home loan", "personal loan", "auto loan", "car loan", "business loan",
+    "education loan", "gold loan", "loan against property", "lap",
+    "लोन", "निवेश", "योजना", "उत्पाद", "सेवा",
+    "पीपीएफ", "एनपीएस", "सुकन्या", "ईएलएसएस", "एफडी", "आरडी", "एनएससी",
+    "होम लोन", "पर्सनल लोन", "ऑटो लोन",
+)
+
+OPTION_KEYWORDS = (
+    "options", "option", "choices", "choice", "what do i have", "what are",
+    "show me", "list", "available", "विकल्प", "क्या", "दिखाएं", "सूची",
+)
+
+LOAN_KEYWORDS = (
+    "loan", "interest rate", "emi", "eligibility", "documents required",
+    "home loan", "personal loan", "auto loan", "car loan", "education loan",
+    "business loan", "gold loan", "property loan", "mortgage", "down payment",
+    "processing fee", "prepayment", "tenure", "collateral",
+    # Only counts as a loan query when the conversation already mentions loans
+    "against property",
+    "loan against property",
+    "udhar", "udhaar", "कर्ज", "ऋण", "लोन", "उधार", "उधारी", "ब्याज दर",
+    "होम लोन", "पर्सनल लोन", "ऑटो लोन", "एजुकेशन लोन", "बिजनेस लोन", "गोल्ड लोन",
+)
+
+GENERAL_LOAN_QUERIES = (
+    "what loans", "which loans", "available loans", "types of loans", "loan types",
+    "loan products", "tell me about loans", "loans available", "what kind of loans",
+    "loan options", "loan schemes", "loan information", "loan info", "show me loans",
+    "list loans", "all loans", "i want to borrow", "i want to borrow money", "want to borrow",
+    "want to borrow money", "i need a loan", "i need loan", "need a loan", "need loan",
+    "what options do i have", "what options", "what choices", "what are my options",
+    "what are the options", "show me options", "show options", "loan list",
+    # Hindi general loan queries (only when NO specific loan type is mentioned).
+    # "लोन के बारे में" is deliberately absent: it also matches "होम लोन के बारे में"
+    "कौन से लोन", "कौन सी लोन", "कौन सा लोन", "कौन से ऋण", "कौन सी ऋण", "कौन सा ऋण",
+    "उधार के बारे में", "कर्ज के बारे में", "मुझे लोन चाहिए", "मुझे ऋण चाहिए",
+    "मुझे उधार चाहिए", "मुझे कर्ज चाहिए", "बैंक से उधार", "बैंक से कर्ज", "बैंक से लोन",
+    "बैंक से ऋण", "पैसे उधार", "पैसे कर्ज", "लोन की जानकारी", "लोन जानकारी",
+    "ऋण की जानकारी", "ऋण जानकारी", "मुझे पैसे चाहिए", "मुझे पैसा चाहिए",
+    "क्या विकल्प हैं", "क्या विकल्प", "कौन से विकल्प",
+)
+
+INVESTMENT_KEYWORDS = (
+    "investment", "invest", "scheme", "ppf", "nps", "ssy", "sukanya", "elss",
+    "fixed deposit", "fd", "recurring deposit", "rd", "nsc", "tax saving",
+    "retirement", "pension", "savings", "mutual fund", "public provident fund",
+    "national pension", "sukanya samriddhi", "equity linked", "national savings certificate",
+    "nivesh", "निवेश", "निवेश करना", "योजना", "स्कीम", "पीपीएफ", "एनपीएस", "सुकन्या",
+    "फिक्स्ड डिपॉजिट", "एफडी", "रिकरिंग डिपॉजिट", "आरडी", "टैक्स सेविंग", "बचत",
+    "पेंशन", "रिटायरमेंट",
+)
+
+GENERAL_INVESTMENT_QUERIES = (
+    "what investments", "which investments", "available investments", "investment schemes",
+    "investment types", "investment options", "tell me about investments",
+    "investments available", "what investment schemes", "investment plans",
+    "savings schemes", "tax saving schemes", "show me investment",
+    "investment options available", "i want to invest", "i want to do investment",
+    "want to invest", "want to do investment", "what options do i have", "what options",
+    "what choices", "what are my options", "what are the options", "show me options",
+    "show options", "list investments", "list investment", "investment list",
+    "कौन सी योजना", "कौन सी स्कीम", "कौन से निवेश", "कौन सी निवेश योजना", "निवेश योजना",
+    "निवेश स्कीम", "निवेश के बारे में", "योजना के बारे में", "स्कीम के बारे में",
+    "मुझे निवेश करना है", "पैसे निवेश करना", "पैसे निवेश", "निवेश करने के लिए",
+    "कुछ योजना", "कुछ स्कीम", "कुछ निवेश", "निवेश की जानकारी", "योजना की जानकारी",
+    "स्कीम की जानकारी", "मुझे निवेश करना चाहिए", "मैं निवेश करना चाहता",
+    "मैं निवेश करना चाहती", "क्या विकल्प हैं", "क्या विकल्प", "कौन से विकल्प",
+)
+
+LOAN_TYPE_KEYWORDS: Dict[str, str] = {
+    "home loan": "home_loan",
+    "home_loan": "home_loan",
+    "personal loan": "personal_loan",
+    "personal_loan": "personal_loan",
+    "auto loan": "auto_loan",
+    "auto_loan": "auto_loan",
+    "car loan": "auto_loan",
+    "education loan": "education_loan",
+    "education_loan": "education_loan",
+    "business loan": "business_loan",
+    "business_loan": "business_loan",
+    "gold loan": "gold_loan",
+    "gold_loan": "gold_loan",
+    "loan against property": "loan_against_property",
+    "loan_against_property": "loan_against_property",
+    "property loan": "loan_against_property",
+    "lap": "loan_against_property",
+    "होम लोन": "home_loan",
+    "होमलोन": "home_loan",
+    "पर्सनल लोन": "personal_loan",
+    "पर्सनललोन": "personal_loan",
+    "ऑटो लोन": "auto_loan",
+    "ऑटोलोन": "auto_loan",
+    "एजुकेशन लोन": "education_loan",
+    "एजुकेशनलोन": "education_loan",
+    "बिजनेस लोन": "business_loan",
+    "बिजनेसलोन": "business_loan",
+    "गोल्ड लोन": "gold_loan",
+    "गोल्डलोन": "gold_loan",
+    "प्रॉपर्टी लोन": "loan_against_property",
+    "प्रॉपर्टी के खिलाफ लोन": "loan_against_property",
+}
+
+INVESTMENT_TYPE_KEYWORDS: Dict[str, str] = {
+    "ppf": "ppf",
+    "public provident fund": "ppf",
+    "nps": "nps",
+    "national pension": "nps",
+    "national pension system": "nps",
+    "ssy": "ssy",
+    "sukanya": "ssy",
+    "sukanya samriddhi": "ssy",
+    "sukanya samriddhi yojana": "ssy",
+    "sukanya samridhi": "ssy",
+    "sukanya samridhi yojana": "ssy",
+    "elss": "elss",
+    "tax saving mutual fund": "elss",
+    "equity linked savings scheme": "elss",
+    "fixed deposit": "fd",
+    "fd": "fd",
+    "recurring deposit": "rd",
+    "rd": "rd",
+    "nsc": "nsc",
+    "national savings certificate": "nsc",
+    "पीपीएफ": "ppf",
+    "पब्लिक प्रोविडेंट फंड": "ppf",
+    "एनपीएस": "nps",
+    "नेशनल पेंशन": "nps",
+    "नेशनल पेंशन सिस्टम": "nps",
+    "सुकन्या": "ssy",
+    "सुकन्या समृद्धि": "ssy",
+    "सुकन्या समृद्धि योजना": "ssy",
+    "ईएलएसएस": "elss",
+    "टैक्स सेविंग म्यूचुअल फंड": "elss",
+    "फिक्स्ड डिपॉजिट": "fd",
+    "एफडी": "fd",
+    "रिकरिंग डिपॉजिट": "rd",
+    "आरडी": "rd",
+    "नेशनल सेविंग्स सर्टिफिकेट": "nsc",
+    "एनएससी": "nsc",
+}
+
+# Conversation context words that make "against property" / "property loan" mean a loan
+LOAN_CONTEXT_KEYWORDS = ("loan", "लोन", "ऋण")
+
+# Context words under which a brief message is read as a loan follow-up
+LOAN_FOLLOWUP_CONTEXT_KEYWORDS = ("loan", "लोन", "ऋण", "loans", "products", "options")
+
+# Brief follow-ups to an earlier loan answer, in the order they are tried
+LOAN_FOLLOWUP_TYPES: Dict[str, str] = {
+    "property": "loan_against_property",
+    "gold": "gold_loan",
+    "home": "home_loan",
+    "personal": "personal_loan",
+    "business": "business_loan",
+    "education": "education_loan",
+    "auto": "auto_loan",
+    "car": "auto_loan",  # Names the type, but alone does not make a message a follow-up
+}
+
+# --- Loan agent (agents/rag_agents/loan_agent.py) ---
+
+SUB_LOAN_KEYWORDS: Dict[str, Dict[str, str]] = {
+    "business_loan": {
+        "mudra": "BUSINESS_LOAN_MUDRA",
+        "term loan": "BUSINESS_LOAN_TERM",
+        "term": "BUSINESS_LOAN_TERM",
+        "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
+        "working": "BUSINESS_LOAN_WORKING_CAPITAL",
+        "invoice": "BUSINESS_LOAN_INVOICE",
+        "equipment": "BUSINESS_LOAN_EQUIPMENT",
+        "overdraft": "BUSINESS_LOAN_OVERDRAFT",
+        "मुद्रा": "BUSINESS_LOAN_MUDRA",
+        "टर्म": "BUSINESS_LOAN_TERM",
+        "कार्यशील": "BUSINESS_LOAN_WORKING_CAPITAL",
+    },
+    "home_loan": {
+        "purchase": "HOME_LOAN_PURCHASE",
+        "construction": "HOME_LOAN_CONSTRUCTION",
+        "plot": "HOME_LOAN_PLOT_CONSTRUCTION",
+        "extension": "HOME_LOAN_EXTENSION",
+        "renovation": "HOME_LOAN_RENOVATION",
+        "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
+    },
+}
+
+# --- Guardrails (services/guardrail_service.py) ---
+
+TOXIC_KEYWORDS_EN = (
+    # Profanity (common words)
+    "fuck", "fucking", "fucked", "fucker", "shit", "shitting", "shitted",
+    "damn", "damned", "dammit", "hell", "crap", "ass", "asshole",
+    "bitch", "bastard", "piss", "pissed", "piss off",
+    # Threats
+    "kill you", "hurt you", "attack you", "destroy you", "sue you",
+    "sue", "lawsuit", "legal action", "file complaint",
+    # Hate speech indicators
+    "hate you", "stupid", "idiot", "moron", "fool", "dumb", "dumbass",
+    "retard", "retarded", "imbecile",
+    # Harassment
+    "shut up", "shut your mouth", "be quiet", "shut the fuck up",
+    "fuck off", "go to hell",
+    # Aggressive language
+    "useless", "worthless", "pathetic", "terrible", "worst",
+)
+
+TOXIC_KEYWORDS_HI = (
+    # Profanity
+    "बकवास", "गंदा", "मूर्ख",
+    # Threats
+    "मार दूंगा", "हत्या", "नुकसान",
+    # Hate speech
+    "नफरत", "बेवकूफ", "गधा",
+    # Harassment
+    "चुप रहो", "बंद करो", "खामोश",
+)
+
+TOXIC_KEYWORDS_ROMANIZED_HI = (
+    "bakwas", "ganda", "murkha", "chutiya", "bhosdike", "madarchod",
+    "behenchod", "lund", "gaand", "chut", "bhenchod",
+    "maar dunga", "hate", "stupid", "fuck", "shit",
+    "chup raho", "band karo", "teri maa", "teri behen",
+)
+
+# A banking word anywhere in the message keeps it on topic
+BANKING_KEYWORDS = (
+    "account", "balance", "transaction", "loan", "credit", "debit", "deposit",
+    "withdraw", "transfer", "upi", "payment", "bill", "statement", "interest",
+    "rate", "fd", "rd", "savings", "checking", "bank", "banking",
+    "atm", "card", "pin", "password", "branch", "ifsc", "aadhaar", "pan",
+    "emi", "scheme", "plan", "insurance", "mutual fund", "ppf", "nps",
+    "banking investment", "bank investment", "bank scheme", "bank plan",
+    "elss", "equity linked", "equity linked savings", "sukanya", "ssy", "nsc",
+    "fixed deposit", "recurring deposit", "public provident fund",
+    "national pension", "tax saving", "tax-saving",
+    "home loan", "personal loan", "auto loan", "car loan", "business loan",
+    "education loan", "gold loan", "loan against property", "lap",
+    "खाता", "बैलेंस", "लेनदेन", "लोन", "क्रेडिट", "डेबिट", "जमा",
+    "निकासी", "ट्रांसफर", "यूपीआई", "भुगतान", "बिल", "स्टेटमेंट", "ब्याज",
+    "दर", "निवेश", "एफडी", "आरडी", "बचत", "बैंक", "बैंकिंग",
+    "एटीएम", "कार्ड", "पिन", "पासवर्ड", "शाखा", "आईएफएससी", "आधार", "पैन",
+    "ईएमआई", "योजना", "बीमा", "म्यूचुअल फंड", "पीपीएफ", "एनपीएस",
+    "बैंक निवेश", "बैंक योजना", "बैंक प्लान",
+    "ईएलएसएस", "सुकन्या", "एनएससी", "होम लोन", "पर्सनल लोन", "ऑटो लोन",
+)
+
+NON_BANKING_INVESTMENT_KEYWORDS = (
+    "bitcoin", "btc", "crypto", "cryptocurrency", "ethereum", "eth",
+    "trading", "stock market", "stocks", "shares", "share market",
+    "nft", "blockchain", "defi", "altcoin", "dogecoin", "shiba",
+    "forex", "forex trading", "commodity", "commodities",
+    "air purifier", "amazon", "shopping", "online shopping", "e-commerce",
+    "buy", "purchase", "shop", "shopping at", "buy from",
+    "investment in bitcoin", "investment in crypto", "investment in air purifier",
+    "invest in bitcoin", "invest in crypto", "invest in air purifier",
+)
+
+# Exempts "invest in X" / "buy from X" phrasings that name a bank product
+BANK_INVESTMENT_KEYWORDS = ("bank", "banking", "fd", "rd", "ppf", "nps", "mutual fund", "scheme", "plan")
+
+OFF_TOPIC_KEYWORDS_EN = (
+    # Politics
+    "politics", "political", "election", "vote", "president", "prime minister",
+    "government", "parliament", "congress", "bjp", "modi", "rahul",
+    # Religion
+    "religion", "religious", "hindu", "muslim", "christian", "sikh", "buddhist",
+    "temple", "mosque", "church", "god", "allah", "jesus", "krishna",
+    # Coding/Programming
+    "code", "coding", "programming", "python", "javascript", "java", "c++",
+    "function", "variable", "algorithm", "debug", "compile", "syntax",
+    # Illegal acts
+    "hack", "hacking", "steal", "stealing", "rob", "robbery", "fraud",
+    "scam", "illegal", "crime", "criminal", "drug", "weapon",
+    # General knowledge topics
+    "airplane", "aircraft", "plane", "airport", "flight", "fly", "flying",
+    "weather", "temperature", "rain", "sunny", "cloud", "storm",
+    "sports", "cricket", "football", "soccer", "basketball", "tennis",
+    "movie", "film", "actor", "actress", "cinema", "hollywood",
+    "recipe", "cooking", "food", "restaurant", "cuisine",
+    "science", "physics", "chemistry", "biology", "math", "mathematics",
+    "history", "geography", "country", "capital", "city",
+    "animal", "dog", "cat", "bird", "fish", "wildlife",
+    "car", "vehicle", "bike", "motorcycle", "transport",
+    "what is", "what does", "how does", "tell me about", "explain",
+    # Question patterns that are likely general knowledge
+    "what does a", "what does an", "what is a", "what is an",
+    "how do", "why is", "why are",
+    "who is", "who are", "who was", "who were",
+    # Famous people/sports personalities
+    "ronaldo", "messi", "gandhi", "einstein",
+    "celebrity", "famous", "person", "people",
+)
+
+OFF_TOPIC_KEYWORDS_HI = (
+    "राजनीति", "चुनाव", "सरकार", "धर्म", "मंदिर", "मस्जिद",
+    "कोडिंग", "प्रोग्रामिंग", "अवैध", "अपराध",
+    "विमान", "हवाई जहाज", "मौसम", "खेल", "फिल्म", "खाना",
+    "विज्ञान", "इतिहास", "भूगोल", "जानवर", "गाड़ी",
+)
+
+
+def _longest_first(keywords: Mapping[str, str]) -> Tuple[str, ...]:
+    """Longer phrases win ("home loan" before "loan"); ties keep their listed order"""
+    return tuple(sorted(keywords, key=len, reverse=True))
+
+
+KEYWORD_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "wake_up": WAKE_UP_PHRASES,
+    "balance": BALANCE_KEYWORDS,
+    "transfer": TRANSFER_KEYWORDS,
+    "loan_product": LOAN_PRODUCT_KEYWORDS,
+    "product_operation": PRODUCT_OPERATION_KEYWORDS,
+    "language_change": LANGUAGE_CHANGE_KEYWORDS,
+    "reminder": REMINDER_KEYWORDS,
+    "upi": UPI_KEYWORDS,
+    "statement": STATEMENT_KEYWORDS,
+    "customer_support": CUSTOMER_SUPPORT_KEYWORDS,
+    "support_request": SUPPORT_REQUEST_KEYWORDS,
+    "bank_info": BANK_INFO_KEYWORDS,
+    "bank_product": BANK_PRODUCT_KEYWORDS,
+    "options": OPTION_KEYWORDS,
+    "loan": LOAN_KEYWORDS,
+    "general_loan": GENERAL_LOAN_QUERIES,
+    "investment": INVESTMENT_KEYWORDS,
+    "general_investment": GENERAL_INVESTMENT_QUERIES,
+    "loan_type": _longest_first(LOAN_TYPE_KEYWORDS),
+    "investment_type": _longest_first(INVESTMENT_TYPE_KEYWORDS),
+    "loan_context": LOAN_CONTEXT_KEYWORDS,
+    "loan_followup_context": LOAN_FOLLOWUP_CONTEXT_KEYWORDS,
+    "loan_followup": tuple(LOAN_FOLLOWUP_TYPES),
+    **{f"sub_loan:{loan_type}": _longest_first(keywords) for loan_type, keywords in SUB_LOAN_KEYWORDS.items()},
+    "toxic_en": TOXIC_KEYWORDS_EN,
+    "toxic_hi": TOXIC_KEYWORDS_HI,
+    "toxic_romanized_hi": TOXIC_KEYWORDS_ROMANIZED_HI,
+    "banking": BANKING_KEYWORDS,
+    "non_banking_investment": NON_BANKING_INVESTMENT_KEYWORDS,
+    "bank_investment": BANK_INVESTMENT_KEYWORDS,
+    "off_topic_en": OFF_TOPIC_KEYWORDS_EN,
+    "off_topic_hi": OFF_TOPIC_KEYWORDS_HI,
+}
+
+# Single-word toxic keywords must be whole words ("hell" is not in "hello")
+WHOLE_WORD_CATEGORIES = ("toxic_en", "toxic_hi", "toxic_romanized_hi")
+
+# Same pattern the intent classifier has always used to spot a payment amount
+_HAS_AMOUNT = re.compile(r"\d+|rupees?|rs\.?|₹|hundred|thousand|lakh|crore")
+
+_MULTIPLIERS = {
+    "hundred": 100, "thousand": 1_000, "k": 1_000, "हजार": 1_000, "हज़ार": 1_000,
+    "lakh": 100_000, "lac": 100_000, "लाख": 100_000,
+    "crore": 10_000_000, "cr": 10_000_000, "करोड़": 10_000_000, "करोड": 10_000_000,
+}
+# "₹500", "rs 2,000", "5 lakh", "300 rupees", "2 हजार रुपये"; a bare number is not an amount
+_AMOUNT = re.compile(
+    r"(?:(?<![a-z])(?P<currency>₹|rs\.?|inr)\s*)?"
+    r"(?P<number>\d[\d,]*(?:\.\d+)?)"
+    r"(?:\s*(?P<multiplier>" + "|".join(sorted(_MULTIPLIERS, key=len, reverse=True)) + r")(?![a-z]))?"
+    r"(?P<unit>\s*(?:rupees?|rs\b|inr\b|₹|रुपये|रुपए|रुपया))?"
+)
+# "account 1444", "a/c ending 9012", "खाता 1444", "xx4321"
+_MARKED_ACCOUNT_DIGITS = re.compile(
+    r"(?:account|a/c|acct|खाता|खाते|ending(?:\s+(?:in|with))?|xx+|\*{2,})\s*(?:no\.?|number|नंबर)?\s*(\d{3,18})(?!\d)"
+)
+# Full account numbers quoted on their own
+_LONG_DIGITS = re.compile(r"(?<![\d,.])\d{6,18}(?![\d,.])")
+
+
+def _overlaps(span: Tuple[int, int], spans) -> bool:
+    return any(span[0] < end and start < span[1] for start, end in spans)
+
+
+def _parse_numbers(text: str) -> Tuple[Tuple[float, ...], Tuple[str, ...]]:
+    """Currency amounts and account-number digits mentioned in lower-cased text"""
+    accounts = [(match.span(1), match.group(1)) for match in _MARKED_ACCOUNT_DIGITS.finditer(text)]
+    account_spans = [span for span, _ in accounts]
+
+    amounts = []
+    amount_spans = []
+    for match in _AMOUNT.finditer(text):
+        if not (match.group("currency") or match.group("multiplier") or match.group("unit")):
+            continue
+        if _overlaps(match.span("number"), account_spans):
+            continue
+        value = float(match.group("number").replace(",", "") or 0)
+        amounts.append(value * _MULTIPLIERS.get(match.group("multiplier") or "", 1))
+        amount_spans.append(match.span())
+
+    for match in _LONG_DIGITS.finditer(text):
+        if not _overlaps(match.span(), account_spans + amount_spans):
+            accounts.append((match.span(), match.group()))
+    accounts.sort()
+    return tuple(amounts), tuple(digits for _, digits in accounts)
+
+
+@dataclass(frozen=True)
+class MessageFeatures:
+    """Everything downstream components need to know about a message's wording"""
+
+    message: str
+    keywords: KeywordMatches
+    amounts: Tuple[float, ...]
+    account_digits: Tuple[str, ...]
+    has_amount: bool
+
+    @property
+    def text(self) -> str:
+        """Lower-cased message the keyword spans index into"""
+        return self.keywords.text
+
+    def has(self, *categories: str) -> bool:
+        return self.keywords.has(*categories)
+
+    def matched(self, category: str) -> Tuple[str, ...]:
+        return tuple(self.keywords.keywords(category))
+
+    def first(self, category: str) -> Optional[str]:
+        return self.keywords.first(category)
+
+    def summary(self) -> Dict[str, Any]:
+        """Loggable view: matched keywords per category plus extracted numbers"""
+        return {
+            "categories": {category: self.keywords.keywords(category) for category in sorted(self.keywords.spans)},
+            "amounts": list(self.amounts),
+            "account_digits": list(self.account_digits),
+        }
+
+
+class MessageFeatureExtractor:
+    """
+    Compiles the shared lexicon once and scans each message with it.
+
+    Results are memoized per message text, so the guardrails, the intent
+    classifier and the agents all reuse the one scan made for a turn.
+    """
+
+    def __init__(self, categories: Optional[Mapping[str, Tuple[str, ...]]] = None, cache_size: int = 256):
+        self.matcher = KeywordMatcher(
+            categories if categories is not None else KEYWORD_CATEGORIES,
+            whole_word=[c for c in WHOLE_WORD_CATEGORIES if c in (categories or KEYWORD_CATEGORIES)],
+        )
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, MessageFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def extract(self, message: str) -> MessageFeatures:
+        """
+        Scan a user message once and derive its features
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            MessageFeatures (shared, do not mutate)
+        """
+        with self._lock:
+            features = self._cache.get(message)
+            if features is not None:
+                self._cache.move_to_end(message)
+                return features
+
+        keywords = self.matcher.scan(message)
+        amounts, account_digits = _parse_numbers(keywords.text)
+        features = MessageFeatures(
+            message=message,
+            keywords=keywords,
+            amounts=amounts,
+            account_digits=account_digits,
+            has_amount=bool(_HAS_AMOUNT.search(keywords.text)),
+        )
+        with self._lock:
+            self._cache[message] = features
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return features
+
+    def scan(self, text: str) -> KeywordMatches:
+        """Keyword scan of arbitrary text (context, LLM output) without memoizing it"""
+        return self.matcher.scan(text)
+
+
+# Singleton instance
+_extractor: Optional[MessageFeatureExtractor] = None
+
+
+def get_message_feature_extractor() -> MessageFeatureExtractor:
+    """Get or create the shared feature extractor"""
+    global _extractor
+    if _extractor is None:
+        _extractor = MessageFeatureExtractor()
+    return _extractor
+
+
+def extract_message_features(message: str) -> MessageFeatures:
+    """Features of a user message (memoized, so repeated calls in a turn are free)"""
+    return get_message_feature_extractor().extract(message)
+
+
+def scan_keywords(text: str) -> KeywordMatches:
+    """Scan text that is not the user's message, e.g. conversation context or an LLM answer"""
+    return get_message_feature_extractor().scan(text)
+
+
+def message_features_for(state: Mapping[str, Any], message: str) -> MessageFeatures:
+    """The turn's features from agent state when they describe ``message``, else extract them"""
+    features = state.get("message_features")
+    if isinstance(features, MessageFeatures) and features.message == message:
+        return features
+    return extract_message_features(message)
@@ -10,6 +10,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from config import settings
 from utils.exceptions import OllamaServiceError
 from utils.logging import logger, log_llm_call
+from .http_transport import get_http_clients
 
 
 class OllamaService:
@@ -22,7 +23,6 @@ class OllamaService:
         self.model = settings.ollama_model
         self.fast_model = settings.ollama_fast_model
         self.timeout = settings.ollama_timeout
-        self.client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
         
         logger.info(
             "ollama_service_initialized",
@@ -31,6 +31,11 @@ class OllamaService:
             fast_model=self.fast_model,
         )
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client shared with every other caller of the Ollama server"""
+        return get_http_clients().get_client("ollama", timeout=self.timeout, follow_redirects=True)
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -59,7 +64,7 @@ class OllamaService:
             OllamaServiceError: If request fails
         """
         model = self.fast_model if use_fast_model else self.model
-        temperature = temperature or settings.llm_temperature
+        temperature = temperature if temperature is not None else settings.llm_temperature
         max_tokens = max_tokens or settings.llm_max_tokens
         
         start_time = time.time()
@@ -183,7 +188,7 @@ class OllamaService:
             Text chunks as they're generated
         """
         model = self.fast_model if use_fast_model else self.model
-        temperature = temperature or settings.llm_temperature
+        temperature = temperature if temperature is not None else settings.llm_temperature
         
         try:
             # Ensure messages are in dict format (not LangChain objects)
@@ -293,7 +298,7 @@ class OllamaService:
     
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        await get_http_clients().close_client("ollama")
 
 
 # Create singleton instance
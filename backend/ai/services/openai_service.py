@@ -8,6 +8,7 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 from config import settings
 from utils import logger, log_llm_call, OpenAIServiceError
+from .http_transport import get_http_clients
 
 
 class OpenAIService:
@@ -22,14 +23,6 @@ class OpenAIService:
         if not self.api_key:
             raise OpenAIServiceError("OpenAI API key not configured")
         
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-        )
-        
         logger.info(
             "openai_service_initialized",
             model=self.model,
@@ -37,6 +30,18 @@ class OpenAIService:
             api_key_suffix=f"...{self.api_key[-10:]}" if self.api_key else "None",
         )
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client shared with every other caller of the OpenAI API"""
+        return get_http_clients().get_client(
+            "openai",
+            timeout=self.timeout,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -246,7 +251,7 @@ class OpenAIService:
     
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        await get_http_clients().close_client("openai")
 
 
 # Create singleton instance
@@ -0,0 +1,481 @@
+"""
+Product Card Index
+Precomputed loan/investment product cards parsed from the product PDFs at ingestion time
+"""
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+from config import settings
+from utils import logger
+
+
+# Written next to the collection's other ingest artifacts (manifest, version marker)
+PRODUCT_CARD_INDEX_FILE = "product_cards.json"
+PRODUCT_CARD_INDEX_VERSION = 1
+
+# Same marker RAGService bumps on every ingest that changed the collection
+_COLLECTION_VERSION_FILE = "collection_version"
+
+# Table row labels mapped to card fields, per document language
+_FIELD_LABELS: Dict[str, Dict[str, str]] = {
+    "en-IN": {
+        "interest rate": "interest_rate",
+        "returns": "interest_rate",
+        "loan amount": "amount",
+        "investment amount": "amount",
+        "tenure": "tenure",
+        "processing fee": "processing_fee",
+        "tax benefit": "tax_benefits",
+        "tax benefits": "tax_benefits",
+    },
+    "hi-IN": {
+        "ब्याज दर": "interest_rate",
+        "रिटर्न": "interest_rate",
+        "लोन राशि": "amount",
+        "निवेश राशि": "amount",
+        "अवधि": "tenure",
+        "प्रोसेसिंग शुल्क": "processing_fee",
+        "कर लाभ": "tax_benefits",
+    },
+}
+
+_FEATURE_TABLE_HEADERS = {"feature", "विशेषता"}
+_OVERVIEW_HEADINGS = ("OVERVIEW", "अवलोकन")
+_ELIGIBILITY_HEADINGS = ("ELIGIBILITY", "पात्रता")
+_SUB_TYPE_HEADING = re.compile(r"^TYPES OF\b|के प्रकार$")
+_NUMBERED_ITEM = re.compile(r"^(\d+)\.\s*(.+)$")
+_GUIDE_SUFFIX = re.compile(r"\s*(Product Guide|Scheme Guide|Guide|योजना गाइड|गाइड)$")
+_FILE_SUFFIX = re.compile(r"_(product_guide|scheme_guide|guide)$")
+_AMOUNT_RANGE = re.compile(r"^(Rs\.\s*[\d,.]+(?:\s+[^\s\d(]+)?)\s+(?:to|-|से)\s+(Rs\.\s*[\d,.]+(?:\s+[^\s\d(]+)?)")
+_AMOUNT_BOUND = re.compile(r"^(Minimum|Maximum|न्यूनतम|अधिकतम)\s*:\s*(.+)$")
+_SENTENCE_END = re.compile(r"(?<=[.।])\s")
+_BULLET = re.compile(r"^[\x7f•]\s*")
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f]")
+
+# Page furniture (bank name, running title, footer) sits outside these bounds
+_BODY_TOP = 770.0
+_BODY_BOTTOM = 40.0
+_HEADING_MIN_SIZE = 13.0
+_TITLE_MIN_SIZE = 18.0
+_COLUMN_TOLERANCE = 1.5
+_MAX_FEATURES = 5
+# Table cells wrap at about this many characters; a longer line continues on the next
+_WRAP_WIDTH = 70
+
+# Rows shown in their own card slot rather than repeated under features
+_CARD_SLOT_FIELDS = {
+    "loan": {"interest_rate", "amount", "tenure"},
+    "investment": {"interest_rate", "amount", "tenure", "tax_benefits"},
+}
+
+
+@dataclass
+class _Line:
+    x: float
+    y: float
+    size: float
+    bold: bool
+    text: str
+
+
+@dataclass
+class _Table:
+    columns: List[str]
+    rows: List[Tuple[str, List[List[str]]]] = field(default_factory=list)
+
+
+@dataclass
+class _Section:
+    heading: str
+    lines: List[str] = field(default_factory=list)
+    tables: List[_Table] = field(default_factory=list)
+
+
+@dataclass
+class _Layout:
+    running_title: str = ""
+    sections: List[_Section] = field(default_factory=list)
+
+
+def _page_lines(page) -> Tuple[List[_Line], List[_Line]]:
+    """Text runs of one page as (body lines, page furniture), merging runs that share a baseline and x"""
+    runs: List[_Line] = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if not text.strip():
+            return
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        font = str((font_dict or {}).get("/BaseFont", ""))
+        size = font_size * (tm[0] or 1)
+        text = _CONTROL_CHARS.sub(" ", _BULLET.sub("", text.strip())).strip()
+        if not text:
+            return
+        previous = runs[-1] if runs else None
+        if previous and abs(previous.x - x) < 0.5 and abs(previous.y - y) < 0.5:
+            previous.text = f"{previous.text} {text}"
+            return
+        runs.append(_Line(round(x, 1), round(y, 1), round(size, 1), "Bold" in font, text))
+
+    page.extract_text(visitor_text=visit)
+    body = [run for run in runs if _BODY_BOTTOM < run.y < _BODY_TOP]
+    furniture = [run for run in runs if not _BODY_BOTTOM < run.y < _BODY_TOP]
+    return body, furniture
+
+
+def _read_layout(pdf_path: Path) -> _Layout:
+    """Split a product guide into headed sections holding plain lines and tables"""
+    layout = _Layout()
+    section = _Section(heading="")
+    layout.sections.append(section)
+    table: Optional[_Table] = None
+    column_xs: List[float] = []
+
+    for page in PdfReader(str(pdf_path)).pages:
+        body, furniture = _page_lines(page)
+        if not layout.running_title:
+            # Running title ("Home Loan Product Guide") sits under the larger bank name
+            titles = [line.text for line in furniture if line.y > _BODY_TOP and line.size <= 12]
+            layout.running_title = titles[0] if titles else ""
+
+        for line in body:
+            column = next((i for i, x in enumerate(column_xs) if abs(x - line.x) < _COLUMN_TOLERANCE), None)
+            if table is not None and not line.bold and column is not None:
+                if column == 0:
+                    table.rows.append((line.text, [[] for _ in column_xs[1:]]))
+                elif table.rows:
+                    table.rows[-1][1][column - 1].append(line.text)
+                continue
+            if table is not None and line.bold and column is not None and not table.rows:
+                table.columns.append(line.text)  # Header cell
+                continue
+            table, column_xs = None, []
+
+            if line.size >= _TITLE_MIN_SIZE:
+                continue
+            if line.bold and line.size >= _HEADING_MIN_SIZE:
+                section = _Section(heading=line.text)
+                layout.sections.append(section)
+            elif line.bold and line.size <= 10 and line.x < 75:
+                # Table header row: its cells fix the column positions
+                table = _Table(columns=[line.text])
+                column_xs = [line.x] + [other.x for other in body if other.bold and other.y == line.y and other.x > line.x]
+                section.tables.append(table)
+            else:
+                section.lines.append(line.text)
+    return layout
+
+
+def _product_key(pdf_path: Path) -> str:
+    """home_loan_product_guide.pdf -> home_loan, ppf_scheme_guide.pdf -> ppf"""
+    return _FILE_SUFFIX.sub("", pdf_path.stem.lower())
+
+
+def _cell_text(lines: List[str]) -> str:
+    """Join a cell's lines: wrapped continuations with a space, separate statements with '; '"""
+    text = ""
+    previous = ""
+    for line in lines:
+        if not text:
+            text = line
+        elif line[0] == "(" or line[0].islower() or previous[-1] in "+-," or len(previous) >= _WRAP_WIDTH:
+            text = f"{text} {line}"
+        else:
+            text = f"{text}; {line}"
+        previous = line
+    return text
+
+
+def _row_value(columns: List[str], values: List[List[str]]) -> str:
+    """One string per row; multi-column rows are prefixed by their column header"""
+    if len(values) == 1:
+        return _cell_text(values[0])
+    return "; ".join(f"{column}: {_cell_text(cells)}" for column, cells in zip(columns[1:], values) if cells)
+
+
+def _first_sentence(lines: List[str]) -> str:
+    text = " ".join(lines).strip()
+    return _SENTENCE_END.split(text, maxsplit=1)[0] if text else ""
+
+
+def _find_section(layout: _Layout, markers: Tuple[str, ...]) -> Optional[_Section]:
+    return next((s for s in layout.sections if any(marker in s.heading.upper() for marker in markers)), None)
+
+
+def _eligibility(section: Optional[_Section]) -> str:
+    if section is None:
+        return ""
+    if section.tables:
+        table = section.tables[0]
+        return "; ".join(f"{label}: {_row_value(table.columns, values)}" for label, values in table.rows[:2])
+    return "; ".join(section.lines[:2])
+
+
+def _sub_types(layout: _Layout) -> List[Dict[str, str]]:
+    """Numbered entries of the "TYPES OF ... LOANS" section"""
+    section = next((s for s in layout.sections if _SUB_TYPE_HEADING.search(s.heading)), None)
+    if section is None:
+        return []
+    entries: List[Dict[str, str]] = []
+    for line in section.lines:
+        match = _NUMBERED_ITEM.match(line)
+        if match:
+            name, _, description = match.group(2).partition(":")
+            entries.append({"name": name.strip(), "description": description.strip()})
+        elif entries:
+            entries[-1]["description"] = f"{entries[-1]['description']} {line}".strip()
+    return entries
+
+
+def parse_product_card(pdf_path: Path, language: str, documents_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the product card for one product guide PDF
+
+    Args:
+        pdf_path: Product guide PDF
+        language: Language the PDF is written in ("en-IN" or "hi-IN")
+        documents_type: "loan" or "investment"
+
+    Returns:
+        Card dict in the shape the agents send to the frontend, or None if the
+        PDF has no feature table with an interest rate
+    """
+    layout = _read_layout(pdf_path)
+    feature_table = next(
+        (t for s in layout.sections for t in s.tables if t.columns[0].strip().lower() in _FEATURE_TABLE_HEADERS),
+        None,
+    )
+    if feature_table is None:
+        return None
+
+    labels = _FIELD_LABELS.get(language, _FIELD_LABELS["en-IN"])
+    card: Dict[str, Any] = {"name": _GUIDE_SUFFIX.sub("", layout.running_title).strip()}
+    features: List[str] = []
+    for label, values in feature_table.rows:
+        value = _row_value(feature_table.columns, values)
+        if not value:
+            continue
+        field_name = labels.get(label.strip().lower())
+        if field_name == "amount":
+            _set_amounts(card, feature_table.columns, values, documents_type)
+        elif field_name and field_name not in card:
+            card[field_name] = value
+        if field_name not in _CARD_SLOT_FIELDS[documents_type]:
+            features.append(f"{label}: {value}")
+    if not card.get("interest_rate"):
+        return None
+
+    overview = _find_section(layout, _OVERVIEW_HEADINGS)
+    description = _first_sentence(overview.lines) if overview else ""
+    eligibility = _eligibility(_find_section(layout, _ELIGIBILITY_HEADINGS))
+    for key, value in (("eligibility", eligibility), ("description", description)):
+        if value:
+            card[key] = value
+    if features:
+        card["features"] = features[:_MAX_FEATURES]
+
+    product_key = _product_key(pdf_path)
+    if documents_type == "investment":
+        card["scheme_type"] = product_key.upper()
+    else:
+        card["loan_type"] = product_key.upper()
+        sub_types = _sub_types(layout)
+        if sub_types:
+            card["sub_types"] = sub_types
+    return card
+
+
+def _set_amounts(card: Dict[str, Any], columns: List[str], values: List[List[str]], documents_type: str) -> None:
+    """Fill the amount fields; min/max only when a single cell states the range"""
+    card["loan_amount" if documents_type == "loan" else "investment_amount"] = _row_value(columns, values)
+    if len(values) != 1:
+        return
+    bounds: Dict[str, str] = {}
+    for line in values[0]:
+        match = _AMOUNT_BOUND.match(line)
+        if match:
+            bounds.setdefault("min_amount" if match.group(1) in ("Minimum", "न्यूनतम") else "max_amount", match.group(2))
+    range_match = _AMOUNT_RANGE.match(values[0][0])
+    if range_match and not bounds:
+        bounds = {"min_amount": range_match.group(1), "max_amount": range_match.group(2)}
+    card.update(bounds)
+
+
+def build_product_card_index(
+    documents_path: str,
+    persist_directory: str,
+    language: str,
+    documents_type: str,
+) -> Dict[str, Any]:
+    """
+    Parse every product PDF of a collection and write its card index
+
+    Called by the ingest scripts after a collection sync, so the index carries
+    the collection version the vector store was built at.
+
+    Args:
+        documents_path: Folder with the collection's PDFs
+        persist_directory: Collection persist directory (index is written here)
+        language: Language of the collection ("en-IN" or "hi-IN")
+        documents_type: "loan" or "investment"
+
+    Returns:
+        The written index
+    """
+    started = time.perf_counter()
+    products: Dict[str, Dict[str, Any]] = {}
+    for pdf_path in sorted(Path(documents_path).glob("*.pdf")):
+        try:
+            card = parse_product_card(pdf_path, language, documents_type)
+        except Exception as e:
+            logger.warning("product_card_parse_failed", file=pdf_path.name, error=str(e))
+            continue
+        if card is None:
+            logger.warning("product_card_not_found", file=pdf_path.name)
+            continue
+        products[_product_key(pdf_path)] = card
+
+    index = {
+        "version": PRODUCT_CARD_INDEX_VERSION,
+        "collection_version": _read_collection_version(persist_directory),
+        "language": language,
+        "documents_type": documents_type,
+        "built_at": time.time(),
+        "products": products,
+    }
+    path = Path(persist_directory) / PRODUCT_CARD_INDEX_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+    logger.info(
+        "product_card_index_built",
+        path=str(path),
+        products=len(products),
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return index
+
+
+def _read_collection_version(persist_directory: str) -> str:
+    try:
+        return (Path(persist_directory) / _COLLECTION_VERSION_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return "unversioned"
+
+
+class ProductCardIndex:
+    """
+    Lazily loaded, read-only view of one collection's product_cards.json.
+
+    The file is parsed on first lookup and re-read only when it or the
+    collection's version marker changes. An index whose collection version no
+    longer matches the marker (the PDFs were re-ingested without rebuilding
+    it) is ignored, so callers fall back to retrieval.
+    """
+
+    def __init__(self, persist_directory: str):
+        self.persist_directory = persist_directory
+        self.path = Path(persist_directory) / PRODUCT_CARD_INDEX_FILE
+        self._lock = threading.Lock()
+        self._loaded_stamp: Optional[Tuple[int, int]] = None
+        self._products: Dict[str, Dict[str, Any]] = {}
+
+    def _stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            index_mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+        try:
+            marker_mtime = (Path(self.persist_directory) / _COLLECTION_VERSION_FILE).stat().st_mtime_ns
+        except OSError:
+            marker_mtime = 0
+        return index_mtime, marker_mtime
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        stamp = self._stamp()
+        if stamp is None:
+            self._products, self._loaded_stamp = {}, None
+            return self._products
+        if stamp == self._loaded_stamp:
+            return self._products
+
+        with self._lock:
+            if stamp == self._loaded_stamp:
+                return self._products
+            products: Dict[str, Dict[str, Any]] = {}
+            try:
+                index = json.loads(self.path.read_text(encoding="utf-8"))
+                current_version = _read_collection_version(self.persist_directory)
+                if index.get("version") != PRODUCT_CARD_INDEX_VERSION:
+                    logger.warning("product_card_index_incompatible", path=str(self.path), version=index.get("version"))
+                elif index.get("collection_version") != current_version:
+                    logger.warning(
+                        "product_card_index_stale",
+                        path=str(self.path),
+                        index_version=index.get("collection_version"),
+                        collection_version=current_version,
+                    )
+                else:
+                    products = index.get("products", {})
+            except (OSError, ValueError) as e:
+                logger.warning("product_card_index_load_failed", path=str(self.path), error=str(e))
+            self._products, self._loaded_stamp = products, stamp
+            logger.info("product_card_index_loaded", path=str(self.path), products=len(products))
+        return self._products
+
+    def get(self, product_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Card for a loan/scheme type
+
+        Args:
+            product_type: e.g. "home_loan", "HOME_LOAN", "ppf"
+
+        Returns:
+            A copy of the card (callers may mutate it), or None when not indexed
+        """
+        card = self._load().get(product_type.lower().replace(" ", "_"))
+        return json.loads(json.dumps(card)) if card is not None else None
+
+    def sub_types(self, product_type: str) -> List[Dict[str, str]]:
+        """Sub-loan types listed in a product's guide (empty if none or not indexed)"""
+        card = self._load().get(product_type.lower().replace(" ", "_"))
+        return list(card.get("sub_types", [])) if card else []
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+# Indexes per collection: (documents_type, language) -> ProductCardIndex
+_product_card_indexes: Dict[Tuple[str, str], ProductCardIndex] = {}
+
+
+def get_product_card_index(documents_type: str, language: str) -> Optional[ProductCardIndex]:
+    """
+    Get the product card index of a collection
+
+    Args:
+        documents_type: "loan" or "investment"
+        language: "en-IN" or "hi-IN"
+
+    Returns:
+        ProductCardIndex, or None when the index is disabled
+    """
+    if not settings.product_card_index_enabled:
+        return None
+    language = language if language in ("en-IN", "hi-IN") else "en-IN"
+    key = (documents_type, language)
+    if key not in _product_card_indexes:
+        from services.rag_service import resolve_collection
+
+        _, _, persist_directory = resolve_collection(documents_type, language)
+        _product_card_indexes[key] = ProductCardIndex(persist_directory)
+    return _product_card_indexes[key]
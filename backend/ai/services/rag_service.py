@@ -2,12 +2,19 @@
 RAG (Retrieval-Augmented Generation) Service
 Handles document ingestion, vector storage, and retrieval for Q&A
 """
+import asyncio
+import functools
+import hashlib
 import json
+import multiprocessing
 import os
+import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from langchain_chroma import Chroma
 from langchain_community.document_loaders import PyPDFLoader
@@ -15,31 +22,166 @@ from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from config import settings
 from utils import logger
 from utils.demo_logging import demo_logger
+from services.embedding_service import get_embedding_registry
 from services.semantic_chunker import SemanticChunker
 
 
 class OllamaEmbeddings(Embeddings):
     """Custom Ollama embeddings wrapper"""
     
-    def __init__(self, model: str = "nomic-embed-text"):
+    def __init__(self, model: str = "nomic-embed-text", batch_size: int = 32):
         import ollama
         self.model = model
         self.client = ollama
+        self.batch_size = batch_size
         
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of documents"""
+        """Embed a list of documents (one HTTP call per batch, not per text)"""
         embeddings = []
-        for text in texts:
-            response = self.client.embed(model=self.model, input=text)
-            embeddings.append(response['embedding'])
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = self.client.embed(model=self.model, input=batch)
+            embeddings.extend(response['embeddings'])
         return embeddings
     
     def embed_query(self, text: str) -> List[float]:
         """Embed a single query"""
         response = self.client.embed(model=self.model, input=text)
-        return response['embedding']
+        return response['embeddings'][0]
+
+
+# Marker file written next to each persisted collection on every (re-)ingest;
+# caches built on top of retrieval compare against it to detect stale entries
+COLLECTION_VERSION_FILE = "collection_version"
+
+# Per-collection record of ingested PDFs: content hash -> chunk IDs in Chroma
+INGEST_MANIFEST_FILE = "ingest_manifest.json"
+INGEST_MANIFEST_VERSION = 1
+
+
+@dataclass
+class IngestionReport:
+    """Outcome of an incremental sync of a collection with its documents folder"""
+    
+    collection: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    chunks_written: int = 0
+    chunks_deleted: int = 0
+    full_rebuild: bool = False
+    duration_seconds: float = 0.0
+    
+    @property
+    def modified(self) -> bool:
+        return bool(self.added or self.changed or self.removed or self.full_rebuild)
+
+
+def load_pdf_pages(pdf_path: Path, documents_path: Path) -> List[Document]:
+    """
+    Load one PDF and tag its pages with source and loan/scheme metadata
+    
+    Args:
+        pdf_path: PDF file to load
+        documents_path: Folder the PDF belongs to (decides loan vs investment)
+        
+    Returns:
+        One Document per page
+    """
+    loader = PyPDFLoader(str(pdf_path))
+    docs = loader.load()
+    
+    # Add metadata - detect if it's loan or investment based on path/filename
+    is_investment = "investment" in str(documents_path).lower() or "_scheme_guide" in pdf_path.stem
+    
+    for doc in docs:
+        doc.metadata["source"] = pdf_path.name
+        if is_investment:
+            doc.metadata["scheme_type"] = pdf_path.stem.replace("_scheme_guide", "")
+            doc.metadata["document_type"] = "investment"
+        else:
+            doc.metadata["loan_type"] = pdf_path.stem.replace("_product_guide", "")
+            doc.metadata["document_type"] = "loan"
+    
+    logger.info("pdf_loaded", file=pdf_path.name, pages=len(docs), type="investment" if is_investment else "loan")
+    return docs
+
+
+def _build_semantic_chunker() -> SemanticChunker:
+    return SemanticChunker(min_chunk_size=200, max_chunk_size=2000)
+
+
+# One chunker per ingestion worker process, built on first use
+_worker_chunker: Optional[SemanticChunker] = None
+
+
+def _process_pdf(pdf_path: str, documents_path: str, chunk: bool) -> List[Document]:
+    """Process-pool worker: load one PDF and optionally semantic-chunk its pages"""
+    global _worker_chunker
+    pages = load_pdf_pages(Path(pdf_path), Path(documents_path))
+    if not chunk:
+        return pages
+    if _worker_chunker is None:
+        _worker_chunker = _build_semantic_chunker()
+    return _worker_chunker.chunk_documents(pages)
+
+
+class _ChunkWriter:
+    """Buffers chunks from many PDFs into fixed-size embed + upsert batches"""
+    
+    def __init__(self, vectorstore: Chroma, batch_size: int):
+        self.vectorstore = vectorstore
+        self.batch_size = max(1, batch_size)
+        self._chunks: List[Document] = []
+        self._ids: List[str] = []
+        self.batches = 0
+    
+    def add(self, chunks: List[Document], ids: List[str]) -> None:
+        self._chunks.extend(chunks)
+        self._ids.extend(ids)
+        while len(self._chunks) >= self.batch_size:
+            self._write(self.batch_size)
+    
+    def flush(self) -> None:
+        if self._chunks:
+            self._write(len(self._chunks))
+    
+    def _write(self, count: int) -> None:
+        self.vectorstore.add_documents(self._chunks[:count], ids=self._ids[:count])
+        del self._chunks[:count]
+        del self._ids[:count]
+        self.batches += 1
+
+
+# Dedicated executor for CPU-bound encoder + Chroma queries so they never run on the event loop
+_retrieval_executor: Optional[ThreadPoolExecutor] = None
+
+# Per-collection concurrency limits: collection_name -> semaphore
+_collection_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded thread pool used for async retrieval"""
+    global _retrieval_executor
+    if _retrieval_executor is None:
+        _retrieval_executor = ThreadPoolExecutor(
+            max_workers=settings.rag_executor_workers,
+            thread_name_prefix="rag-retrieval",
+        )
+    return _retrieval_executor
+
+
+def _get_collection_semaphore(collection_name: str) -> asyncio.Semaphore:
+    semaphore = _collection_semaphores.get(collection_name)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.rag_collection_max_concurrency)
+        _collection_semaphores[collection_name] = semaphore
+    return semaphore
 
 
 class RAGService:
@@ -51,7 +193,8 @@ class RAGService:
         persist_directory: str = "./chroma_db",
         collection_name: str = "loan_products",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        embeddings: Optional[Embeddings] = None
     ):
         """
         Initialize RAG service
@@ -62,6 +205,8 @@ class RAGService:
             collection_name: Name of the Chroma collection
             chunk_size: Size of text chunks for splitting
             chunk_overlap: Overlap between chunks
+            embeddings: Optional embedding model to use instead of the shared one.
+                        If None, the process-wide model is borrowed from the registry.
         """
         # Set default documents path to backend/documents/loan_products
         if documents_path is None:
@@ -74,18 +219,10 @@ class RAGService:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         
-        # Initialize embeddings - use sentence-transformers (reliable, no external dependencies)
-        try:
-            from langchain_community.embeddings import HuggingFaceEmbeddings
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2",
-                model_kwargs={'device': 'cpu'},
-                encode_kwargs={'normalize_embeddings': True}
-            )
-            logger.info("rag_service_init", embedding_model="all-MiniLM-L6-v2")
-        except Exception as e:
-            logger.error("embeddings_init_failed", error=str(e))
-            raise
+        # Initialize embeddings - borrow the shared sentence-transformers model
+        # (one copy of the weights across all collections instead of one per service)
+        self._borrowed_embeddings = embeddings is None
+        self.embeddings = get_embedding_registry().acquire() if embeddings is None else embeddings
         
         # Initialize text splitter (fallback for simple splitting)
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -96,54 +233,90 @@ class RAGService:
         )
         
         # Initialize semantic chunker for intelligent chunking
-        self.semantic_chunker = SemanticChunker(
-            min_chunk_size=200,
-            max_chunk_size=2000
-        )
+        self.semantic_chunker = _build_semantic_chunker()
         
         # Vector store will be initialized when needed
         self.vectorstore = None
         self._context_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
         self._cache_max_size = 128
         self._cache_ttl_seconds = 120
+        self._collection_version: Optional[Tuple[int, str]] = None
+        
+    def close(self) -> None:
+        """Release the shared embedding model held by this service"""
+        if getattr(self, "_borrowed_embeddings", False):
+            get_embedding_registry().release(self.embeddings)
+            self._borrowed_embeddings = False
         
     def load_pdf_documents(self) -> List[Document]:
         """
         Load all PDF documents from the documents folder
         
         Returns:
-            List of Document objects
+            List of Document objects, in file name order
         """
         documents = []
-        pdf_files = list(self.documents_path.glob("*.pdf"))
+        pdf_files = sorted(self.documents_path.glob("*.pdf"))
         
         logger.info("loading_pdfs", count=len(pdf_files), path=str(self.documents_path))
         
-        for pdf_path in pdf_files:
-            try:
-                loader = PyPDFLoader(str(pdf_path))
-                docs = loader.load()
-                
-                # Add metadata - detect if it's loan or investment based on path/filename
-                is_investment = "investment" in str(self.documents_path).lower() or "_scheme_guide" in pdf_path.stem
-                
-                for doc in docs:
-                    doc.metadata["source"] = pdf_path.name
-                    if is_investment:
-                        doc.metadata["scheme_type"] = pdf_path.stem.replace("_scheme_guide", "")
-                        doc.metadata["document_type"] = "investment"
-                    else:
-                        doc.metadata["loan_type"] = pdf_path.stem.replace("_product_guide", "")
-                        doc.metadata["document_type"] = "loan"
-                
-                documents.extend(docs)
-                logger.info("pdf_loaded", file=pdf_path.name, pages=len(docs), type="investment" if is_investment else "loan")
-                
-            except Exception as e:
-                logger.error("pdf_load_error", file=pdf_path.name, error=str(e))
+        for pdf_path, (docs, error) in zip(pdf_files, self._iter_processed_pdfs(pdf_files, chunk=False)):
+            if error is not None:
+                logger.error("pdf_load_error", file=pdf_path.name, error=str(error))
+                continue
+            documents.extend(docs)
         
         return documents
     
+    def _load_pdf(self, pdf_path: Path) -> List[Document]:
+        """Load one PDF and tag its pages with source and loan/scheme metadata"""
+        return load_pdf_pages(pdf_path, self.documents_path)
+    
+    def _iter_processed_pdfs(
+        self,
+        pdf_paths: List[Path],
+        chunk: bool = True,
+    ) -> Iterator[Tuple[List[Document], Optional[Exception]]]:
+        """
+        Load (and optionally semantic-chunk) PDFs across a process pool
+        
+        Results are yielded in the order of pdf_paths, one (documents, error)
+        pair per PDF, so a corrupt file only loses its own entry. At most two
+        PDFs per worker are in flight, which keeps memory bounded on big corpora.
+        """
+        workers = min(settings.ingest_workers or os.cpu_count() or 1, len(pdf_paths))
+        if workers <= 1:
+            for pdf_path in pdf_paths:
+                try:
+                    pages = self._load_pdf(pdf_path)
+                    yield (self.chunk_documents(pages) if chunk else pages), None
+                except Exception as e:
+                    yield [], e
+            return
+        
+        # spawn, not fork: the parent holds torch/encoder threads that fork would copy mid-lock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            remaining = iter(pdf_paths)
+            in_flight = deque()
+            
+            def submit_next() -> None:
+                pdf_path = next(remaining, None)
+                if pdf_path is not None:
+                    in_flight.append(
+                        pool.submit(_process_pdf, str(pdf_path), str(self.documents_path), chunk)
+                    )
+            
+            for _ in range(workers * 2):
+                submit_next()
+            while in_flight:
+                future = in_flight.popleft()
+                submit_next()
+                try:
+                    yield future.result(), None
+                except Exception as e:
+                    yield [], e
+    
     def chunk_documents(self, documents: List[Document], use_semantic: bool = True) -> List[Document]:
         """
         Split documents into chunks using semantic chunking
@@ -198,6 +371,8 @@ class RAGService:
                        document_count=len(documents),
                        collection=self.collection_name)
             
+            self._context_cache.clear()
+            self._write_collection_version()
             return vectorstore
             
         except Exception as e:
@@ -227,12 +402,46 @@ class RAGService:
             logger.error("vectorstore_load_error", error=str(e))
             return None
     
+    @property
+    def collection_version(self) -> str:
+        """
+        Version of the persisted collection, bumped on every ingest
+        
+        Returns:
+            Version string, or "unversioned" for collections built before versioning
+        """
+        marker = Path(self.persist_directory) / COLLECTION_VERSION_FILE
+        try:
+            mtime_ns = marker.stat().st_mtime_ns
+        except OSError:
+            return "unversioned"
+        
+        # Re-read only when the marker changes (e.g. an ingest script ran in another process)
+        if self._collection_version is None or self._collection_version[0] != mtime_ns:
+            try:
+                version = marker.read_text(encoding="utf-8").strip()
+            except OSError:
+                return "unversioned"
+            self._collection_version = (mtime_ns, version)
+        return self._collection_version[1]
+    
+    def _write_collection_version(self) -> None:
+        marker = Path(self.persist_directory) / COLLECTION_VERSION_FILE
+        version = f"{int(time.time() * 1000)}-{os.getpid()}"
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(version, encoding="utf-8")
+            logger.info("collection_version_updated", collection=self.collection_name, version=version)
+        except OSError as e:
+            logger.warning("collection_version_write_failed", collection=self.collection_name, error=str(e))
+    
     def initialize(self, force_rebuild: bool = False) -> None:
         """
         Initialize the RAG system - load or create vector store
         
         Args:
-            force_rebuild: If True, rebuild vector store even if exists
+            force_rebuild: If True, sync the vector store with the documents folder even if
+                           it exists (only added, changed or removed PDFs are re-embedded)
         """
         # Try to load existing vector store
         if not force_rebuild:
@@ -241,20 +450,170 @@ class RAGService:
                 logger.info("rag_initialized", mode="loaded_existing")
                 return
         
-        # Load and process documents
-        logger.info("rag_building", mode="creating_new")
-        documents = self.load_pdf_documents()
+        logger.info("rag_building", mode="incremental_sync")
+        report = self.sync_documents()
+        logger.info(
+            "rag_initialized",
+            mode="synced",
+            chunks_written=report.chunks_written,
+            chunks_deleted=report.chunks_deleted,
+        )
+    
+    def sync_documents(self, full_rebuild: bool = False) -> IngestionReport:
+        """
+        Bring the collection in line with the documents folder
         
-        if not documents:
-            logger.warning("no_documents_found", path=str(self.documents_path))
-            return
+        Each PDF is hashed and compared with the ingest manifest; only added or
+        changed PDFs are re-chunked and re-embedded (upserted under deterministic
+        chunk IDs), and chunks of changed or removed PDFs are deleted.
+        
+        Args:
+            full_rebuild: Drop the collection and re-ingest every PDF
+            
+        Returns:
+            IngestionReport describing what changed
+        """
+        start = time.perf_counter()
+        report = IngestionReport(collection=self.collection_name)
+        
+        manifest = self._load_manifest()
+        vectorstore = Chroma(
+            collection_name=self.collection_name,
+            embedding_function=self.embeddings,
+            persist_directory=self.persist_directory,
+        )
+        
+        # Collections built before the manifest existed (or with different chunking)
+        # cannot be diffed, so they are rebuilt once
+        if full_rebuild or (manifest is None and vectorstore._collection.count() > 0):
+            vectorstore.reset_collection()
+            report.full_rebuild = True
+            manifest = None
+        previous: Dict[str, Dict[str, Any]] = manifest["documents"] if manifest else {}
+        
+        current: Dict[str, Tuple[Path, str]] = {}
+        for pdf_path in sorted(self.documents_path.glob("*.pdf")):
+            current[pdf_path.name] = (pdf_path, self._hash_file(pdf_path))
+        
+        stale_ids: List[str] = []
+        for name, entry in previous.items():
+            if name not in current:
+                report.removed.append(name)
+                stale_ids.extend(entry["chunk_ids"])
+            elif entry["sha256"] != current[name][1]:
+                stale_ids.extend(entry["chunk_ids"])
+        
+        documents_manifest: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, Path, str, Optional[Dict[str, Any]]]] = []
+        for name, (pdf_path, digest) in current.items():
+            entry = previous.get(name)
+            if entry and entry["sha256"] == digest:
+                report.unchanged.append(name)
+                documents_manifest[name] = entry
+            else:
+                pending.append((name, pdf_path, digest, entry))
+        
+        # PDFs are parsed and chunked in parallel; chunks stream into batched writes
+        writer = _ChunkWriter(vectorstore, settings.ingest_write_batch_size)
+        processed = self._iter_processed_pdfs([pdf_path for _, pdf_path, _, _ in pending])
+        for (name, _, digest, entry), (chunks, error) in zip(pending, processed):
+            if error is not None:
+                # Keep the old chunks of a changed PDF rather than dropping it from the index
+                logger.error("pdf_ingest_error", file=name, error=str(error))
+                report.failed.append(name)
+                if entry:
+                    kept_ids = set(entry["chunk_ids"])
+                    stale_ids = [cid for cid in stale_ids if cid not in kept_ids]
+                    documents_manifest[name] = entry
+                continue
+            
+            chunk_ids = self._prepare_chunks(chunks, name, digest)
+            writer.add(chunks, chunk_ids)
+            (report.changed if entry else report.added).append(name)
+            report.chunks_written += len(chunk_ids)
+            documents_manifest[name] = {"sha256": digest, "chunk_ids": chunk_ids}
+        writer.flush()
         
-        # Chunk documents
-        chunks = self.chunk_documents(documents)
+        # New chunk IDs embed the content hash, so stale IDs never collide with fresh ones
+        if stale_ids:
+            vectorstore.delete(ids=stale_ids)
+            report.chunks_deleted = len(stale_ids)
         
-        # Create vector store
-        self.vectorstore = self.create_vector_store(chunks)
-        logger.info("rag_initialized", mode="created_new", chunks=len(chunks))
+        self._save_manifest(documents_manifest)
+        self.vectorstore = vectorstore
+        if report.modified:
+            self._context_cache.clear()
+            self._write_collection_version()
+        
+        report.duration_seconds = round(time.perf_counter() - start, 3)
+        logger.info(
+            "rag_documents_synced",
+            collection=self.collection_name,
+            added=report.added,
+            changed=report.changed,
+            removed=report.removed,
+            unchanged=len(report.unchanged),
+            failed=report.failed,
+            chunks_written=report.chunks_written,
+            chunks_deleted=report.chunks_deleted,
+            full_rebuild=report.full_rebuild,
+            duration_seconds=report.duration_seconds,
+        )
+        return report
+    
+    @staticmethod
+    def _prepare_chunks(chunks: List[Document], name: str, digest: str) -> List[str]:
+        """Strip unsupported metadata in place and assign deterministic chunk IDs"""
+        from langchain_community.vectorstores.utils import filter_complex_metadata
+        
+        chunks[:] = filter_complex_metadata(chunks)
+        for chunk in chunks:
+            chunk.metadata["content_hash"] = digest
+        return [f"{name}:{digest[:16]}:{idx:04d}" for idx in range(len(chunks))]
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _manifest_fingerprint(self) -> Dict[str, Any]:
+        """Settings that change chunk contents; a mismatch forces a rebuild"""
+        return {
+            "manifest_version": INGEST_MANIFEST_VERSION,
+            "embedding_model": settings.embedding_model_name,
+            "embedding_backend": settings.embedding_backend,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+        }
+    
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        manifest_path = Path(self.persist_directory) / INGEST_MANIFEST_FILE
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if manifest.get("fingerprint") != self._manifest_fingerprint():
+            logger.info("ingest_manifest_outdated", collection=self.collection_name)
+            return None
+        return manifest
+    
+    def _save_manifest(self, documents: Dict[str, Dict[str, Any]]) -> None:
+        manifest_path = Path(self.persist_directory) / INGEST_MANIFEST_FILE
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"fingerprint": self._manifest_fingerprint(), "documents": documents},
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        # Atomic replace so a crashed ingest never leaves a half-written manifest
+        os.replace(tmp_path, manifest_path)
     
     def retrieve(
         self,
@@ -385,6 +744,46 @@ class RAGService:
             demo_logger.error("RAG retrieval with scores failed", error=str(e))
             return []
     
+    async def _run_in_retrieval_executor(self, fn, *args, **kwargs):
+        """
+        Run a blocking retrieval call on the RAG executor under the collection's concurrency limit.
+        
+        If the awaiting task is cancelled (e.g. the client disconnected), a call that has not
+        started yet is dropped from the executor queue and the slot is released immediately.
+        """
+        semaphore = _get_collection_semaphore(self.collection_name)
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                get_retrieval_executor(),
+                functools.partial(fn, *args, **kwargs),
+            )
+            try:
+                return await future
+            except asyncio.CancelledError:
+                future.cancel()
+                logger.info("rag_retrieval_cancelled", collection=self.collection_name)
+                raise
+
+    async def aretrieve(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Async variant of retrieve() that keeps the event loop free
+        
+        Args:
+            query: Search query
+            k: Number of documents to retrieve
+            filter: Optional metadata filter
+            
+        Returns:
+            List of relevant documents
+        """
+        return await self._run_in_retrieval_executor(self.retrieve, query, k=k, filter=filter)
+
     def _normalize_query(self, query: str) -> str:
         return " ".join(query.split()).lower()
 
@@ -416,28 +815,7 @@ class RAGService:
             evicted_key, _ = self._context_cache.popitem(last=False)
             logger.debug("rag_context_cache_evict", cache_key=evicted_key)
 
-    def get_context_for_query(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None) -> str:
-        """
-        Get formatted context string for a query
-        
-        Args:
-            query: Search query
-            k: Number of documents to retrieve
-            filter: Optional metadata filter to narrow retrieval scope
-            
-        Returns:
-            Formatted context string
-        """
-        cache_key = self._make_cache_key(query, k, filter)
-        cached_context = self._get_cached_context(cache_key)
-        if cached_context is not None:
-            return cached_context
-
-        documents = self.retrieve(query, k=k, filter=filter)
-        
-        if not documents:
-            return ""
-        
+    def _format_context(self, documents: List[Document]) -> str:
         context_parts = []
         for i, doc in enumerate(documents, 1):
             source = doc.metadata.get("source", "Unknown")
@@ -455,7 +833,19 @@ class RAGService:
                 f"[Source {i}: {type_label} - {source}]\n{doc.page_content}\n"
             )
         
-        context = "\n".join(context_parts)
+        return "\n".join(context_parts)
+
+    def _finalize_context(
+        self,
+        cache_key: str,
+        query: str,
+        documents: List[Document],
+        filter: Optional[Dict[str, Any]],
+    ) -> str:
+        if not documents:
+            return ""
+        
+        context = self._format_context(documents)
         logger.info(
             "context_generated",
             query_length=len(query),
@@ -468,12 +858,89 @@ class RAGService:
         
         return context
 
+    def get_context_for_query(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get formatted context string for a query
+        
+        Args:
+            query: Search query
+            k: Number of documents to retrieve
+            filter: Optional metadata filter to narrow retrieval scope
+            
+        Returns:
+            Formatted context string
+        """
+        cache_key = self._make_cache_key(query, k, filter)
+        cached_context = self._get_cached_context(cache_key)
+        if cached_context is not None:
+            return cached_context
+
+        documents = self.retrieve(query, k=k, filter=filter)
+        return self._finalize_context(cache_key, query, documents, filter)
+
+    async def aget_context_for_query(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Async variant of get_context_for_query()
+        
+        Cache hits are served directly on the event loop; misses run the
+        encoder and Chroma search on the retrieval executor.
+        """
+        cache_key = self._make_cache_key(query, k, filter)
+        cached_context = self._get_cached_context(cache_key)
+        if cached_context is not None:
+            return cached_context
+
+        documents = await self.aretrieve(query, k=k, filter=filter)
+        return self._finalize_context(cache_key, query, documents, filter)
+
 
 # Global RAG service instances cache: (documents_type, language) -> RAGService
 _rag_service_cache: Dict[Tuple[str, str], RAGService] = {}
+# One construction lock per collection, so different collections still load in parallel
+_rag_service_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_rag_service_locks_guard = threading.Lock()
+
+
+def _rag_service_lock(cache_key: Tuple[str, str]) -> threading.Lock:
+    with _rag_service_locks_guard:
+        return _rag_service_locks.setdefault(cache_key, threading.Lock())
+
+
+def resolve_collection(documents_type: str, language: str) -> Tuple[Path, str, str]:
+    """
+    Resolve documents path, collection name and persist directory for a collection
+    
+    Args:
+        documents_type: "loan" or "investment"
+        language: "en-IN" or "hi-IN"
+        
+    Returns:
+        Tuple of (documents_path, collection_name, persist_directory)
+    """
+    ai_dir = Path(__file__).parent.parent
+    base_docs_dir = ai_dir.parent / "backend" / "documents"
+    
+    if language == "hi-IN":
+        # Hindi documents
+        if documents_type == "investment":
+            collection_name = "investment_schemes_hindi"
+        else:
+            collection_name = "loan_products_hindi"
+    else:
+        # English documents (default)
+        if documents_type == "investment":
+            collection_name = "investment_schemes"
+        else:
+            collection_name = "loan_products"
+    
+    return base_docs_dir / collection_name, collection_name, f"./chroma_db/{collection_name}"
 
 
-def get_rag_service(documents_type: str = None, language: str = "en-IN") -> RAGService:
+def get_rag_service(
+    documents_type: str = None,
+    language: str = "en-IN",
+    embeddings: Optional[Embeddings] = None,
+) -> RAGService:
     """
     Get or create RAG service instance
     
@@ -482,6 +949,7 @@ def get_rag_service(documents_type: str = None, language: str = "en-IN") -> RAGS
                         If None, defaults to "loan" for backward compatibility.
         language: "en-IN" or "hi-IN" - determines which language vector database to use.
                  Defaults to "en-IN".
+        embeddings: Optional shared embedding model, used only when the service is created.
     """
     global _rag_service_cache
     
@@ -496,48 +964,61 @@ def get_rag_service(documents_type: str = None, language: str = "en-IN") -> RAGS
     cache_key = (documents_type, language)
     
     # Check if service already exists in cache
-    if cache_key in _rag_service_cache:
-        return _rag_service_cache[cache_key]
+    rag_service = _rag_service_cache.get(cache_key)
+    if rag_service is not None:
+        return rag_service
     
-    # Determine documents path and collection name based on type and language
-    ai_dir = Path(__file__).parent.parent
-    base_docs_dir = ai_dir.parent / "backend" / "documents"
-    
-    if language == "hi-IN":
-        # Hindi documents
-        if documents_type == "investment":
-            documents_path = base_docs_dir / "investment_schemes_hindi"
-            collection_name = "investment_schemes_hindi"
-            persist_directory = "./chroma_db/investment_schemes_hindi"
-        else:
-            documents_path = base_docs_dir / "loan_products_hindi"
-            collection_name = "loan_products_hindi"
-            persist_directory = "./chroma_db/loan_products_hindi"
-    else:
-        # English documents (default)
-        if documents_type == "investment":
-            documents_path = base_docs_dir / "investment_schemes"
-            collection_name = "investment_schemes"
-            persist_directory = "./chroma_db/investment_schemes"
-        else:
-            documents_path = base_docs_dir / "loan_products"
-            collection_name = "loan_products"
-            persist_directory = "./chroma_db/loan_products"
+    with _rag_service_lock(cache_key):
+        # Another caller may have built it while we waited
+        rag_service = _rag_service_cache.get(cache_key)
+        if rag_service is not None:
+            return rag_service
+        
+        # Determine documents path and collection name based on type and language
+        documents_path, collection_name, persist_directory = resolve_collection(documents_type, language)
+        
+        # Create new service
+        rag_service = RAGService(
+            documents_path=str(documents_path),
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embeddings=embeddings,
+        )
+        rag_service._documents_type = documents_type  # Store type for reference
+        rag_service._language = language  # Store language for reference
+        rag_service.initialize()
+        
+        # Cache the service
+        _rag_service_cache[cache_key] = rag_service
     
-    # Create new service
-    rag_service = RAGService(
-        documents_path=str(documents_path),
-        collection_name=collection_name,
-        persist_directory=persist_directory
-    )
-    rag_service._documents_type = documents_type  # Store type for reference
-    rag_service._language = language  # Store language for reference
-    rag_service.initialize()
+    return rag_service
+
+
+async def aget_rag_service(documents_type: str = None, language: str = "en-IN") -> RAGService:
+    """
+    Async variant of get_rag_service()
     
-    # Cache the service
-    _rag_service_cache[cache_key] = rag_service
+    Cached services are returned immediately; first-time construction (model
+    load + Chroma open) runs on the retrieval executor instead of the event loop.
+    """
+    cache_key = (documents_type or "loan", language if language in ["en-IN", "hi-IN"] else "en-IN")
+    if cache_key in _rag_service_cache:
+        return _rag_service_cache[cache_key]
     
-    return rag_service
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_retrieval_executor(),
+        functools.partial(get_rag_service, documents_type=documents_type, language=language),
+    )
+
+
+def close_rag_services() -> None:
+    """Drop every cached RAG service and release its shared embedding model (app shutdown)"""
+    with _rag_service_locks_guard:
+        services = list(_rag_service_cache.values())
+        _rag_service_cache.clear()
+    for service in services:
+        service.close()
 
 
 def initialize_rag(force_rebuild: bool = False) -> None:
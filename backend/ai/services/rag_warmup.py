@@ -0,0 +1,194 @@
+"""
+RAG Warm-up Service
+Preloads every (documents_type, language) RAG collection at startup with one shared embedding model
+"""
+import asyncio
+import functools
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+from utils import logger
+from services.embedding_service import get_embedding_registry
+from services.intent_model import get_intent_model
+from services.rag_service import get_rag_service, get_retrieval_executor
+
+
+# Every collection served by the loan and investment agents
+RAG_COLLECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("loan", "en-IN"),
+    ("loan", "hi-IN"),
+    ("investment", "en-IN"),
+    ("investment", "hi-IN"),
+)
+
+
+def _process_rss_mb() -> float:
+    """Current resident set size in MB (falls back to peak RSS off Linux)"""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class CollectionWarmupReport:
+    """Load outcome for a single RAG collection"""
+
+    documents_type: str
+    language: str
+    collection: Optional[str] = None
+    loaded: bool = False
+    load_seconds: float = 0.0
+    vectors: int = 0
+    estimated_index_mb: float = 0.0
+    error: Optional[str] = None
+
+
+class RAGWarmup:
+    """Tracks startup preloading of the RAG collections for readiness checks"""
+
+    def __init__(self) -> None:
+        self.state = "pending"  # pending -> warming -> ready | degraded
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.embedding_load_seconds = 0.0
+        self.embedding_memory_mb = 0.0
+        self.reports: Dict[str, CollectionWarmupReport] = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished (even if some collections failed) or is disabled"""
+        return self.state in ("ready", "degraded", "disabled")
+
+    def mark_disabled(self) -> None:
+        self.state = "disabled"
+
+    async def run(self) -> None:
+        """Load the shared embedding model, then open all collections concurrently"""
+        self.state = "warming"
+        self.started_at = time.time()
+        loop = asyncio.get_running_loop()
+        executor = get_retrieval_executor()
+
+        # Load the model first, on its own, so its memory cost is attributable
+        rss_before = _process_rss_mb()
+        model_start = time.perf_counter()
+        registry = get_embedding_registry()
+        try:
+            embeddings = await loop.run_in_executor(executor, registry.acquire)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("rag_warmup_embeddings_failed", error=str(exc))
+            self.state = "degraded"
+            self.finished_at = time.time()
+            return
+        self.embedding_load_seconds = round(time.perf_counter() - model_start, 3)
+        self.embedding_memory_mb = round(_process_rss_mb() - rss_before, 1)
+
+        # Each collection borrows its own lease on the shared model; ours is
+        # only held until they have all taken theirs
+        try:
+            await asyncio.gather(
+                *(
+                    self._load_collection(documents_type, language)
+                    for documents_type, language in RAG_COLLECTIONS
+                )
+            )
+            if settings.intent_model_enabled:
+                # Embedding the intent examples here keeps the first unmatched turn off the slow path
+                try:
+                    await loop.run_in_executor(executor, get_intent_model().fit)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.warning("intent_model_warmup_failed", error=str(exc))
+        finally:
+            registry.release(embeddings)
+
+        failed = [key for key, report in self.reports.items() if not report.loaded]
+        self.state = "degraded" if failed else "ready"
+        self.finished_at = time.time()
+        logger.info(
+            "rag_warmup_completed",
+            state=self.state,
+            duration_seconds=round(self.finished_at - self.started_at, 3),
+            embedding_load_seconds=self.embedding_load_seconds,
+            embedding_memory_mb=self.embedding_memory_mb,
+            failed_collections=failed,
+            process_rss_mb=round(_process_rss_mb(), 1),
+        )
+
+    async def _load_collection(self, documents_type: str, language: str) -> None:
+        key = f"{documents_type}:{language}"
+        report = CollectionWarmupReport(documents_type=documents_type, language=language)
+        self.reports[key] = report
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            service = await loop.run_in_executor(
+                get_retrieval_executor(),
+                functools.partial(
+                    get_rag_service,
+                    documents_type=documents_type,
+                    language=language,
+                ),
+            )
+            report.collection = service.collection_name
+            report.loaded = service.vectorstore is not None
+            if service.vectorstore is not None:
+                report.vectors, dimension = await loop.run_in_executor(
+                    get_retrieval_executor(), self._measure_index, service
+                )
+                # HNSW index keeps float32 vectors resident in memory
+                report.estimated_index_mb = round(report.vectors * dimension * 4 / (1024 * 1024), 2)
+            else:
+                report.error = "vectorstore not available"
+        except Exception as exc:  # pylint: disable=broad-except
+            report.error = str(exc)
+            logger.error("rag_warmup_collection_failed", collection=key, error=str(exc))
+        report.load_seconds = round(time.perf_counter() - start, 3)
+
+        logger.info("rag_warmup_collection_loaded", **asdict(report))
+
+    @staticmethod
+    def _measure_index(service) -> Tuple[int, int]:
+        """Return (vector count, embedding dimension); the probe query also warms the encoder"""
+        dimension = len(service.embeddings.embed_query("warm-up"))
+        collection = getattr(service.vectorstore, "_collection", None)
+        try:
+            vectors = int(collection.count()) if collection is not None else 0
+        except Exception:  # pylint: disable=broad-except
+            vectors = 0
+        return vectors, dimension
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable status for the /health endpoint"""
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "embedding_load_seconds": self.embedding_load_seconds,
+            "embedding_memory_mb": self.embedding_memory_mb,
+            "embedding_models": get_embedding_registry().stats(),
+            "process_rss_mb": round(_process_rss_mb(), 1),
+            "collections": {key: asdict(report) for key, report in self.reports.items()},
+        }
+
+
+# Singleton instance
+_rag_warmup: Optional[RAGWarmup] = None
+
+
+def get_rag_warmup() -> RAGWarmup:
+    """Get or create the RAG warm-up tracker"""
+    global _rag_warmup
+    if _rag_warmup is None:
+        _rag_warmup = RAGWarmup()
+        if not settings.rag_preload_on_startup:
+            _rag_warmup.mark_disabled()
+    return _rag_warmup
@@ -0,0 +1,269 @@
+"""
+Rate Limiter
+Sliding-window-counter rate limiting with in-process and Redis backends
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from config import settings
+from utils import logger
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most ``limit`` requests per ``window_seconds``"""
+
+    name: str  # e.g. "minute"; reported back when the limit is hit
+    limit: int
+    window_seconds: int
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate-limited request"""
+
+    allowed: bool
+    limit: Optional[RateLimit] = None  # The first limit that rejected the request
+    count: int = 0  # Estimated requests in the rejecting window
+    retry_after: float = 0.0  # Seconds until the rejecting window has room again
+
+
+def _window_weight(now: float, window_seconds: int) -> float:
+    """Share of the previous fixed window still inside the sliding window ending at ``now``"""
+    return 1.0 - (now % window_seconds) / window_seconds
+
+
+def _estimate(previous: int, current: int, now: float, window_seconds: int) -> float:
+    """
+    Sliding-window estimate of requests in the last ``window_seconds``
+
+    Requests in the previous fixed window are assumed to be spread evenly, so
+    the estimate never needs per-request timestamps.
+    """
+    return previous * _window_weight(now, window_seconds) + current
+
+
+def _retry_after(previous: int, current: int, limit: int, now: float, window_seconds: int) -> float:
+    """Seconds until the estimate drops enough to admit one more request"""
+    offset = now % window_seconds
+    if previous and current < limit:
+        # The previous window's share decays linearly through the current window
+        needed_weight = (limit - current - 1) / previous
+        return max(0.0, (1.0 - needed_weight) * window_seconds - offset)
+    return window_seconds - offset
+
+
+class RateLimiter(ABC):
+    """
+    Base class for rate limiter backends.
+
+    Every backend keeps two fixed-window counters (current and previous) per
+    key and limit, and admits a request when the weighted sliding-window
+    estimate including it stays within the limit. A check is O(number of
+    limits), whatever the request rate; rejected requests are not counted.
+    """
+
+    def __init__(self, limits: Sequence[RateLimit], clock: Callable[[], float] = time.time):
+        if not limits:
+            raise ValueError("At least one rate limit is required")
+        self.limits: Tuple[RateLimit, ...] = tuple(limits)
+        self.clock = clock
+
+    @abstractmethod
+    def hit(self, key: str) -> RateLimitDecision:
+        """Count one request for key if every limit allows it"""
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        """Forget all counters of key"""
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Per-process rate limiter.
+
+    Keys idle for two of the longest windows hold only zero counters and are
+    evicted; ``max_keys`` additionally bounds memory, dropping the least
+    recently seen keys first.
+    """
+
+    def __init__(
+        self,
+        limits: Sequence[RateLimit],
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(limits, clock)
+        self.max_keys = max_keys
+        self.idle_seconds = 2 * max(limit.window_seconds for limit in self.limits)
+        # key -> (last_seen, [[window_index, current, previous] per limit]), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, list[list[int]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def hit(self, key: str) -> RateLimitDecision:
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.pop(key, None)
+            counters = entry[1] if entry else [[0, 0, 0] for _ in self.limits]
+            decision = RateLimitDecision(allowed=True)
+
+            for limit, counter in zip(self.limits, counters):
+                window_index = int(now // limit.window_seconds)
+                if window_index != counter[0]:
+                    # Roll over: last window becomes previous (or zero after a gap)
+                    counter[2] = counter[1] if window_index == counter[0] + 1 else 0
+                    counter[1] = 0
+                    counter[0] = window_index
+                if decision.allowed and _estimate(counter[2], counter[1] + 1, now, limit.window_seconds) > limit.limit:
+                    decision = RateLimitDecision(
+                        allowed=False,
+                        limit=limit,
+                        count=int(_estimate(counter[2], counter[1], now, limit.window_seconds)),
+                        retry_after=_retry_after(counter[2], counter[1], limit.limit, now, limit.window_seconds),
+                    )
+
+            if decision.allowed:
+                for counter in counters:
+                    counter[1] += 1
+            self._entries[key] = (now, counters)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return decision
+
+    def _evict_idle(self, now: float) -> None:
+        while self._entries:
+            oldest_key, (last_seen, _) = next(iter(self._entries.items()))
+            if now - last_seen < self.idle_seconds:
+                break
+            del self._entries[oldest_key]
+            self.evictions += 1
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Rate limiter shared by all workers through Redis.
+
+    Each fixed window is an INCR counter that expires after two windows.
+    The request is counted first and refunded with DECR when it exceeds a
+    limit, so concurrent workers can never admit more than the limit between
+    them. Only INCR, EXPIRE, GET, DECR and DELETE are used (in one
+    MULTI/EXEC pipeline per check), so any Redis-protocol server works.
+    If Redis is unreachable the per-process ``fallback`` limiter is used.
+    """
+
+    def __init__(
+        self,
+        limits: Sequence[RateLimit],
+        client: Any = None,
+        prefix: str = "ratelimit",
+        fallback: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(limits, clock)
+        self._client = client
+        self.prefix = prefix
+        self.fallback = fallback or InMemoryRateLimiter(limits, clock=clock)
+        self.errors = 0
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import redis
+
+            # Short timeouts: a slow Redis must not stall the chat request
+            self._client = redis.Redis.from_url(
+                settings.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25
+            )
+        return self._client
+
+    def _key(self, key: str, limit: RateLimit, window_index: int) -> str:
+        return f"{self.prefix}:{limit.name}:{key}:{window_index}"
+
+    def hit(self, key: str) -> RateLimitDecision:
+        now = self.clock()
+        windows = [int(now // limit.window_seconds) for limit in self.limits]
+        current_keys = [self._key(key, limit, index) for limit, index in zip(self.limits, windows)]
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            for limit, index, current_key in zip(self.limits, windows, current_keys):
+                pipe.incr(current_key)
+                pipe.expire(current_key, 2 * limit.window_seconds)
+                pipe.get(self._key(key, limit, index - 1))
+            replies = pipe.execute()
+
+            decision = RateLimitDecision(allowed=True)
+            for position, limit in enumerate(self.limits):
+                current = int(replies[3 * position])
+                previous = int(replies[3 * position + 2] or 0)
+                if _estimate(previous, current, now, limit.window_seconds) > limit.limit:
+                    decision = RateLimitDecision(
+                        allowed=False,
+                        limit=limit,
+                        count=int(_estimate(previous, current - 1, now, limit.window_seconds)),
+                        retry_after=_retry_after(previous, current - 1, limit.limit, now, limit.window_seconds),
+                    )
+                    break
+
+            if not decision.allowed:
+                refund = self.client.pipeline(transaction=True)
+                for current_key in current_keys:
+                    refund.decr(current_key)
+                refund.execute()
+            return decision
+        except Exception as e:
+            self.errors += 1
+            logger.warning("rate_limiter_redis_error", error=str(e), fallback="in_process")
+            return self.fallback.hit(key)
+
+    def reset(self, key: str) -> None:
+        now = self.clock()
+        stale = [
+            self._key(key, limit, int(now // limit.window_seconds) - offset)
+            for limit in self.limits
+            for offset in (0, 1)
+        ]
+        try:
+            self.client.delete(*stale)
+        except Exception as e:
+            logger.warning("rate_limiter_redis_error", error=str(e), operation="reset")
+        self.fallback.reset(key)
+
+
+def create_rate_limiter(
+    limits: Sequence[RateLimit],
+    backend: Optional[str] = None,
+    prefix: str = "ratelimit",
+) -> RateLimiter:
+    """
+    Build the configured rate limiter backend
+
+    Args:
+        limits: Limits every key is held to
+        backend: "memory" or "redis" (defaults to settings.rate_limiter_backend)
+        prefix: Redis key prefix separating limiters that share a server
+
+    Returns:
+        RateLimiter instance
+    """
+    backend = backend or settings.rate_limiter_backend
+    if backend == "redis" and settings.redis_enabled:
+        logger.info("rate_limiter_initialized", backend="redis", prefix=prefix,
+                    limits={limit.name: limit.limit for limit in limits})
+        return RedisRateLimiter(limits, prefix=prefix)
+    if backend == "redis":
+        logger.warning("rate_limiter_redis_disabled", fallback="memory")
+    return InMemoryRateLimiter(limits, max_keys=settings.rate_limiter_max_keys)
@@ -7,13 +7,152 @@ FinTech RAG Pipeline - Universal Chunking & Metadata Extraction Methodology
 - Language detection and preservation
 - Metadata normalization for precise filtering
 """
+import functools
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Pattern, Tuple
 from langchain_core.documents import Document
 
 from utils import logger
 
 
+# Patterns used on every page/chunk, compiled once at import
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Header/footer lines dropped after the first few lines: page numbers, URLs, bank footer, phone numbers
+_FOOTER_LINE_RE = re.compile(r'(?:(?i:Page)\s+\d+$|https?://|(?i:www\.sunnationalbank)|\d{4}-\d{3}-\d{4}$)')
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+
+_TABLE_INDICATOR_RE = re.compile(
+    "|".join(f"(?:{indicator})" for indicator in (
+        r"The following table:",
+        r"निम्नलिखित तालिका:",
+        r"Feature.*Details",
+        r"Criteria.*Requirement",
+        r"Charge Type.*Amount",
+        r"\|.*\|",  # Markdown table format
+        r"विशेषता.*MUDRA",  # Hindi business loan table pattern
+        r"MUDRA.*टर्म.*कार्यशील",  # Multiple loan types in header
+    )),
+    re.IGNORECASE,
+)
+_TABLE_LOAN_KEYWORDS = ("mudra", "term", "working capital", "टर्म", "कार्यशील", "मुद्रा")
+_MARKDOWN_LOAN_KEYWORDS = ("mudra", "term", "working", "टर्म", "कार्यशील", "मुद्रा")
+_TABLE_HEADER_PATTERNS = (
+    (re.compile(r'विशेषता', re.IGNORECASE), 'Feature'),
+    (re.compile(r'MUDRA[^\s]*', re.IGNORECASE), 'MUDRA लोन'),
+    (re.compile(r'टर्म[^\s]*', re.IGNORECASE), 'SME टर्म लोन'),
+    (re.compile(r'कार्यशील[^\s]*', re.IGNORECASE), 'कार्यशील पूंजी'),
+)
+
+_FAQ_SECTION_RE = re.compile(r'FREQUENTLY ASKED QUESTIONS|FAQ|प्रश्न', re.IGNORECASE)
+_FAQ_QUESTION_RES = tuple(
+    re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+        r'<b>Q\d+[:\s]+(.*?)</b>',  # HTML format
+        r'Q\d+[:\s]+(.*?)(?=\n|Q\d+|$)',
+        r'प्रश्न\s*\d+[:\s]+(.*?)(?=\n|प्रश्न|$)',
+        r'Q[:\s]+(.*?)(?=\n|Q|$)',
+        r'(\d+\.\s*[^?]+\?)',  # Numbered questions ending with ?
+    )
+)
+_FAQ_NEXT_QUESTION_RE = re.compile(r'Q\d+|प्रश्न\s*\d+|\d+\.\s*[^?]+\?', re.IGNORECASE)
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+
+_KEYWORD_NUMBER_RE = re.compile(r'\d+[.,]?\d*%?')
+_FINANCIAL_TERM_RES = {
+    "en": tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\b(interest rate|loan amount|tenure|emi|processing fee|eligibility|documents|collateral)\b',
+        r'\b(rs\.?\s*\d+|rupees?\s*\d+|₹\s*\d+)\b',
+        r'\b(\d+\s*years?|\d+\s*months?)\b',
+    )),
+    "hi": tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\b(ब्याज दर|लोन राशि|अवधि|पात्रता|दस्तावेज|गारंटी)\b',
+        r'\b(रुपये?\s*\d+|₹\s*\d+)\b',
+        r'\b(\d+\s*वर्ष|\d+\s*महीने?)\b',
+    )),
+}
+
+# Sub-loan headings such as "1. MUDRA Loans:" or "2. Term Loans:"
+_SUB_LOAN_HEADING_RES = tuple(
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+        r'\d+\.\s*(MUDRA|Term|Working Capital|Invoice Financing|Equipment Financing|Business Overdraft)[^:]*:',
+        r'\d+\.\s*(Home Purchase|Home Construction|Plot|Home Extension|Home Renovation|Balance Transfer)[^:]*:',
+        r'\d+\.\s*(शिशु|किशोर|तरुण|MUDRA|टर्म|कार्यशील पूंजी)[^:]*:',
+    )
+)
+
+# Characters re.IGNORECASE equates with ASCII letters although str.lower() does not;
+# text containing them falls back to regex scanning so matches stay identical
+_IGNORECASE_SPECIAL_CHARS = ("\u0130", "\u0131", "\u017f", "\u212a")
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+class _MatcherTables:
+    """Compiled matchers and keyword tables derived from a SemanticChunker's mappings"""
+
+    def __init__(self, chunker_cls: type):
+        # extract_section_name: one alternation per section family, tried in family order
+        self.section_families: List[Tuple[str, Pattern]] = [
+            (section.title().replace("_", " "), re.compile("|".join(patterns), re.IGNORECASE))
+            for section, patterns in chunker_cls.SECTION_PATTERNS.items()
+        ]
+
+        # split_by_sections: every occurrence of every header, in pattern order
+        self.section_headers: List[Tuple[str, Pattern]] = [
+            (section, re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+            for section, patterns in chunker_cls.SECTION_PATTERNS.items()
+            for pattern in patterns
+        ]
+        # Plain-text headers can be found with substring search on the lower-cased page
+        self.section_literals: Optional[List[Tuple[str, str]]] = None
+        if all(not _REGEX_METACHARS.intersection(pattern.pattern) for _, pattern in self.section_headers):
+            self.section_literals = [(section, pattern.pattern.lower()) for section, pattern in self.section_headers]
+
+        # normalize_scheme_or_loan_type: (keyword, value) pairs, first match in table order wins
+        self.scheme_keywords = [(key.lower(), value) for key, value in chunker_cls.SCHEME_MAPPINGS.items()]
+        self.sub_loan_keywords = list(chunker_cls.SUB_LOAN_KEYWORDS.items())
+        self.main_loan_keywords = [
+            (key, value) for key, value in chunker_cls.LOAN_TYPE_MAPPINGS.items()
+            if key not in chunker_cls.SUB_LOAN_KEYWORDS
+        ]
+        self.loan_keywords = list(chunker_cls.LOAN_TYPE_MAPPINGS.items())
+
+    @staticmethod
+    def first_keyword(text: str, keywords: List[Tuple[str, str]]) -> Optional[str]:
+        """Value of the first (keyword, value) pair whose keyword occurs in text"""
+        for keyword, value in keywords:
+            if keyword in text:
+                return value
+        return None
+
+    def find_section_headers(self, text: str) -> List[Tuple[int, str, str]]:
+        """(start, section, matched text) for every header occurrence, ordered like a per-pattern scan"""
+        folded = text.lower()
+        if (
+            self.section_literals is None
+            or len(folded) != len(text)
+            or any(char in text for char in _IGNORECASE_SPECIAL_CHARS)
+        ):
+            return [
+                (match.start(), section, match.group(0))
+                for section, pattern in self.section_headers
+                for match in pattern.finditer(text)
+            ]
+
+        # Non-overlapping occurrences per header, exactly as finditer would report them
+        markers = []
+        for section, literal in self.section_literals:
+            size = len(literal)
+            start = folded.find(literal)
+            while start != -1:
+                markers.append((start, section, text[start:start + size]))
+                start = folded.find(literal, start + size)
+        return markers
+
+
+@functools.lru_cache(maxsize=None)
+def _matcher_tables(chunker_cls: type) -> _MatcherTables:
+    return _MatcherTables(chunker_cls)
+
+
 class SemanticChunker:
     """
     Semantic chunker that splits documents by logical sections rather than fixed character count.
@@ -74,6 +213,77 @@ class SemanticChunker:
         "balance transfer loan": "HOME_LOAN_BALANCE_TRANSFER",
     }
     
+    # Sub-loan keywords checked (before main loan types) against file name + section text
+    SUB_LOAN_KEYWORDS = {
+        "mudra": "BUSINESS_LOAN_MUDRA",
+        "shishu": "BUSINESS_LOAN_MUDRA",
+        "kishore": "BUSINESS_LOAN_MUDRA",
+        "tarun": "BUSINESS_LOAN_MUDRA",
+        "term loan": "BUSINESS_LOAN_TERM",
+        "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
+        "invoice financing": "BUSINESS_LOAN_INVOICE",
+        "equipment financing": "BUSINESS_LOAN_EQUIPMENT",
+        "business overdraft": "BUSINESS_LOAN_OVERDRAFT",
+        "home purchase": "HOME_LOAN_PURCHASE",
+        "home construction": "HOME_LOAN_CONSTRUCTION",
+        "plot construction": "HOME_LOAN_PLOT_CONSTRUCTION",
+        "plot + construction": "HOME_LOAN_PLOT_CONSTRUCTION",
+        "home extension": "HOME_LOAN_EXTENSION",
+        "home renovation": "HOME_LOAN_RENOVATION",
+        "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
+    }
+    
+    # Table column headers -> sub-loan types, per base loan type
+    SUB_LOAN_COLUMN_PATTERNS = {
+        "business_loan": {
+            "mudra": "BUSINESS_LOAN_MUDRA",
+            "term loan": "BUSINESS_LOAN_TERM",
+            "sme term": "BUSINESS_LOAN_TERM",
+            "term": "BUSINESS_LOAN_TERM",  # Match "Term Loan" or "SME Term Loan"
+            "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
+            "invoice": "BUSINESS_LOAN_INVOICE",
+            "equipment": "BUSINESS_LOAN_EQUIPMENT",
+            "overdraft": "BUSINESS_LOAN_OVERDRAFT",
+        },
+        "home_loan": {
+            "purchase": "HOME_LOAN_PURCHASE",
+            "construction": "HOME_LOAN_CONSTRUCTION",
+            "plot": "HOME_LOAN_PLOT_CONSTRUCTION",
+            "extension": "HOME_LOAN_EXTENSION",
+            "renovation": "HOME_LOAN_RENOVATION",
+            "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
+        }
+    }
+    
+    # Column header patterns used to locate a sub-loan type's column when splitting tables
+    SUB_LOAN_TABLE_COLUMNS = {
+        "mudra": "BUSINESS_LOAN_MUDRA",
+        "term loan": "BUSINESS_LOAN_TERM",
+        "sme term": "BUSINESS_LOAN_TERM",
+        "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
+        "invoice": "BUSINESS_LOAN_INVOICE",
+        "equipment": "BUSINESS_LOAN_EQUIPMENT",
+        "overdraft": "BUSINESS_LOAN_OVERDRAFT",
+    }
+    
+    # Map Hindi section names to English (normalized)
+    HINDI_SECTION_NAMES = {
+        "पात्रता": "Eligibility",
+        "पात्रता मानदंड": "Eligibility",
+        "दस्तावेज": "Documents",
+        "आवश्यक दस्तावेज": "Documents",
+        "ब्याज दर": "Interest_Rates",
+        "ब्याज दर संरचना": "Interest_Rates",
+        "शुल्क": "Fees",
+        "चार्ज": "Fees",
+        "प्रश्न": "FAQ",
+        "सवाल": "FAQ",
+        "अवलोकन": "Overview",
+        "उत्पाद अवलोकन": "Overview",
+        "विशेषताएं": "Features",
+        "मुख्य विशेषताएं": "Features",
+    }
+    
     # Section headers in English and Hindi - normalized to English for metadata
     SECTION_PATTERNS = {
         "Overview": [r"PRODUCT OVERVIEW", r"OVERVIEW", r"उत्पाद अवलोकन", r"अवलोकन"],
@@ -97,6 +307,8 @@ class SemanticChunker:
         """
         self.min_chunk_size = min_chunk_size
         self.max_chunk_size = max_chunk_size
+        # Compiled once per chunker class and shared by every instance
+        self._tables = _matcher_tables(type(self))
     
     def preprocess_text(self, text: str) -> str:
         """
@@ -109,7 +321,7 @@ class SemanticChunker:
             Cleaned text
         """
         # Remove HTML/XML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         # Remove generic headers/footers (but keep if at start for context)
         # Common patterns: Page numbers, URLs, generic bank info
@@ -120,19 +332,10 @@ class SemanticChunker:
         for line in lines:
             line_stripped = line.strip()
             
-            # Skip generic headers/footers (unless at document start)
-            if not is_start:
-                # Skip page numbers
-                if re.match(r'^Page\s+\d+$', line_stripped, re.IGNORECASE):
-                    continue
-                # Skip URLs
-                if re.match(r'^https?://', line_stripped):
-                    continue
-                # Skip generic bank footer patterns
-                if re.match(r'^www\.sunnationalbank', line_stripped, re.IGNORECASE):
-                    continue
-                if re.match(r'^\d{4}-\d{3}-\d{4}$', line_stripped):  # Phone numbers in footer
-                    continue
+            # Skip generic headers/footers (unless at document start):
+            # page numbers, URLs, bank footer, phone numbers in footer
+            if not is_start and _FOOTER_LINE_RE.match(line_stripped):
+                continue
             
             cleaned_lines.append(line)
             # After first few lines, mark as not start
@@ -152,8 +355,7 @@ class SemanticChunker:
             Language code: "en" or "hi"
         """
         # Simple heuristic: if text contains Devanagari characters, it's Hindi
-        devanagari_pattern = r'[\u0900-\u097F]'
-        if re.search(devanagari_pattern, text):
+        if _DEVANAGARI_RE.search(text):
             return "hi"
         return "en"
     
@@ -179,45 +381,26 @@ class SemanticChunker:
         section_lower = section_text.lower() if section_text else ""
         combined_text = f"{text_lower} {section_lower}"
         
+        tables = self._tables
         if document_type == "investment":
-            # Check scheme mappings (case-insensitive)
-            for key, value in self.SCHEME_MAPPINGS.items():
-                if key.lower() in text_lower:
-                    return value  # Returns uppercase: PPF, NPS, SSY
+            # Check scheme mappings (case-insensitive), first mapping in table order wins
+            scheme = tables.first_keyword(text_lower, tables.scheme_keywords)
+            if scheme is not None:
+                return scheme  # Returns uppercase: PPF, NPS, SSY
             # Fallback: if filename is like "ppf_scheme_guide", normalize to uppercase
             if text_lower in ["ppf", "nps", "ssy"]:
                 return text_lower.upper()  # "ppf" -> "PPF"
         else:
             # Check sub-loan types first (more specific) - check both text and section
-            sub_loan_keywords = {
-                "mudra": "BUSINESS_LOAN_MUDRA",
-                "shishu": "BUSINESS_LOAN_MUDRA",
-                "kishore": "BUSINESS_LOAN_MUDRA",
-                "tarun": "BUSINESS_LOAN_MUDRA",
-                "term loan": "BUSINESS_LOAN_TERM",
-                "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
-                "invoice financing": "BUSINESS_LOAN_INVOICE",
-                "equipment financing": "BUSINESS_LOAN_EQUIPMENT",
-                "business overdraft": "BUSINESS_LOAN_OVERDRAFT",
-                "home purchase": "HOME_LOAN_PURCHASE",
-                "home construction": "HOME_LOAN_CONSTRUCTION",
-                "plot construction": "HOME_LOAN_PLOT_CONSTRUCTION",
-                "plot + construction": "HOME_LOAN_PLOT_CONSTRUCTION",
-                "home extension": "HOME_LOAN_EXTENSION",
-                "home renovation": "HOME_LOAN_RENOVATION",
-                "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
-            }
-            
-            # Check for sub-loan types in combined text
-            for keyword, value in sub_loan_keywords.items():
-                if keyword in combined_text:
-                    return value
+            loan_type = tables.first_keyword(combined_text, tables.sub_loan_keywords)
+            if loan_type is not None:
+                return loan_type
             
             # Check main loan types - text_lower already has underscores normalized to spaces
-            for key, value in self.LOAN_TYPE_MAPPINGS.items():
-                # Check if key matches (text_lower already normalized, so "personal loan" will match)
-                if key in text_lower and key not in sub_loan_keywords:
-                    return value
+            # (keys that are also sub-loan keywords were already checked above)
+            loan_type = tables.first_keyword(text_lower, tables.main_loan_keywords)
+            if loan_type is not None:
+                return loan_type
         
         # Default fallback
         if document_type == "investment":
@@ -234,10 +417,9 @@ class SemanticChunker:
         Returns:
             Section name or None
         """
-        for section, patterns in self.SECTION_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return section.title().replace("_", " ")
+        for section, pattern in self._tables.section_families:
+            if pattern.search(text):
+                return section
         return None
     
     def detect_table(self, text: str) -> bool:
@@ -251,20 +433,8 @@ class SemanticChunker:
             True if table detected
         """
         # Look for table indicators
-        table_indicators = [
-            r"The following table:",
-            r"निम्नलिखित तालिका:",
-            r"Feature.*Details",
-            r"Criteria.*Requirement",
-            r"Charge Type.*Amount",
-            r"\|.*\|",  # Markdown table format
-            r"विशेषता.*MUDRA",  # Hindi business loan table pattern
-            r"MUDRA.*टर्म.*कार्यशील",  # Multiple loan types in header
-        ]
-        
-        for indicator in table_indicators:
-            if re.search(indicator, text, re.IGNORECASE):
-                return True
+        if _TABLE_INDICATOR_RE.search(text):
+            return True
         
         # Check for CSV-style patterns (multiple lines with commas/quotes)
         lines = text.split('\n')
@@ -275,15 +445,10 @@ class SemanticChunker:
         
         # Check for space-separated table with multiple columns (like business loan table)
         # Look for lines with multiple loan type names (MUDRA, Term, Working Capital, etc.)
-        loan_type_keywords = ["mudra", "term", "working capital", "टर्म", "कार्यशील", "मुद्रा"]
-        found_keywords = []
-        for line in lines[:10]:  # Check first 10 lines
-            line_lower = line.lower()
-            for keyword in loan_type_keywords:
-                if keyword in line_lower and keyword not in found_keywords:
-                    found_keywords.append(keyword)
+        head_lower = '\n'.join(lines[:10]).lower()  # Check first 10 lines
+        found_keywords = sum(1 for keyword in _TABLE_LOAN_KEYWORDS if keyword in head_lower)
         # If we find 2+ loan type keywords in the same section, it's likely a comparison table
-        if len(found_keywords) >= 2:
+        if found_keywords >= 2:
             return True
         
         return False
@@ -326,7 +491,7 @@ class SemanticChunker:
             for i, line in enumerate(lines):
                 # Check if this line contains multiple loan type keywords
                 line_lower = line.lower()
-                loan_keywords_found = sum(1 for kw in ["mudra", "term", "working", "टर्म", "कार्यशील", "मुद्रा"] if kw in line_lower)
+                loan_keywords_found = sum(1 for kw in _MARKDOWN_LOAN_KEYWORDS if kw in line_lower)
                 if loan_keywords_found >= 2:
                     table_start_idx = i
                     break
@@ -339,17 +504,10 @@ class SemanticChunker:
                 
                 # Look for known column headers in the header line
                 # Pattern: "विशेषता" (Feature) followed by loan type names
-                header_patterns = [
-                    (r'विशेषता', 'Feature'),
-                    (r'MUDRA[^\s]*', 'MUDRA लोन'),
-                    (r'टर्म[^\s]*', 'SME टर्म लोन'),
-                    (r'कार्यशील[^\s]*', 'कार्यशील पूंजी'),
-                ]
-                
                 # Find positions of each header pattern
                 header_positions = []
-                for pattern, name in header_patterns:
-                    match = re.search(pattern, header_line, re.IGNORECASE)
+                for pattern, name in _TABLE_HEADER_PATTERNS:
+                    match = pattern.search(header_line)
                     if match:
                         header_positions.append((match.start(), name))
                 
@@ -410,27 +568,7 @@ class SemanticChunker:
         """
         detected_sub_types = []
         
-        # Map of column header patterns to sub-loan types
-        sub_loan_column_patterns = {
-            "business_loan": {
-                "mudra": "BUSINESS_LOAN_MUDRA",
-                "term loan": "BUSINESS_LOAN_TERM",
-                "sme term": "BUSINESS_LOAN_TERM",
-                "term": "BUSINESS_LOAN_TERM",  # Match "Term Loan" or "SME Term Loan"
-                "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
-                "invoice": "BUSINESS_LOAN_INVOICE",
-                "equipment": "BUSINESS_LOAN_EQUIPMENT",
-                "overdraft": "BUSINESS_LOAN_OVERDRAFT",
-            },
-            "home_loan": {
-                "purchase": "HOME_LOAN_PURCHASE",
-                "construction": "HOME_LOAN_CONSTRUCTION",
-                "plot": "HOME_LOAN_PLOT_CONSTRUCTION",
-                "extension": "HOME_LOAN_EXTENSION",
-                "renovation": "HOME_LOAN_RENOVATION",
-                "balance transfer": "HOME_LOAN_BALANCE_TRANSFER",
-            }
-        }
+        sub_loan_column_patterns = self.SUB_LOAN_COLUMN_PATTERNS
         
         base_type_lower = base_loan_type.lower().replace("_", " ")
         # Try both with space and underscore
@@ -625,15 +763,7 @@ class SemanticChunker:
         sub_type_columns = {}
         for sub_type in sub_types:
             # Find which column header matches this sub-type
-            for pattern, mapped_sub_type in {
-                "mudra": "BUSINESS_LOAN_MUDRA",
-                "term loan": "BUSINESS_LOAN_TERM",
-                "sme term": "BUSINESS_LOAN_TERM",
-                "working capital": "BUSINESS_LOAN_WORKING_CAPITAL",
-                "invoice": "BUSINESS_LOAN_INVOICE",
-                "equipment": "BUSINESS_LOAN_EQUIPMENT",
-                "overdraft": "BUSINESS_LOAN_OVERDRAFT",
-            }.items():
+            for pattern, mapped_sub_type in self.SUB_LOAN_TABLE_COLUMNS.items():
                 if mapped_sub_type == sub_type:
                     # Find column index
                     for idx, header in enumerate(header_cells):
@@ -710,36 +840,28 @@ class SemanticChunker:
         faqs = []
         
         # Check if text contains FAQ section
-        if not re.search(r'FREQUENTLY ASKED QUESTIONS|FAQ|प्रश्न', text, re.IGNORECASE):
+        if not _FAQ_SECTION_RE.search(text):
             return faqs
         
         # Patterns for questions (more flexible)
-        question_patterns = [
-            r'<b>Q\d+[:\s]+(.*?)</b>',  # HTML format
-            r'Q\d+[:\s]+(.*?)(?=\n|Q\d+|$)',
-            r'प्रश्न\s*\d+[:\s]+(.*?)(?=\n|प्रश्न|$)',
-            r'Q[:\s]+(.*?)(?=\n|Q|$)',
-            r'(\d+\.\s*[^?]+\?)',  # Numbered questions ending with ?
-        ]
-        
-        for pattern in question_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _FAQ_QUESTION_RES:
+            matches = pattern.finditer(text)
             for match in matches:
                 question = match.group(1).strip() if len(match.groups()) > 0 else match.group(0).strip()
                 # Find answer (text after question until next question or end)
                 start_pos = match.end()
                 # Look for next question pattern
-                next_q_match = re.search(r'Q\d+|प्रश्न\s*\d+|\d+\.\s*[^?]+\?', text[start_pos:], re.IGNORECASE)
+                next_q_match = _FAQ_NEXT_QUESTION_RE.search(text[start_pos:])
                 if next_q_match:
                     answer = text[start_pos:start_pos + next_q_match.start()].strip()
                 else:
                     # Take next few sentences or until end
                     remaining = text[start_pos:]
-                    sentences = re.split(r'[.!?]\s+', remaining)
+                    sentences = _SENTENCE_SPLIT_RE.split(remaining)
                     answer = '. '.join(sentences[:3]).strip()  # Take first 3 sentences
                 
                 # Clean up answer (remove HTML tags, extra whitespace)
-                answer = re.sub(r'<[^>]+>', '', answer)
+                answer = _HTML_TAG_RE.sub('', answer)
                 answer = ' '.join(answer.split())
                 
                 # Filter out very short answers (likely false positives)
@@ -762,25 +884,13 @@ class SemanticChunker:
         keywords = []
         
         # Extract numbers (interest rates, amounts, percentages)
-        numbers = re.findall(r'\d+[.,]?\d*%?', text)
+        numbers = _KEYWORD_NUMBER_RE.findall(text)
         keywords.extend(numbers[:5])  # Limit to 5 numbers
         
         # Extract key financial terms
-        if language == "en":
-            financial_terms = [
-                r'\b(interest rate|loan amount|tenure|emi|processing fee|eligibility|documents|collateral)\b',
-                r'\b(rs\.?\s*\d+|rupees?\s*\d+|₹\s*\d+)\b',
-                r'\b(\d+\s*years?|\d+\s*months?)\b',
-            ]
-        else:
-            financial_terms = [
-                r'\b(ब्याज दर|लोन राशि|अवधि|पात्रता|दस्तावेज|गारंटी)\b',
-                r'\b(रुपये?\s*\d+|₹\s*\d+)\b',
-                r'\b(\d+\s*वर्ष|\d+\s*महीने?)\b',
-            ]
-        
+        financial_terms = _FINANCIAL_TERM_RES["en" if language == "en" else "hi"]
         for pattern in financial_terms:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+            matches = pattern.findall(text)
             keywords.extend([m[0] if isinstance(m, tuple) else m for m in matches[:3]])
         
         # Extract section names
@@ -807,21 +917,12 @@ class SemanticChunker:
         # Find all section headers (including sub-loan types)
         section_markers = []
         
-        # Standard section patterns
-        for section_name, patterns in self.SECTION_PATTERNS.items():
-            for pattern in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                    section_markers.append((match.start(), section_name, match.group(0)))
+        # Standard section patterns (every occurrence of every header)
+        section_markers.extend(self._tables.find_section_headers(text))
         
         # Detect sub-loan types (e.g., "1. MUDRA Loans:", "2. Term Loans:")
-        sub_loan_patterns = [
-            r'\d+\.\s*(MUDRA|Term|Working Capital|Invoice Financing|Equipment Financing|Business Overdraft)[^:]*:',
-            r'\d+\.\s*(Home Purchase|Home Construction|Plot|Home Extension|Home Renovation|Balance Transfer)[^:]*:',
-            r'\d+\.\s*(शिशु|किशोर|तरुण|MUDRA|टर्म|कार्यशील पूंजी)[^:]*:',
-        ]
-        
-        for pattern in sub_loan_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
+        for pattern in _SUB_LOAN_HEADING_RES:
+            for match in pattern.finditer(text):
                 # Extract sub-loan type
                 sub_loan_text = match.group(1).strip()
                 section_markers.append((match.start(), "SubLoan", sub_loan_text))
@@ -899,10 +1000,9 @@ class SemanticChunker:
                 if base_normalized_type == "UNKNOWN_LOAN":
                     filename_clean = filename.replace("_", " ").lower().strip()
                     # Direct match against loan type mappings
-                    for key, value in self.LOAN_TYPE_MAPPINGS.items():
-                        if key in filename_clean:
-                            base_normalized_type = value
-                            break
+                    loan_type = self._tables.first_keyword(filename_clean, self._tables.loan_keywords)
+                    if loan_type is not None:
+                        base_normalized_type = loan_type
         
         chunks = []
         chunk_id_counter = 1
@@ -1255,25 +1355,7 @@ class SemanticChunker:
         Returns:
             English section name
         """
-        # Map Hindi section names to English (normalized)
-        hindi_to_english = {
-            "पात्रता": "Eligibility",
-            "पात्रता मानदंड": "Eligibility",
-            "दस्तावेज": "Documents",
-            "आवश्यक दस्तावेज": "Documents",
-            "ब्याज दर": "Interest_Rates",
-            "ब्याज दर संरचना": "Interest_Rates",
-            "शुल्क": "Fees",
-            "चार्ज": "Fees",
-            "प्रश्न": "FAQ",
-            "सवाल": "FAQ",
-            "अवलोकन": "Overview",
-            "उत्पाद अवलोकन": "Overview",
-            "विशेषताएं": "Features",
-            "मुख्य विशेषताएं": "Features",
-        }
-        
-        for hindi, english in hindi_to_english.items():
+        for hindi, english in self.HINDI_SECTION_NAMES.items():
             if hindi in section_name:
                 return english
         
@@ -0,0 +1,204 @@
+"""
+Streaming TTS Service
+Splits streamed response text into sentences and synthesizes each one while the rest is still being generated
+"""
+import asyncio
+import io
+import re
+import wave
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Protocol
+
+from config import settings
+from utils import logger
+
+
+# Sentence terminators: Latin punctuation, Hindi danda / double danda
+_LATIN_TERMINATORS = ".!?"
+_DANDA_TERMINATORS = "।॥"
+_SOFT_BREAK_RE = re.compile(r"[,;:]\s")
+
+# Abbreviations whose trailing period does not end a sentence ("Rs. 500", "8.5% p.a. for")
+_ABBREVIATIONS = frozenset({
+    "rs", "p.a", "e.g", "i.e", "no", "nos", "dr", "mr", "mrs", "ms", "st", "vs", "etc", "approx", "max", "min",
+    "a/c", "acc", "ltd", "pvt", "govt", "dept", "sr", "jr", "inc", "co",
+})
+
+
+class SentenceSegmenter:
+    """
+    Incrementally splits streamed text into speakable sentences.
+
+    A Latin ``.``/``!``/``?`` ends a sentence only when followed by whitespace
+    (so "8.5%" and "₹1,00,000.50" stay intact) and not after a known
+    abbreviation such as "Rs."; a danda (``।``/``॥``) always ends one. Newlines
+    end a sentence too, and run-on text is broken at a comma or space once it
+    exceeds ``max_chars``.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars or settings.tts_sentence_max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        while True:
+            end = self._find_boundary(self._buffer)
+            if end is None:
+                break
+            sentence, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left once the stream has ended"""
+        sentence, self._buffer = self._buffer.strip(), ""
+        return [sentence] if sentence else []
+
+    def _find_boundary(self, text: str) -> Optional[int]:
+        for index, char in enumerate(text):
+            if char in _DANDA_TERMINATORS or char == "\n":
+                return index + 1
+            if char in _LATIN_TERMINATORS:
+                if index + 1 >= len(text):
+                    return None  # Wait: the next character decides ("8." vs "8.5")
+                if text[index + 1].isspace() and not self._ends_with_abbreviation(text[:index]):
+                    return index + 1
+        if len(text) > self.max_chars:
+            soft = None
+            for match in _SOFT_BREAK_RE.finditer(text, 0, self.max_chars):
+                soft = match.end()
+            if soft is None:
+                soft = text.rfind(" ", 0, self.max_chars) + 1 or self.max_chars
+            return soft
+        return None
+
+    @staticmethod
+    def _ends_with_abbreviation(text: str) -> bool:
+        word = text.rsplit(None, 1)[-1] if text.strip() else ""
+        return word.lower().lstrip("(\"'") in _ABBREVIATIONS
+
+
+class SpeechSynthesizer(Protocol):
+    """Anything with AzureTTSService's synthesize_text signature"""
+
+    async def synthesize_text(self, text: str, language: str = "en-IN") -> bytes:
+        ...
+
+
+class LocalSpeechSynthesizer:
+    """
+    Stand-in synthesizer for tests and local development.
+
+    Returns a silent 16 kHz mono WAV whose length tracks the text (about
+    60 ms per character), optionally after a simulated synthesis delay.
+    """
+
+    SAMPLE_RATE = 16000
+
+    def __init__(self, delay_seconds: float = 0.0, ms_per_char: int = 60):
+        self.delay_seconds = delay_seconds
+        self.ms_per_char = ms_per_char
+        self.calls: List[str] = []
+
+    async def synthesize_text(self, text: str, language: str = "en-IN") -> bytes:
+        self.calls.append(text)
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        frames = int(self.SAMPLE_RATE * len(text) * self.ms_per_char / 1000)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.SAMPLE_RATE)
+            wav.writeframes(b"\x00\x00" * frames)
+        return buffer.getvalue()
+
+
+@dataclass
+class SpeechSegment:
+    """Audio for one sentence, in playback order"""
+
+    index: int
+    text: str
+    audio: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+async def stream_speech(
+    text_stream: AsyncIterator[str],
+    synthesizer: SpeechSynthesizer,
+    language: str = "en-IN",
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[SpeechSegment]:
+    """
+    Synthesize sentences as soon as they are complete and yield audio in order
+
+    Args:
+        text_stream: Streamed response text (LLM tokens or request body chunks)
+        synthesizer: Speech backend (AzureTTSService or LocalSpeechSynthesizer)
+        language: Language code for voice selection
+        max_concurrency: Sentences synthesized in parallel ahead of playback
+
+    Yields:
+        SpeechSegment per sentence; a failed sentence carries ``error`` instead
+        of audio so the client can fall back to on-device speech for it
+    """
+    segmenter = SentenceSegmenter()
+    limit = asyncio.Semaphore(max(1, max_concurrency or settings.tts_stream_max_concurrency))
+    pending: "asyncio.Queue[Optional[asyncio.Task]]" = asyncio.Queue()
+
+    async def synthesize(index: int, sentence: str) -> SpeechSegment:
+        async with limit:
+            try:
+                audio = await synthesizer.synthesize_text(sentence, language=language)
+                return SpeechSegment(index=index, text=sentence, audio=audio)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("tts_sentence_failed", index=index, language=language, error=str(exc))
+                return SpeechSegment(index=index, text=sentence, error=str(exc))
+
+    async def segment() -> None:
+        index = 0
+        try:
+            async for chunk in text_stream:
+                for sentence in segmenter.feed(chunk):
+                    pending.put_nowait(asyncio.create_task(synthesize(index, sentence)))
+                    index += 1
+            for sentence in segmenter.flush():
+                pending.put_nowait(asyncio.create_task(synthesize(index, sentence)))
+                index += 1
+        finally:
+            pending.put_nowait(None)
+
+    producer = asyncio.create_task(segment())
+    started: List[asyncio.Task] = []
+    try:
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            started.append(task)
+            yield await task
+        await producer
+    finally:
+        producer.cancel()
+        for task in started:
+            task.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is not None:
+                task.cancel()
+
+
+def get_stream_synthesizer() -> Optional[SpeechSynthesizer]:
+    """Configured synthesizer for streaming TTS, or None if it is unavailable"""
+    if settings.tts_stream_synthesizer == "local":
+        return LocalSpeechSynthesizer()
+
+    from services.azure_tts_service import get_azure_tts_service
+
+    azure_tts = get_azure_tts_service()
+    return azure_tts if azure_tts.is_available() else None
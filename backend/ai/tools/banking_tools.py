@@ -17,15 +17,28 @@ from langchain.tools import tool
 from pydantic import BaseModel, Field
 
 # Import backend functions
+from db.account_cache import AccountSummaryCache
 from db.repositories import accounts as account_repo
 from db.repositories import transactions as transaction_repo
-from utils.db_helper import get_db
+from db.services.banking import STATEMENT_PAGE_SIZE, serialize_statement_line
+from utils.db_helper import get_async_db
 
 # Import demo logging
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.demo_logging import demo_logger
 
 
+# Account summaries per user; transfers committed in this process invalidate them and
+# older entries are revalidated against the account version (transfers made via the API)
+_account_cache = AccountSummaryCache()
+_account_owners: Dict[str, str] = {}  # account number -> user id of cached summaries
+
+
+def _copy_accounts_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Callers get their own dicts, never the cached ones"""
+    return {**result, "accounts": [dict(account) for account in result["accounts"]]}
+
+
 # Tool input schemas
 class GetBalanceInput(BaseModel):
     """Input for get_balance tool"""
@@ -53,7 +66,7 @@ class DownloadStatementInput(BaseModel):
 
 
 @tool("get_user_accounts", args_schema=GetUserAccountsInput)
-def get_user_accounts(user_id: str) -> Dict[str, Any]:
+async def get_user_accounts(user_id: str) -> Dict[str, Any]:
     """
     Get all accounts for a user.
     Use this when the user asks about their accounts, or to find a specific account type.
@@ -65,8 +78,17 @@ def get_user_accounts(user_id: str) -> Dict[str, Any]:
         Dictionary with list of all user accounts
     """
     try:
-        with get_db() as db:
-            accounts = account_repo.list_accounts_for_user(db, user_id)
+        entry = _account_cache.get(user_id)
+        if entry is not None and _account_cache.is_fresh(entry):
+            return _copy_accounts_result(entry.value)
+        generation = _account_cache.generation(user_id)
+        
+        async with get_async_db() as db:
+            if entry is not None and await account_repo.get_accounts_version_async(db, user_id) == entry.etag:
+                _account_cache.mark_validated(entry)
+                return _copy_accounts_result(entry.value)
+            
+            accounts = await account_repo.list_accounts_for_user_async(db, user_id, with_cards=False)
             
             if not accounts:
                 return {
@@ -88,11 +110,17 @@ def get_user_accounts(user_id: str) -> Dict[str, Any]:
                     "status": account.status.value if hasattr(account.status, 'value') else str(account.status)
                 })
             
-            return {
+            result = {
                 "success": True,
                 "accounts": accounts_list,
                 "count": len(accounts_list)
             }
+            etag = account_repo.accounts_version_of(accounts)
+        
+        for account in accounts_list:
+            _account_owners[account["account_number"]] = user_id
+        _account_cache.put(user_id, etag, result, generation)
+        return _copy_accounts_result(result)
     except Exception as e:
         return {
             "success": False,
@@ -100,8 +128,20 @@ def get_user_accounts(user_id: str) -> Dict[str, Any]:
         }
 
 
+def _cached_account(account_number: str) -> Optional[Dict[str, Any]]:
+    """The account from its owner's cached summary, if that summary needs no revalidation"""
+    user_id = _account_owners.get(account_number)
+    entry = _account_cache.get(user_id) if user_id else None
+    if entry is None or not _account_cache.is_fresh(entry):
+        return None
+    return next(
+        (account for account in entry.value["accounts"] if account["account_number"] == account_number),
+        None,
+    )
+
+
 @tool("get_account_balance", args_schema=GetBalanceInput)
-def get_account_balance(account_number: str) -> Dict[str, Any]:
+async def get_account_balance(account_number: str) -> Dict[str, Any]:
     """
     Get the current balance for a specific bank account.
     Use this when you have a specific account number.
@@ -114,8 +154,25 @@ def get_account_balance(account_number: str) -> Dict[str, Any]:
     """
     start_time = time.time()
     try:
-        with get_db() as db:
-            account = account_repo.get_account_by_number(db, account_number)
+        cached = _cached_account(account_number)
+        if cached is not None:
+            result = {
+                "success": True,
+                "account_number": cached["account_number"],
+                "account_type": cached["account_type"],
+                "balance": cached["balance"],
+                "currency": "INR"
+            }
+            demo_logger.tool_execution(
+                tool_name="get_account_balance",
+                success=True,
+                duration_ms=(time.time() - start_time) * 1000,
+                result=f"Balance: ₹{result['balance']:.2f} ({account_number}, cached)"
+            )
+            return result
+        
+        async with get_async_db() as db:
+            account = await account_repo.get_account_by_number_async(db, account_number)
             
             if not account:
                 result = {
@@ -160,7 +217,7 @@ def get_account_balance(account_number: str) -> Dict[str, Any]:
 
 
 @tool("get_transaction_history", args_schema=GetTransactionHistoryInput)
-def get_transaction_history(account_number: str, days: int = 30, limit: int = 10) -> Dict[str, Any]:
+async def get_transaction_history(account_number: str, days: int = 30, limit: int = 10) -> Dict[str, Any]:
     """
     Get recent transaction history for an account.
     Use this when user asks about transactions, transaction history, or recent activity.
@@ -175,9 +232,9 @@ def get_transaction_history(account_number: str, days: int = 30, limit: int = 10
     """
     start_time = time.time()
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             # Get account first
-            account = account_repo.get_account_by_number(db, account_number)
+            account = await account_repo.get_account_by_number_async(db, account_number)
             
             if not account:
                 result = {
@@ -196,7 +253,7 @@ def get_transaction_history(account_number: str, days: int = 30, limit: int = 10
             start_date = datetime.now() - timedelta(days=days)
             
             # Get transactions
-            transactions = transaction_repo.get_transaction_history(
+            transactions = await transaction_repo.get_transaction_history_async(
                 db,
                 account_id=account.id,
                 start_date=start_date,
@@ -244,7 +301,7 @@ def get_transaction_history(account_number: str, days: int = 30, limit: int = 10
 
 
 @tool("download_statement", args_schema=DownloadStatementInput)
-def download_statement(account_number: str, from_date: str, to_date: str, period_type: str = "custom") -> Dict[str, Any]:
+async def download_statement(account_number: str, from_date: str, to_date: str, period_type: str = "custom") -> Dict[str, Any]:
     """
     Prepare account statement for download.
     Use this when user asks to download statement, get statement, or export transactions.
@@ -290,9 +347,9 @@ def download_statement(account_number: str, from_date: str, to_date: str, period
                 "error": "Statement period cannot exceed 365 days (RBI compliance). Please select a shorter period."
             }
         
-        with get_db() as db:
+        async with get_async_db() as db:
             # Get account
-            account = account_repo.get_account_by_number(db, account_number)
+            account = await account_repo.get_account_by_number_async(db, account_number)
             
             if not account:
                 return {
@@ -300,27 +357,22 @@ def download_statement(account_number: str, from_date: str, to_date: str, period
                     "error": "Account not found"
                 }
             
-            # Get transactions for the period
-            transactions = transaction_repo.get_transaction_history(
-                db,
-                account_id=account.id,
-                start_date=start_dt,
-                end_date=end_dt,
-                limit=500  # Max statement limit
-            )
-            
+            # Get every transaction of the period, one keyset page at a time
             transactions_list = []
-            for txn in transactions:
-                transactions_list.append({
-                    "date": txn.occurred_at.strftime("%Y-%m-%d %H:%M"),
-                    "type": txn.transaction_type.value if hasattr(txn.transaction_type, 'value') else str(txn.transaction_type),
-                    "amount": float(txn.amount),
-                    "currency": txn.currency_code,
-                    "description": txn.description or "",
-                    "status": txn.status.value if hasattr(txn.status, 'value') else str(txn.status),
-                    "counterparty": txn.counterparty_name or "",
-                    "reference_id": txn.reference_id or ""
-                })
+            before = None
+            while True:
+                rows = await transaction_repo.get_statement_rows_async(
+                    db,
+                    account_id=account.id,
+                    start_date=start_dt,
+                    end_date=end_dt,
+                    limit=STATEMENT_PAGE_SIZE,
+                    before=before,
+                )
+                transactions_list.extend(serialize_statement_line(row) for row in rows)
+                if len(rows) < STATEMENT_PAGE_SIZE:
+                    break
+                before = transaction_repo.HistoryCursor.after(rows[-1])
             
             return {
                 "success": True,
@@ -2,6 +2,7 @@
 UPI Payment Tools for AI agent
 Handles UPI ID resolution and payment processing
 """
+import asyncio
 import sys
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -19,11 +20,9 @@ from pydantic import BaseModel, Field
 from db.repositories import accounts as account_repo
 from db.repositories import beneficiaries as beneficiary_repo
 from db.services.banking import BankingService
-from db.engine import get_session_factory
-from db.config import load_database_config
-from db.engine import create_db_engine
-from utils.db_helper import get_db
+from utils.db_helper import SessionLocal, get_async_db
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from db.models import User, Account
 
 
@@ -44,7 +43,7 @@ class InitiateUPIPaymentInput(BaseModel):
 
 
 @tool("resolve_upi_id", args_schema=ResolveUPIIDInput)
-def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
+async def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
     """
     Resolve UPI ID, phone number, or name to a user account.
     Use this to find the recipient account for UPI payments.
@@ -56,7 +55,7 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
         Dictionary with account information if found
     """
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             # Try to find by UPI ID first
             if "@" in upi_identifier:
                 # Trim whitespace and use case-insensitive comparison
@@ -67,14 +66,15 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
                 stmt = select(User).where(
                     func.lower(User.upi_id) == func.lower(trimmed_upi_id)
                 ).where(User.upi_id.isnot(None))  # Exclude NULL values
-                user = db.execute(stmt).scalars().first()
+                user = (await db.execute(stmt)).scalars().first()
                 
                 # If not found in User table, try Account table
                 if not user:
                     account_stmt = select(Account).where(
                         func.lower(Account.upi_id) == func.lower(trimmed_upi_id)
                     ).where(Account.upi_id.isnot(None))  # Exclude NULL values
-                    account = db.execute(account_stmt).scalars().first()
+                    account_stmt = account_stmt.options(joinedload(Account.user))  # No lazy loads on AsyncSession
+                    account = (await db.execute(account_stmt)).scalars().first()
                     
                     if account:
                         # Found account with UPI ID - get the user
@@ -92,7 +92,7 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
                 # If found via User table, get the account
                 if user:
                     # Get user's primary account (first active account)
-                    accounts = account_repo.list_accounts_for_user(db, user.id)
+                    accounts = await account_repo.list_accounts_for_user_async(db, user.id)
                     primary_account = next(iter(accounts), None)
                     if primary_account:
                         return {
@@ -110,9 +110,9 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
             if len(clean_phone) >= 10:
                 clean_phone = clean_phone[-10:]  # Take last 10 digits
                 stmt = select(User).where(User.phone_number.like(f"%{clean_phone}%"))
-                user = db.execute(stmt).scalars().first()
+                user = (await db.execute(stmt)).scalars().first()
                 if user:
-                    accounts = account_repo.list_accounts_for_user(db, user.id)
+                    accounts = await account_repo.list_accounts_for_user_async(db, user.id)
                     primary_account = next(iter(accounts), None)
                     if primary_account:
                         return {
@@ -132,11 +132,11 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
                     (User.first_name.ilike(f"%{name_parts[0]}%")) |
                     (User.last_name.ilike(f"%{name_parts[0]}%"))
                 )
-                users = db.execute(stmt).scalars().all()
+                users = (await db.execute(stmt)).scalars().all()
                 if users:
                     # Return first match
                     user = users[0]
-                    accounts = account_repo.list_accounts_for_user(db, user.id)
+                    accounts = await account_repo.list_accounts_for_user_async(db, user.id)
                     primary_account = next(iter(accounts), None)
                     if primary_account:
                         return {
@@ -161,7 +161,7 @@ def resolve_upi_id(upi_identifier: str) -> Dict[str, Any]:
 
 
 @tool("initiate_upi_payment", args_schema=InitiateUPIPaymentInput)
-def initiate_upi_payment(
+async def initiate_upi_payment(
     source_account_number: str,
     recipient_identifier: str,
     amount: float,
@@ -186,7 +186,7 @@ def initiate_upi_payment(
     """
     try:
         # First resolve the recipient
-        recipient_info = resolve_upi_id.invoke({"upi_identifier": recipient_identifier})
+        recipient_info = await resolve_upi_id.ainvoke({"upi_identifier": recipient_identifier})
         
         if not recipient_info.get("success"):
             return {
@@ -199,15 +199,14 @@ def initiate_upi_payment(
         # Generate UPI reference ID
         upi_ref_id = f"UPI-{datetime.now().strftime('%Y%m%d')}-{datetime.now().strftime('%H%M%S')}"
         
-        # Use banking service to process the transfer
-        config = load_database_config()
-        engine = create_db_engine(config)
-        session_factory = get_session_factory(engine)
-        banking_service = BankingService(session_factory)
+        # Use banking service (on the shared engine) to process the transfer
+        banking_service = BankingService(SessionLocal)
         
-        # Process the transfer with UPI channel
+        # Process the transfer with UPI channel; the transfer stays on the sync
+        # session path, so run it off the event loop
         from db.utils.enums import TransactionChannel
-        result = banking_service.transfer_between_accounts(
+        result = await asyncio.to_thread(
+            banking_service.transfer_between_accounts,
             source_account_number=source_account_number,
             destination_account_number=destination_account_number,
             amount=amount,
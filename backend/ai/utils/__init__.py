@@ -7,6 +7,7 @@ from .exceptions import (
     DatabaseToolError,
     AuthenticationError,
     RateLimitError,
+    LLMOverloadedError,
     AzureTTSError,
     AgentExecutionError,
 )
@@ -22,6 +23,7 @@ __all__ = [
     "DatabaseToolError",
     "AuthenticationError",
     "RateLimitError",
+    "LLMOverloadedError",
     "AzureTTSError",
     "AgentExecutionError",
 ]
@@ -8,19 +8,31 @@ if str(project_root) not in sys.path:
 Database helper for AI backend
 Connects to the existing banking backend database
 """
+import asyncio
 import sys
 from pathlib import Path
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, Union
 
 from sqlalchemy.orm import Session
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 # Add backend to path
 backend_path = Path(__file__).parent.parent.parent / "backend"
 sys.path.insert(0, str(backend_path))
 
+from utils.logging import logger
 from db.config import load_database_config
-from db.engine import create_db_engine, get_session_factory
+from db.engine import (
+    async_session_scope,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_session_factory,
+    get_session_factory,
+)
 
 
 # Create database engine and session factory
@@ -42,4 +54,59 @@ def get_db() -> Iterator[Session]:
         session.close()
 
 
-__all__ = ["get_db", "SessionLocal", "engine"]
+class ThreadedSession:
+    """
+    Stand-in for AsyncSession when no async driver (or greenlet) is installed
+
+    Each statement runs on a worker thread with a regular Session and its
+    result is buffered, which is what the repositories' *_async functions
+    expect from ``await session.execute(...)``.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def execute(self, statement, *args, **kwargs) -> Any:
+        def run():
+            return self.sync_session.execute(statement, *args, **kwargs).freeze()
+
+        return (await asyncio.to_thread(run))()
+
+
+@lru_cache
+def get_async_session_factory_cached():
+    """Get or create the AsyncSession factory, or None when no async driver is installed"""
+    try:
+        # The tools only read balances and history, so use the read-only SQLite profile when configured
+        async_engine = create_async_db_engine(config, read_only=config.has_read_pool)
+    except ImportError as exc:
+        logger.warning("async_db_unavailable", fallback="threadpool", error=str(exc))
+        return None
+    return get_async_session_factory(async_engine)
+
+
+@asynccontextmanager
+async def get_async_db() -> AsyncIterator[Union["AsyncSession", ThreadedSession]]:
+    """
+    Async database session for AI tools
+    Queries are awaited on the event loop instead of blocking it; without an
+    async driver they run on worker threads through a ThreadedSession
+    """
+    factory = get_async_session_factory_cached()
+    if factory is not None:
+        async with async_session_scope(factory) as session:
+            yield session
+        return
+
+    session = SessionLocal()
+    try:
+        yield ThreadedSession(session)
+        await asyncio.to_thread(session.commit)
+    except BaseException:
+        await asyncio.to_thread(session.rollback)
+        raise
+    finally:
+        await asyncio.to_thread(session.close)
+
+
+__all__ = ["get_db", "get_async_db", "ThreadedSession", "SessionLocal", "engine"]
@@ -33,6 +33,11 @@ class RateLimitError(VaaniAIException):
     pass
 
 
+class LLMOverloadedError(VaaniAIException):
+    """Raised when the LLM scheduler sheds a request because its queue is full"""
+    pass
+
+
 class AzureTTSError(VaaniAIException):
     """Raised when Azure TTS service fails"""
     pass
@@ -0,0 +1,213 @@
+"""
+Keyword Automaton
+Aho-Corasick multi-keyword matcher: finds every occurrence of every keyword in one pass over the text
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed, ordered keyword list.
+
+    Matching is exact and code-point based, so English and Devanagari keywords
+    share one automaton; callers lower-case the text (and keywords) when they
+    want case-insensitive matching. Keywords are identified by their index in
+    the list, which doubles as a priority for ``first()``.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords: List[str] = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                raise ValueError("Keywords must be non-empty")
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (index,)
+
+        # Breadth-first pass wires failure links and merges suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+        # From the root state only a keyword's first character can make progress,
+        # so scanning jumps straight to the next such character
+        self._lengths: Tuple[int, ...] = tuple(len(keyword) for keyword in self.keywords)
+        self._root_skip = re.compile(
+            "[" + "".join(re.escape(char) for char in self._goto[0]) + "]"
+        ) if self._goto[0] else None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (start, keyword_index) for every occurrence, including overlapping ones
+
+        Matches are produced in order of their end position.
+        """
+        if self._root_skip is None:
+            return
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        root_skip = self._root_skip.search
+        length = len(text)
+        position = 0
+        state = 0
+        while position < length:
+            if not state:
+                match = root_skip(text, position)
+                if match is None:
+                    return
+                position = match.start()
+            char = text[position]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position - lengths[index] + 1, index
+            position += 1
+
+    def find_indices(self, text: str) -> Set[int]:
+        """Indices of all keywords that occur in text"""
+        return {index for _, index in self.iter_matches(text)}
+
+    def first(self, text: str) -> Optional[int]:
+        """Lowest keyword index occurring in text (i.e. the highest-priority match)"""
+        best: Optional[int] = None
+        for _, index in self.iter_matches(text):
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+
+def _is_word_char(char: str) -> bool:
+    """Same notion of a word character as ``\\w`` in a str regex"""
+    return char.isalnum() or char == "_"
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """True where ``\\b<keyword>\\b`` would match text[start:end]"""
+    def boundary(position: int) -> bool:
+        before = position > 0 and _is_word_char(text[position - 1])
+        after = position < len(text) and _is_word_char(text[position])
+        return before != after
+
+    return boundary(start) and boundary(end)
+
+
+@dataclass(frozen=True)
+class KeywordSpan:
+    """One occurrence of a category keyword in the scanned text"""
+
+    keyword: str
+    start: int
+    end: int
+    rank: int  # Position of the keyword in its category list (lower wins)
+
+
+@dataclass
+class KeywordMatches:
+    """Result of one scan: keyword occurrences grouped by category"""
+
+    text: str  # Lower-cased text the spans index into
+    spans: Dict[str, List[KeywordSpan]] = field(default_factory=dict)
+
+    @property
+    def categories(self) -> Set[str]:
+        return set(self.spans)
+
+    def has(self, *categories: str) -> bool:
+        """True if any keyword of any of the categories occurred"""
+        return any(category in self.spans for category in categories)
+
+    def keywords(self, category: str) -> List[str]:
+        """Distinct matched keywords of a category, in category-list order"""
+        ranked = sorted({(span.rank, span.keyword) for span in self.spans.get(category, ())})
+        return [keyword for _, keyword in ranked]
+
+    def first(self, category: str) -> Optional[str]:
+        """Highest-priority (earliest listed) keyword of a category that occurred"""
+        spans = self.spans.get(category)
+        return min(spans, key=lambda span: span.rank).keyword if spans else None
+
+
+class KeywordMatcher:
+    """
+    Named keyword categories compiled into one automaton.
+
+    A keyword may belong to several categories; the text is scanned once and
+    every occurrence is credited to each category listing it. Matching is
+    case-insensitive substring containment, except in ``whole_word``
+    categories, where single-word keywords must also sit on word boundaries
+    (as ``\\bkeyword\\b`` would) and phrases are still plain containment.
+    """
+
+    def __init__(self, categories: Mapping[str, Sequence[str]], whole_word: Iterable[str] = ()):
+        whole_word = set(whole_word)
+        unknown = whole_word - set(categories)
+        if unknown:
+            raise ValueError(f"Unknown whole-word categories: {sorted(unknown)}")
+
+        self.categories: Dict[str, Tuple[str, ...]] = {}
+        index_of: Dict[str, int] = {}
+        self._entries: List[List[Tuple[str, int, bool]]] = []
+        for category, keywords in categories.items():
+            ordered = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+            self.categories[category] = ordered
+            for rank, keyword in enumerate(ordered):
+                index = index_of.get(keyword)
+                if index is None:
+                    index = index_of[keyword] = len(self._entries)
+                    self._entries.append([])
+                bounded = category in whole_word and len(keyword.split()) == 1
+                self._entries[index].append((category, rank, bounded))
+        self._automaton = KeywordAutomaton(list(index_of))
+
+    def scan(self, text: str) -> KeywordMatches:
+        """
+        Find every category keyword in text with a single pass
+
+        Args:
+            text: Text to scan (lower-cased here)
+
+        Returns:
+            KeywordMatches with spans into the lower-cased text
+        """
+        lowered = text.lower()
+        spans: Dict[str, List[KeywordSpan]] = {}
+        keywords = self._automaton.keywords
+        for start, index in self._automaton.iter_matches(lowered):
+            keyword = keywords[index]
+            end = start + len(keyword)
+            for category, rank, bounded in self._entries[index]:
+                if bounded and not _on_word_boundary(lowered, start, end):
+                    continue
+                spans.setdefault(category, []).append(KeywordSpan(keyword, start, end, rank))
+        return KeywordMatches(text=lowered, spans=spans)
+
+    def __len__(self) -> int:
+        return len(self._automaton)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from functools import lru_cache
 from typing import Generator
 
@@ -14,13 +15,17 @@ from ..db import (
     DeviceBindingService,
     VoiceVerificationService,
     DatabaseConfig,
+    create_async_db_engine,
     create_db_engine,
+    get_async_session_factory,
     get_session_factory,
     load_database_config,
 )
 from ..db.engine import session_scope
 from ..db.base import Base
 
+logger = logging.getLogger(__name__)
+
 
 @lru_cache
 def get_db_config() -> DatabaseConfig:
@@ -35,6 +40,29 @@ def get_session_factory_cached():
     return get_session_factory(engine)
 
 
+@lru_cache
+def get_read_session_factory_cached():
+    """Session factory on the read-only SQLite pool, or None when none is configured."""
+    config = get_db_config()
+    if not config.has_read_pool:
+        return None
+    get_session_factory_cached()  # The writer creates the schema and sets the journal mode first
+    return get_session_factory(create_db_engine(config, read_only=True))
+
+
+@lru_cache
+def get_async_session_factory_cached():
+    """AsyncSession factory for async routes, or None when no async driver is installed."""
+    config = get_db_config()
+    try:
+        # Async routes only read, so they share the read-only profile when there is one
+        engine = create_async_db_engine(config, read_only=config.has_read_pool)
+    except ImportError as exc:
+        logger.warning(f"Async database driver unavailable, async routes use the threadpool: {exc}")
+        return None
+    return get_async_session_factory(engine)
+
+
 def get_session() -> Generator[Session, None, None]:
     factory = get_session_factory_cached()
     with session_scope(factory) as session:
@@ -48,10 +76,20 @@ def get_auth_service() -> AuthService:
     return AuthService(factory, voice_service)
 
 
+def close_auth_service() -> None:
+    """Flush buffered session activity if the auth service was ever created."""
+    if get_auth_service.cache_info().currsize:
+        get_auth_service().close()
+
+
 @lru_cache
 def get_banking_service() -> BankingService:
     factory = get_session_factory_cached()
-    return BankingService(factory)
+    return BankingService(
+        factory,
+        get_async_session_factory_cached(),
+        read_session_factory=get_read_session_factory_cached(),
+    )
 
 
 @lru_cache
@@ -76,6 +114,7 @@ __all__ = [
     "BankingServiceDep",
     "DeviceBindingServiceDep",
     "VoiceVerificationServiceDep",
+    "close_auth_service",
     "get_session",
 ]
 
@@ -6,12 +6,16 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
 
+import csv
 import hashlib
+import io
+import json
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response, status, File, UploadFile, Form
+from fastapi.responses import FileResponse, StreamingResponse
 
+from ..db.repositories import HistoryCursor
 from ..db.services.auth import AuthService
 from ..db.services.banking import BankingService
 from ..db.services.device_binding import DeviceBindingService
@@ -22,6 +26,7 @@ from .dependencies import (
     BankingServiceDep,
     DeviceBindingServiceDep,
     VoiceVerificationServiceDep,
+    get_session_factory_cached,
 )
 from .schemas import (
     AccountBalanceData,
@@ -48,7 +53,6 @@ from .schemas import (
     TransferResponse,
     StatementDownloadRequest,
     StatementDownloadResponse,
-    StatementTransaction,
     StatementData,
     UserProfile,
     BeneficiaryCreateRequest,
@@ -74,6 +78,19 @@ def build_meta(ctx: RequestContext) -> ResponseMeta:
     )
 
 
+def account_etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header already names the current account version."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def account_cache_headers(etag: str) -> dict:
+    # Clients may keep the response but must revalidate it; it is per user
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
 def raise_http_error(
     ctx: RequestContext,
     message: str,
@@ -412,14 +429,20 @@ def revoke_device_binding_v1(
     tags=["Accounts"],
     summary="List customer accounts",
 )
-def list_accounts(
+async def list_accounts(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     ctx: RequestContext = RequestContextDep,
     session=CurrentSessionDep,
     banking_service: BankingService = BankingServiceDep,
 ):
-    accounts = banking_service.list_accounts(user_id=session.user_id)
+    summary = await banking_service.get_account_summary_async(user_id=session.user_id)
+    etag = f'"{summary.etag}"'
+    if account_etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=account_cache_headers(etag))
+    response.headers.update(account_cache_headers(etag))
     meta = build_meta(ctx)
-    items = [AccountItem(**account) for account in accounts]
+    items = [AccountItem(**account) for account in summary.value]
     return AccountListResponse(meta=meta, data=items)
 
 
@@ -429,13 +452,15 @@ def list_accounts(
     tags=["Accounts"],
     summary="Retrieve account balance",
 )
-def get_account_balance(
+async def get_account_balance(
     account_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     ctx: RequestContext = RequestContextDep,
     session=CurrentSessionDep,
     banking_service: BankingService = BankingServiceDep,
 ):
-    account = banking_service.get_account_for_user(
+    account = await banking_service.get_account_for_user_async(
         user_id=session.user_id, account_id=account_id
     )
     if account is None:
@@ -446,6 +471,13 @@ def get_account_balance(
             status_code=status.HTTP_404_NOT_FOUND,
         )
 
+    # Served from the account cache the lookup above just filled
+    summary = await banking_service.get_account_summary_async(user_id=session.user_id)
+    etag = f'"{summary.etag}"'
+    if account_etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=account_cache_headers(etag))
+    response.headers.update(account_cache_headers(etag))
+
     balance = AccountBalanceData(
         accountNumber=account["accountNumber"],
         currency=account["currency"],
@@ -463,7 +495,7 @@ def get_account_balance(
     tags=["Transactions"],
     summary="Retrieve transaction history",
 )
-def list_transactions(
+async def list_transactions(
     account_id: str,
     from_date: Optional[datetime] = Query(
         default=None, alias="from", description="ISO8601 start timestamp."
@@ -472,17 +504,28 @@ def list_transactions(
         default=None, alias="to", description="ISO8601 end timestamp."
     ),
     limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None, description="`nextCursor` of the previous page."
+    ),
     ctx: RequestContext = RequestContextDep,
     session=CurrentSessionDep,
     banking_service: BankingService = BankingServiceDep,
 ):
+    before = None
+    if cursor:
+        try:
+            before = HistoryCursor.decode(cursor)
+        except ValueError:
+            raise_http_error(ctx, message="Invalid pagination cursor.", code="invalid_cursor")
+
     try:
-        transactions = banking_service.fetch_transaction_history(
+        transactions = await banking_service.fetch_transaction_history_async(
             user_id=session.user_id,
             account_id=account_id,
             start_date=from_date,
             end_date=to_date,
             limit=limit,
+            before=before,
         )
     except ValueError as exc:
         if str(exc) == "account_not_found":
@@ -494,8 +537,15 @@ def list_transactions(
             )
         raise
 
+    next_cursor = None
+    if len(transactions) == limit:
+        last = transactions[-1]
+        next_cursor = HistoryCursor(
+            occurred_at=last["occurredAt"], id=uuid.UUID(last["id"])
+        ).encode()
+
     meta = build_meta(ctx)
-    return TransactionHistoryResponse(meta=meta, data=transactions)
+    return TransactionHistoryResponse(meta=meta, data=transactions, nextCursor=next_cursor)
 
 
 @router.post(
@@ -516,12 +566,7 @@ def create_internal_transfer(
     import logging
     logger = logging.getLogger(__name__)
     
-    # First, try to get all user accounts for debugging
-    all_user_accounts = banking_service.list_accounts(user_id=session.user_id)
-    logger.info(f"User {session.user_id} has {len(all_user_accounts)} accounts")
     logger.info(f"Requested account: {payload.sourceAccountId}")
-    if all_user_accounts:
-        logger.info(f"Available accounts: {[acc.get('accountNumber') for acc in all_user_accounts]}")
     
     try:
         # Try to parse as UUID first
@@ -537,8 +582,9 @@ def create_internal_transfer(
             user_id=session.user_id, account_number=payload.sourceAccountId
         )
         
-        # If not found, try to find in user's accounts list
-        if source_account is None and all_user_accounts:
+        # If not found, try to find in user's accounts list (served from the account cache)
+        if source_account is None:
+            all_user_accounts = banking_service.list_accounts(user_id=session.user_id)
             matching_account = next(
                 (acc for acc in all_user_accounts 
                  if acc.get('accountNumber') == payload.sourceAccountId or 
@@ -562,7 +608,6 @@ def create_internal_transfer(
     
     if source_account is None:
         logger.error(f"Account not found: account_number={payload.sourceAccountId}, user_id={session.user_id}")
-        logger.error(f"User's available accounts: {[acc.get('accountNumber') for acc in all_user_accounts]}")
         
         raise_http_error(
             ctx,
@@ -662,6 +707,48 @@ def create_internal_transfer(
     return TransferResponse(meta=meta, data=receipt)
 
 
+STATEMENT_CSV_COLUMNS = (
+    "date",
+    "type",
+    "amount",
+    "currency",
+    "description",
+    "status",
+    "counterparty",
+    "reference_id",
+)
+
+
+def statement_ndjson_chunks(header: dict, pages):
+    """One JSON object per line: the statement header, every transaction, then a summary."""
+    yield json.dumps({"record": "statement", **header}) + "\n"
+    count = 0
+    for page in pages:
+        count += len(page)
+        yield "".join(json.dumps({"record": "transaction", **line}) + "\n" for line in page)
+    yield json.dumps({"record": "summary", "transaction_count": count}) + "\n"
+
+
+def csv_safe(value):
+    # Narrations are user supplied; keep spreadsheets from evaluating them as formulas
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def statement_csv_chunks(pages):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=STATEMENT_CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for page in pages:
+        writer.writerows({key: csv_safe(value) for key, value in line.items()} for line in page)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
 @router.post(
     "/statements/download",
     response_model=StatementDownloadResponse,
@@ -694,7 +781,7 @@ def download_statement_v1(
         )
 
     try:
-        statement = banking_service.generate_account_statement(
+        header, pages = banking_service.open_account_statement(
             user_id=session.user_id,
             account_number=payload.accountNumber,
             from_date=from_date,
@@ -708,30 +795,33 @@ def download_statement_v1(
             code="statement_error",
         )
 
-    transactions = [
-        StatementTransaction(
-            date=txn["date"],
-            type=txn["type"],
-            amount=Decimal(str(txn["amount"])),
-            currency=txn["currency"],
-            description=txn.get("description"),
-            status=txn.get("status"),
-            counterparty=txn.get("counterparty"),
-            reference_id=txn.get("reference_id"),
+    if payload.format != "json":
+        # Pages are fetched lazily while the body is sent, so any period streams in constant memory
+        filename = f"statement_{header['account_number']}_{header['from_date']}_{header['to_date']}.{payload.format}"
+        if payload.format == "csv":
+            chunks, media_type = statement_csv_chunks(pages), "text/csv"
+        else:
+            chunks, media_type = statement_ndjson_chunks(header, pages), "application/x-ndjson"
+        return StreamingResponse(
+            chunks,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Cache-Control": "private, no-store",
+            },
         )
-        for txn in statement["transactions"]
-    ]
 
+    transactions = [line for page in pages for line in page]
     data = StatementData(
-        accountNumber=statement["account_number"],
-        accountType=statement["account_type"],
-        fromDate=statement["from_date"],
-        toDate=statement["to_date"],
-        periodType=statement["period_type"],
-        transactionCount=statement["transaction_count"],
+        accountNumber=header["account_number"],
+        accountType=header["account_type"],
+        fromDate=header["from_date"],
+        toDate=header["to_date"],
+        periodType=header["period_type"],
+        transactionCount=len(transactions),
         transactions=transactions,
-        currentBalance=Decimal(str(statement["current_balance"])),
-        currency=statement["currency"],
+        currentBalance=Decimal(str(header["current_balance"])),
+        currency=header["currency"],
     )
     meta = build_meta(ctx)
     return StatementDownloadResponse(meta=meta, data=data)
@@ -950,13 +1040,8 @@ def verify_upi_pin(
     # Get user from database using banking service
     from sqlalchemy import select
     from ..db.models import User
-    from ..db.engine import get_session_factory
-    from ..db.config import load_database_config
-    from ..db.engine import create_db_engine
     
-    config = load_database_config()
-    engine = create_db_engine(config)
-    session_factory = get_session_factory(engine)
+    session_factory = get_session_factory_cached()
     
     with session_factory() as db:
         stmt = select(User).where(User.id == user_id)
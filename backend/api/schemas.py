@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, condecimal, constr
 
@@ -180,6 +180,10 @@ class TransactionItem(BaseModel):
 class TransactionHistoryResponse(BaseModel):
     meta: ResponseMeta
     data: List[TransactionItem]
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next (older) page; absent on the last page.",
+    )
 
 
 class TransferRequest(BaseModel):
@@ -245,6 +249,10 @@ class StatementDownloadRequest(BaseModel):
     fromDate: str = Field(description="Start date in YYYY-MM-DD format")
     toDate: str = Field(description="End date in YYYY-MM-DD format")
     periodType: Optional[str] = Field(default="custom")
+    format: Literal["json", "ndjson", "csv"] = Field(
+        default="json",
+        description="`ndjson` and `csv` stream every line of the period instead of one JSON document.",
+    )
 
 
 class StatementDownloadResponse(BaseModel):
@@ -5,11 +5,14 @@ from __future__ import annotations
 import logging
 import sys
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.dependencies import close_auth_service
 from .api.routes import router as api_router
+from .db.services.ai_voice_verification import close_ai_backend_client
 from .utils.demo_logging import demo_logger
 
 
@@ -50,9 +53,19 @@ def create_app() -> FastAPI:
     logger = logging.getLogger(__name__)
     logger.info("Logging configured - INFO level enabled for voice verification")
     
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        logger.info("Backend application started - voice verification logging enabled")
+        yield
+        # Write buffered session activity and drop the kept-alive connections to the AI backend
+        close_auth_service()
+        close_ai_backend_client()
+        logger.info("Backend application stopped")
+
     app = FastAPI(
         title="Sun National Bank API",
         description="Voice-first banking backend for the Vaani assistant.",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -100,10 +113,6 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router)
     
-    @app.on_event("startup")
-    async def startup_event():
-        logger.info("Backend application started - voice verification logging enabled")
-    
     return app
 
 
@@ -8,14 +8,16 @@ PostgreSQL).
 """
 
 from .config import DatabaseConfig, load_database_config
-from .engine import create_db_engine, get_session_factory
+from .engine import create_async_db_engine, create_db_engine, get_async_session_factory, get_session_factory
 from .services import AuthService, BankingService, DeviceBindingService, VoiceVerificationService
 
 __all__ = [
     "DatabaseConfig",
     "load_database_config",
     "create_db_engine",
+    "create_async_db_engine",
     "get_session_factory",
+    "get_async_session_factory",
     "AuthService",
     "BankingService",
     "DeviceBindingService",
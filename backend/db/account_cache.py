@@ -0,0 +1,202 @@
+"""
+Per-user account-summary cache with ledger-driven invalidation.
+
+Balances only change when ``execute_internal_transfer`` moves funds, so the
+serialized account list of a user can be served from memory between
+transfers. Transfers mark the users they touched on their database session;
+the entries are dropped when that transaction commits, never before (a
+rolled-back transfer invalidates nothing).
+
+Transfers committed by another process (the AI backend and the banking API
+each hold their own cache) are caught by revalidation: an entry older than
+``ACCOUNT_CACHE_REVALIDATE_SECONDS`` is checked against the account version
+(``accounts_etag`` over id, balances and status), a narrow query that is much
+cheaper than reloading and reserializing the accounts and their cards. The
+same version is exposed as the HTTP ETag of the account endpoints.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from .commit_hooks import run_after_commit
+
+ACCOUNT_CACHE_TTL_SECONDS = 300  # Entries are reloaded at least this often
+ACCOUNT_CACHE_REVALIDATE_SECONDS = 2.0  # Bounds how long another process's transfer can go unseen
+ACCOUNT_CACHE_MAX_ENTRIES = 10_000
+
+
+def accounts_etag(rows: Iterable) -> str:
+    """
+    Version of a user's accounts from ``(id, balance, available_balance, status)`` rows.
+
+    Every transfer changes a balance of both parties, so the version changes
+    exactly when the cached summary would.
+    """
+
+    digest = hashlib.sha1()
+    for account_id, balance, available_balance, status in sorted(rows, key=lambda row: str(row[0])):
+        status = getattr(status, "value", status)
+        digest.update(f"{account_id}|{balance}|{available_balance}|{status};".encode())
+    return digest.hexdigest()[:20]
+
+
+def _user_key(user_id) -> str:
+    # UUID objects and differently formatted id strings must hit the same entry
+    try:
+        return str(uuid.UUID(str(user_id)))
+    except ValueError:
+        return str(user_id)
+
+
+@dataclass
+class AccountSummary:
+    """A cached account summary and the account version it was built from."""
+
+    user_id: str
+    etag: str
+    value: Any  # Treated as read-only by every caller
+    loaded_at: float
+    validated_at: float
+
+
+class AccountSummaryCache:
+    """
+    In-process cache of one summary per user.
+
+    ``value`` is whatever the owner serializes (the banking API and the AI
+    tools cache different shapes in separate instances). Every instance is
+    invalidated by committed transfers.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ACCOUNT_CACHE_TTL_SECONDS,
+        revalidate_seconds: float = ACCOUNT_CACHE_REVALIDATE_SECONDS,
+        max_entries: int = ACCOUNT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._revalidate_seconds = revalidate_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, AccountSummary]" = OrderedDict()
+        # Unique stamp per invalidation so loads that raced a transfer are not stored
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._stamps = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        _caches.add(self)
+
+    def get(self, user_id) -> Optional[AccountSummary]:
+        user_id = _user_key(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and self._clock() - entry.loaded_at > self._ttl_seconds:
+                del self._entries[user_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def is_fresh(self, entry: AccountSummary) -> bool:
+        """True while an entry may be served without checking the account version."""
+
+        fresh = self._clock() - entry.validated_at <= self._revalidate_seconds
+        if fresh:
+            with self._lock:
+                self.hits += 1
+        return fresh
+
+    def mark_validated(self, entry: AccountSummary) -> None:
+        with self._lock:
+            entry.validated_at = self._clock()
+            self.revalidations += 1
+
+    def generation(self, user_id) -> int:
+        with self._lock:
+            return self._generations.get(_user_key(user_id), 0)
+
+    def put(self, user_id, etag: str, value: Any, generation: int) -> AccountSummary:
+        """
+        Store a freshly loaded summary and return it.
+
+        The summary is only stored if no transfer for the user committed since
+        ``generation`` was read; it is returned either way.
+        """
+
+        user_id = _user_key(user_id)
+        now = self._clock()
+        entry = AccountSummary(user_id=user_id, etag=etag, value=value, loaded_at=now, validated_at=now)
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                self._entries[user_id] = entry
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id) -> None:
+        user_id = _user_key(user_id)
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations.pop(user_id, None)
+            self._generations[user_id] = next(self._stamps)
+            # Bounded like the entries; revalidation covers a race with a forgotten stamp
+            while len(self._generations) > self._max_entries:
+                self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_caches: "weakref.WeakSet[AccountSummaryCache]" = weakref.WeakSet()
+
+
+def _invalidate_users(user_ids) -> None:
+    for cache in list(_caches):
+        for user_id in user_ids:
+            cache.invalidate(user_id)
+
+
+def mark_accounts_changed(session: Session, *user_ids) -> None:
+    """Invalidate the users' cached summaries once ``session`` commits."""
+
+    run_after_commit(session, _invalidate_users, *(_user_key(user_id) for user_id in user_ids))
+
+
+_account_summary_cache = AccountSummaryCache()
+
+
+def get_account_summary_cache() -> AccountSummaryCache:
+    """Process-wide cache of serialized account lists used by ``BankingService``."""
+    return _account_summary_cache
+
+
+__all__ = [
+    "ACCOUNT_CACHE_REVALIDATE_SECONDS",
+    "ACCOUNT_CACHE_TTL_SECONDS",
+    "AccountSummary",
+    "AccountSummaryCache",
+    "accounts_etag",
+    "get_account_summary_cache",
+    "mark_accounts_changed",
+]
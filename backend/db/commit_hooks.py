@@ -0,0 +1,44 @@
+"""
+Work deferred until a database session commits.
+
+In-process caches mark what a transaction changed with ``run_after_commit``;
+the marks are handed to their handlers once the transaction commits and
+discarded if it rolls back, so nothing is invalidated for changes that never
+became visible.
+
+A mark carries its own handler. The AI backend imports this package as
+``db`` while the API imports it as ``backend.db``, so each copy registers
+these listeners on ``Session``; whichever runs first delivers every pending
+mark, including the ones made through the other copy.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = "after_commit_pending"
+
+
+def run_after_commit(session: Session, handler: Callable[[Iterable], None], *items) -> None:
+    """Call ``handler`` with the items marked for it once ``session`` commits."""
+
+    session.info.setdefault(_PENDING_KEY, {}).setdefault(handler, set()).update(items)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        for handler, items in pending.items():
+            handler(items)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+__all__ = ["run_after_commit"]
@@ -34,6 +34,26 @@ else:
     )
 
 
+# Tuned SQLite settings for the deployed file database (DB_SQLITE_PROFILE=production).
+# WAL lets readers run alongside the single writer, and synchronous=NORMAL is
+# durable in WAL mode except for the last commits on power loss.
+SQLITE_PRODUCTION_PROFILE = {
+    "sqlite_pooled": True,
+    "sqlite_journal_mode": "WAL",
+    "sqlite_synchronous": "NORMAL",
+    "sqlite_mmap_size": 256 * 1024 * 1024,
+    "sqlite_cache_size_kib": 64 * 1024,
+    "sqlite_read_pool_size": 8,
+}
+
+
+# asyncio drivers used by the async engine, per SQLAlchemy dialect
+_ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
 @dataclass(frozen=True)
 class DatabaseConfig:
     """Container for database connection settings."""
@@ -43,6 +63,36 @@ class DatabaseConfig:
     echo: bool = False
     pool_size: Optional[int] = None
     max_overflow: Optional[int] = None
+    # SQLite tuning; the defaults keep the previous one-connection-per-session behaviour
+    sqlite_pooled: bool = False  # Reuse connections through a thread-safe QueuePool
+    sqlite_journal_mode: Optional[str] = None  # e.g. "WAL"
+    sqlite_synchronous: Optional[str] = None  # e.g. "NORMAL"
+    sqlite_mmap_size: Optional[int] = None  # Bytes of the file memory-mapped per connection
+    sqlite_cache_size_kib: Optional[int] = None  # Page cache per connection
+    sqlite_busy_timeout_ms: int = 20_000  # How long a connection waits for a lock
+    sqlite_read_pool_size: Optional[int] = None  # Size of the separate read-only pool, if any
+
+    @property
+    def has_read_pool(self) -> bool:
+        """True when balance and history reads get their own read-only SQLite pool."""
+
+        return self.backend == "sqlite" and bool(self.sqlite_read_pool_size)
+
+    @property
+    def async_database_url(self) -> str:
+        """
+        The database URL with the asyncio driver for its backend.
+
+        SQLite uses ``aiosqlite`` and PostgreSQL ``asyncpg``; URLs that
+        already name an async driver are returned unchanged.
+        """
+
+        scheme, separator, rest = self.database_url.partition("://")
+        dialect = scheme.split("+", 1)[0]
+        driver = _ASYNC_DRIVERS.get(dialect)
+        if driver is None or scheme.endswith(f"+{driver}"):
+            return self.database_url
+        return f"{dialect}+{driver}{separator}{rest}"
 
 
 def _build_default_sqlite_url() -> str:
@@ -59,6 +109,12 @@ def load_database_config() -> DatabaseConfig:
         DB_ECHO: Enable SQL echo logging when set to ``1`` or ``true``.
         DB_POOL_SIZE: Optional integer for SQLAlchemy pool size.
         DB_MAX_OVERFLOW: Optional integer for pool overflow allowance.
+        DB_SQLITE_PROFILE: ``production`` applies ``SQLITE_PRODUCTION_PROFILE``
+            (the default when deployed), ``default`` keeps plain SQLite.
+        DB_SQLITE_POOLED, DB_SQLITE_JOURNAL_MODE, DB_SQLITE_SYNCHRONOUS,
+        DB_SQLITE_MMAP_SIZE, DB_SQLITE_CACHE_SIZE_KIB, DB_SQLITE_BUSY_TIMEOUT_MS,
+        DB_SQLITE_READ_POOL_SIZE: Override single SQLite settings of the profile
+            (``0`` or an empty value disables the read pool).
     """
 
     backend = os.getenv("DB_BACKEND", "sqlite").lower()
@@ -84,9 +140,44 @@ def load_database_config() -> DatabaseConfig:
         echo=echo,
         pool_size=pool_size,
         max_overflow=max_overflow,
+        **_load_sqlite_settings(),
     )
 
 
+def _load_sqlite_settings() -> dict:
+    default_profile = "production" if IS_DEPLOYMENT else "default"
+    profile = os.getenv("DB_SQLITE_PROFILE", default_profile).lower()
+    if profile == "production":
+        settings = dict(SQLITE_PRODUCTION_PROFILE)
+    elif profile == "default":
+        settings = {}
+    else:
+        raise ValueError(f"Unknown DB_SQLITE_PROFILE {profile!r}; use 'production' or 'default'.")
+
+    pooled = os.getenv("DB_SQLITE_POOLED")
+    if pooled is not None:
+        settings["sqlite_pooled"] = pooled.strip().lower() in {"1", "true", "yes"}
+    for env_name, field_name in (
+        ("DB_SQLITE_JOURNAL_MODE", "sqlite_journal_mode"),
+        ("DB_SQLITE_SYNCHRONOUS", "sqlite_synchronous"),
+    ):
+        raw = os.getenv(env_name)
+        if raw is not None:
+            settings[field_name] = raw.strip().upper() or None
+    for env_name, field_name in (
+        ("DB_SQLITE_MMAP_SIZE", "sqlite_mmap_size"),
+        ("DB_SQLITE_CACHE_SIZE_KIB", "sqlite_cache_size_kib"),
+        ("DB_SQLITE_READ_POOL_SIZE", "sqlite_read_pool_size"),
+    ):
+        raw = os.getenv(env_name)
+        if raw is not None:
+            settings[field_name] = _parse_optional_int(raw)
+    busy_timeout = _parse_optional_int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS"))
+    if busy_timeout is not None:
+        settings["sqlite_busy_timeout_ms"] = busy_timeout
+    return settings
+
+
 def _parse_optional_int(raw: Optional[str]) -> Optional[int]:
     if raw is None:
         return None
@@ -96,6 +187,6 @@ def _parse_optional_int(raw: Optional[str]) -> Optional[int]:
     return int(raw)
 
 
-__all__ = ["DatabaseConfig", "load_database_config"]
+__all__ = ["DatabaseConfig", "SQLITE_PRODUCTION_PROFILE", "load_database_config"]
 
 
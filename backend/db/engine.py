@@ -4,30 +4,95 @@ Engine and session management helpers.
 
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio needs greenlet; imported lazily so the sync layer works without it
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 from .config import DatabaseConfig
 
 
-def create_db_engine(config: DatabaseConfig) -> Engine:
+# Pool defaults for pooled SQLite when DB_POOL_SIZE / DB_MAX_OVERFLOW are unset
+SQLITE_POOL_SIZE = 5
+SQLITE_MAX_OVERFLOW = 10
+
+
+def _sqlite_pragmas(config: DatabaseConfig, read_only: bool) -> list[str]:
+    """PRAGMA statements run on every new SQLite connection."""
+
+    pragmas = []
+    # journal_mode is stored in the database file, so only the writer sets it
+    if config.sqlite_journal_mode and not read_only:
+        pragmas.append(f"PRAGMA journal_mode={_pragma_keyword(config.sqlite_journal_mode)}")
+    if config.sqlite_synchronous:
+        pragmas.append(f"PRAGMA synchronous={_pragma_keyword(config.sqlite_synchronous)}")
+    if config.sqlite_mmap_size is not None:
+        pragmas.append(f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}")
+    if config.sqlite_cache_size_kib is not None:
+        # Negative cache_size is in KiB rather than pages
+        pragmas.append(f"PRAGMA cache_size={-int(config.sqlite_cache_size_kib)}")
+    pragmas.append(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _pragma_keyword(value: str) -> str:
+    if not value.isalpha():
+        raise ValueError(f"Invalid SQLite pragma value {value!r}.")
+    return value.upper()
+
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _sqlite_pool_kwargs(config: DatabaseConfig, read_only: bool, queue_pool) -> dict:
+    if not config.sqlite_pooled and not read_only:
+        from sqlalchemy.pool import NullPool
+        return {"poolclass": NullPool}
+
+    pool_size = config.sqlite_read_pool_size if read_only else config.pool_size
+    max_overflow = config.max_overflow
+    return {
+        "poolclass": queue_pool,
+        "pool_size": pool_size or SQLITE_POOL_SIZE,
+        "max_overflow": SQLITE_MAX_OVERFLOW if max_overflow is None else max_overflow,
+    }
+
+
+def create_db_engine(config: DatabaseConfig, *, read_only: bool = False) -> Engine:
     """
     Build an SQLAlchemy engine based on the provided configuration.
 
     Handles backend-specific options (e.g., SQLite check_same_thread) to
     ensure compatibility across different database vendors.
+
+    For SQLite, ``read_only=True`` builds the separate read pool
+    (``DatabaseConfig.sqlite_read_pool_size``) whose connections refuse
+    writes, so balance and history reads never wait for a free writer
+    connection. The configured pragmas are applied to every connection.
     """
 
     connect_args = {}
     if config.backend == "sqlite":
+        # Connections are handed between threads by the pool, never shared
         connect_args["check_same_thread"] = False
-        # Set timeout to handle concurrent access (default is 5 seconds)
-        # This prevents "readonly database" errors when multiple connections try to write
-        connect_args["timeout"] = 20.0
+        # Wait for locks instead of failing with "database is locked"
+        connect_args["timeout"] = config.sqlite_busy_timeout_ms / 1000
 
     engine_kwargs = {
         "echo": config.echo,
@@ -35,10 +100,9 @@ def create_db_engine(config: DatabaseConfig) -> Engine:
         "connect_args": connect_args,
     }
 
-    # SQLite doesn't benefit from connection pooling - use NullPool for SQLite
     if config.backend == "sqlite":
-        from sqlalchemy.pool import NullPool
-        engine_kwargs["poolclass"] = NullPool
+        from sqlalchemy.pool import QueuePool
+        engine_kwargs.update(_sqlite_pool_kwargs(config, read_only, QueuePool))
     else:
         # For other databases, use configured pool settings
         if config.pool_size is not None:
@@ -50,6 +114,45 @@ def create_db_engine(config: DatabaseConfig) -> Engine:
         config.database_url,
         **engine_kwargs,
     )
+    if config.backend == "sqlite":
+        _install_sqlite_pragmas(engine, _sqlite_pragmas(config, read_only))
+    return engine
+
+
+def create_async_db_engine(config: DatabaseConfig, *, read_only: bool = False) -> AsyncEngine:
+    """
+    Build an asyncio SQLAlchemy engine for the same database.
+
+    Uses ``aiosqlite`` for SQLite and ``asyncpg`` for PostgreSQL (see
+    ``DatabaseConfig.async_database_url``), so queries awaited from async
+    routes and agents neither block the event loop nor occupy a worker
+    thread of the sync session layer. Pooling, pragmas and ``read_only``
+    behave as in ``create_db_engine``.
+    """
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    connect_args = {}
+    engine_kwargs = {"echo": config.echo}
+
+    if config.backend == "sqlite":
+        # Same lock wait as the sync engine
+        connect_args["timeout"] = config.sqlite_busy_timeout_ms / 1000
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        engine_kwargs.update(_sqlite_pool_kwargs(config, read_only, AsyncAdaptedQueuePool))
+    else:
+        if config.pool_size is not None:
+            engine_kwargs["pool_size"] = config.pool_size
+        if config.max_overflow is not None:
+            engine_kwargs["max_overflow"] = config.max_overflow
+
+    engine = create_async_engine(
+        config.async_database_url,
+        connect_args=connect_args,
+        **engine_kwargs,
+    )
+    if config.backend == "sqlite":
+        _install_sqlite_pragmas(engine.sync_engine, _sqlite_pragmas(config, read_only))
     return engine
 
 
@@ -80,6 +183,47 @@ def session_scope(session_factory) -> Iterator:
         session.close()
 
 
-__all__ = ["create_db_engine", "get_session_factory", "session_scope"]
+def get_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """
+    Return an AsyncSession factory bound to the provided async engine.
+
+    Objects stay loaded after commit (``expire_on_commit=False``) because
+    AsyncSession cannot lazily refresh them on attribute access.
+    """
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def async_session_scope(session_factory) -> AsyncIterator[AsyncSession]:
+    """
+    Async counterpart of ``session_scope``.
+
+    Example:
+        async with async_session_scope(AsyncSessionLocal) as session:
+            # await session.execute(...)
+    """
+
+    session = session_factory()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+__all__ = [
+    "create_db_engine",
+    "create_async_db_engine",
+    "get_session_factory",
+    "get_async_session_factory",
+    "session_scope",
+    "async_session_scope",
+]
 
 
@@ -3,17 +3,27 @@ Repository layer abstracts database access patterns from business logic.
 """
 
 from .accounts import (
+    accounts_version_of,
     get_account_balance,
     get_account_by_id,
+    get_account_by_id_async,
     get_account_by_number,
+    get_account_by_number_async,
+    get_accounts_version,
+    get_accounts_version_async,
     get_user_profile,
     list_accounts_for_user,
+    list_accounts_for_user_async,
 )
 from .transactions import (
+    HistoryCursor,
     TransferResult,
     execute_internal_transfer,
+    get_statement_rows,
+    get_statement_rows_async,
     get_transaction_by_reference,
     get_transaction_history,
+    get_transaction_history_async,
 )
 from .reminders import (
     create_reminder,
@@ -30,6 +40,7 @@ from .device_bindings import (
 )
 from .beneficiaries import (
     list_beneficiaries,
+    list_beneficiaries_async,
     create_beneficiary,
     get_beneficiary_by_id,
     get_beneficiary_by_account_number,
@@ -38,15 +49,25 @@ from .beneficiaries import (
 )
 
 __all__ = [
+    "accounts_version_of",
     "get_account_balance",
     "get_account_by_id",
+    "get_account_by_id_async",
     "get_account_by_number",
+    "get_account_by_number_async",
+    "get_accounts_version",
+    "get_accounts_version_async",
     "get_user_profile",
     "list_accounts_for_user",
+    "list_accounts_for_user_async",
+    "HistoryCursor",
     "TransferResult",
     "execute_internal_transfer",
     "get_transaction_by_reference",
     "get_transaction_history",
+    "get_transaction_history_async",
+    "get_statement_rows",
+    "get_statement_rows_async",
     "create_reminder",
     "fetch_due_reminders",
     "list_reminders_for_user",
@@ -57,6 +78,7 @@ __all__ = [
     "get_device_binding_for_device",
     "mark_device_binding_trust",
     "list_beneficiaries",
+    "list_beneficiaries_async",
     "create_beneficiary",
     "get_beneficiary_by_id",
     "get_beneficiary_by_account_number",
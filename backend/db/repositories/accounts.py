@@ -2,13 +2,71 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from ..account_cache import accounts_etag
 from ..models import Account, User
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# AsyncSession cannot lazy-load, so async lookups eagerly load what their callers touch:
+# cards for account serialization, the owner for transfer counterparty names
+_ASYNC_CARDS = selectinload(Account.cards)
+_ASYNC_OWNER = joinedload(Account.user, innerjoin=True)
+
+
+def _account_by_id_stmt(account_id, user_id, for_update: bool) -> Select:
+    stmt = select(Account).where(Account.id == account_id)
+    if user_id is not None:
+        stmt = stmt.where(Account.user_id == user_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    return stmt
+
+
+def _account_by_number_stmt(account_number: str, for_update: bool) -> Select:
+    stmt = select(Account).where(Account.account_number == account_number)
+    if for_update:
+        stmt = stmt.with_for_update()
+    return stmt
+
+
+def _accounts_for_user_stmt(user_id) -> Select:
+    return (
+        select(Account)
+        .where(Account.user_id == user_id)
+        .order_by(Account.created_at.asc())
+    )
+
+
+def _accounts_version_stmt(user_id) -> Select:
+    return select(
+        Account.id, Account.balance, Account.available_balance, Account.status
+    ).where(Account.user_id == user_id)
+
+
+def accounts_version_of(accounts: Iterable[Account]) -> str:
+    """Account version (see ``accounts_etag``) of already loaded accounts."""
+
+    return accounts_etag(
+        (account.id, account.balance, account.available_balance, account.status)
+        for account in accounts
+    )
+
+
+def _balance_payload(account: Account) -> dict:
+    return {
+        "account_number": account.account_number,
+        "currency": account.currency_code,
+        "ledger_balance": account.balance,
+        "available_balance": account.available_balance,
+        "status": account.status.value,
+    }
+
 
 def get_account_by_id(
     session: Session, account_id, *, user_id=None, for_update: bool = False
@@ -17,11 +75,7 @@ def get_account_by_id(
     Fetch an account by its primary key, optionally ensuring user ownership.
     """
 
-    stmt = select(Account).where(Account.id == account_id)
-    if user_id is not None:
-        stmt = stmt.where(Account.user_id == user_id)
-    if for_update:
-        stmt = stmt.with_for_update()
+    stmt = _account_by_id_stmt(account_id, user_id, for_update)
     return session.execute(stmt).scalars().first()
 
 
@@ -37,20 +91,14 @@ def get_account_by_number(
         for_update: Apply row-level locking where supported.
     """
 
-    stmt = select(Account).where(Account.account_number == account_number)
-    if for_update:
-        stmt = stmt.with_for_update()
+    stmt = _account_by_number_stmt(account_number, for_update)
     return session.execute(stmt).scalars().first()
 
 
 def list_accounts_for_user(session: Session, user_id) -> Iterable[Account]:
     """Return all active accounts for a user."""
 
-    stmt = (
-        select(Account)
-        .where(Account.user_id == user_id)
-        .order_by(Account.created_at.asc())
-    )
+    stmt = _accounts_for_user_stmt(user_id)
     return session.execute(stmt).scalars().all()
 
 
@@ -60,13 +108,7 @@ def get_account_balance(session: Session, account_number: str):
     account = get_account_by_number(session, account_number)
     if account is None:
         raise ValueError(f"Account {account_number} not found")
-    return {
-        "account_number": account.account_number,
-        "currency": account.currency_code,
-        "ledger_balance": account.balance,
-        "available_balance": account.available_balance,
-        "status": account.status.value,
-    }
+    return _balance_payload(account)
 
 
 def get_user_profile(session: Session, user_id) -> Optional[User]:
@@ -76,12 +118,63 @@ def get_user_profile(session: Session, user_id) -> Optional[User]:
     return session.execute(stmt).scalars().first()
 
 
+async def get_account_by_id_async(
+    session: AsyncSession, account_id, *, user_id=None, for_update: bool = False
+) -> Optional[Account]:
+    """Async variant of ``get_account_by_id`` (cards loaded eagerly)."""
+
+    stmt = _account_by_id_stmt(account_id, user_id, for_update).options(_ASYNC_CARDS)
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def get_account_by_number_async(
+    session: AsyncSession, account_number: str, *, for_update: bool = False
+) -> Optional[Account]:
+    """Async variant of ``get_account_by_number`` (owner loaded in the same query)."""
+
+    stmt = _account_by_number_stmt(account_number, for_update).options(_ASYNC_OWNER)
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def list_accounts_for_user_async(
+    session: AsyncSession, user_id, *, with_cards: bool = True
+) -> Iterable[Account]:
+    """Async variant of ``list_accounts_for_user`` (cards loaded eagerly unless disabled)."""
+
+    stmt = _accounts_for_user_stmt(user_id)
+    if with_cards:
+        stmt = stmt.options(_ASYNC_CARDS)
+    return (await session.execute(stmt)).scalars().all()
+
+
+def get_accounts_version(session: Session, user_id) -> str:
+    """
+    Current version of a user's accounts, for revalidating cached summaries.
+
+    Reads only ids, balances and status, without loading entities or cards.
+    """
+
+    return accounts_etag(session.execute(_accounts_version_stmt(user_id)).all())
+
+
+async def get_accounts_version_async(session: AsyncSession, user_id) -> str:
+    """Async variant of ``get_accounts_version``."""
+
+    return accounts_etag((await session.execute(_accounts_version_stmt(user_id))).all())
+
+
 __all__ = [
     "get_account_by_id",
     "get_account_by_number",
     "list_accounts_for_user",
     "get_account_balance",
     "get_user_profile",
+    "get_accounts_version",
+    "accounts_version_of",
+    "get_account_by_id_async",
+    "get_account_by_number_async",
+    "list_accounts_for_user_async",
+    "get_accounts_version_async",
 ]
 
 
@@ -6,7 +6,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from ..models import Session as SessionModel, User
 from ..utils.enums import SessionStatus
@@ -22,10 +22,15 @@ def get_user_by_customer_number(session: Session, customer_number: str) -> User
     return session.execute(stmt).scalars().first()
 
 
-def get_session_by_token(session: Session, token: str) -> SessionModel | None:
-    """Return the active session matching an access token, if any."""
+def get_session_by_token(session: Session, token: str, *, with_user: bool = False) -> SessionModel | None:
+    """Return the active session matching an access token, if any.
+
+    ``with_user`` loads the owning user in the same query instead of lazily.
+    """
 
     stmt = select(SessionModel).where(SessionModel.access_token == token)
+    if with_user:
+        stmt = stmt.options(joinedload(SessionModel.user))
     return session.execute(stmt).scalars().first()
 
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
@@ -12,6 +12,9 @@ from sqlalchemy.orm import Session
 from ..models import Account, Beneficiary
 from ..utils.enums import BeneficiaryStatus
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 IST = ZoneInfo("Asia/Kolkata")
 
 
@@ -29,6 +32,13 @@ def list_beneficiaries(session: Session, *, user_id, include_blocked: bool = Fal
     return session.execute(stmt).scalars().all()
 
 
+async def list_beneficiaries_async(session: AsyncSession, *, user_id, include_blocked: bool = False):
+    """Async variant of ``list_beneficiaries``."""
+
+    stmt = _base_query(user_id, include_blocked)
+    return (await session.execute(stmt)).scalars().all()
+
+
 def get_beneficiary_by_id(session: Session, *, beneficiary_id, user_id=None) -> Optional[Beneficiary]:
     """Fetch a beneficiary by UUID with optional ownership check."""
 
@@ -2,19 +2,25 @@
 
 from __future__ import annotations
 
+import base64
+import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from decimal import Decimal
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.orm import Session
 
+from ..account_cache import mark_accounts_changed
 from ..models import Account, Transaction
 from ..utils.enums import TransactionChannel, TransactionStatus, TransactionType
 from .accounts import get_account_by_number
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 
 @dataclass(frozen=True)
 class TransferResult:
@@ -22,36 +28,31 @@ class TransferResult:
     credit_transaction: Transaction
 
 
-def execute_internal_transfer(
-    session: Session,
+def _transfer_amount(amount: Decimal | float | int) -> Decimal:
+    amount_decimal = Decimal(str(amount)).quantize(Decimal("0.01"))
+    if amount_decimal <= Decimal("0.00"):
+        raise ValueError("Transfer amount must be positive.")
+    return amount_decimal
+
+
+def _apply_transfer(
     *,
+    source_account: Optional[Account],
+    destination_account: Optional[Account],
     source_account_number: str,
     destination_account_number: str,
-    amount: Decimal | float | int,
-    currency_code: str = "INR",
-    description: Optional[str] = None,
-    initiated_session_id: Optional[str] = None,
-    reference_id: Optional[str] = None,
-    channel: TransactionChannel = TransactionChannel.VOICE,
+    amount_decimal: Decimal,
+    currency_code: str,
+    description: Optional[str],
+    initiated_session_id: Optional[str],
+    reference_id: Optional[str],
+    channel: TransactionChannel,
 ) -> TransferResult:
-    """
-    Perform an intra-bank transfer between two Sun National Bank accounts.
-
-    Validates available balance, ensures currency alignment, and creates
-    corresponding debit and credit ledger entries.
-    """
-
-    amount_decimal = Decimal(str(amount)).quantize(Decimal("0.01"))
-    if amount_decimal <= Decimal("0.00"):
-        raise ValueError("Transfer amount must be positive.")
+    """Validate the locked accounts, move the funds and build both ledger entries."""
 
-    source_account = get_account_by_number(session, source_account_number, for_update=True)
     if source_account is None:
         raise ValueError(f"Source account {source_account_number} not found.")
 
-    destination_account = get_account_by_number(
-        session, destination_account_number, for_update=True
-    )
     if destination_account is None:
         raise ValueError(f"Destination account {destination_account_number} not found.")
 
@@ -102,11 +103,123 @@ def execute_internal_transfer(
         occurred_at=occurrence_time,
     )
 
-    session.add_all([debit_txn, credit_txn])
-
     return TransferResult(debit_transaction=debit_txn, credit_transaction=credit_txn)
 
 
+def execute_internal_transfer(
+    session: Session,
+    *,
+    source_account_number: str,
+    destination_account_number: str,
+    amount: Decimal | float | int,
+    currency_code: str = "INR",
+    description: Optional[str] = None,
+    initiated_session_id: Optional[str] = None,
+    reference_id: Optional[str] = None,
+    channel: TransactionChannel = TransactionChannel.VOICE,
+) -> TransferResult:
+    """
+    Perform an intra-bank transfer between two Sun National Bank accounts.
+
+    Validates available balance, ensures currency alignment, and creates
+    corresponding debit and credit ledger entries.
+    """
+
+    amount_decimal = _transfer_amount(amount)
+    source_account = get_account_by_number(session, source_account_number, for_update=True)
+    destination_account = (
+        get_account_by_number(session, destination_account_number, for_update=True)
+        if source_account is not None
+        else None
+    )
+    result = _apply_transfer(
+        source_account=source_account,
+        destination_account=destination_account,
+        source_account_number=source_account_number,
+        destination_account_number=destination_account_number,
+        amount_decimal=amount_decimal,
+        currency_code=currency_code,
+        description=description,
+        initiated_session_id=initiated_session_id,
+        reference_id=reference_id,
+        channel=channel,
+    )
+    session.add_all([result.debit_transaction, result.credit_transaction])
+    mark_accounts_changed(session, source_account.user_id, destination_account.user_id)
+    return result
+
+
+@dataclass(frozen=True)
+class HistoryCursor:
+    """
+    Keyset position in reverse-chronological history.
+
+    Pages continue strictly after ``(occurred_at, id)`` of the last row served,
+    so paging stays a single index range scan however deep it goes and rows
+    sharing a timestamp are neither repeated nor skipped.
+    """
+
+    occurred_at: datetime
+    id: uuid.UUID
+
+    @classmethod
+    def after(cls, row) -> "HistoryCursor":
+        """Cursor continuing after a ``Transaction`` or statement row."""
+        return cls(occurred_at=row.occurred_at, id=row.id)
+
+    def encode(self) -> str:
+        raw = f"{self.occurred_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "HistoryCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            occurred_at, txn_id = raw.split("|")
+            return cls(occurred_at=datetime.fromisoformat(occurred_at), id=uuid.UUID(txn_id))
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ValueError("invalid_cursor") from exc
+
+
+# Columns a statement line needs; selected without building ORM objects
+_STATEMENT_COLUMNS = (
+    Transaction.id,
+    Transaction.occurred_at,
+    Transaction.transaction_type,
+    Transaction.status,
+    Transaction.amount,
+    Transaction.currency_code,
+    Transaction.description,
+    Transaction.counterparty_name,
+    Transaction.reference_id,
+)
+
+
+def _history_stmt(
+    account_id,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    limit: int,
+    before: Optional[HistoryCursor] = None,
+    columns=None,
+) -> Select:
+    stmt = select(*(columns or (Transaction,))).where(Transaction.account_id == account_id)
+
+    if start_date is not None:
+        stmt = stmt.where(Transaction.occurred_at >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Transaction.occurred_at <= end_date)
+    if before is not None:
+        stmt = stmt.where(
+            or_(
+                Transaction.occurred_at < before.occurred_at,
+                and_(Transaction.occurred_at == before.occurred_at, Transaction.id < before.id),
+            )
+        )
+
+    return stmt.order_by(Transaction.occurred_at.desc(), Transaction.id.desc()).limit(limit)
+
+
 def get_transaction_history(
     session: Session,
     *,
@@ -114,21 +227,36 @@ def get_transaction_history(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     limit: int = 50,
+    before: Optional[HistoryCursor] = None,
 ) -> Iterable[Transaction]:
     """
     Retrieve reverse-chronological transaction history for an account.
+
+    Pass ``HistoryCursor.after(last_row)`` as ``before`` to fetch the next page.
     """
 
-    stmt = select(Transaction).where(Transaction.account_id == account_id)
+    stmt = _history_stmt(account_id, start_date, end_date, limit, before)
+    return session.execute(stmt).scalars().all()
 
-    if start_date is not None:
-        stmt = stmt.where(Transaction.occurred_at >= start_date)
-    if end_date is not None:
-        stmt = stmt.where(Transaction.occurred_at <= end_date)
 
-    stmt = stmt.order_by(Transaction.occurred_at.desc()).limit(limit)
+def get_statement_rows(
+    session: Session,
+    *,
+    account_id,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 500,
+    before: Optional[HistoryCursor] = None,
+) -> list:
+    """
+    One keyset page of statement lines as plain rows (no ORM identity map).
 
-    return session.execute(stmt).scalars().all()
+    Rows expose the ``_STATEMENT_COLUMNS`` by attribute name and can be passed
+    to ``HistoryCursor.after`` to continue.
+    """
+
+    stmt = _history_stmt(account_id, start_date, end_date, limit, before, _STATEMENT_COLUMNS)
+    return session.execute(stmt).all()
 
 
 def get_transaction_by_reference(session: Session, reference_id: str) -> Optional[Transaction]:
@@ -138,10 +266,44 @@ def get_transaction_by_reference(session: Session, reference_id: str) -> Optiona
     return session.execute(stmt).scalars().first()
 
 
+async def get_transaction_history_async(
+    session: AsyncSession,
+    *,
+    account_id,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 50,
+    before: Optional[HistoryCursor] = None,
+) -> Iterable[Transaction]:
+    """Async variant of ``get_transaction_history``."""
+
+    stmt = _history_stmt(account_id, start_date, end_date, limit, before)
+    return (await session.execute(stmt)).scalars().all()
+
+
+async def get_statement_rows_async(
+    session: AsyncSession,
+    *,
+    account_id,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 500,
+    before: Optional[HistoryCursor] = None,
+) -> list:
+    """Async variant of ``get_statement_rows``."""
+
+    stmt = _history_stmt(account_id, start_date, end_date, limit, before, _STATEMENT_COLUMNS)
+    return (await session.execute(stmt)).all()
+
+
 __all__ = [
+    "HistoryCursor",
     "TransferResult",
     "execute_internal_transfer",
     "get_transaction_history",
+    "get_transaction_history_async",
+    "get_statement_rows",
+    "get_statement_rows_async",
     "get_transaction_by_reference",
 ]
 
@@ -18,9 +18,36 @@ from .voice_verification import VoiceVerificationService
 AI_BACKEND_URL = "http://localhost:8001"
 AI_VERIFICATION_ENABLED = True  # Can be made configurable
 AI_VERIFICATION_TIMEOUT = 8.0  # seconds (increased to allow for LLM processing time)
+# Keep-alive pool shared by all service instances, so verifications reuse connections
+AI_BACKEND_POOL_LIMITS = httpx.Limits(
+    max_connections=10,
+    max_keepalive_connections=5,
+    keepalive_expiry=30.0,
+)
 
 logger = logging.getLogger(__name__)
 
+_ai_backend_client: Optional[httpx.Client] = None
+
+
+def get_ai_backend_client() -> httpx.Client:
+    """Return the pooled HTTP client used to call the AI backend."""
+    global _ai_backend_client
+    if _ai_backend_client is None or _ai_backend_client.is_closed:
+        _ai_backend_client = httpx.Client(
+            timeout=AI_VERIFICATION_TIMEOUT,
+            limits=AI_BACKEND_POOL_LIMITS,
+        )
+    return _ai_backend_client
+
+
+def close_ai_backend_client() -> None:
+    """Close the pooled client; called on application shutdown."""
+    global _ai_backend_client
+    if _ai_backend_client is not None:
+        _ai_backend_client.close()
+        _ai_backend_client = None
+
 
 @dataclass
 class AIVoiceVerificationResult:
@@ -48,7 +75,6 @@ class AIVoiceVerificationService:
         self._base_verifier = base_verifier
         self._ai_backend_url = ai_backend_url.rstrip('/')
         self._enabled = enabled
-        self._client = httpx.Client(timeout=AI_VERIFICATION_TIMEOUT)
         self._threshold = base_verifier.threshold
 
     def compute_embedding(self, audio_bytes: bytes) -> Optional[np.ndarray]:
@@ -97,7 +123,7 @@ class AIVoiceVerificationService:
 
         # Call AI backend for analysis
         try:
-            response = self._client.post(
+            response = get_ai_backend_client().post(
                 f"{self._ai_backend_url}/api/voice-verification",
                 json={
                     "similarity_score": float(similarity_score),
@@ -331,5 +357,10 @@ Respond in JSON format:
         return max(0.65, min(0.90, base_threshold))
 
 
-__all__ = ["AIVoiceVerificationService", "AIVoiceVerificationResult"]
+__all__ = [
+    "AIVoiceVerificationService",
+    "AIVoiceVerificationResult",
+    "get_ai_backend_client",
+    "close_ai_backend_client",
+]
 
@@ -33,6 +33,7 @@ from ..repositories import (
     mark_device_binding_trust,
 )
 from ..utils.security import verify_password
+from .session_cache import CachedSession, SessionActivityBuffer, get_session_token_cache, mark_sessions_ended
 from .voice_verification import VoiceVerificationService
 
 logger = logging.getLogger(__name__)
@@ -80,6 +81,8 @@ class AuthService:
     def __init__(self, session_factory, voice_verifier: VoiceVerificationService):
         self._session_factory = session_factory
         self._voice_verifier = voice_verifier
+        self._token_cache = get_session_token_cache()
+        self._activity = SessionActivityBuffer(session_factory)
 
     def authenticate(
         self,
@@ -691,6 +694,7 @@ class AuthService:
         # CRITICAL: Clear ALL existing sessions for this user before creating a new one
         # This ensures only ONE active session exists per user at any time
         invalidated_count = invalidate_all_user_sessions(session, user_id_value)
+        mark_sessions_ended(session, user_id_value)
         if invalidated_count > 0:
             logger.info(
                 f"[Auth] Invalidated {invalidated_count} existing session(s) for user_id={user_id_value} "
@@ -799,6 +803,7 @@ class AuthService:
         
         # Clear ALL existing sessions for this user before creating a new one
         invalidated_count = invalidate_all_user_sessions(session, user_id_value)
+        mark_sessions_ended(session, user_id_value)
         if invalidated_count > 0:
             logger.info(
                 f"[Auth] Invalidated {invalidated_count} existing session(s) for user_id={user_id_value} "
@@ -885,26 +890,35 @@ class AuthService:
         )
 
     def validate_token(self, *, token: str) -> AuthenticatedSession:
+        tz = ZoneInfo("Asia/Kolkata")
+        now = datetime.now(tz)
+
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            if cached.expires_at >= now and (now - cached.last_activity_at) <= SESSION_INACTIVITY_TIMEOUT:
+                cached.last_activity_at = now
+                self._activity.touch(cached.session_id, now)
+                return AuthenticatedSession(
+                    user_id=cached.user_id,
+                    customer_number=cached.customer_number,
+                    session_id=cached.session_id,
+                    access_token=cached.access_token,
+                    expires_at=cached.expires_at,
+                )
+            # Expired while cached: the database path below records it
+            self._token_cache.invalidate(token)
+
         error: SessionValidationError | None = None
         result: AuthenticatedSession | None = None
+        cache_generation = self._token_cache.generation()
 
         with session_scope(self._session_factory) as session:
-            session_record = get_session_by_token(session, token)
-            tz = ZoneInfo("Asia/Kolkata")
-            now = datetime.now(tz)
+            session_record = get_session_by_token(session, token, with_user=True)
 
             if session_record is None:
                 logger.warning(
                     f"[Auth] Token validation failed - session not found: token={token[:10]}... "
-                    f"(length={len(token)}), checking database..."
-                )
-                # Debug: Try to find any sessions for this token pattern
-                from sqlalchemy import select
-                all_sessions = session.execute(
-                    select(SessionModel).where(SessionModel.access_token.like(f"{token[:10]}%"))
-                ).scalars().all()
-                logger.warning(
-                    f"[Auth] Found {len(all_sessions)} sessions with similar token prefix"
+                    f"(length={len(token)})"
                 )
                 error = SessionValidationError(
                     code="session_invalid",
@@ -921,6 +935,7 @@ class AuthService:
                     message="Session metadata is incomplete. Please sign in again.",
                 )
             else:
+                session_id = str(session_record.id)
                 expires_at = session_record.token_expires_at
                 if expires_at is not None and expires_at.tzinfo is None:
                     expires_at = expires_at.replace(tzinfo=tz)
@@ -929,6 +944,7 @@ class AuthService:
                     session_record.status = SessionStatus.EXPIRED
                     session_record.ended_at = now
                     session.flush()
+                    self._activity.discard(session_id)
                     error = SessionValidationError(
                         code="session_expired",
                         message="Your session has expired. Please sign in again.",
@@ -938,25 +954,43 @@ class AuthService:
                     if last_activity is not None:
                         if last_activity.tzinfo is None:
                             last_activity = last_activity.replace(tzinfo=tz)
+                        # Activity not yet written by the write-behind buffer counts too
+                        pending_activity = self._activity.pending(session_id)
+                        if pending_activity is not None and pending_activity > last_activity:
+                            last_activity = pending_activity
                         if (now - last_activity) > SESSION_INACTIVITY_TIMEOUT:
                             session_record.status = SessionStatus.EXPIRED
                             session_record.ended_at = now
                             session.flush()
+                            self._activity.discard(session_id)
                             error = SessionValidationError(
                                 code="session_timeout",
                                 message="Your session ended due to inactivity. Please sign in again.",
                             )
                     if error is None:
-                        session_record.last_activity_at = now
-                        session.flush()
+                        # Coalesced into the next batched write instead of a write per request
+                        self._activity.touch(session_id, now)
                         user = session_record.user
                         result = AuthenticatedSession(
                             user_id=str(user.id),
                             customer_number=user.customer_number,
-                            session_id=str(session_record.id),
+                            session_id=session_id,
                             access_token=session_record.access_token,
                             expires_at=expires_at,
                         )
+                        self._token_cache.put(
+                            token,
+                            CachedSession(
+                                session_id=session_id,
+                                user_id=result.user_id,
+                                customer_number=result.customer_number,
+                                access_token=result.access_token,
+                                expires_at=expires_at,
+                                last_activity_at=now,
+                                cached_at=self._token_cache.now(),
+                            ),
+                            generation=cache_generation,
+                        )
 
         if error is not None:
             raise error
@@ -967,6 +1001,10 @@ class AuthService:
             )
         return result
 
+    def close(self) -> None:
+        """Write buffered session activity; called on application shutdown."""
+        self._activity.close()
+
 
 __all__ = ["AuthService", "AuthResult", "AuthenticatedSession", "ACCESS_TOKEN_TTL_SECONDS"]
 
@@ -2,21 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Iterator, Optional
 
-from ..engine import session_scope
+from ..account_cache import AccountSummary, AccountSummaryCache, get_account_summary_cache
+from ..engine import async_session_scope, session_scope
 from ..repositories import (
+    HistoryCursor,
     TransferResult,
+    accounts_version_of,
     create_reminder,
     execute_internal_transfer,
     fetch_due_reminders,
     get_account_balance,
     get_account_by_id,
+    get_account_by_id_async,
     get_account_by_number,
+    get_accounts_version,
+    get_accounts_version_async,
+    get_statement_rows,
     get_transaction_history,
+    get_transaction_history_async,
     list_accounts_for_user,
+    list_accounts_for_user_async,
     list_reminders_for_user,
     mark_reminder_status,
     list_beneficiaries as repo_list_beneficiaries,
@@ -28,6 +39,8 @@ from ..repositories import (
 )
 from ..utils.enums import CardType, ReminderStatus, ReminderType, TransactionChannel, BeneficiaryStatus
 
+STATEMENT_PAGE_SIZE = 500  # Statement rows fetched (and held in memory) per keyset page
+
 
 def _serialize_account(account) -> dict:
     return {
@@ -70,6 +83,35 @@ def _serialize_account(account) -> dict:
     }
 
 
+def _serialize_transaction(txn) -> dict:
+    return {
+        "id": str(txn.id),
+        "type": txn.transaction_type.value,
+        "status": txn.status.value,
+        "amount": float(txn.amount),
+        "currency": txn.currency_code,
+        "description": txn.description,
+        "referenceId": txn.reference_id,
+        "counterpartyAccount": txn.counterparty_account,
+        "counterpartyName": txn.counterparty_name,
+        "occurredAt": txn.occurred_at,
+    }
+
+
+def serialize_statement_line(row) -> dict:
+    """A statement line from a ``get_statement_rows`` row, shared by the API export and the AI tool."""
+    return {
+        "date": row.occurred_at.strftime("%Y-%m-%d %H:%M"),
+        "type": row.transaction_type.value,
+        "amount": float(row.amount),
+        "currency": row.currency_code,
+        "description": row.description or "",
+        "status": row.status.value,
+        "counterparty": row.counterparty_name or "",
+        "reference_id": row.reference_id or "",
+    }
+
+
 def _serialize_beneficiary(beneficiary) -> dict:
     return {
         "id": str(beneficiary.id),
@@ -85,18 +127,76 @@ def _serialize_beneficiary(beneficiary) -> dict:
     }
 
 
+def _find_account(summary: AccountSummary, account_id) -> Optional[dict]:
+    try:
+        account_id = str(uuid.UUID(str(account_id)))
+    except ValueError:
+        return None
+    return next((account for account in summary.value if account["id"] == account_id), None)
+
+
 class BankingService:
     """
     Domain service that encapsulates core operations exposed by the voice assistant.
     """
 
-    def __init__(self, session_factory):
+    def __init__(
+        self,
+        session_factory,
+        async_session_factory=None,
+        read_session_factory=None,
+        account_cache: Optional[AccountSummaryCache] = None,
+    ):
         self._session_factory = session_factory
+        # Balance, account and history reads use the read-only pool when one is configured
+        self._read_session_factory = read_session_factory or session_factory
+        # Optional: without an async driver the *_async methods run the sync ones in a thread
+        self._async_session_factory = async_session_factory
+        self._account_cache = account_cache if account_cache is not None else get_account_summary_cache()
+
+    def get_account_summary(self, *, user_id) -> AccountSummary:
+        """
+        The user's serialized accounts and their version (the ETag of the account routes).
+
+        Served from the account cache; transfers invalidate it on commit.
+        """
+
+        cache = self._account_cache
+        entry = cache.get(user_id)
+        if entry is not None and cache.is_fresh(entry):
+            return entry
+        generation = cache.generation(user_id)
+        with session_scope(self._read_session_factory) as session:
+            if entry is not None and get_accounts_version(session, user_id) == entry.etag:
+                cache.mark_validated(entry)
+                return entry
+            accounts = list_accounts_for_user(session, user_id)
+            value = [_serialize_account(account) for account in accounts]
+            etag = accounts_version_of(accounts)
+        return cache.put(user_id, etag, value, generation)
+
+    async def get_account_summary_async(self, *, user_id) -> AccountSummary:
+        if self._async_session_factory is None:
+            return await asyncio.to_thread(self.get_account_summary, user_id=user_id)
+        cache = self._account_cache
+        entry = cache.get(user_id)
+        if entry is not None and cache.is_fresh(entry):
+            return entry
+        generation = cache.generation(user_id)
+        async with async_session_scope(self._async_session_factory) as session:
+            if entry is not None and await get_accounts_version_async(session, user_id) == entry.etag:
+                cache.mark_validated(entry)
+                return entry
+            accounts = await list_accounts_for_user_async(session, user_id)
+            value = [_serialize_account(account) for account in accounts]
+            etag = accounts_version_of(accounts)
+        return cache.put(user_id, etag, value, generation)
 
     def list_accounts(self, *, user_id) -> list[dict]:
-        with session_scope(self._session_factory) as session:
-            accounts = list_accounts_for_user(session, user_id)
-            return [_serialize_account(account) for account in accounts]
+        return self.get_account_summary(user_id=user_id).value
+
+    async def list_accounts_async(self, *, user_id) -> list[dict]:
+        return (await self.get_account_summary_async(user_id=user_id)).value
 
     def list_beneficiaries(self, *, user_id, include_blocked: bool = False) -> list[dict]:
         with session_scope(self._session_factory) as session:
@@ -138,15 +238,14 @@ class BankingService:
             return _serialize_beneficiary(beneficiary)
 
     def get_account_for_user(self, *, user_id, account_id) -> Optional[dict]:
-        with session_scope(self._session_factory) as session:
-            account = get_account_by_id(session, account_id, user_id=user_id)
-            if account is None:
-                return None
-            return _serialize_account(account)
+        return _find_account(self.get_account_summary(user_id=user_id), account_id)
+
+    async def get_account_for_user_async(self, *, user_id, account_id) -> Optional[dict]:
+        return _find_account(await self.get_account_summary_async(user_id=user_id), account_id)
 
     def get_account_by_number_for_user(self, *, user_id, account_number: str) -> Optional[dict]:
         """Get account by account number for a specific user"""
-        with session_scope(self._session_factory) as session:
+        with session_scope(self._read_session_factory) as session:
             # First try direct lookup
             account = get_account_by_number(session, account_number)
             if account is None:
@@ -186,7 +285,7 @@ class BankingService:
             return _serialize_account(account)
 
     def lookup_account_balance(self, *, account_id) -> dict:
-        with session_scope(self._session_factory) as session:
+        with session_scope(self._read_session_factory) as session:
             account = get_account_by_id(session, account_id)
             if account is None:
                 raise ValueError("account_not_found")
@@ -299,8 +398,9 @@ class BankingService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 50,
+        before: Optional[HistoryCursor] = None,
     ) -> list[dict]:
-        with session_scope(self._session_factory) as session:
+        with session_scope(self._read_session_factory) as session:
             account = get_account_by_id(session, account_id, user_id=user_id)
             if account is None:
                 raise ValueError("account_not_found")
@@ -310,24 +410,45 @@ class BankingService:
                 start_date=start_date,
                 end_date=end_date,
                 limit=limit,
+                before=before,
             )
-            return [
-                {
-                    "id": str(txn.id),
-                    "type": txn.transaction_type.value,
-                    "status": txn.status.value,
-                    "amount": float(txn.amount),
-                    "currency": txn.currency_code,
-                    "description": txn.description,
-                    "referenceId": txn.reference_id,
-                    "counterpartyAccount": txn.counterparty_account,
-                    "counterpartyName": txn.counterparty_name,
-                    "occurredAt": txn.occurred_at,
-                }
-                for txn in transactions
-            ]
+            return [_serialize_transaction(txn) for txn in transactions]
 
-    def generate_account_statement(
+    async def fetch_transaction_history_async(
+        self,
+        *,
+        user_id,
+        account_id,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 50,
+        before: Optional[HistoryCursor] = None,
+    ) -> list[dict]:
+        if self._async_session_factory is None:
+            return await asyncio.to_thread(
+                self.fetch_transaction_history,
+                user_id=user_id,
+                account_id=account_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                before=before,
+            )
+        async with async_session_scope(self._async_session_factory) as session:
+            account = await get_account_by_id_async(session, account_id, user_id=user_id)
+            if account is None:
+                raise ValueError("account_not_found")
+            transactions = await get_transaction_history_async(
+                session,
+                account_id=account.id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                before=before,
+            )
+            return [_serialize_transaction(txn) for txn in transactions]
+
+    def open_account_statement(
         self,
         *,
         user_id,
@@ -335,38 +456,23 @@ class BankingService:
         from_date: datetime,
         to_date: datetime,
         period_type: str = "custom",
-    ) -> dict:
+    ) -> tuple[dict, Iterator[list[dict]]]:
+        """
+        Validate a statement request and return its header and lazy line pages.
+
+        Ownership and the 365-day limit are checked before returning, so callers
+        can report errors before they start streaming the pages.
+        """
+
         if (to_date - from_date).days > 365:
             raise ValueError("statement_period_too_long")
 
-        with session_scope(self._session_factory) as session:
+        with session_scope(self._read_session_factory) as session:
             account = get_account_by_number(session, account_number)
             if account is None or str(account.user_id) != str(user_id):
                 raise ValueError("account_not_found")
 
-            transactions = get_transaction_history(
-                session,
-                account_id=account.id,
-                start_date=from_date,
-                end_date=to_date,
-                limit=500,
-            )
-
-            transactions_list = [
-                {
-                    "date": txn.occurred_at.strftime("%Y-%m-%d %H:%M"),
-                    "type": txn.transaction_type.value,
-                    "amount": float(txn.amount),
-                    "currency": txn.currency_code,
-                    "description": txn.description or "",
-                    "status": txn.status.value,
-                    "counterparty": txn.counterparty_name or "",
-                    "reference_id": txn.reference_id or "",
-                }
-                for txn in transactions
-            ]
-
-            return {
+            header = {
                 "account_number": account.account_number,
                 "account_type": account.account_type.value
                 if hasattr(account.account_type, "value")
@@ -374,11 +480,69 @@ class BankingService:
                 "from_date": from_date.strftime("%Y-%m-%d"),
                 "to_date": to_date.strftime("%Y-%m-%d"),
                 "period_type": period_type,
-                "transaction_count": len(transactions_list),
-                "transactions": transactions_list,
                 "current_balance": float(account.balance),
                 "currency": account.currency_code,
             }
+            account_id = account.id
+
+        return header, self.iter_statement_pages(
+            account_id=account_id, from_date=from_date, to_date=to_date
+        )
+
+    def iter_statement_pages(
+        self,
+        *,
+        account_id,
+        from_date: datetime,
+        to_date: datetime,
+        page_size: int = STATEMENT_PAGE_SIZE,
+    ) -> Iterator[list[dict]]:
+        """
+        Yield a statement's lines newest first, one keyset page at a time.
+
+        Each page uses its own short session, so a slow consumer never holds a
+        pooled connection, and only one page is in memory at a time.
+        """
+
+        before = None
+        while True:
+            with session_scope(self._read_session_factory) as session:
+                rows = get_statement_rows(
+                    session,
+                    account_id=account_id,
+                    start_date=from_date,
+                    end_date=to_date,
+                    limit=page_size,
+                    before=before,
+                )
+            if rows:
+                yield [serialize_statement_line(row) for row in rows]
+            if len(rows) < page_size:
+                return
+            before = HistoryCursor.after(rows[-1])
+
+    def generate_account_statement(
+        self,
+        *,
+        user_id,
+        account_number: str,
+        from_date: datetime,
+        to_date: datetime,
+        period_type: str = "custom",
+    ) -> dict:
+        header, pages = self.open_account_statement(
+            user_id=user_id,
+            account_number=account_number,
+            from_date=from_date,
+            to_date=to_date,
+            period_type=period_type,
+        )
+        transactions_list = [line for page in pages for line in page]
+        return {
+            **header,
+            "transaction_count": len(transactions_list),
+            "transactions": transactions_list,
+        }
 
     def schedule_reminder(
         self,
@@ -466,6 +630,6 @@ class BankingService:
             }
 
 
-__all__ = ["BankingService"]
+__all__ = ["BankingService", "serialize_statement_line"]
 
 
@@ -19,6 +19,7 @@ from ..repositories import (
 )
 from ..repositories.auth import invalidate_all_user_sessions
 from ..utils.enums import DeviceTrustLevel
+from .session_cache import mark_sessions_ended
 
 IST = ZoneInfo("Asia/Kolkata")
 
@@ -203,6 +204,7 @@ class DeviceBindingService:
             # If this was the only trusted binding (or only binding overall), invalidate all user sessions
             if should_force_logout:
                 invalidated_count = invalidate_all_user_sessions(session, binding.user_id)
+                mark_sessions_ended(session, binding.user_id)
                 logger.info(
                     f"[Device Binding] Revoked only trusted binding, invalidated {invalidated_count} sessions: "
                     f"binding_id={binding_id}, user_id={binding.user_id}"
@@ -0,0 +1,259 @@
+"""Token-validation cache and write-behind activity buffer for sessions.
+
+Every authenticated API call validates its bearer token. Serving repeat
+validations from memory and coalescing the ``last_activity_at`` updates
+keeps that hot path off the database, which on SQLite would otherwise
+serialize all API traffic behind the single writer lock.
+
+Code that ends a user's sessions marks the user on its database session
+with ``mark_sessions_ended``; cached tokens are dropped once that
+transaction commits, and validations that read the row before the commit
+are not cached (the same ``db.commit_hooks`` scheme as ``db.account_cache``).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from ..commit_hooks import run_after_commit
+from ..engine import session_scope
+from ..models import Session as SessionModel
+from ..utils.enums import SessionStatus
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_TTL_SECONDS = 30  # Bounds how long another worker's logout/revoke can go unseen
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 10.0  # Must stay well below SESSION_INACTIVITY_TIMEOUT
+
+
+@dataclass
+class CachedSession:
+    """A validated session plus what is needed to re-check expiry without the database."""
+
+    session_id: str
+    user_id: str
+    customer_number: str
+    access_token: str
+    expires_at: datetime
+    last_activity_at: datetime
+    cached_at: float
+
+
+class SessionTokenCache:
+    """
+    Short-lived, in-process cache of validated access tokens.
+
+    Entries are dropped after ``ttl_seconds`` and explicitly whenever a
+    session ends (logout, revoke, re-login, expiry), so status changes made
+    in this process are seen immediately and changes made by other workers
+    within the TTL.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidate_user so validations that raced it are not cached
+        self._generation = 0
+        self._stamps = itertools.count(1)
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def get(self, token: str) -> Optional[CachedSession]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and self._clock() - entry.cached_at > self._ttl_seconds:
+                del self._entries[token]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def generation(self) -> int:
+        """Read before loading a session from the database and pass to ``put``."""
+        with self._lock:
+            return self._generation
+
+    def put(self, token: str, entry: CachedSession, generation: Optional[int] = None) -> None:
+        """
+        Cache a validated token.
+
+        With ``generation``, the entry is only stored if no user's sessions
+        ended since it was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id) -> int:
+        """Drop every cached token of a user; returns how many were dropped."""
+        user_id = str(user_id)
+        with self._lock:
+            self._generation = next(self._stamps)
+            stale = [token for token, entry in self._entries.items() if entry.user_id == user_id]
+            for token in stale:
+                del self._entries[token]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SessionActivityBuffer:
+    """
+    Write-behind buffer for ``sessions.last_activity_at``.
+
+    ``touch`` only records the latest activity per session in memory; a
+    daemon thread writes all pending timestamps in one transaction every
+    ``flush_interval`` seconds. Sessions that have ended in the meantime
+    are left untouched.
+    """
+
+    def __init__(self, session_factory, flush_interval: float = ACTIVITY_FLUSH_INTERVAL_SECONDS):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def touch(self, session_id: str, at: datetime) -> None:
+        with self._lock:
+            previous = self._pending.get(session_id)
+            if previous is None or at > previous:
+                self._pending[session_id] = at
+            if self._thread is None and self._flush_interval > 0:
+                self._thread = threading.Thread(
+                    target=self._run, name="session-activity-flush", daemon=True
+                )
+                self._thread.start()
+
+    def pending(self, session_id: str) -> Optional[datetime]:
+        """Latest activity not yet written for a session, if any."""
+        with self._lock:
+            return self._pending.get(session_id)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._pending.pop(session_id, None)
+
+    def flush(self) -> int:
+        """Write all pending activity timestamps; returns the number of sessions updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        table = SessionModel.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("session_id"))
+            .where(table.c.status == SessionStatus.ACTIVE)
+            .values(last_activity_at=bindparam("activity_at"))
+        )
+        params = [
+            {"session_id": session_id, "activity_at": at}
+            for session_id, at in pending.items()
+        ]
+        try:
+            with session_scope(self._session_factory) as session:
+                session.connection().execute(stmt, params)
+        except Exception as exc:
+            # Keep the timestamps for the next attempt unless newer ones arrived
+            with self._lock:
+                for session_id, at in pending.items():
+                    newer = self._pending.get(session_id)
+                    if newer is None or newer < at:
+                        self._pending[session_id] = at
+            logger.warning(f"[Auth] Session activity flush failed, will retry: {exc}")
+            return 0
+
+        self.flushes += 1
+        self.rows_written += len(params)
+        logger.debug(f"[Auth] Flushed activity for {len(params)} session(s)")
+        return len(params)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flush thread and write whatever is still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._flush_interval)
+        self.flush()
+
+
+_caches: "weakref.WeakSet[SessionTokenCache]" = weakref.WeakSet()
+
+
+def _invalidate_users(user_ids) -> None:
+    for cache in list(_caches):
+        for user_id in user_ids:
+            cache.invalidate_user(user_id)
+
+
+def mark_sessions_ended(session: Session, *user_ids) -> None:
+    """Drop the users' cached tokens once ``session`` commits."""
+
+    run_after_commit(session, _invalidate_users, *(str(user_id) for user_id in user_ids))
+
+
+_token_cache = SessionTokenCache()
+
+
+def get_session_token_cache() -> SessionTokenCache:
+    """Process-wide token cache shared by the services that end sessions."""
+    return _token_cache
+
+
+__all__ = [
+    "ACTIVITY_FLUSH_INTERVAL_SECONDS",
+    "CachedSession",
+    "SessionActivityBuffer",
+    "SessionTokenCache",
+    "TOKEN_CACHE_TTL_SECONDS",
+    "get_session_token_cache",
+    "mark_sessions_ended",
+]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark: per-message keyword scanning, list-by-list vs the shared automaton
+
+Scans a bilingual utterance corpus against every keyword category the intent
+classifier, RAG agents and guardrails consult. The reference does what those
+modules used to do (``any(keyword in text)`` per list, ``\\bkeyword\\b``
+regexes for the toxic lists); the current path is one KeywordMatcher pass.
+The matched category sets are checked to be identical on every message.
+
+Usage (from backend/ai):
+    python ../../test/ai/benchmarks/bench_keyword_matching.py --rounds 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+AI_DIR = REPO_ROOT / "backend" / "ai"
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+sys.path.insert(0, str(AI_DIR))
+
+from services.message_features import KEYWORD_CATEGORIES, WHOLE_WORD_CATEGORIES  # noqa: E402
+from utils.keyword_automaton import KeywordMatcher  # noqa: E402
+
+UTTERANCES = (
+    "hello, how are you",
+    "What is my account balance?",
+    "Transfer 5000 rupees to account 123456789012",
+    "pay 500 to Rahul via UPI",
+    "show my last five transactions",
+    "download my bank statement for last month",
+    "what is the interest rate for home loan",
+    "I want a loan against property, what are the options",
+    "tell me about PPF and sukanya samriddhi yojana",
+    "change language to Hindi",
+    "set a reminder to pay rent on 5th",
+    "who is Ronaldo?",
+    "invest in bitcoin",
+    "go to hell",
+    "I need customer support, please call me back",
+    "what are the branch timings and IFSC code",
+    "मेरा खाते का बैलेंस क्या है?",
+    "मुझे होम लोन के बारे में जानकारी चाहिए",
+    "यूपीआई से 200 रुपये भेजें",
+    "भाषा बदलें",
+    "Mera account balance kitna hai",
+    "gold loan ka interest rate kya hai",
+    "mujhe business loan chahiye, mudra loan ke baare mein batao",
+    "senior citizen savings scheme details",
+)
+
+
+class ListByListReference:
+    """The pre-automaton approach: one containment test (or regex) per keyword per list"""
+
+    def __init__(self, categories, whole_word):
+        self.categories = {
+            category: tuple(keyword.lower() for keyword in keywords) for category, keywords in categories.items()
+        }
+        self.patterns = {
+            category: [
+                re.compile(r"\b" + re.escape(keyword) + r"\b", re.IGNORECASE) if len(keyword.split()) == 1 else keyword
+                for keyword in self.categories[category]
+            ]
+            for category in whole_word
+        }
+
+    def scan(self, text):
+        lowered = text.lower()
+        matched = set()
+        for category, keywords in self.categories.items():
+            if category in self.patterns:
+                hit = any(
+                    pattern.search(lowered) if isinstance(pattern, re.Pattern) else pattern in lowered
+                    for pattern in self.patterns[category]
+                )
+            else:
+                hit = any(keyword in lowered for keyword in keywords)
+            if hit:
+                matched.add(category)
+        return matched
+
+
+def run(scan, messages, rounds: int):
+    timings = []
+    results = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [scan(message) for message in messages]
+        timings.append(time.perf_counter() - start)
+    return min(timings), sorted(timings)[len(timings) // 2], results
+
+
+def report(label, best, median, messages):
+    print(f"{label:<10} best {best * 1000:8.1f} ms  median {median * 1000:8.1f} ms  "
+          f"{len(messages) / best:10.0f} msgs/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200, help="copies of the utterance corpus per round")
+    args = parser.parse_args()
+
+    messages = list(UTTERANCES) * args.repeat
+    keywords = sum(len(keywords) for keywords in KEYWORD_CATEGORIES.values())
+    print(f"{len(messages)} messages, {len(KEYWORD_CATEGORIES)} categories, {keywords} keywords, "
+          f"{args.rounds} rounds\n")
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(KEYWORD_CATEGORIES, whole_word=WHOLE_WORD_CATEGORIES)
+    print(f"automaton build {(time.perf_counter() - start) * 1000:.1f} ms ({len(matcher)} distinct keywords)\n")
+
+    reference = ListByListReference(KEYWORD_CATEGORIES, WHOLE_WORD_CATEGORIES)
+    best, median, results = run(lambda message: matcher.scan(message).categories, messages, args.rounds)
+    report("automaton", best, median, messages)
+    base_best, base_median, base_results = run(reference.scan, messages, args.rounds)
+    report("per-list", base_best, base_median, messages)
+
+    identical = results == base_results
+    print(f"\nspeedup x{base_best / best:.2f}, identical categories: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark: SemanticChunker throughput on the bundled loan/investment PDFs
+
+Chunks every page of the four document folders (English + Hindi, loans +
+investments) several times and reports pages/s and chunks/s. With
+--baseline-rev the chunker from that git revision is timed on the same pages
+and its output is checked to be identical.
+
+Usage (from backend/ai):
+    python ../../test/ai/benchmarks/bench_semantic_chunker.py --rounds 5 --baseline-rev <rev>
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+AI_DIR = REPO_ROOT / "backend" / "ai"
+DOCUMENTS_DIR = REPO_ROOT / "backend" / "documents"
+CORPORA = ("loan_products", "loan_products_hindi", "investment_schemes", "investment_schemes_hindi")
+
+# Keep per-table info/warning logs out of the timings
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+sys.path.insert(0, str(AI_DIR))
+
+from services.rag_service import load_pdf_pages  # noqa: E402
+from services.semantic_chunker import SemanticChunker  # noqa: E402
+
+
+def load_pages():
+    pages = []
+    for corpus in CORPORA:
+        folder = DOCUMENTS_DIR / corpus
+        for pdf_path in sorted(folder.glob("*.pdf")):
+            pages.extend(load_pdf_pages(pdf_path, folder))
+    return pages
+
+
+def load_chunker_from_rev(rev: str):
+    """Import SemanticChunker as it was at a git revision"""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:backend/ai/services/semantic_chunker.py"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False, encoding="utf-8") as tmp:
+        tmp.write(source)
+    spec = importlib.util.spec_from_file_location(f"semantic_chunker_{rev}", tmp.name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    os.unlink(tmp.name)
+    return module.SemanticChunker
+
+
+def run(chunker_cls, pages, rounds: int):
+    chunker = chunker_cls(min_chunk_size=200, max_chunk_size=2000)
+    timings = []
+    chunks = []
+    for _ in range(rounds):
+        # chunk_documents mutates chunk metadata, so hand it fresh page copies
+        batch = [page.model_copy(deep=True) for page in pages]
+        start = time.perf_counter()
+        chunks = chunker.chunk_documents(batch)
+        timings.append(time.perf_counter() - start)
+    return min(timings), sorted(timings)[len(timings) // 2], chunks
+
+
+def report(label, best, median, pages, chunks):
+    print(f"{label:<10} best {best * 1000:8.1f} ms  median {median * 1000:8.1f} ms  "
+          f"{len(pages) / best:8.1f} pages/s  {len(chunks) / best:8.1f} chunks/s  ({len(chunks)} chunks)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline-rev", help="git revision whose chunker to compare against")
+    args = parser.parse_args()
+
+    pages = load_pages()
+    print(f"{len(pages)} pages from {len(CORPORA)} corpora, {args.rounds} rounds\n")
+
+    best, median, chunks = run(SemanticChunker, pages, args.rounds)
+    report("current", best, median, pages, chunks)
+
+    if args.baseline_rev:
+        base_best, base_median, base_chunks = run(load_chunker_from_rev(args.baseline_rev), pages, args.rounds)
+        report("baseline", base_best, base_median, pages, base_chunks)
+        identical = [(c.page_content, c.metadata) for c in chunks] == [
+            (c.page_content, c.metadata) for c in base_chunks
+        ]
+        print(f"\nspeedup x{base_best / best:.2f}, identical output: {identical}")
+        return 0 if identical else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""Shared setup for the AI backend tests."""
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# utils.logging opens settings.log_file (relative to the working directory) on
+# import; point it at a temporary directory so test runs leave no logs/ behind.
+# Set before any test module imports config.
+_log_dir = tempfile.mkdtemp(prefix="ai-backend-test-logs-")
+os.environ["LOG_FILE"] = str(Path(_log_dir) / "ai_backend.log")
+atexit.register(shutil.rmtree, _log_dir, ignore_errors=True)
@@ -0,0 +1,89 @@
+"""Unit tests for the semantic answer cache."""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from services.answer_cache import SemanticAnswerCache
+
+
+class TopicEmbeddings(Embeddings):
+    """Maps queries to fixed vectors by topic so similarity is predictable."""
+
+    TOPICS: Dict[str, List[float]] = {
+        "interest": [1.0, 0.0, 0.0],
+        "eligibility": [0.0, 1.0, 0.0],
+    }
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        for topic, vector in self.TOPICS.items():
+            if topic in text.lower():
+                return vector
+        return [0.0, 0.0, 1.0]
+
+
+def build_cache() -> SemanticAnswerCache:
+    return SemanticAnswerCache(TopicEmbeddings(), similarity_threshold=0.9, ttl_seconds=60, max_entries=8)
+
+
+def test_similar_query_in_same_scope_hits() -> None:
+    cache = build_cache()
+    scope = SemanticAnswerCache.scope_key("en-IN", "loan", "HOME_LOAN")
+    cache.store("What is the home loan interest rate?", scope, "v1", "8.5% p.a.", {"type": "loan"})
+
+    hit = cache.lookup("home loan interest please", scope, "v1")
+
+    assert hit is not None
+    assert hit.response == "8.5% p.a."
+    assert hit.structured_data == {"type": "loan"}
+    assert cache.lookup("home loan eligibility", scope, "v1") is None
+    assert cache.lookup("home loan interest", SemanticAnswerCache.scope_key("hi-IN", "loan", "home_loan"), "v1") is None
+
+
+def test_reingested_collection_invalidates_scope() -> None:
+    cache = build_cache()
+    scope = SemanticAnswerCache.scope_key("en-IN", "loan", "home loan")
+    cache.store("home loan interest", scope, "v1", "8.5% p.a.")
+
+    assert cache.lookup("home loan interest", scope, "v2") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_user_name_is_templated_for_other_customers() -> None:
+    cache = build_cache()
+    scope = SemanticAnswerCache.scope_key("en-IN", "support")
+    cache.store("bank interest", scope, "static", "Hi Priya, savings earn 4%.", user_name="Priya")
+
+    hit = cache.lookup("bank interest", scope, "static", user_name="Rahul")
+
+    assert hit is not None and hit.response == "Hi Rahul, savings earn 4%."
+    assert cache.lookup("bank interest", scope, "static") is None
+    # A Hindi answer that does not contain the literal name may hold a transliteration
+    assert not cache.store("bank interest", SemanticAnswerCache.scope_key("hi-IN", "support"), "static",
+                           "नमस्ते प्रिया", user_name="Priya", language="hi-IN")
+
+
+def test_first_name_only_answer_is_templated() -> None:
+    cache = build_cache()
+    scope = SemanticAnswerCache.scope_key("en-IN", "support")
+    assert cache.store("bank interest", scope, "static", "Hi Priya, savings earn 4%.", user_name="Priya Sharma")
+
+    hit = cache.lookup("bank interest", scope, "static", user_name="Rahul Verma")
+
+    assert hit is not None and hit.response == "Hi Rahul, savings earn 4%."
+    assert "Priya" not in hit.response
+    assert cache.lookup("bank interest", scope, "static") is None
+
+
+def test_answer_addressing_customer_by_surname_is_not_cached() -> None:
+    cache = build_cache()
+    scope = SemanticAnswerCache.scope_key("en-IN", "support")
+
+    assert not cache.store("bank interest", scope, "static", "Dear Mr. Sharma, savings earn 4%.",
+                           user_name="Priya Sharma")
+    assert cache.lookup("bank interest", scope, "static", user_name="Rahul Verma") is None
@@ -2,6 +2,7 @@
 """
 Simple test to verify the balance response logic
 """
+import asyncio
 import sys
 from pathlib import Path
 
@@ -21,7 +22,7 @@ print(f"User ID: {test_user_id} (Mohammed Khalsa)")
 print()
 
 # Get accounts
-result = get_user_accounts.invoke({"user_id": test_user_id})
+result = asyncio.run(get_user_accounts.ainvoke({"user_id": test_user_id}))
 
 if result["success"] and result["accounts"]:
     print(f"Found {result['count']} account(s):\n")
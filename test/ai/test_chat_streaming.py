@@ -0,0 +1,112 @@
+"""Unit tests for streaming chat turns through the supervisor."""
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Dict, List
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agents.agent_graph import supervisor
+from orchestrator import supervisor as supervisor_module
+from services import get_guardrail_service
+
+
+RESPONSE = (
+    "Your card 4111 1111 1111 1111 is linked to account 123456789012 and PAN ABCDE1234F. "
+    "The balance is Rs 250000000 as of today, and nothing else needs your attention right now."
+)
+
+
+def split_randomly(text: str, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    chunks, position = [], 0
+    while position < len(text):
+        size = rng.randint(1, 7)
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_streaming_redactor_output_is_prefix_of_full_redaction(seed: int) -> None:
+    guardrail = get_guardrail_service()
+    expected = guardrail._redact_pii_from_text(RESPONSE)
+    redactor = guardrail.stream_redactor()
+
+    released = ""
+    for chunk in split_randomly(RESPONSE, seed):
+        released += redactor.feed(chunk)
+        assert expected.startswith(released)
+
+    assert released == redactor.emitted
+    assert "4111" not in released and "ABCDE1234F" not in released
+    assert len(released) > 0
+
+
+def test_digit_free_first_token_is_released_immediately() -> None:
+    redactor = get_guardrail_service().stream_redactor()
+
+    assert redactor.feed("Namaste! ") == "Namaste! "
+    assert redactor.feed("How can") == "How "
+    assert redactor.feed(" I help?") == "can I "
+
+
+def test_text_after_a_digit_is_held_back() -> None:
+    guardrail = get_guardrail_service()
+    redactor = guardrail.stream_redactor()
+    chunks = ["Your account ", "123456789012 is active. ", "x " * redactor.HOLDBACK]
+
+    assert redactor.feed(chunks[0]) == "Your account "
+    assert redactor.feed(chunks[1]) == ""
+    redactor.feed(chunks[2])
+    assert "123456789012" not in redactor.emitted
+    assert redactor.emitted == guardrail._redact_pii_from_text("".join(chunks))
+
+
+async def collect(**overrides: Any) -> List[Dict[str, Any]]:
+    kwargs = {"message": "hello", "user_id": "u1", "session_id": "s1"}
+    kwargs.update(overrides)
+    return [event async for event in supervisor.process_stream(**kwargs)]
+
+
+def install_specialist(monkeypatch: pytest.MonkeyPatch, chunks: List[str], final_text: str) -> None:
+    async def fake_route(context: Any) -> str:
+        return "fake_agent"
+
+    async def fake_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+        for chunk in chunks:
+            await state["token_sink"](chunk)
+        state["messages"].append(AIMessage(content=final_text))
+        state["structured_data"] = {"type": "loan", "loanInfo": {"name": "Home Loan"}}
+        return state
+
+    monkeypatch.setattr(supervisor, "_route", fake_route)
+    monkeypatch.setitem(supervisor_module.SPECIALIST_MAP, "fake_agent", fake_agent)
+
+
+def test_tokens_stream_before_final_event_with_structured_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    text = "Home loans start at 8.5% per annum for salaried customers with a good credit history. "
+    install_specialist(monkeypatch, split_randomly(text, 1), text + "Anything else?")
+
+    events = asyncio.run(collect())
+
+    tokens = [event["text"] for event in events if event["type"] == "token"]
+    final = events[-1]
+    assert final["type"] == "final" and final["replace"] is False
+    assert len(tokens) > 1
+    assert "".join(tokens) == final["response"] == text + "Anything else?"
+    assert final["structured_data"]["type"] == "loan"
+
+
+def test_rewritten_answer_replaces_streamed_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    streamed = "I cannot help with that request because it is outside of what I was trained on. "
+    install_specialist(monkeypatch, [streamed], streamed)
+
+    events = asyncio.run(collect())
+
+    final = events[-1]
+    # Refusal normalization rewrites the whole answer after it was streamed
+    assert final["replace"] is True
+    assert final["response"].startswith("I'm sorry, I can only help with banking services")
@@ -0,0 +1,94 @@
+"""Unit tests for the AI tools' database sessions when no async driver is installed."""
+from __future__ import annotations
+
+import asyncio
+import shutil
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+
+# Importing the helper loads the whole banking backend (voice verification needs soundfile)
+db_helper = pytest.importorskip("utils.db_helper")
+
+from utils.db_helper import ThreadedSession
+from db.config import DatabaseConfig
+from db.engine import create_db_engine, get_session_factory
+from db.models import Account
+from db.repositories import accounts as account_repo
+from db.repositories import transactions as transaction_repo
+
+SEEDED_DB = Path(__file__).resolve().parents[2] / "backend" / "db" / "vaani.db"
+USER_ID = uuid.UUID("3bce8b0a-93f3-4513-98f7-a6d0815512b8")
+ACCOUNT_ID = uuid.UUID("00169fc2-23a9-43b7-85b0-d516f2f116aa")
+ACCOUNT_NUMBER = "910015702635881694"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    db_path = tmp_path / "vaani.db"
+    shutil.copy(SEEDED_DB, db_path)
+    engine = create_db_engine(DatabaseConfig(backend="sqlite", database_url=f"sqlite:///{db_path}"))
+    yield get_session_factory(engine)
+    engine.dispose()
+
+
+def test_threaded_session_runs_async_repository_reads(session_factory) -> None:
+    async def reads():
+        with session_factory() as session:
+            threaded = ThreadedSession(session)
+            accounts = await account_repo.list_accounts_for_user_async(threaded, USER_ID)
+            account = await account_repo.get_account_by_number_async(threaded, ACCOUNT_NUMBER)
+            history = await transaction_repo.get_transaction_history_async(threaded, account_id=ACCOUNT_ID)
+            rows = await transaction_repo.get_statement_rows_async(threaded, account_id=ACCOUNT_ID)
+            return (
+                [(a.id, a.balance, len(a.cards)) for a in accounts],
+                (account.id, account.user.id),
+                [txn.id for txn in history],
+                [tuple(row) for row in rows],
+            )
+
+    with session_factory() as session:
+        accounts = account_repo.list_accounts_for_user(session, USER_ID)
+        account = account_repo.get_account_by_number(session, ACCOUNT_NUMBER)
+        expected = (
+            [(a.id, a.balance, len(a.cards)) for a in accounts],
+            (account.id, account.user.id),
+            [txn.id for txn in transaction_repo.get_transaction_history(session, account_id=ACCOUNT_ID)],
+            [tuple(row) for row in transaction_repo.get_statement_rows(session, account_id=ACCOUNT_ID)],
+        )
+
+    assert len(expected[2]) == 6
+    assert asyncio.run(reads()) == expected
+
+
+def test_get_async_db_falls_back_to_threaded_session(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(db_helper, "get_async_session_factory_cached", lambda: None)
+    monkeypatch.setattr(db_helper, "SessionLocal", session_factory)
+
+    async def read_version():
+        async with db_helper.get_async_db() as db:
+            assert isinstance(db, ThreadedSession)
+            return await account_repo.get_accounts_version_async(db, USER_ID)
+
+    with session_factory() as session:
+        expected = account_repo.get_accounts_version(session, USER_ID)
+    assert asyncio.run(read_version()) == expected
+
+
+def test_get_async_db_rolls_back_on_error(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(db_helper, "get_async_session_factory_cached", lambda: None)
+    monkeypatch.setattr(db_helper, "SessionLocal", session_factory)
+
+    async def fail():
+        async with db_helper.get_async_db() as db:
+            await db.execute(update(Account).where(Account.id == ACCOUNT_ID).values(balance=12345))
+            raise RuntimeError("tool failed")
+
+    with session_factory() as session:
+        before = session.get(Account, ACCOUNT_ID).balance
+    with pytest.raises(RuntimeError):
+        asyncio.run(fail())
+    with session_factory() as session:
+        assert session.get(Account, ACCOUNT_ID).balance == before != 12345
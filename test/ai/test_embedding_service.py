@@ -0,0 +1,131 @@
+"""Unit tests for the batched, cached embedding wrapper."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from services import embedding_service
+from services.embedding_service import CachedEmbeddings, EmbeddingModelRegistry, QueryMicroBatcher
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic encoder stub that records every batch it receives."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.batches.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97)] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_repeat_query_skips_encoder() -> None:
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, cache_size=16, batch_size=8, batch_wait_ms=0)
+
+    first = embeddings.embed_query("home loan interest rate")
+    second = embeddings.embed_query("home  loan interest rate ")
+
+    assert first == second
+    assert len(base.batches) == 1
+    assert embeddings.stats()["cache_hits"] == 1
+
+
+def test_embed_documents_encodes_only_missing_texts() -> None:
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, cache_size=16, batch_size=2, batch_wait_ms=0)
+
+    embeddings.embed_documents(["chunk a", "chunk b"])
+    vectors = embeddings.embed_documents(["chunk a", "chunk c", "chunk c", "chunk d"])
+
+    assert base.batches == [["chunk a", "chunk b"], ["chunk c", "chunk d"]]
+    assert vectors[1] == vectors[2]
+
+
+def test_concurrent_queries_share_a_batch() -> None:
+    base = CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, cache_size=64, batch_size=8, batch_wait_ms=200)
+    barrier = threading.Barrier(8)
+    results: dict = {}
+
+    def worker(idx: int) -> None:
+        barrier.wait()
+        results[idx] = embeddings.embed_query(f"query {idx}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert len(base.batches) < 8
+    assert sum(len(batch) for batch in base.batches) == 8
+
+
+def test_batch_leader_returns_under_sustained_load() -> None:
+    def slow_encoder(texts: List[str]) -> List[List[float]]:
+        time.sleep(0.02)
+        return [[float(len(text))] for text in texts]
+
+    batcher = QueryMicroBatcher(slow_encoder, max_batch_size=2, max_wait_ms=0)
+    stop = threading.Event()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(idx: int) -> None:
+        while not stop.is_set():
+            start = time.monotonic()
+            batcher.embed(f"query {idx} {start}")
+            with lock:
+                latencies.append(time.monotonic() - start)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    time.sleep(1.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    # A leader that kept draining the queue would wait for the whole second
+    assert latencies and max(latencies) < 0.5
+
+
+def test_registry_shares_one_model_until_last_release() -> None:
+    loads: List[str] = []
+
+    def loader(model_name: str, backend: str) -> CountingEmbeddings:
+        loads.append(f"{model_name}:{backend}")
+        return CountingEmbeddings()
+
+    registry = EmbeddingModelRegistry(loader=loader)
+    first = registry.acquire("mini", "int8")
+    second = registry.acquire("mini", "int8")
+
+    assert first is second
+    assert loads == ["mini:int8"]
+
+    registry.release(first)
+    assert registry.stats()["mini[int8]"]["refcount"] == 1
+
+    registry.release(second)
+    assert registry.stats() == {}
+    assert registry.acquire("mini", "int8") is not first
+    assert loads == ["mini:int8", "mini:int8"]
+
+
+def test_onnx_backend_requires_sentence_transformers_3_2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(embedding_service, "_sentence_transformers_version", lambda: (2, 7))
+
+    with pytest.raises(ValueError, match="sentence-transformers>=3.2"):
+        embedding_service.load_sentence_transformer_embeddings("mini", backend="onnx")
@@ -0,0 +1,91 @@
+"""Unit tests for the persistent extraction-output cache."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, List
+
+from services.extraction_cache import ExtractionCache
+
+
+CARD = '{"name": "Home Loan", "interest_rate": "8.35% - 9.50% p.a."}'
+
+
+class FakeLLM:
+    def __init__(self, output: str = CARD) -> None:
+        self.output = output
+        self.prompts: List[str] = []
+
+    def model_name(self, use_fast_model: bool) -> str:
+        return "fast" if use_fast_model else "main"
+
+    async def chat(self, messages: List[dict], **kwargs: Any) -> str:
+        self.prompts.append(messages[-1]["content"])
+        return self.output
+
+
+def extract(cache: ExtractionCache, llm: FakeLLM, prompt: str, version: str = "v1", **kwargs: Any) -> str:
+    return asyncio.run(cache.achat(llm, prompt, "loan_products", version, use_fast_model=True, **kwargs))
+
+
+def test_outputs_persist_across_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    llm = FakeLLM()
+
+    assert extract(ExtractionCache(path=path), llm, "home loan context") == CARD
+    reopened = ExtractionCache(path=path)
+    assert extract(reopened, llm, "home loan context") == CARD
+
+    assert llm.prompts == ["home loan context"]
+    assert reopened.stats()["hits"] == 1
+
+
+def test_model_is_part_of_the_key(tmp_path: Path) -> None:
+    cache = ExtractionCache(path=str(tmp_path / "cache.sqlite3"))
+    llm = FakeLLM()
+
+    extract(cache, llm, "prompt")
+    asyncio.run(cache.achat(llm, "prompt", "loan_products", "v1", use_fast_model=False))
+
+    assert len(llm.prompts) == 2
+
+
+def test_new_collection_version_invalidates_older_entries(tmp_path: Path) -> None:
+    cache = ExtractionCache(path=str(tmp_path / "cache.sqlite3"))
+    llm = FakeLLM()
+
+    extract(cache, llm, "a")
+    extract(cache, llm, "b")
+    cache.put("fast", "other", "investment_schemes", "v1", CARD)
+    extract(cache, llm, "a", version="v2")
+
+    stats = cache.stats()
+    assert stats["invalidations"] == 2  # Only the loan collection's old entries
+    assert stats["entries"] == 2
+    assert cache.get("fast", "other", "investment_schemes", "v1") == CARD
+    assert len(llm.prompts) == 3
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache = ExtractionCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    llm = FakeLLM()
+
+    extract(cache, llm, "first")
+    extract(cache, llm, "second")
+    extract(cache, llm, "first")  # Refresh "first"
+    extract(cache, llm, "third")
+
+    assert cache.get("fast", "second", "loan_products", "v1") is None
+    assert cache.get("fast", "first", "loan_products", "v1") == CARD
+    assert cache.stats()["evictions"] == 1
+
+
+def test_unparseable_outputs_are_not_stored(tmp_path: Path) -> None:
+    cache = ExtractionCache(path=str(tmp_path / "cache.sqlite3"))
+    llm = FakeLLM(output="Sorry, I could not find {that")
+
+    extract(cache, llm, "prompt")
+    extract(cache, llm, "prompt")
+
+    assert len(llm.prompts) == 2
+    assert cache.stats()["entries"] == 0
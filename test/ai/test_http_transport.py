@@ -0,0 +1,113 @@
+"""Unit tests for the shared, pooled upstream HTTP clients."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from config import settings
+from services.http_transport import HTTPClientRegistry, http_limits
+from services.ollama_service import OllamaService
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def do_GET(self) -> None:
+        body = b'{"models": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sequential_requests_reuse_one_connection(server_url: str) -> None:
+    registry = HTTPClientRegistry()
+
+    async def run() -> None:
+        client = registry.get_client("ollama", timeout=5)
+        for _ in range(5):
+            assert (await client.get(f"{server_url}/api/tags")).status_code == 200
+        assert registry.get_client("ollama") is client
+        assert registry.stats()["ollama"]["open_connections"] == 1
+        await registry.close()
+
+    asyncio.run(run())
+
+    stats = registry.stats()["ollama"]
+    assert (stats["requests"], stats["connections_opened"], stats["reused_requests"]) == (5, 1, 4)
+    assert stats["reuse_ratio"] == 0.8
+    assert stats["http_versions"] == {"HTTP/1.1": 5}
+    assert stats["open_connections"] == 0
+
+
+def test_concurrent_requests_are_bounded_by_the_per_host_limit(
+    server_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "http_host_max_connections", {"ollama": 2})
+    registry = HTTPClientRegistry()
+
+    async def run() -> None:
+        client = registry.get_client("ollama", timeout=5)
+        responses = await asyncio.gather(*(client.get(f"{server_url}/api/tags") for _ in range(8)))
+        assert all(response.status_code == 200 for response in responses)
+        await registry.close()
+
+    asyncio.run(run())
+
+    assert http_limits("ollama").max_connections == 2
+    assert http_limits("openai").max_connections == settings.http_max_connections
+    stats = registry.stats()["ollama"]
+    assert stats["requests"] == 8 and stats["connections_opened"] <= 2
+
+
+def test_closed_client_is_rebuilt_and_errors_are_counted() -> None:
+    registry = HTTPClientRegistry()
+
+    async def run() -> None:
+        first = registry.get_client("ollama", timeout=0.5)
+        await registry.close_client("ollama")
+        second = registry.get_client("ollama", timeout=0.5)
+        assert first.is_closed and second is not first
+        with pytest.raises(httpx.ConnectError):
+            await second.get("http://127.0.0.1:9/")  # Discard port: nothing listens
+        await registry.close()
+
+    asyncio.run(run())
+
+    assert registry.stats()["ollama"]["errors"] == 1
+
+
+def test_ollama_service_calls_share_the_pooled_client(server_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    import services.ollama_service as ollama_module
+
+    registry = HTTPClientRegistry()
+    monkeypatch.setattr(ollama_module, "get_http_clients", lambda: registry)
+    monkeypatch.setattr(settings, "ollama_base_url", server_url)
+    service = OllamaService()
+
+    async def run() -> None:
+        assert await service.health_check()
+        assert await service.health_check()
+        await service.close()
+
+    asyncio.run(run())
+
+    assert registry.stats()["ollama"]["connections_opened"] == 1
@@ -0,0 +1,119 @@
+"""Unit tests for the local intent model and the classifier's LLM escalation."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Any, List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import HumanMessage
+
+import services
+from agents import intent_classifier
+from services.intent_model import INTENT_EXAMPLES, IntentModel, IntentRoutingMetrics
+
+
+class HashedBagOfWords(Embeddings):
+    """Deterministic stand-in for the sentence encoder: hashed token counts."""
+
+    DIMENSIONS = 512
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.DIMENSIONS
+        for token in text.lower().replace("?", " ").replace(",", " ").split():
+            vector[int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16) % self.DIMENSIONS] += 1.0
+        return vector
+
+
+@pytest.fixture(scope="module")
+def model() -> IntentModel:
+    return IntentModel(HashedBagOfWords()).fit()
+
+
+def test_centroids_cover_every_intent_and_temperature_is_calibrated(model: IntentModel) -> None:
+    assert model.labels == list(INTENT_EXAMPLES)
+    assert 0.005 <= model.temperature <= 0.5
+
+
+def test_close_paraphrase_is_confident_and_unseen_text_is_not(model: IntentModel) -> None:
+    greeting = model.predict("hello, how are you")
+    unknown = model.predict("zxq plorf wibble")
+
+    assert greeting.intent == "greeting"
+    assert greeting.confidence > 0.7
+    assert unknown.confidence < 0.5  # No overlap with any centroid: near-uniform
+
+
+def test_routing_metrics_report_escalation_rate_and_percentiles() -> None:
+    metrics = IntentRoutingMetrics()
+    for route, latency_ms in (("rule", 1.0), ("rule", 2.0), ("model", 8.0), ("llm", 400.0)):
+        metrics.record(route, latency_ms)
+
+    stats = metrics.stats()
+    assert stats["classified"] == 4
+    assert stats["llm_escalation_rate"] == 0.25
+    assert stats["unmatched_llm_escalation_rate"] == 0.5
+    assert stats["routes"]["llm"]["p50_ms"] == 400.0
+    assert stats["overall"]["p95_ms"] == 400.0
+
+
+class CountingLLM:
+    def __init__(self, intent: str = "feedback") -> None:
+        self.intent = intent
+        self.calls = 0
+
+    async def chat(self, *args: Any, **kwargs: Any) -> str:
+        self.calls += 1
+        return self.intent
+
+
+def classify(message: str) -> str:
+    state = {"messages": [HumanMessage(content=message)], "language": "en-IN", "structured_data": {}}
+    return asyncio.run(intent_classifier.classify_intent(state))["current_intent"]
+
+
+@pytest.fixture
+def routing(model: IntentModel, monkeypatch: pytest.MonkeyPatch):
+    llm = CountingLLM()
+    metrics = IntentRoutingMetrics()
+    monkeypatch.setattr(services, "get_llm_service", lambda: llm)
+    monkeypatch.setattr(intent_classifier, "get_intent_model", lambda: model)
+    monkeypatch.setattr(intent_classifier, "get_intent_metrics", lambda: metrics)
+    return llm, metrics
+
+
+def test_confident_model_prediction_skips_the_llm(routing) -> None:
+    llm, metrics = routing
+
+    assert classify("good morning") == "greeting"
+    assert llm.calls == 0
+    assert metrics.stats()["routes"]["model"]["count"] == 1
+
+
+def test_low_confidence_escalates_and_keywords_never_reach_the_model(routing) -> None:
+    llm, metrics = routing
+
+    assert classify("zxq plorf wibble") == "feedback"
+    assert classify("check my balance") == "banking_operation"
+
+    assert llm.calls == 1
+    routes = metrics.stats()["routes"]
+    assert (routes["llm"]["count"], routes["rule"]["count"], routes["model"]["count"]) == (1, 1, 0)
+
+
+def test_unavailable_encoder_falls_back_to_the_llm(routing, monkeypatch: pytest.MonkeyPatch) -> None:
+    llm, metrics = routing
+
+    class MissingEncoder(IntentModel):
+        def predict(self, text: str):
+            raise ImportError("sentence_transformers")
+
+    monkeypatch.setattr(intent_classifier, "get_intent_model", lambda: MissingEncoder(HashedBagOfWords()))
+
+    assert classify("good morning") == "feedback"
+    assert llm.calls == 1
+    assert metrics.stats()["llm_escalation_rate"] == 1.0
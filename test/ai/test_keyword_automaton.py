@@ -0,0 +1,76 @@
+"""Unit tests for the keyword automaton and the shared per-message features."""
+from __future__ import annotations
+
+import pytest
+
+from agents.rag_agent import _detect_query_signals
+from services.guardrail_service import GuardrailService
+from services.message_features import MessageFeatureExtractor, extract_message_features, message_features_for
+from utils.keyword_automaton import KeywordAutomaton, KeywordMatcher
+
+
+def test_automaton_reports_overlapping_and_devanagari_matches() -> None:
+    automaton = KeywordAutomaton(["he", "she", "hers", "बैलेंस"])
+
+    matches = sorted(automaton.iter_matches("ushers मेरा बैलेंस"))
+
+    assert matches == [(1, 1), (2, 0), (2, 2), (12, 3)]
+    assert automaton.first("ushers") == 0
+    assert automaton.find_indices("nothing here") == {0}
+    assert automaton.first("xyz") is None
+
+
+def test_whole_word_categories_need_word_boundaries() -> None:
+    matcher = KeywordMatcher({"toxic": ["hell", "shut up"], "greeting": ["hell"]}, whole_word=["toxic"])
+
+    assert matcher.scan("Hello there").categories == {"greeting"}
+    assert matcher.scan("Go to HELL!").categories == {"toxic", "greeting"}
+    assert matcher.scan("please shut up").keywords("toxic") == ["shut up"]
+    with pytest.raises(ValueError):
+        KeywordMatcher({"a": ["x"]}, whole_word=["b"])
+
+
+def test_first_follows_category_order_not_text_position() -> None:
+    matcher = KeywordMatcher({"loan_type": ["home loan", "loan against property", "property"]})
+    matches = matcher.scan("property loan, or a loan against property?")
+
+    assert matches.first("loan_type") == "loan against property"
+    assert matches.keywords("loan_type") == ["loan against property", "property"]
+
+
+def test_features_extract_amounts_and_account_digits() -> None:
+    features = MessageFeatureExtractor().extract("Transfer ₹2,500 and 3 lakh rupees from account 1444 to 123456789012")
+
+    assert features.has("transfer") and features.has_amount
+    assert features.amounts == (2500.0, 300000.0)
+    assert features.account_digits == ("1444", "123456789012")
+
+
+def test_features_are_memoized_and_reused_from_state() -> None:
+    extractor = MessageFeatureExtractor(cache_size=2)
+    first = extractor.extract("check my balance")
+
+    assert extractor.extract("check my balance") is first
+    extractor.extract("a")
+    extractor.extract("b")
+    assert extractor.extract("check my balance") is not first  # Evicted
+
+    shared = extract_message_features("show my balance")
+    assert message_features_for({"message_features": shared}, "show my balance") is shared
+    assert message_features_for({"message_features": shared}, "other").message == "other"
+
+
+def test_query_signals_and_guardrails_keep_their_decisions() -> None:
+    signals = _detect_query_signals("tell me about loan against property")
+    followup = _detect_query_signals("what is the interest rate?", conversation_context="tell me about home loan")
+    investment = _detect_query_signals("ppf interest rate")
+
+    assert (signals.is_loan_query, signals.detected_loan_type) == (True, "loan_against_property")
+    assert (followup.is_loan_query, followup.detected_loan_type) == (True, "home_loan")
+    assert (investment.is_investment_query, investment.detected_investment_type) == (True, "ppf")
+
+    guardrails = GuardrailService()
+    assert guardrails._check_toxicity("hello, check my balance", "en-IN").passed
+    assert not guardrails._check_toxicity("go to hell", "en-IN").passed
+    assert guardrails._check_off_topic("buy mutual fund", "en-IN").passed
+    assert not guardrails._check_off_topic("invest in bitcoin", "en-IN").passed
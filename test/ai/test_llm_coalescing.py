@@ -0,0 +1,146 @@
+"""Unit tests for single-flight coalescing of identical LLM calls."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from services.llm_service import LLMPriority, LLMScheduler, LLMService, SingleFlight
+
+
+class CountingProvider:
+    model = "main"
+    fast_model = "fast"
+
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.calls: List[Any] = []
+
+    async def chat(self, messages, use_fast_model=False, temperature=None, max_tokens=None) -> str:
+        self.calls.append((messages[-1]["content"], temperature))
+        await asyncio.sleep(self.delay)
+        return f"reply to {messages[-1]['content']}"
+
+
+def make_llm(provider: CountingProvider) -> LLMService:
+    llm = LLMService()
+    llm.service = provider
+    llm.single_flight = SingleFlight(ttl_seconds=60, max_entries=8)
+    return llm
+
+
+def ask(text: str) -> List[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def test_concurrent_identical_prompts_share_one_upstream_call() -> None:
+    provider = CountingProvider()
+    llm = make_llm(provider)
+
+    async def run() -> List[str]:
+        return await asyncio.gather(
+            *[llm.chat(ask("home loan rate"), use_fast_model=True) for _ in range(5)],
+            llm.chat(ask("car loan rate"), use_fast_model=True),
+            llm.chat(ask("home loan rate"), use_fast_model=False),  # Different model: separate call
+        )
+
+    results = asyncio.run(run())
+
+    assert results[:5] == ["reply to home loan rate"] * 5
+    assert len(provider.calls) == 3
+    assert llm.single_flight.stats()["coalesced"] == 4
+    assert llm.single_flight.stats()["in_flight"] == 0
+
+
+def test_only_temperature_zero_results_are_cached() -> None:
+    provider = CountingProvider(delay=0)
+    llm = make_llm(provider)
+
+    async def run() -> None:
+        for _ in range(3):
+            await llm.chat(ask("extract card"), use_fast_model=True, temperature=0)
+            await llm.chat(ask("answer"), use_fast_model=True)
+
+    asyncio.run(run())
+
+    assert provider.calls.count(("extract card", 0)) == 1
+    assert provider.calls.count(("answer", None)) == 3
+    assert llm.single_flight.stats()["cache_hits"] == 2
+
+
+def test_expired_results_are_fetched_again() -> None:
+    provider = CountingProvider(delay=0)
+    llm = make_llm(provider)
+    llm.single_flight.ttl_seconds = 0.01
+
+    async def run() -> None:
+        await llm.chat(ask("extract card"), temperature=0)
+        await asyncio.sleep(0.02)
+        await llm.chat(ask("extract card"), temperature=0)
+
+    asyncio.run(run())
+
+    assert len(provider.calls) == 2
+
+
+def test_upstream_call_survives_until_last_waiter_cancels() -> None:
+    provider = CountingProvider(delay=0.05)
+    llm = make_llm(provider)
+
+    async def run() -> str:
+        first = asyncio.create_task(llm.chat(ask("shared")))
+        second = asyncio.create_task(llm.chat(ask("shared")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "reply to shared"
+    assert len(provider.calls) == 1
+
+
+def test_errors_are_shared_but_not_cached() -> None:
+    class FailingProvider(CountingProvider):
+        async def chat(self, *args, **kwargs) -> str:
+            await super().chat(*args, **kwargs)
+            raise RuntimeError("upstream down")
+
+    provider = FailingProvider()
+    llm = make_llm(provider)
+
+    async def run() -> List[Any]:
+        return await asyncio.gather(
+            llm.chat(ask("x"), temperature=0), llm.chat(ask("x"), temperature=0), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(provider.calls) == 1
+    assert llm.single_flight.stats()["cached_results"] == 0
+
+
+def test_higher_priority_caller_promotes_the_shared_call() -> None:
+    provider = CountingProvider(delay=0)
+    llm = make_llm(provider)
+    llm.scheduler = LLMScheduler(
+        default_slots=1, model_slots={}, queue_limits={priority: 8 for priority in LLMPriority}
+    )
+
+    async def run() -> None:
+        async with llm.scheduler.slot("main", LLMPriority.ANSWER):
+            background = asyncio.create_task(llm.chat(ask("card json"), priority=LLMPriority.BACKGROUND))
+            await asyncio.sleep(0)
+            classify = asyncio.create_task(llm.chat(ask("classify"), priority=LLMPriority.CLASSIFICATION))
+            await asyncio.sleep(0)
+            voice = asyncio.create_task(llm.chat(ask("card json"), priority=LLMPriority.VOICE_ANSWER))
+            await asyncio.sleep(0)
+            assert llm.scheduler.stats()["models"]["main"]["queued"] == 2
+        await asyncio.gather(background, classify, voice)
+
+    asyncio.run(run())
+
+    # The background call was served first because a voice answer joined it
+    assert [content for content, _ in provider.calls] == ["card json", "classify"]
+    assert llm.single_flight.stats()["coalesced"] == 1
@@ -0,0 +1,131 @@
+"""Unit tests for the priority-aware LLM scheduler."""
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from services.llm_service import LLMPriority, LLMScheduler, LLMService
+from utils import LLMOverloadedError
+
+
+def make_scheduler(slots: int = 1, limits: Dict[LLMPriority, int] = None) -> LLMScheduler:
+    return LLMScheduler(
+        default_slots=slots,
+        model_slots={},
+        queue_limits=limits or {priority: 8 for priority in LLMPriority},
+    )
+
+
+async def run_in_slot(
+    scheduler: LLMScheduler, priority: LLMPriority, order: List[str], name: str, model: str = "main"
+) -> None:
+    async with scheduler.slot(model, priority):
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+def test_waiting_calls_are_served_by_priority_then_arrival() -> None:
+    async def run() -> List[str]:
+        scheduler = make_scheduler()
+        order: List[str] = []
+        async with scheduler.slot("main", LLMPriority.ANSWER):
+            tasks = []
+            for name, priority in [
+                ("background", LLMPriority.BACKGROUND),
+                ("classify-1", LLMPriority.CLASSIFICATION),
+                ("voice", LLMPriority.VOICE_ANSWER),
+                ("classify-2", LLMPriority.CLASSIFICATION),
+            ]:
+                tasks.append(asyncio.create_task(run_in_slot(scheduler, priority, order, name)))
+                await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        stats = scheduler.stats()
+        assert stats["models"]["main"] == {"slots": 1, "active": 0, "queued": 0}
+        assert stats["priorities"]["voice_answer"]["admitted"] == 1
+        return order
+
+    assert asyncio.run(run()) == ["voice", "classify-1", "classify-2", "background"]
+
+
+def test_models_have_independent_slots() -> None:
+    async def run() -> None:
+        scheduler = make_scheduler()
+        async with scheduler.slot("main", LLMPriority.ANSWER):
+            # The fast model is not blocked by a busy main model
+            fast = run_in_slot(scheduler, LLMPriority.CLASSIFICATION, [], "fast", model="fast")
+            await asyncio.wait_for(fast, timeout=1)
+
+    asyncio.run(run())
+
+
+def test_full_background_queue_sheds_without_blocking_interactive_calls() -> None:
+    async def run() -> None:
+        limits = {priority: 8 for priority in LLMPriority}
+        limits[LLMPriority.BACKGROUND] = 1
+        scheduler = make_scheduler(limits=limits)
+        order: List[str] = []
+        async with scheduler.slot("main", LLMPriority.ANSWER):
+            queued = asyncio.create_task(run_in_slot(scheduler, LLMPriority.BACKGROUND, order, "bg-1"))
+            await asyncio.sleep(0)
+            with pytest.raises(LLMOverloadedError):
+                await run_in_slot(scheduler, LLMPriority.BACKGROUND, order, "bg-2")
+            voice = asyncio.create_task(run_in_slot(scheduler, LLMPriority.VOICE_ANSWER, order, "voice"))
+            await asyncio.sleep(0)
+        await asyncio.gather(queued, voice)
+        assert order == ["voice", "bg-1"]
+        assert scheduler.stats()["priorities"]["background"]["shed"] == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    async def run() -> None:
+        scheduler = make_scheduler()
+        async with scheduler.slot("main", LLMPriority.ANSWER):
+            waiter = asyncio.create_task(run_in_slot(scheduler, LLMPriority.ANSWER, [], "cancelled"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            # Released in the same step: the slot is handed to the cancelled waiter
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(run_in_slot(scheduler, LLMPriority.ANSWER, [], "next"), timeout=1)
+        assert scheduler.stats()["models"]["main"]["active"] == 0
+
+    asyncio.run(run())
+
+
+class SlowProvider:
+    model = "main"
+    fast_model = "fast"
+
+    async def chat(self, messages, use_fast_model=False, temperature=None, max_tokens=None) -> str:
+        await asyncio.sleep(0.01)
+        return "answer"
+
+
+def test_chat_returns_fallback_when_shed() -> None:
+    async def run() -> List[str]:
+        llm = LLMService()
+        llm.service = SlowProvider()
+        limits = {priority: 0 for priority in LLMPriority}
+        llm.scheduler = make_scheduler(limits=limits)
+        messages = [{"role": "user", "content": "hi"}]
+        busy = asyncio.create_task(llm.chat(messages, use_fast_model=True))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(
+            busy,
+            llm.chat([{"role": "user", "content": "other prompt"}], use_fast_model=True, fallback="other"),
+            llm.chat(messages, use_fast_model=False),  # Main model slot is still free
+        )
+        with pytest.raises(LLMOverloadedError):
+            blocker = asyncio.create_task(llm.chat(messages))
+            await asyncio.sleep(0)
+            try:
+                await llm.chat([{"role": "user", "content": "voice"}], priority=LLMPriority.VOICE_ANSWER)
+            finally:
+                await blocker
+        return results
+
+    assert asyncio.run(run()) == ["answer", "other", "answer"]
@@ -0,0 +1,115 @@
+"""Unit tests for the product card index built from the product PDFs."""
+from __future__ import annotations
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from agents.rag_agents import investment_agent, loan_agent
+from services.product_card_index import (
+    PRODUCT_CARD_INDEX_FILE,
+    ProductCardIndex,
+    build_product_card_index,
+    parse_product_card,
+)
+
+DOCUMENTS = Path(__file__).resolve().parents[2] / "backend" / "documents"
+
+
+def test_single_column_loan_card() -> None:
+    card = parse_product_card(DOCUMENTS / "loan_products" / "home_loan_product_guide.pdf", "en-IN", "loan")
+
+    assert card["name"] == "Home Loan"
+    assert card["interest_rate"] == "8.35% - 9.50% p.a. (Floating Rate); 8.85% - 10.00% p.a. (Fixed Rate)"
+    assert (card["min_amount"], card["max_amount"]) == ("Rs. 5 lakhs", "Rs. 5 crores")
+    assert card["processing_fee"].startswith("0.50% of loan amount")
+    assert card["eligibility"].startswith("Age: Salaried Individuals: 21 - 65 years")
+    assert card["loan_type"] == "HOME_LOAN"
+    assert [sub["name"] for sub in card["sub_types"]][:2] == ["Home Purchase Loan", "Home Construction Loan"]
+    assert len(card["sub_types"]) == 6
+
+
+def test_multi_column_hindi_card_keeps_column_labels() -> None:
+    card = parse_product_card(DOCUMENTS / "loan_products_hindi" / "business_loan_product_guide.pdf", "hi-IN", "loan")
+
+    assert card["name"] == "बिजनेस लोन"
+    assert card["interest_rate"].startswith("MUDRA लोन: 7.50% - 10.00% प्रति वर्ष; SME टर्म लोन: 10.00%")
+    assert "min_amount" not in card  # No single range across columns
+    assert card["sub_types"][0]["name"] == "MUDRA लोन"
+
+
+def test_investment_card_amount_bounds_and_tax_benefits() -> None:
+    card = parse_product_card(DOCUMENTS / "investment_schemes" / "ppf_scheme_guide.pdf", "en-IN", "investment")
+
+    assert card["interest_rate"].startswith("7.1% per annum")
+    assert (card["min_amount"], card["max_amount"]) == ("Rs. 500 per year", "Rs. 1.5 lakhs per year")
+    assert card["tax_benefits"].startswith("Section 80C")
+    assert not any(feature.startswith("Tax Benefits") for feature in card["features"])
+    assert card["scheme_type"] == "PPF"
+
+
+@pytest.fixture
+def loan_index(tmp_path: Path) -> ProductCardIndex:
+    (tmp_path / "collection_version").write_text("v1", encoding="utf-8")
+    build_product_card_index(str(DOCUMENTS / "loan_products"), str(tmp_path), "en-IN", "loan")
+    return ProductCardIndex(str(tmp_path))
+
+
+def test_index_covers_every_product_and_returns_copies(loan_index: ProductCardIndex) -> None:
+    assert len(loan_index) == len(list((DOCUMENTS / "loan_products").glob("*.pdf")))
+    card = loan_index.get("HOME_LOAN")
+    card["name"] = "changed"
+
+    assert loan_index.get("home_loan")["name"] == "Home Loan"
+    assert loan_index.get("business_loan_mudra") is None
+    assert len(loan_index.sub_types("business_loan")) == 6
+
+
+def test_index_is_ignored_once_the_collection_is_reingested(loan_index: ProductCardIndex) -> None:
+    assert loan_index.get("gold_loan") is not None
+
+    (Path(loan_index.persist_directory) / "collection_version").write_text("v2", encoding="utf-8")
+    assert loan_index.get("gold_loan") is None
+
+    build_product_card_index(str(DOCUMENTS / "loan_products"), loan_index.persist_directory, "en-IN", "loan")
+    assert loan_index.get("gold_loan") is not None
+
+
+class NoLLM:
+    async def chat(self, *args, **kwargs) -> str:
+        raise AssertionError("indexed cards must not call the LLM")
+
+
+def test_agents_answer_indexed_products_without_retrieval_or_llm(
+    tmp_path: Path, loan_index: ProductCardIndex, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    investments_dir = tmp_path / "investments"
+    investments_dir.mkdir()
+    shutil.copy(Path(loan_index.persist_directory) / "collection_version", investments_dir)
+    build_product_card_index(str(DOCUMENTS / "investment_schemes"), str(investments_dir), "en-IN", "investment")
+    indexes = {"loan": loan_index, "investment": ProductCardIndex(str(investments_dir))}
+    for module in (loan_agent, investment_agent):
+        monkeypatch.setattr(module, "get_product_card_index", lambda documents_type, language: indexes[documents_type])
+
+    async def no_retrieval(*args, **kwargs):
+        raise AssertionError("indexed cards must not hit the vector store")
+
+    monkeypatch.setattr("services.rag_service.aget_rag_service", no_retrieval)
+
+    state = asyncio.run(investment_agent.handle_investment_query(
+        {"messages": []}, user_query="ssy details", language="en-IN", llm=NoLLM(), detected_investment_type="ssy",
+    ))
+    assert state["structured_data"]["investmentInfo"]["interest_rate"].startswith("8.2% per annum")
+    assert state["messages"][-1].content.startswith("Here are the details for SSY:")
+
+    async def cached_rag_service(*args, **kwargs):
+        return object()  # Resolved at the top of handle_loan_query, never queried for indexed cards
+
+    monkeypatch.setattr("services.rag_service.aget_rag_service", cached_rag_service)
+    state = asyncio.run(loan_agent.handle_loan_query(
+        {"messages": []}, user_query="gold loan", language="en-IN", llm=NoLLM(), detected_loan_type="gold_loan",
+    ))
+    assert state["structured_data"] == {"type": "loan", "loanInfo": loan_index.get("gold_loan")}
+    assert (Path(loan_index.persist_directory) / PRODUCT_CARD_INDEX_FILE).exists()
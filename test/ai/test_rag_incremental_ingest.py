@@ -0,0 +1,161 @@
+"""Unit tests for incremental, manifest-driven ingestion into Chroma."""
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from config import settings
+from services.rag_service import INGEST_MANIFEST_FILE, RAGService
+
+LOAN_PDFS = Path(__file__).resolve().parents[2] / "backend" / "documents" / "loan_products"
+
+
+@pytest.fixture(autouse=True)
+def serial_ingestion(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stubbed loaders below only exist in this process, so ingest serially by default."""
+    monkeypatch.setattr(settings, "ingest_workers", 1)
+    monkeypatch.setattr(settings, "ingest_write_batch_size", 2)
+
+
+class CountingEmbeddings(Embeddings):
+    """Cheap deterministic encoder that records how many texts it embedded."""
+
+    def __init__(self) -> None:
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), float(sum(map(ord, text)) % 101), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def build_service(tmp_path: Path, embeddings: CountingEmbeddings) -> RAGService:
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir(exist_ok=True)
+    service = RAGService(
+        documents_path=str(docs_dir),
+        persist_directory=str(tmp_path / "chroma"),
+        collection_name="incremental_test",
+        embeddings=embeddings,
+    )
+
+    # Text files named *.pdf stand in for real PDFs; each line becomes one chunk
+    def fake_load_pdf(pdf_path: Path) -> List[Document]:
+        return [Document(page_content=pdf_path.read_text(), metadata={"source": pdf_path.name})]
+
+    def fake_chunk(documents: List[Document], use_semantic: bool = True) -> List[Document]:
+        return [
+            Document(page_content=line, metadata=dict(doc.metadata))
+            for doc in documents
+            for line in doc.page_content.splitlines()
+        ]
+
+    service._load_pdf = fake_load_pdf  # type: ignore[assignment]
+    service.chunk_documents = fake_chunk  # type: ignore[assignment]
+    return service
+
+
+def collection_texts(service: RAGService) -> List[str]:
+    return sorted(service.vectorstore.get()["documents"])
+
+
+def test_only_changed_documents_are_reembedded(tmp_path: Path) -> None:
+    embeddings = CountingEmbeddings()
+    service = build_service(tmp_path, embeddings)
+    docs_dir = Path(service.documents_path)
+    (docs_dir / "home_loan_product_guide.pdf").write_text("home rate 8.5\nhome tenure 30y")
+    (docs_dir / "gold_loan_product_guide.pdf").write_text("gold rate 9.0")
+    (docs_dir / "auto_loan_product_guide.pdf").write_text("auto rate 9.5")
+
+    first = service.sync_documents()
+    assert len(first.added) == 3 and first.chunks_written == 4
+    assert collection_texts(service) == ["auto rate 9.5", "gold rate 9.0", "home rate 8.5", "home tenure 30y"]
+
+    embeddings.embedded.clear()
+    (docs_dir / "home_loan_product_guide.pdf").write_text("home rate 8.25\nhome tenure 30y")
+    (docs_dir / "auto_loan_product_guide.pdf").unlink()
+    (docs_dir / "education_loan_product_guide.pdf").write_text("education rate 10.0")
+
+    second = service.sync_documents()
+
+    assert second.changed == ["home_loan_product_guide.pdf"]
+    assert second.added == ["education_loan_product_guide.pdf"]
+    assert second.removed == ["auto_loan_product_guide.pdf"]
+    assert second.unchanged == ["gold_loan_product_guide.pdf"]
+    assert second.chunks_deleted == 3
+    assert sorted(embeddings.embedded) == ["education rate 10.0", "home rate 8.25", "home tenure 30y"]
+    assert collection_texts(service) == ["education rate 10.0", "gold rate 9.0", "home rate 8.25", "home tenure 30y"]
+
+    manifest = json.loads((tmp_path / "chroma" / INGEST_MANIFEST_FILE).read_text())
+    assert set(manifest["documents"]) == {
+        "education_loan_product_guide.pdf",
+        "gold_loan_product_guide.pdf",
+        "home_loan_product_guide.pdf",
+    }
+
+
+def test_unchanged_folder_is_a_no_op(tmp_path: Path) -> None:
+    embeddings = CountingEmbeddings()
+    service = build_service(tmp_path, embeddings)
+    (Path(service.documents_path) / "ppf_scheme_guide.pdf").write_text("ppf rate 7.1")
+    service.sync_documents()
+    version = service.collection_version
+    embeddings.embedded.clear()
+
+    report = service.sync_documents()
+
+    assert not report.modified
+    assert embeddings.embedded == []
+    assert service.collection_version == version
+
+
+def test_failed_document_keeps_previous_chunks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    embeddings = CountingEmbeddings()
+    service = build_service(tmp_path, embeddings)
+    pdf = Path(service.documents_path) / "nps_scheme_guide.pdf"
+    pdf.write_text("nps returns 10%")
+    service.sync_documents()
+
+    pdf.write_text("corrupted")
+    monkeypatch.setattr(service, "_load_pdf", lambda path: (_ for _ in ()).throw(ValueError("bad pdf")))
+
+    report = service.sync_documents()
+
+    assert report.failed == ["nps_scheme_guide.pdf"]
+    assert report.chunks_deleted == 0
+    assert collection_texts(service) == ["nps returns 10%"]
+
+
+def test_parallel_loading_matches_serial_order_and_isolates_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    docs_dir = tmp_path / "loan_products"
+    docs_dir.mkdir()
+    for name in ("auto_loan_product_guide.pdf", "gold_loan_product_guide.pdf", "home_loan_product_guide.pdf"):
+        shutil.copy(LOAN_PDFS / name, docs_dir / name)
+    (docs_dir / "broken_product_guide.pdf").write_bytes(b"not a pdf")
+    service = RAGService(
+        documents_path=str(docs_dir),
+        persist_directory=str(tmp_path / "chroma"),
+        collection_name="parallel_test",
+        embeddings=CountingEmbeddings(),
+    )
+    pdf_paths = sorted(docs_dir.glob("*.pdf"))
+
+    serial = list(service._iter_processed_pdfs(pdf_paths))
+    monkeypatch.setattr(settings, "ingest_workers", 2)
+    parallel = list(service._iter_processed_pdfs(pdf_paths))
+
+    assert [error is None for _, error in parallel] == [True, False, True, True]
+    assert [[c.page_content for c in chunks] for chunks, _ in parallel] == [
+        [c.page_content for c in chunks] for chunks, _ in serial
+    ]
+    assert all(chunks for chunks, error in parallel if error is None)
@@ -1,11 +1,15 @@
 """Unit tests for RAGService context caching helpers."""
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 from collections import OrderedDict
 from typing import Any, Dict, List
 
 import pytest
 
+from services import rag_service as rag_service_module
 from services.rag_service import RAGService
 
 
@@ -22,6 +26,7 @@ def build_service(documents: List[DummyDocument]) -> RAGService:
 
     service = RAGService.__new__(RAGService)
     service.vectorstore = True
+    service.collection_name = "test_collection"
     service._context_cache = OrderedDict()
     service._cache_max_size = 8
     service._cache_ttl_seconds = 60
@@ -60,3 +65,105 @@ def test_cache_key_includes_filter(monkeypatch: pytest.MonkeyPatch) -> None:
     service.get_context_for_query("Best schemes", k=2, filter={"scheme_type": "nps"})
 
     assert len(service._retrieve_calls) == 2  # type: ignore[attr-defined]
+
+
+def test_async_context_uses_cache() -> None:
+    documents = [
+        DummyDocument("Loan info chunk", {"source": "loan.pdf", "loan_type": "home_loan"}),
+    ]
+    service = build_service(documents)
+
+    async def run() -> tuple[str, str]:
+        first = await service.aget_context_for_query("Home Loan interest", k=3)
+        second = await service.aget_context_for_query("home loan   interest", k=3)
+        return first, second
+
+    first_context, second_context = asyncio.run(run())
+
+    assert first_context == second_context
+    assert "Loan info chunk" in first_context
+    assert len(service._retrieve_calls) == 1  # type: ignore[attr-defined]
+
+
+def test_async_retrieval_respects_collection_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rag_service_module, "_collection_semaphores", {})
+    monkeypatch.setattr(rag_service_module.settings, "rag_collection_max_concurrency", 2)
+    service = build_service([])
+    service.collection_name = "limited_collection"
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_retrieve(query: str, k: int = 4, filter: Dict[str, Any] | None = None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return []
+
+    service.retrieve = slow_retrieve  # type: ignore[assignment]
+
+    async def run() -> None:
+        await asyncio.gather(*(service.aretrieve(f"query {i}") for i in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+
+def test_concurrent_first_requests_build_one_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rag_service_module, "_rag_service_cache", {})
+    monkeypatch.setattr(rag_service_module, "_rag_service_locks", {})
+    built: List[str] = []
+
+    class SlowService:
+        def __init__(self, documents_path: str, collection_name: str, persist_directory: str, embeddings=None) -> None:
+            built.append(collection_name)
+
+        def initialize(self) -> None:
+            time.sleep(0.05)
+
+    monkeypatch.setattr(rag_service_module, "RAGService", SlowService)
+    barrier = threading.Barrier(6)
+    services: List[Any] = []
+
+    def worker(idx: int) -> None:
+        barrier.wait()
+        documents_type = "loan" if idx % 2 else "investment"
+        services.append((documents_type, rag_service_module.get_rag_service(documents_type=documents_type)))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(built) == ["investment_schemes", "loan_products"]
+    for documents_type, service in services:
+        assert service is rag_service_module._rag_service_cache[(documents_type, "en-IN")]
+
+
+def test_close_rag_services_releases_every_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    closed: List[str] = []
+
+    class ClosingService:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def close(self) -> None:
+            closed.append(self.name)
+
+    monkeypatch.setattr(
+        rag_service_module,
+        "_rag_service_cache",
+        {("loan", "en-IN"): ClosingService("loan"), ("investment", "hi-IN"): ClosingService("investment")},
+    )
+
+    rag_service_module.close_rag_services()
+
+    assert sorted(closed) == ["investment", "loan"]
+    assert rag_service_module._rag_service_cache == {}
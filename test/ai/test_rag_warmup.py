@@ -0,0 +1,94 @@
+"""Unit tests for startup preloading of the RAG collections."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+
+from services import rag_warmup as rag_warmup_module
+from services.embedding_service import EmbeddingModelRegistry
+from services.rag_warmup import RAG_COLLECTIONS, RAGWarmup
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[0.0] * 384 for _ in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [0.0] * 384
+
+
+class FakeCollection:
+    def count(self) -> int:
+        return 10
+
+
+class FakeVectorStore:
+    _collection = FakeCollection()
+
+
+class FakeService:
+    def __init__(self, collection_name: str, embeddings: Any) -> None:
+        self.collection_name = collection_name
+        self.embeddings = embeddings
+        self.vectorstore = FakeVectorStore()
+
+
+def install_registry(monkeypatch: pytest.MonkeyPatch) -> Tuple[EmbeddingModelRegistry, List[str]]:
+    loads: List[str] = []
+
+    def loader(model_name: str, backend: str) -> FakeEmbeddings:
+        loads.append(model_name)
+        return FakeEmbeddings()
+
+    registry = EmbeddingModelRegistry(loader=loader)
+    monkeypatch.setattr(rag_warmup_module, "get_embedding_registry", lambda: registry)
+    return registry, loads
+
+
+def test_warmup_shares_embeddings_and_reports_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry, loads = install_registry(monkeypatch)
+    seen_embeddings: List[Any] = []
+
+    def fake_get_rag_service(documents_type: str, language: str) -> FakeService:
+        # Mirrors RAGService borrowing the shared model from the registry
+        embeddings = registry.acquire()
+        seen_embeddings.append(embeddings)
+        return FakeService(f"{documents_type}_{language}", embeddings)
+
+    monkeypatch.setattr(rag_warmup_module, "get_rag_service", fake_get_rag_service)
+
+    warmup = RAGWarmup()
+    assert not warmup.ready
+
+    asyncio.run(warmup.run())
+
+    assert warmup.state == "ready"
+    assert len(loads) == 1
+    assert len(seen_embeddings) == len(RAG_COLLECTIONS)
+    assert all(embeddings is seen_embeddings[0] for embeddings in seen_embeddings)
+    # Warm-up released its own lease; one lease per collection remains
+    (model_stats,) = registry.stats().values()
+    assert model_stats["refcount"] == len(RAG_COLLECTIONS)
+    report = warmup.snapshot()["collections"]["loan:hi-IN"]
+    assert report["loaded"] and report["vectors"] == 10
+    assert report["estimated_index_mb"] > 0
+
+
+def test_warmup_failure_is_degraded_but_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    install_registry(monkeypatch)
+
+    def fake_get_rag_service(documents_type: str, language: str) -> FakeService:
+        if language == "hi-IN":
+            raise RuntimeError("collection missing")
+        return FakeService(f"{documents_type}_{language}", FakeEmbeddings())
+
+    monkeypatch.setattr(rag_warmup_module, "get_rag_service", fake_get_rag_service)
+
+    warmup = RAGWarmup()
+    asyncio.run(warmup.run())
+
+    assert warmup.state == "degraded"
+    assert warmup.ready
+    assert warmup.reports["investment:hi-IN"].error == "collection missing"
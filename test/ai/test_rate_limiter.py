@@ -0,0 +1,143 @@
+"""Unit tests for the sliding-window rate limiter backends."""
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from config import settings
+from services.guardrail_service import GuardrailService, GuardrailViolationType
+from services.rate_limiter import InMemoryRateLimiter, RateLimit, RateLimiter, RedisRateLimiter
+
+MINUTE = RateLimit("minute", 3, 60)
+HOUR = RateLimit("hour", 5, 3600)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_040.0) -> None:  # 20 s into a minute window
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """The handful of Redis commands the limiter uses, with MULTI/EXEC pipelines"""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, int] = {}
+        self.ttls: Dict[str, int] = {}
+        self.fail = False
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class FakePipeline:
+    def __init__(self, server: FakeRedis) -> None:
+        self.server = server
+        self.commands: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self) -> List[Optional[object]]:
+        if self.server.fail:
+            raise ConnectionError("redis unavailable")
+        replies = []
+        for name, args in self.commands:
+            key = args[0]
+            if name in ("incr", "decr"):
+                self.server.data[key] = self.server.data.get(key, 0) + (1 if name == "incr" else -1)
+                replies.append(self.server.data[key])
+            elif name == "expire":
+                self.server.ttls[key] = args[1]
+                replies.append(True)
+            elif name == "get":
+                value = self.server.data.get(key)
+                replies.append(None if value is None else str(value).encode())
+        return replies
+
+
+def test_in_memory_limit_rejects_without_counting_the_rejection() -> None:
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter([MINUTE, HOUR], clock=clock)
+
+    assert [limiter.hit("u1").allowed for _ in range(3)] == [True, True, True]
+    rejected = limiter.hit("u1")
+    assert (rejected.allowed, rejected.limit, rejected.count) == (False, MINUTE, 3)
+    assert rejected.retry_after == pytest.approx(40.0)
+    assert limiter.hit("u2").allowed  # Keys are independent
+
+    clock.now += 60  # Next window: the previous 3 requests count 2/3
+    assert [limiter.hit("u1").allowed for _ in range(2)] == [True, False]
+    clock.now += 20  # Now they count 1/3
+    assert [limiter.hit("u1").allowed for _ in range(2)] == [True, False]
+    clock.now += 60
+    hourly = limiter.hit("u1")
+    assert (hourly.allowed, hourly.limit, hourly.count) == (False, HOUR, 5)
+
+
+def test_in_memory_limiter_evicts_idle_and_excess_keys() -> None:
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter([MINUTE], max_keys=2, clock=clock)
+
+    for key in ("a", "b", "c"):
+        limiter.hit(key)
+    assert len(limiter) == 2 and limiter.evictions == 1
+
+    clock.now += 120  # Two full windows idle: only zero counters left
+    limiter.hit("d")
+    assert len(limiter) == 1 and limiter.evictions == 3
+
+
+def test_redis_limit_is_shared_by_workers_and_refunds_rejections() -> None:
+    server, clock = FakeRedis(), FakeClock()
+    workers = [RedisRateLimiter([MINUTE, HOUR], client=server, prefix="t", clock=clock) for _ in range(2)]
+
+    decisions = [workers[i % 2].hit("u1").allowed for i in range(4)]
+
+    assert decisions == [True, True, True, False]
+    window = int(clock.now // 60)
+    assert server.data[f"t:minute:u1:{window}"] == 3  # Rejected request refunded
+    assert server.ttls[f"t:minute:u1:{window}"] == 120
+
+    workers[0].reset("u1")
+    assert workers[1].hit("u1").allowed
+
+
+def test_redis_outage_falls_back_to_the_in_process_limiter() -> None:
+    server = FakeRedis()
+    server.fail = True
+    limiter = RedisRateLimiter([MINUTE], client=server, clock=FakeClock())
+
+    assert [limiter.hit("u1").allowed for _ in range(4)] == [True, True, True, False]
+    assert limiter.errors == 4
+
+
+def test_guardrail_reports_the_limit_that_was_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "guardrail_rate_limit_per_minute", 2)
+    guardrails = GuardrailService()
+
+    results = [asyncio.run(guardrails.check_input("check my balance", user_id="u1")) for _ in range(3)]
+
+    assert [result.passed for result in results] == [True, True, False]
+    assert results[-1].violation_type == GuardrailViolationType.RATE_LIMIT
+    assert results[-1].metadata["requests_per_minute"] == 2
+    guardrails.clear_rate_limit("u1")
+    assert asyncio.run(guardrails.check_input("check my balance", user_id="u1")).passed
+
+
+def test_backends_must_implement_hit_and_reset() -> None:
+    class CountOnly(RateLimiter):
+        def hit(self, key: str):
+            raise AssertionError("not called")
+
+    with pytest.raises(TypeError):
+        RateLimiter([MINUTE])
+    with pytest.raises(TypeError):
+        CountOnly([MINUTE])
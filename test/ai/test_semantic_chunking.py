@@ -123,5 +123,22 @@ Yes, but minimum 2 years business vintage required. For fresh startups, explore
     print("=" * 60)
 
 
+def test_section_header_scan_matches_regex_scan():
+    """Substring-based header scan must report exactly what per-pattern regex scanning would"""
+    tables = SemanticChunker()._tables
+    samples = [
+        "KEY FEATURES\nfeatures overview OVERVIEW\nFEES & CHARGES\nInterest Rate Structure ratE",
+        "उत्पाद अवलोकन\nपात्रता मानदंड\nब्याज दर संरचना FAQFAQ प्रश्न",
+        "İstanbul branch OVERVIEW ſ",  # characters where lower() and re.IGNORECASE disagree
+    ]
+    for text in samples:
+        expected = [
+            (match.start(), section, match.group(0))
+            for section, pattern in tables.section_headers
+            for match in pattern.finditer(text)
+        ]
+        assert tables.find_section_headers(text) == expected
+
+
 if __name__ == "__main__":
     test_semantic_chunking()
@@ -0,0 +1,96 @@
+"""Unit tests for sentence-level streaming TTS."""
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+import wave
+from typing import AsyncIterator, List
+
+import pytest
+
+from services.tts_streaming import LocalSpeechSynthesizer, SentenceSegmenter, stream_speech
+
+
+def segment(chunks: List[str], max_chars: int = 300) -> List[str]:
+    segmenter = SentenceSegmenter(max_chars=max_chars)
+    sentences = [sentence for chunk in chunks for sentence in segmenter.feed(chunk)]
+    return sentences + segmenter.flush()
+
+
+def test_english_decimals_and_abbreviations_do_not_split() -> None:
+    text = "Home loans start at 8.5% p.a. for salaried customers. The fee is Rs. 10,000.50 only! Apply now?"
+    # Feed one character at a time: boundaries must not depend on chunking
+    assert segment(list(text)) == [
+        "Home loans start at 8.5% p.a. for salaried customers.",
+        "The fee is Rs. 10,000.50 only!",
+        "Apply now?",
+    ]
+
+
+def test_hindi_danda_ends_sentence_immediately() -> None:
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("होम लोन की ब्याज दर 8.5% है। प्रोसेसिंग") == ["होम लोन की ब्याज दर 8.5% है।"]
+    assert segmenter.feed(" शुल्क 0.5% है॥") == ["प्रोसेसिंग शुल्क 0.5% है॥"]
+    assert segmenter.flush() == []
+
+
+def test_run_on_text_breaks_at_soft_boundary() -> None:
+    sentences = segment(["one two three, four five six seven eight nine ten"], max_chars=20)
+    assert sentences[0] == "one two three,"
+    assert all(len(sentence) <= 20 for sentence in sentences)
+    assert " ".join(sentences) == "one two three, four five six seven eight nine ten"
+
+
+async def trickle(chunks: List[str], delay: float) -> AsyncIterator[str]:
+    for chunk in chunks:
+        await asyncio.sleep(delay)
+        yield chunk
+
+
+def test_sentences_synthesized_while_text_is_still_arriving() -> None:
+    chunks = ["First sentence here. ", "Second one", " is longer. ", "दूसरा वाक्य। ", "Tail without stop"]
+    synthesizer = LocalSpeechSynthesizer(delay_seconds=0.05)
+
+    async def run():
+        started = time.perf_counter()
+        first_audio_at = None
+        segments = []
+        async for item in stream_speech(trickle(chunks, 0.05), synthesizer, max_concurrency=2):
+            if first_audio_at is None:
+                first_audio_at = time.perf_counter() - started
+            segments.append(item)
+        return first_audio_at, time.perf_counter() - started, segments
+
+    first_audio_at, total, segments = asyncio.run(run())
+
+    assert [s.index for s in segments] == list(range(4))
+    assert [s.text for s in segments] == [
+        "First sentence here.", "Second one is longer.", "दूसरा वाक्य।", "Tail without stop",
+    ]
+    # First audio arrives before the text stream has finished
+    assert first_audio_at < 0.05 * len(chunks)
+    # Synthesis overlaps generation instead of running after it
+    assert total < 0.05 * len(chunks) + 0.05 * len(segments)
+    with wave.open(io.BytesIO(segments[0].audio)) as wav:
+        assert wav.getnframes() > 0
+
+
+class FlakySynthesizer(LocalSpeechSynthesizer):
+    async def synthesize_text(self, text: str, language: str = "en-IN") -> bytes:
+        if "fail" in text:
+            raise RuntimeError("synthesis failed")
+        return await super().synthesize_text(text, language)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_failed_sentence_reports_error_and_stream_continues(max_concurrency: int) -> None:
+    async def run():
+        text = trickle(["Okay. This will fail. ", "Still here."], 0)
+        return [item async for item in stream_speech(text, FlakySynthesizer(), max_concurrency=max_concurrency)]
+
+    segments = asyncio.run(run())
+
+    assert [s.error is None for s in segments] == [True, False, True]
+    assert segments[1].error == "synthesis failed"
+    assert segments[2].audio
@@ -2,6 +2,7 @@
 """
 Quick test script to verify UUID user_id works with banking tools
 """
+import asyncio
 import sys
 from pathlib import Path
 
@@ -18,7 +19,7 @@ test_user_id = "3370530d-376d-400d-870a-41b36be9abab"  # Isaac Bakshi
 print(f"Testing get_user_accounts with UUID: {test_user_id}")
 print("-" * 60)
 
-result = get_user_accounts.invoke({"user_id": test_user_id})
+result = asyncio.run(get_user_accounts.ainvoke({"user_id": test_user_id}))
 
 print(f"Success: {result.get('success')}")
 print(f"Account count: {result.get('count', 0)}")
@@ -0,0 +1,175 @@
+"""
+Concurrency benchmark: balance/history reads alongside transfers on SQLite
+
+Copies the seeded database (backend/db/vaani.db) to a temporary directory and
+runs the same mixed workload against each SQLite profile: reader threads call
+BankingService.lookup_account_balance and fetch_transaction_history while
+writer threads move 1.00 back and forth between two accounts with
+transfer_between_accounts. Reports operations/s, read latency percentiles and
+failed operations (e.g. "database is locked") per profile.
+
+    default     NullPool, rollback journal: a new file connection per session
+    production  SQLITE_PRODUCTION_PROFILE: pooled WAL writer plus read-only pool
+
+Usage (from the repository root):
+    python test/backend/benchmarks/bench_sqlite_concurrency.py --seconds 5 --readers 8 --writers 2
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SEEDED_DB = REPO_ROOT / "backend" / "db" / "vaani.db"
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from sqlalchemy import select  # noqa: E402
+
+from db.config import SQLITE_PRODUCTION_PROFILE, DatabaseConfig  # noqa: E402
+from db.engine import create_db_engine, get_session_factory  # noqa: E402
+from db.models import Account  # noqa: E402
+from db.services.banking import BankingService  # noqa: E402
+
+PROFILES = {
+    "default": {},
+    "production": SQLITE_PRODUCTION_PROFILE,
+}
+
+
+def build_service(db_path: Path, profile: dict):
+    config = DatabaseConfig(backend="sqlite", database_url=f"sqlite:///{db_path}", **profile)
+    engines = [create_db_engine(config)]
+    read_factory = None
+    if config.has_read_pool:
+        engines.append(create_db_engine(config, read_only=True))
+        read_factory = get_session_factory(engines[-1])
+    service = BankingService(get_session_factory(engines[0]), read_session_factory=read_factory)
+    return service, engines
+
+
+def load_accounts(service: BankingService):
+    """(account id, user id, number, currency) of every seeded account"""
+    with service._session_factory() as session:
+        rows = session.execute(
+            select(Account.id, Account.user_id, Account.account_number, Account.currency_code)
+        ).all()
+    return [tuple(row) for row in rows]
+
+
+def transfer_pairs(accounts, count: int):
+    by_currency = {}
+    for account in accounts:
+        by_currency.setdefault(account[3], []).append(account[2])
+    numbers = max(by_currency.values(), key=len)
+    if len(numbers) < 2 * count:
+        raise SystemExit(f"Need {2 * count} accounts with the same currency, found {len(numbers)}")
+    return [(numbers[2 * i], numbers[2 * i + 1]) for i in range(count)]
+
+
+def run_workload(service, accounts, pairs, readers: int, seconds: float):
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_latencies, counts = [], {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+    errors = {}
+
+    def record_error(kind: str, exc: Exception):
+        with lock:
+            counts[kind] += 1
+            message = str(exc).splitlines()[0][:80]
+            errors[message] = errors.get(message, 0) + 1
+
+    def reader(seed: int):
+        rng = random.Random(seed)
+        latencies = []
+        while not stop.is_set():
+            account_id, user_id, _, _ = rng.choice(accounts)
+            start = time.perf_counter()
+            try:
+                if rng.random() < 0.5:
+                    service.lookup_account_balance(account_id=account_id)
+                else:
+                    service.fetch_transaction_history(user_id=user_id, account_id=account_id, limit=20)
+            except Exception as exc:
+                record_error("read_errors", exc)
+                continue
+            latencies.append(time.perf_counter() - start)
+        with lock:
+            read_latencies.extend(latencies)
+            counts["reads"] += len(latencies)
+
+    def writer(pair):
+        source, destination = pair
+        done = 0
+        while not stop.is_set():
+            try:
+                service.transfer_between_accounts(
+                    source_account_number=source,
+                    destination_account_number=destination,
+                    amount=1,
+                    description="bench_sqlite_concurrency",
+                    reference_id=f"BENCH-{uuid.uuid4().hex[:12]}",
+                )
+            except Exception as exc:
+                record_error("write_errors", exc)
+                continue
+            source, destination = destination, source
+            done += 1
+        with lock:
+            counts["writes"] += done
+
+    threads = [threading.Thread(target=reader, args=(seed,)) for seed in range(readers)]
+    threads += [threading.Thread(target=writer, args=(pair,)) for pair in pairs]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts, sorted(read_latencies), errors
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--profile", choices=sorted(PROFILES), action="append",
+                        help="profile to run (repeatable; default: all)")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f} s per profile\n")
+    for name in args.profile or list(PROFILES):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "vaani.db"
+            shutil.copy(SEEDED_DB, db_path)
+            service, engines = build_service(db_path, dict(PROFILES[name]))
+            accounts = load_accounts(service)
+            pairs = transfer_pairs(accounts, args.writers)
+            counts, latencies, errors = run_workload(service, accounts, pairs, args.readers, args.seconds)
+            for engine in engines:
+                engine.dispose()
+
+        print(f"{name:<11} reads {counts['reads'] / args.seconds:8.0f}/s  "
+              f"p50 {percentile(latencies, 0.5) * 1000:6.2f} ms  "
+              f"p95 {percentile(latencies, 0.95) * 1000:6.2f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms  "
+              f"transfers {counts['writes'] / args.seconds:6.0f}/s  "
+              f"errors {counts['read_errors']}/{counts['write_errors']} (read/write)")
+        for message, count in sorted(errors.items(), key=lambda item: -item[1]):
+            print(f"{'':<11} {count:6d} x {message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Shared fixtures for the banking backend tests."""
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SEEDED_DB = REPO_ROOT / "backend" / "db" / "vaani.db"
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def database_config(tmp_path):
+    """Config for a private copy of the seeded SQLite database."""
+    from backend.db.config import DatabaseConfig
+
+    db_path = tmp_path / "vaani.db"
+    shutil.copy(SEEDED_DB, db_path)
+    return DatabaseConfig(backend="sqlite", database_url=f"sqlite:///{db_path}")
+
+
+@pytest.fixture
+def session_factory(database_config):
+    """Session factory on a private copy of the seeded SQLite database."""
+    from backend.db.engine import create_db_engine, get_session_factory
+
+    engine = create_db_engine(database_config)
+    yield get_session_factory(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def run_after_ai_backend_import():
+    """
+    Run a script in a fresh interpreter that first imported the package as ``db``.
+
+    The AI backend puts ``backend/`` on ``sys.path``, so one process can hold
+    both ``db.*`` and ``backend.db.*``; importing ``db`` first makes its copy
+    of every ``Session`` listener run before the ``backend.db`` one.
+    """
+
+    def run(body: str) -> None:
+        prelude = (
+            "import sys\n"
+            f"sys.path[:0] = [{str(REPO_ROOT)!r}, {str(REPO_ROOT / 'backend')!r}]\n"
+            "import db.account_cache, db.services.session_cache\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", prelude + textwrap.dedent(body)],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+
+    return run
@@ -0,0 +1,143 @@
+"""Transfer-driven invalidation of the account-summary cache and the account ETags."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.dependencies import get_banking_service
+from backend.api.routes import account_etag_matches, router
+from backend.api.security import get_current_session
+from backend.db.account_cache import AccountSummaryCache
+from backend.db.repositories import execute_internal_transfer
+from backend.db.services.auth import AuthenticatedSession
+from backend.db.services.banking import BankingService
+
+# Seeded customer with two funded, active accounts
+USER_ID = "03460570-5cf7-4ab4-84c2-2f5a9d3ad5d2"
+SOURCE = "910012101963110410"
+DESTINATION = "910012114401896171"
+
+
+@pytest.fixture
+def cache() -> AccountSummaryCache:
+    return AccountSummaryCache()
+
+
+@pytest.fixture
+def service(session_factory, cache) -> BankingService:
+    return BankingService(session_factory, account_cache=cache)
+
+
+def balances(summary) -> dict:
+    return {account["accountNumber"]: account["balance"] for account in summary.value}
+
+
+def test_committed_transfer_bumps_generation_and_drops_entry(service, cache) -> None:
+    before = service.get_account_summary(user_id=USER_ID)
+    generation = cache.generation(USER_ID)
+    assert cache.get(USER_ID) is before
+
+    service.transfer_between_accounts(
+        source_account_number=SOURCE, destination_account_number=DESTINATION, amount=100
+    )
+
+    assert cache.generation(USER_ID) != generation
+    assert cache.get(USER_ID) is None
+    after = service.get_account_summary(user_id=USER_ID)
+    assert after.etag != before.etag
+    assert balances(after)[SOURCE] == balances(before)[SOURCE] - 100
+
+
+def test_rolled_back_transfer_keeps_cached_summary(service, cache, session_factory) -> None:
+    before = service.get_account_summary(user_id=USER_ID)
+    generation = cache.generation(USER_ID)
+
+    with session_factory() as session:
+        execute_internal_transfer(
+            session, source_account_number=SOURCE, destination_account_number=DESTINATION, amount=100
+        )
+        session.flush()
+        session.rollback()
+
+    assert cache.generation(USER_ID) == generation
+    assert cache.get(USER_ID) is before
+    assert service.get_account_summary(user_id=USER_ID).etag == before.etag
+
+
+def test_load_racing_a_transfer_is_not_cached(cache) -> None:
+    generation = cache.generation(USER_ID)
+    cache.invalidate(USER_ID)
+
+    cache.put(USER_ID, "stale", [], generation)
+
+    assert cache.get(USER_ID) is None
+
+
+def test_commit_invalidates_when_package_is_imported_twice(run_after_ai_backend_import) -> None:
+    run_after_ai_backend_import(
+        """
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import Session
+
+        from backend.db.account_cache import AccountSummaryCache, mark_accounts_changed
+
+        cache = AccountSummaryCache()
+        engine = create_engine("sqlite://")
+        with Session(engine) as session:
+            session.execute(text("select 1"))
+            mark_accounts_changed(session, "u1")
+            session.rollback()
+        assert cache.generation("u1") == 0
+        with Session(engine) as session:
+            session.execute(text("select 1"))
+            mark_accounts_changed(session, "u1")
+            session.commit()
+        assert cache.generation("u1") != 0
+        """
+    )
+
+
+@pytest.fixture
+def client(service) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_banking_service] = lambda: service
+    app.dependency_overrides[get_current_session] = lambda: AuthenticatedSession(
+        user_id=USER_ID,
+        customer_number="C-1",
+        session_id="s-1",
+        access_token="t-1",
+        expires_at=datetime.now(ZoneInfo("Asia/Kolkata")) + timedelta(minutes=30),
+    )
+    return TestClient(app)
+
+
+def test_matching_if_none_match_returns_304(client, service) -> None:
+    first = client.get("/api/v1/accounts")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    revalidated = client.get("/api/v1/accounts", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+    service.transfer_between_accounts(
+        source_account_number=SOURCE, destination_account_number=DESTINATION, amount=100
+    )
+    changed = client.get("/api/v1/accounts", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_account_etag_matches_weak_lists_and_wildcard() -> None:
+    assert account_etag_matches('W/"abc"', '"abc"')
+    assert account_etag_matches('"xyz", "abc"', '"abc"')
+    assert account_etag_matches("*", '"abc"')
+    assert not account_etag_matches('"xyz"', '"abc"')
+    assert not account_etag_matches(None, '"abc"')
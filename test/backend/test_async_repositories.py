@@ -0,0 +1,141 @@
+"""The async repository reads and their thread-pool fallback must match the sync reads."""
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from backend.db.account_cache import AccountSummaryCache
+from backend.db.engine import async_session_scope, create_async_db_engine, get_async_session_factory
+from backend.db.repositories import accounts as account_repo
+from backend.db.repositories import transactions as transaction_repo
+from backend.db.services.banking import BankingService
+
+# Seeded customer with two accounts, the first of which has six transactions
+USER_ID = uuid.UUID("3bce8b0a-93f3-4513-98f7-a6d0815512b8")
+ACCOUNT_ID = uuid.UUID("00169fc2-23a9-43b7-85b0-d516f2f116aa")
+ACCOUNT_NUMBER = "910015702635881694"
+
+
+@pytest.fixture
+def run_async(database_config):
+    """Run ``reads(session)`` in an AsyncSession on the test database (needs the async driver)."""
+    pytest.importorskip("greenlet")
+    pytest.importorskip("aiosqlite")
+
+    def run(reads):
+        async def main():
+            engine = create_async_db_engine(database_config)
+            try:
+                async with async_session_scope(get_async_session_factory(engine)) as session:
+                    return await reads(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def accounts_snapshot(accounts) -> list:
+    return [
+        (account.id, account.balance, account.available_balance, sorted(card.id for card in account.cards))
+        for account in accounts
+    ]
+
+
+def test_account_reads_match_sync(session_factory, run_async) -> None:
+    async def reads(session):
+        by_id = await account_repo.get_account_by_id_async(session, ACCOUNT_ID, user_id=USER_ID)
+        by_number = await account_repo.get_account_by_number_async(session, ACCOUNT_NUMBER)
+        listed = await account_repo.list_accounts_for_user_async(session, USER_ID)
+        version = await account_repo.get_accounts_version_async(session, USER_ID)
+        return (
+            accounts_snapshot([by_id]),
+            (by_number.id, by_number.user.id),
+            accounts_snapshot(listed),
+            version,
+        )
+
+    with session_factory() as session:
+        by_id = account_repo.get_account_by_id(session, ACCOUNT_ID, user_id=USER_ID)
+        by_number = account_repo.get_account_by_number(session, ACCOUNT_NUMBER)
+        listed = account_repo.list_accounts_for_user(session, USER_ID)
+        expected = (
+            accounts_snapshot([by_id]),
+            (by_number.id, by_number.user.id),
+            accounts_snapshot(listed),
+            account_repo.get_accounts_version(session, USER_ID),
+        )
+
+    assert len(expected[2]) == 2
+    assert run_async(reads) == expected
+
+
+def test_history_reads_match_sync(session_factory, run_async) -> None:
+    with session_factory() as session:
+        first_page = transaction_repo.get_transaction_history(session, account_id=ACCOUNT_ID, limit=4)
+        cursor = transaction_repo.HistoryCursor.after(first_page[-1])
+        expected = (
+            [txn.id for txn in first_page],
+            [txn.id for txn in transaction_repo.get_transaction_history(
+                session, account_id=ACCOUNT_ID, limit=4, before=cursor
+            )],
+            [tuple(row) for row in transaction_repo.get_statement_rows(session, account_id=ACCOUNT_ID)],
+        )
+
+    async def reads(session):
+        first = await transaction_repo.get_transaction_history_async(session, account_id=ACCOUNT_ID, limit=4)
+        rest = await transaction_repo.get_transaction_history_async(
+            session, account_id=ACCOUNT_ID, limit=4, before=cursor
+        )
+        rows = await transaction_repo.get_statement_rows_async(session, account_id=ACCOUNT_ID)
+        return [txn.id for txn in first], [txn.id for txn in rest], [tuple(row) for row in rows]
+
+    assert (len(expected[0]), len(expected[1]), len(expected[2])) == (4, 2, 6)
+    assert run_async(reads) == expected
+
+
+def test_service_falls_back_to_sync_reads_without_async_factory(session_factory) -> None:
+    service = BankingService(session_factory, account_cache=AccountSummaryCache())
+    uncached = BankingService(session_factory, account_cache=AccountSummaryCache())
+
+    async def reads():
+        accounts = await service.list_accounts_async(user_id=USER_ID)
+        history = await service.fetch_transaction_history_async(user_id=USER_ID, account_id=ACCOUNT_ID, limit=3)
+        account = await service.get_account_for_user_async(user_id=USER_ID, account_id=ACCOUNT_ID)
+        return accounts, history, account
+
+    accounts, history, account = asyncio.run(reads())
+
+    assert accounts == uncached.list_accounts(user_id=USER_ID)
+    assert history == uncached.fetch_transaction_history(user_id=USER_ID, account_id=ACCOUNT_ID, limit=3)
+    assert account == uncached.get_account_for_user(user_id=USER_ID, account_id=ACCOUNT_ID)
+    assert len(history) == 3
+
+
+def test_service_async_reads_match_sync(session_factory, database_config) -> None:
+    pytest.importorskip("greenlet")
+    pytest.importorskip("aiosqlite")
+
+    async def reads():
+        engine = create_async_db_engine(database_config)
+        try:
+            service = BankingService(
+                session_factory,
+                async_session_factory=get_async_session_factory(engine),
+                account_cache=AccountSummaryCache(),
+            )
+            accounts = await service.list_accounts_async(user_id=USER_ID)
+            history = await service.fetch_transaction_history_async(user_id=USER_ID, account_id=ACCOUNT_ID)
+            return accounts, history
+        finally:
+            await engine.dispose()
+
+    service = BankingService(session_factory, account_cache=AccountSummaryCache())
+    expected = (
+        service.list_accounts(user_id=USER_ID),
+        service.fetch_transaction_history(user_id=USER_ID, account_id=ACCOUNT_ID),
+    )
+    assert asyncio.run(reads()) == expected
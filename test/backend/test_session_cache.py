@@ -0,0 +1,170 @@
+"""Unit tests for the session token cache and the activity write-behind buffer."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, text
+
+from backend.db.models import Session as SessionModel, User
+from backend.db.services.session_cache import (
+    CachedSession,
+    SessionActivityBuffer,
+    SessionTokenCache,
+    mark_sessions_ended,
+)
+from backend.db.utils.enums import SessionStatus
+
+TZ = ZoneInfo("Asia/Kolkata")
+START = datetime(2025, 1, 1, 10, 0, tzinfo=TZ)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def cached(user_id: str, token: str, clock: FakeClock) -> CachedSession:
+    return CachedSession(
+        session_id=str(uuid.uuid4()),
+        user_id=user_id,
+        customer_number="C-1",
+        access_token=token,
+        expires_at=START + timedelta(hours=1),
+        last_activity_at=START,
+        cached_at=clock(),
+    )
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = SessionTokenCache(ttl_seconds=30, clock=clock)
+    cache.put("t1", cached("u1", "t1", clock))
+
+    clock.now += 30
+    assert cache.get("t1") is not None
+    clock.now += 1
+    assert cache.get("t1") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidate_user_drops_only_that_users_tokens() -> None:
+    clock = FakeClock()
+    cache = SessionTokenCache(clock=clock)
+    for user_id, token in [("u1", "a"), ("u1", "b"), ("u2", "c")]:
+        cache.put(token, cached(user_id, token, clock))
+
+    assert cache.invalidate_user("u1") == 2
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_validation_that_raced_an_invalidation_is_not_cached() -> None:
+    clock = FakeClock()
+    cache = SessionTokenCache(clock=clock)
+    generation = cache.generation()
+    cache.invalidate_user("u1")
+
+    cache.put("t1", cached("u1", "t1", clock), generation=generation)
+    assert cache.get("t1") is None
+
+    cache.put("t1", cached("u1", "t1", clock), generation=cache.generation())
+    assert cache.get("t1") is not None
+
+
+def test_ended_sessions_are_invalidated_on_commit_only(session_factory) -> None:
+    clock = FakeClock()
+    cache = SessionTokenCache(clock=clock)
+    cache.put("t1", cached("u1", "t1", clock))
+
+    with session_factory() as session:
+        session.execute(text("SELECT 1"))
+        mark_sessions_ended(session, "u1")
+        assert cache.get("t1") is not None
+        session.rollback()
+    assert cache.get("t1") is not None
+
+    with session_factory() as session:
+        session.execute(text("SELECT 1"))
+        mark_sessions_ended(session, "u1")
+        session.commit()
+    assert cache.get("t1") is None
+
+
+def test_ended_sessions_are_invalidated_when_package_is_imported_twice(run_after_ai_backend_import) -> None:
+    run_after_ai_backend_import(
+        """
+        from datetime import datetime
+
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import Session
+
+        from backend.db.services.session_cache import CachedSession, SessionTokenCache, mark_sessions_ended
+
+        cache = SessionTokenCache()
+        now = datetime.now()
+        cache.put("t1", CachedSession("s1", "u1", "C-1", "t1", now, now, cached_at=cache.now()))
+        assert cache.get("t1") is not None
+        with Session(create_engine("sqlite://")) as session:
+            session.execute(text("select 1"))
+            mark_sessions_ended(session, "u1")
+            session.commit()
+        assert cache.get("t1") is None
+        """
+    )
+
+
+def add_session(session_factory, status: SessionStatus = SessionStatus.ACTIVE) -> str:
+    with session_factory() as session:
+        user_id = session.execute(select(User.id)).scalars().first()
+        record = SessionModel(
+            user_id=user_id,
+            status=status,
+            access_token=uuid.uuid4().hex,
+            started_at=START,
+            last_activity_at=START,
+        )
+        session.add(record)
+        session.commit()
+        return str(record.id)
+
+
+def last_activity(session_factory, session_id: str) -> datetime:
+    with session_factory() as session:
+        value = session.get(SessionModel, uuid.UUID(session_id)).last_activity_at
+    return value.replace(tzinfo=TZ) if value.tzinfo is None else value
+
+
+def test_activity_buffer_coalesces_touches_into_one_write(session_factory) -> None:
+    session_id = add_session(session_factory)
+    buffer = SessionActivityBuffer(session_factory, flush_interval=0)
+
+    buffer.touch(session_id, START + timedelta(minutes=2))
+    buffer.touch(session_id, START + timedelta(minutes=5))
+    buffer.touch(session_id, START + timedelta(minutes=3))  # Out of order: older than pending
+    assert buffer.pending(session_id) == START + timedelta(minutes=5)
+    assert last_activity(session_factory, session_id) == START
+
+    assert buffer.flush() == 1
+    assert buffer.pending(session_id) is None
+    assert last_activity(session_factory, session_id) == START + timedelta(minutes=5)
+    assert buffer.flush() == 0
+    assert (buffer.flushes, buffer.rows_written) == (1, 1)
+
+
+def test_activity_flush_skips_ended_and_discarded_sessions(session_factory) -> None:
+    ended = add_session(session_factory, status=SessionStatus.EXPIRED)
+    discarded = add_session(session_factory)
+    buffer = SessionActivityBuffer(session_factory, flush_interval=0)
+
+    buffer.touch(ended, START + timedelta(minutes=1))
+    buffer.touch(discarded, START + timedelta(minutes=1))
+    buffer.discard(discarded)
+    buffer.flush()
+
+    assert last_activity(session_factory, ended) == START
+    assert last_activity(session_factory, discarded) == START
@@ -0,0 +1,177 @@
+"""Keyset statement paging, history cursors and the streamed statement formats."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from backend.api.dependencies import get_banking_service
+from backend.api.routes import router, statement_csv_chunks, statement_ndjson_chunks
+from backend.api.security import get_current_session
+from backend.db.models import Transaction
+from backend.db.repositories import HistoryCursor, get_statement_rows
+from backend.db.services.auth import AuthenticatedSession
+from backend.db.services.banking import BankingService
+
+# Seeded customer whose first account has six transactions between 2025-08-28 and 2025-10-26
+USER_ID = "3bce8b0a-93f3-4513-98f7-a6d0815512b8"
+ACCOUNT_ID = uuid.UUID("00169fc2-23a9-43b7-85b0-d516f2f116aa")
+ACCOUNT_NUMBER = "910015702635881694"
+FROM_DATE = datetime(2025, 8, 1)
+TO_DATE = datetime(2025, 11, 1)
+TIED_IDS = [
+    uuid.UUID("24e6fa70-4f30-4258-bbb4-0d9c6e86dbf9"),
+    uuid.UUID("a50fc05d-a01e-4877-8312-fbc414063aed"),
+    uuid.UUID("4e5dcbfd-f450-4e06-96a7-7616c269dac8"),
+    uuid.UUID("7bf8355c-c521-4cb3-a71c-4898f052c9cf"),
+]
+
+
+@pytest.fixture
+def tied_session_factory(session_factory):
+    """The test database with four of the account's transactions sharing one timestamp."""
+    with session_factory() as session:
+        session.execute(
+            update(Transaction)
+            .where(Transaction.id.in_(TIED_IDS))
+            .values(occurred_at=datetime(2025, 10, 10, 10, 0))
+        )
+        session.commit()
+    return session_factory
+
+
+@pytest.mark.parametrize(
+    "occurred_at",
+    [
+        datetime(2025, 10, 10, 10, 0, 0, 123456),
+        datetime(2025, 10, 10, 10, 0, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+    ],
+)
+def test_cursor_round_trip(occurred_at) -> None:
+    cursor = HistoryCursor(occurred_at=occurred_at, id=uuid.uuid4())
+
+    token = cursor.encode()
+
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert HistoryCursor.decode(token) == cursor
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "bm8tc2VwYXJhdG9y", "MjAyNS0xMC0xMHxub3QtYS11dWlk"])
+def test_cursor_decode_rejects_garbage(token) -> None:
+    with pytest.raises(ValueError, match="invalid_cursor"):
+        HistoryCursor.decode(token)
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 4])
+def test_pages_split_ties_without_repeating_or_skipping(tied_session_factory, page_size) -> None:
+    with tied_session_factory() as session:
+        expected = [tuple(row) for row in get_statement_rows(session, account_id=ACCOUNT_ID)]
+        paged, before = [], None
+        for _ in range(len(expected) + 1):  # A cursor that fails to advance must not loop forever
+            rows = get_statement_rows(session, account_id=ACCOUNT_ID, limit=page_size, before=before)
+            paged.extend(tuple(row) for row in rows)
+            if len(rows) < page_size:
+                break
+            before = HistoryCursor.decode(HistoryCursor.after(rows[-1]).encode())
+
+    assert len(expected) == 6
+    assert [row[0] for row in expected[1:5]] == sorted(TIED_IDS, key=str, reverse=True)
+    assert paged == expected
+
+
+def test_statement_pages_match_single_query(tied_session_factory) -> None:
+    service = BankingService(tied_session_factory)
+
+    pages = list(
+        islice(
+            service.iter_statement_pages(account_id=ACCOUNT_ID, from_date=FROM_DATE, to_date=TO_DATE, page_size=4),
+            3,
+        )
+    )
+
+    assert [len(page) for page in pages] == [4, 2]
+    lines = [line for page in pages for line in page]
+    whole = service.generate_account_statement(
+        user_id=USER_ID, account_number=ACCOUNT_NUMBER, from_date=FROM_DATE, to_date=TO_DATE
+    )
+    assert lines == whole["transactions"]
+
+
+LINES = [
+    {"date": "2025-10-10 10:00", "type": "debit", "amount": 10.0, "currency": "INR",
+     "description": "=HYPERLINK(\"x\")", "status": "completed", "counterparty": "", "reference_id": "r1"},
+    {"date": "2025-10-09 10:00", "type": "credit", "amount": 5.5, "currency": "INR",
+     "description": "Salary", "status": "completed", "counterparty": "Acme", "reference_id": "r2"},
+]
+
+
+def test_ndjson_framing() -> None:
+    chunks = list(statement_ndjson_chunks({"account_number": ACCOUNT_NUMBER}, [LINES[:1], LINES[1:]]))
+
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    records = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert records[0] == {"record": "statement", "account_number": ACCOUNT_NUMBER}
+    assert records[1:3] == [{"record": "transaction", **line} for line in LINES]
+    assert records[3] == {"record": "summary", "transaction_count": 2}
+
+
+def test_ndjson_framing_without_transactions() -> None:
+    records = [json.loads(chunk) for chunk in statement_ndjson_chunks({}, [])]
+
+    assert records == [{"record": "statement"}, {"record": "summary", "transaction_count": 0}]
+
+
+def test_csv_framing() -> None:
+    chunks = list(statement_csv_chunks([LINES[:1], LINES[1:]]))
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith("date,type,amount,")
+    assert chunks[0].count("\n") == 2 and chunks[1].count("\n") == 1
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [row["reference_id"] for row in rows] == ["r1", "r2"]
+    assert rows[0]["description"] == "'=HYPERLINK(\"x\")"
+
+
+def test_csv_framing_without_transactions_still_has_header() -> None:
+    assert "".join(statement_csv_chunks([])).splitlines() == [
+        "date,type,amount,currency,description,status,counterparty,reference_id"
+    ]
+
+
+@pytest.fixture
+def client(tied_session_factory) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_banking_service] = lambda: BankingService(tied_session_factory)
+    app.dependency_overrides[get_current_session] = lambda: AuthenticatedSession(
+        user_id=USER_ID,
+        customer_number="C-1",
+        session_id="s-1",
+        access_token="t-1",
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=30),
+    )
+    return TestClient(app)
+
+
+def test_download_streams_ndjson(client) -> None:
+    response = client.post(
+        "/api/v1/statements/download",
+        json={"accountNumber": ACCOUNT_NUMBER, "fromDate": "2025-08-01", "toDate": "2025-11-01", "format": "ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == (
+        f'attachment; filename="statement_{ACCOUNT_NUMBER}_2025-08-01_2025-11-01.ndjson"'
+    )
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["record"] for record in records] == ["statement"] + ["transaction"] * 6 + ["summary"]
+    assert records[-1]["transaction_count"] == 6